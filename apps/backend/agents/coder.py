@@ -82,6 +82,7 @@ from .base import (
     sanitize_error_message,
 )
 from .memory_manager import debug_memory_system_status, get_graphiti_context
+from .scheduler import ParallelSubtaskScheduler, get_parallel_subtask_limit
 from .session import is_authentication_error, post_session_processing, run_agent_session
 from .utils import (
     find_phase_for_subtask,
@@ -520,6 +521,21 @@ async def run_autonomous_agent(
     )
     stderr_lines: list[str] = []  # Capture CLI stderr for auth error detection
 
+    # Independent subtasks of parallel_safe phases can run side by side
+    parallel_scheduler = ParallelSubtaskScheduler(
+        project_dir,
+        spec_dir,
+        model,
+        recovery_manager,
+        limit=get_parallel_subtask_limit(),
+        status_manager=status_manager,
+        verbose=verbose,
+        source_spec_dir=source_spec_dir,
+        linear_enabled=linear_task is not None and linear_task.task_id is not None,
+    )
+    # Set after a parallel session error so the sequential loop handles it
+    parallel_paused = False
+
     def _reset_concurrency_state() -> None:
         """Reset concurrency error tracking state after a successful session or non-concurrency error."""
         nonlocal \
@@ -530,6 +546,22 @@ async def run_autonomous_agent(
         current_retry_delay = INITIAL_RETRY_DELAY_SECONDS
         concurrency_error_context = None
 
+    async def _complete_build() -> None:
+        """Report that every subtask is done (QA still has to run)."""
+        print_build_complete_banner(spec_dir)
+        status_manager.update(state=BuildState.COMPLETE)
+
+        if task_logger:
+            task_logger.end_phase(
+                LogPhase.CODING,
+                success=True,
+                message="All subtasks completed successfully",
+            )
+
+        if linear_task and linear_task.task_id:
+            await linear_build_complete(spec_dir)
+            print_status("Linear notified: build complete, ready for QA", "success")
+
     while True:
         iteration += 1
 
@@ -558,6 +590,27 @@ async def run_autonomous_agent(
 
         # Get the next subtask to work on (planner sessions shouldn't bind to a subtask)
         next_subtask = None if first_run else get_next_subtask(spec_dir)
+
+        if (
+            next_subtask
+            and not is_planning_phase
+            and not parallel_paused
+            and parallel_scheduler.has_parallel_work()
+        ):
+            result = await parallel_scheduler.run(
+                first_session=iteration,
+                max_sessions=max_iterations - iteration + 1 if max_iterations else None,
+            )
+            iteration += max(result.sessions - 1, 0)
+            print_progress_summary(spec_dir)
+            if is_build_complete(spec_dir):
+                await _complete_build()
+                break
+            if result.error_info:
+                # Retry sequentially, with the main loop's error handling
+                parallel_paused = True
+            continue
+
         subtask_id = next_subtask.get("id") if next_subtask else None
         phase_name = next_subtask.get("phase_name") if next_subtask else None
 
@@ -904,30 +957,19 @@ async def run_autonomous_agent(
         if status == "complete":
             # Don't emit COMPLETE here - subtasks are done but QA hasn't run yet
             # QA loop will emit COMPLETE after actual approval
-            print_build_complete_banner(spec_dir)
-            status_manager.update(state=BuildState.COMPLETE)
 
             # Reset error tracking on success
             _reset_concurrency_state()
             consecutive_other_errors = 0
 
-            if task_logger:
-                task_logger.end_phase(
-                    LogPhase.CODING,
-                    success=True,
-                    message="All subtasks completed successfully",
-                )
-
-            if linear_task and linear_task.task_id:
-                await linear_build_complete(spec_dir)
-                print_status("Linear notified: build complete, ready for QA", "success")
-
+            await _complete_build()
             break
 
         elif status == "continue":
             # Reset error tracking on successful session
             _reset_concurrency_state()
             consecutive_other_errors = 0
+            parallel_paused = False
 
             print(
                 muted(
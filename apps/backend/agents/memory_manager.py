@@ -144,17 +144,16 @@ async def get_graphiti_context(
                 num_results=5,
             )
 
-        # Get relevant context
-        context_items = await memory.get_relevant_context(query, num_results=5)
-
-        # Get patterns and gotchas specifically (THE FIX for learning loop!)
-        # This retrieves PATTERN and GOTCHA episode types for cross-session learning
-        patterns, gotchas = await memory.get_patterns_and_gotchas(
-            query, num_results=3, min_score=0.5
+        # Get relevant context, patterns and gotchas (THE FIX for learning
+        # loop!) and recent session history in one concurrent retrieval.
+        # PATTERN and GOTCHA episode types enable cross-session learning
+        retrieved = await memory.get_subtask_context(
+            query, num_results=5, num_patterns=3, min_score=0.5, history_limit=3
         )
-
-        # Also get recent session history
-        session_history = await memory.get_session_history(limit=3)
+        context_items = retrieved["context"]
+        patterns = retrieved["patterns"]
+        gotchas = retrieved["gotchas"]
+        session_history = retrieved["session_history"]
 
         if is_debug_enabled():
             debug(
@@ -243,7 +242,7 @@ async def get_graphiti_context(
         )
         return None
     finally:
-        # Always close the memory connection (swallow exceptions to avoid overriding)
+        # Always release the memory to the pool (swallow exceptions to avoid overriding)
         if memory is not None:
             try:
                 await memory.close()
@@ -413,7 +412,7 @@ async def save_session_memory(
                 project_dir=str(project_dir),
             )
         finally:
-            # Always close the memory connection (swallow exceptions to avoid overriding)
+            # Always release the memory to the pool (swallow exceptions to avoid overriding)
             if memory is not None:
                 try:
                     await memory.close()
@@ -0,0 +1,569 @@
+"""
+Parallel Subtask Scheduler
+==========================
+
+Runs independent subtasks of the coding phase at the same time.
+
+Subtasks of phases marked parallel_safe, whose depends_on phases are complete,
+are dispatched to up to AUTO_BUILD_PARALLEL_SUBTASKS concurrent coder sessions:
+- Each session works in its own git worktree (a sub-worktree) checked out at
+  the build's HEAD, with a private copy of the spec directory
+- Subtasks whose files_to_modify overlap never run at the same time (file
+  leases), so most merges back are clean
+- Finished subtasks are merged back one at a time with git, falling back to
+  the merge package's MergeOrchestrator on conflicts
+- implementation_plan.json is updated with atomic writes, and only after the
+  subtask's work is merged
+
+Other phases keep running one subtask at a time in the main loop
+(agents.coder).
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core.client import create_client
+from core.git_executable import run_git
+from core.plan_store import READ_ERRORS, PlanStore
+from phase_config import get_phase_client_thinking_kwargs, get_phase_model
+from progress import get_ready_subtasks
+from prompt_generator import (
+    format_context_for_prompt,
+    generate_subtask_prompt,
+    load_subtask_context,
+)
+from recovery import RecoveryManager
+from task_logger import LogPhase
+from ui import StatusManager, highlight, print_status
+
+from .base import HUMAN_INTERVENTION_FILE, MAX_SUBTASK_RETRIES
+from .memory_manager import get_graphiti_context
+from .session import post_session_processing, run_agent_session
+from .utils import (
+    find_phase_for_subtask,
+    find_subtask_in_plan,
+    get_commit_count,
+    get_latest_commit,
+    load_implementation_plan,
+)
+
+logger = logging.getLogger(__name__)
+
+# Concurrent coder sessions; 1 keeps the build sequential
+DEFAULT_PARALLEL_SUBTASKS = 1
+
+# Sub-worktrees live in the build's (gitignored) .auto-claude directory
+SUBTASK_WORKTREES_DIR = ".auto-claude/subtask-worktrees"
+
+
+def get_parallel_subtask_limit() -> int:
+    """Read AUTO_BUILD_PARALLEL_SUBTASKS (default 1, i.e. sequential)."""
+    try:
+        return max(
+            1,
+            int(
+                os.environ.get(
+                    "AUTO_BUILD_PARALLEL_SUBTASKS", DEFAULT_PARALLEL_SUBTASKS
+                )
+            ),
+        )
+    except ValueError:
+        return DEFAULT_PARALLEL_SUBTASKS
+
+
+def subtask_file_leases(subtask: dict) -> set[str]:
+    """Files a subtask needs to itself while it runs (its files_to_modify)."""
+    leases = set()
+    for path in subtask.get("files_to_modify") or []:
+        if isinstance(path, str) and path.strip():
+            leases.add(Path(path.strip()).as_posix().removeprefix("./"))
+    return leases
+
+
+def select_subtasks(
+    ready: list[dict],
+    slots: int,
+    running: set[str] | None = None,
+    leased_files: set[str] | None = None,
+) -> list[dict]:
+    """
+    Pick subtasks to start from get_ready_subtasks() output.
+
+    Args:
+        ready: Ready subtasks, in plan order
+        slots: How many sessions are free
+        running: IDs of subtasks already running
+        leased_files: Files held by running subtasks
+
+    Returns:
+        Up to slots parallel_safe subtasks whose files don't overlap with
+        each other or with leased_files
+    """
+    running = running or set()
+    leased = set(leased_files or ())
+    selected = []
+    for subtask in ready:
+        if len(selected) >= slots:
+            break
+        if not subtask.get("parallel_safe") or subtask.get("id") in running:
+            continue
+        files = subtask_file_leases(subtask)
+        if files & leased:
+            continue
+        leased |= files
+        selected.append(subtask)
+    return selected
+
+
+def apply_subtask_result(spec_dir: Path, subtask_id: str, result: dict) -> bool:
+    """
+    Copy a subtask's final state into the shared implementation_plan.json.
+
+    Args:
+        spec_dir: Spec directory holding the shared plan
+        subtask_id: The subtask to update
+        result: The subtask as the session left it in its own plan copy
+
+    Returns:
+        True if the subtask was found and the plan written
+    """
+
+    def merge_result(plan: dict) -> bool:
+        subtask = find_subtask_in_plan(plan, subtask_id)
+        if subtask is None:
+            return False
+        subtask.update(result)
+        plan["last_updated"] = datetime.now(timezone.utc).isoformat()
+        return True
+
+    try:
+        # Sessions finishing together update the plan one at a time
+        return PlanStore.for_spec(spec_dir).update(merge_result)
+    except READ_ERRORS:
+        return False
+
+
+class SubtaskWorktreeError(Exception):
+    """A sub-worktree could not be created."""
+
+
+class SubtaskWorktree:
+    """A detached git worktree in which one subtask is implemented."""
+
+    def __init__(self, project_dir: Path, spec_dir: Path, subtask_id: str):
+        self.project_dir = Path(project_dir)
+        self.subtask_id = subtask_id
+        safe_id = "".join(c if c.isalnum() or c in "-_." else "-" for c in subtask_id)
+        self.path = self.project_dir / SUBTASK_WORKTREES_DIR / safe_id
+        try:
+            relative_spec = (
+                Path(spec_dir).resolve().relative_to(self.project_dir.resolve())
+            )
+        except ValueError:
+            relative_spec = Path(".auto-claude") / "specs" / Path(spec_dir).name
+        self.spec_dir = self.path / relative_spec
+        self.base_commit: str | None = None
+
+    def create(self, spec_dir: Path) -> None:
+        """Check out the build's HEAD and copy the spec into the sub-worktree."""
+        self.remove()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        result = run_git(
+            ["worktree", "add", "--detach", str(self.path), "HEAD"],
+            cwd=self.project_dir,
+            timeout=300,
+        )
+        if result.returncode != 0:
+            raise SubtaskWorktreeError(
+                f"Failed to create worktree for {self.subtask_id}: {result.stderr.strip()}"
+            )
+        self.base_commit = get_latest_commit(self.path)
+
+        # The spec copy must never be committed from the sub-worktree
+        if run_git(["check-ignore", "-q", ".auto-claude/"], cwd=self.path).returncode:
+            exclude = run_git(
+                ["rev-parse", "--git-path", "info/exclude"], cwd=self.path
+            )
+            exclude_path = Path(self.path, exclude.stdout.strip())
+            exclude_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(exclude_path, "a", encoding="utf-8") as f:
+                f.write("\n.auto-claude/\n")
+
+        shutil.copytree(spec_dir, self.spec_dir, dirs_exist_ok=True)
+
+    def commit_changes(self) -> None:
+        """Commit whatever the session left uncommitted."""
+        status = run_git(["status", "--porcelain"], cwd=self.path)
+        if status.returncode != 0 or not status.stdout.strip():
+            return
+        run_git(["add", "-A"], cwd=self.path)
+        run_git(
+            ["commit", "-m", f"auto-claude: {self.subtask_id}"],
+            cwd=self.path,
+        )
+
+    def merge_into_project(self, intent: str = "") -> bool:
+        """
+        Merge the subtask's commits into the build's worktree.
+
+        Returns:
+            True if the work is now in the build's HEAD (or there was none)
+        """
+        head = get_latest_commit(self.path)
+        if not head or head == self.base_commit:
+            return True
+
+        message = f"auto-claude: merge subtask {self.subtask_id}"
+        result = run_git(
+            ["merge", "--no-ff", "-m", message, head],
+            cwd=self.project_dir,
+            timeout=120,
+        )
+        if result.returncode == 0:
+            return True
+
+        run_git(["merge", "--abort"], cwd=self.project_dir)
+        logger.info(
+            f"git merge of subtask {self.subtask_id} failed, using MergeOrchestrator"
+        )
+        return self._merge_with_orchestrator(message, intent)
+
+    def _merge_with_orchestrator(self, message: str, intent: str) -> bool:
+        from merge import MergeOrchestrator, TaskMergeRequest
+
+        branch = run_git(["rev-parse", "--abbrev-ref", "HEAD"], cwd=self.project_dir)
+        target = branch.stdout.strip()
+        if branch.returncode != 0 or target == "HEAD":
+            target = get_latest_commit(self.project_dir) or "HEAD"
+
+        orchestrator = MergeOrchestrator(self.project_dir)
+        report = orchestrator.merge_tasks(
+            [
+                TaskMergeRequest(
+                    task_id=f"subtask-{self.path.name}",
+                    worktree_path=self.path,
+                    intent=intent,
+                )
+            ],
+            target_branch=target,
+        )
+        files = [
+            path
+            for path, result in report.file_results.items()
+            if result.merged_content and result.success
+        ]
+        if not report.success or not orchestrator.apply_to_project(report):
+            logger.warning(
+                f"Could not merge subtask {self.subtask_id}: {report.error or 'conflicts'}"
+            )
+            if files:
+                run_git(["checkout", "--", *files], cwd=self.project_dir)
+            return False
+
+        if files:
+            run_git(["add", "--", *files], cwd=self.project_dir)
+            commit = run_git(["commit", "-m", message], cwd=self.project_dir)
+            if commit.returncode != 0:
+                logger.warning(
+                    f"Failed to commit merged subtask {self.subtask_id}: {commit.stderr.strip()}"
+                )
+                return False
+        return True
+
+    def remove(self) -> None:
+        if self.path.exists():
+            run_git(
+                ["worktree", "remove", "--force", str(self.path)],
+                cwd=self.project_dir,
+            )
+            shutil.rmtree(self.path, ignore_errors=True)
+        run_git(["worktree", "prune"], cwd=self.project_dir)
+
+
+@dataclass
+class ParallelRunResult:
+    """What a ParallelSubtaskScheduler.run() did."""
+
+    sessions: int = 0
+    completed: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    error_info: dict | None = None  # First session error (rate limit, auth, ...)
+
+
+class ParallelSubtaskScheduler:
+    """
+    Dispatches ready parallel_safe subtasks to concurrent coder sessions.
+
+    Example:
+        scheduler = ParallelSubtaskScheduler(project_dir, spec_dir, model,
+                                             recovery_manager, limit=4)
+        if scheduler.has_parallel_work():
+            result = await scheduler.run(first_session=iteration)
+    """
+
+    def __init__(
+        self,
+        project_dir: Path,
+        spec_dir: Path,
+        model: str,
+        recovery_manager: RecoveryManager,
+        limit: int,
+        status_manager: StatusManager | None = None,
+        verbose: bool = False,
+        source_spec_dir: Path | None = None,
+        linear_enabled: bool = False,
+    ):
+        self.project_dir = project_dir
+        self.spec_dir = spec_dir
+        self.model = model
+        self.recovery_manager = recovery_manager
+        self.limit = max(1, limit)
+        self.status_manager = status_manager
+        self.verbose = verbose
+        self.source_spec_dir = source_spec_dir
+        self.linear_enabled = linear_enabled
+        self._merge_lock = asyncio.Lock()
+        # git worktree add/remove race on the shared .git/worktrees directory
+        self._worktree_lock = asyncio.Lock()
+
+    def has_parallel_work(self) -> bool:
+        """Whether at least two subtasks could run side by side right now."""
+        if self.limit < 2:
+            return False
+        return len(select_subtasks(get_ready_subtasks(self.spec_dir), self.limit)) > 1
+
+    async def run(
+        self, first_session: int = 1, max_sessions: int | None = None
+    ) -> ParallelRunResult:
+        """
+        Run subtasks until no parallel_safe subtask is ready.
+
+        New subtasks are started as sessions finish and as finished phases
+        unblock their dependents. Stops starting sessions after a session
+        error or when the build is paused, and returns once the running
+        ones are done.
+
+        Args:
+            first_session: Session number of the first session started
+            max_sessions: Most sessions to start (None for no limit)
+
+        Returns:
+            ParallelRunResult
+        """
+        result = ParallelRunResult()
+        running: dict[asyncio.Task, tuple[dict, set[str]]] = {}
+        self._remove_stale_worktrees()
+
+        while True:
+            stop = (
+                result.error_info is not None
+                or (self.spec_dir / HUMAN_INTERVENTION_FILE).exists()
+                or (max_sessions is not None and result.sessions >= max_sessions)
+            )
+            if not stop:
+                slots = self.limit - len(running)
+                if max_sessions is not None:
+                    slots = min(slots, max_sessions - result.sessions)
+                leased = set().union(*(files for _, files in running.values()))
+                batch = select_subtasks(
+                    get_ready_subtasks(self.spec_dir),
+                    slots,
+                    running={s["id"] for s, _ in running.values()},
+                    leased_files=leased,
+                )
+                if batch:
+                    print_status(
+                        f"Starting {len(batch)} parallel subtask(s): "
+                        + ", ".join(s["id"] for s in batch),
+                        "progress",
+                    )
+                for subtask in batch:
+                    session_num = first_session + result.sessions
+                    result.sessions += 1
+                    task = asyncio.create_task(self._run_subtask(subtask, session_num))
+                    running[task] = (subtask, subtask_file_leases(subtask))
+
+            if self.status_manager:
+                self.status_manager.update_subtasks(in_progress=len(running))
+            if not running:
+                return result
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                subtask, _files = running.pop(task)
+                try:
+                    completed, error_info = task.result()
+                except Exception as e:
+                    logger.exception(f"Parallel subtask {subtask['id']} crashed")
+                    completed, error_info = False, {"type": "other", "message": str(e)}
+                if completed:
+                    result.completed.append(subtask["id"])
+                else:
+                    result.failed.append(subtask["id"])
+                if error_info and result.error_info is None:
+                    result.error_info = error_info
+
+    async def _run_subtask(
+        self, subtask: dict, session_num: int
+    ) -> tuple[bool, dict | None]:
+        """Implement one subtask in a sub-worktree and merge it back."""
+        from .coder import validate_subtask_files
+
+        subtask_id = subtask["id"]
+        validation = validate_subtask_files(subtask, self.project_dir)
+        if not validation["success"]:
+            print_status(
+                f"File validation failed for {subtask_id}: {validation['error']}",
+                "error",
+            )
+            self._record_failure(subtask_id, session_num, validation["error"])
+            return False, None
+
+        # Git commands run in threads so parallel sessions keep streaming
+        worktree = SubtaskWorktree(self.project_dir, self.spec_dir, subtask_id)
+        try:
+            try:
+                async with self._worktree_lock:
+                    await asyncio.to_thread(worktree.create, self.spec_dir)
+            except (SubtaskWorktreeError, OSError) as e:
+                self._record_failure(subtask_id, session_num, str(e))
+                return False, None
+
+            status, error_info = await self._run_session(subtask, worktree, session_num)
+
+            plan = load_implementation_plan(worktree.spec_dir)
+            final = find_subtask_in_plan(plan, subtask_id) if plan else None
+            if not final or final.get("status") != "completed":
+                reason = (error_info or {}).get(
+                    "message", "Subtask not marked as completed"
+                )
+                print_status(f"Subtask {subtask_id} not completed", "warning")
+                self._record_failure(subtask_id, session_num, reason)
+                return False, error_info if status == "error" else None
+
+            await asyncio.to_thread(worktree.commit_changes)
+            async with self._merge_lock:
+                commit_before = await asyncio.to_thread(
+                    get_latest_commit, self.project_dir
+                )
+                commit_count_before = await asyncio.to_thread(
+                    get_commit_count, self.project_dir
+                )
+                merged = await asyncio.to_thread(
+                    worktree.merge_into_project, subtask.get("description", "")
+                )
+                if not merged:
+                    self._record_failure(
+                        subtask_id, session_num, "Could not merge subtask changes"
+                    )
+                    return False, None
+                apply_subtask_result(self.spec_dir, subtask_id, final)
+                print_status(
+                    f"Merged parallel subtask {highlight(subtask_id)}", "success"
+                )
+                # Records the attempt, good commit, Linear progress and memory
+                success = await post_session_processing(
+                    spec_dir=self.spec_dir,
+                    project_dir=self.project_dir,
+                    subtask_id=subtask_id,
+                    session_num=session_num,
+                    commit_before=commit_before,
+                    commit_count_before=commit_count_before,
+                    recovery_manager=self.recovery_manager,
+                    linear_enabled=self.linear_enabled,
+                    status_manager=self.status_manager,
+                    source_spec_dir=self.source_spec_dir,
+                    error_info=error_info,
+                )
+            return success, None
+        finally:
+            async with self._worktree_lock:
+                await asyncio.to_thread(worktree.remove)
+
+    async def _run_session(
+        self, subtask: dict, worktree: SubtaskWorktree, session_num: int
+    ) -> tuple[str, dict | None]:
+        """Run a coder session for subtask inside worktree."""
+        subtask_id = subtask["id"]
+        phase_model = get_phase_model(self.spec_dir, "coding", self.model)
+        thinking_kwargs = get_phase_client_thinking_kwargs(
+            self.spec_dir, "coding", phase_model
+        )
+        client = create_client(
+            worktree.path,
+            worktree.spec_dir,
+            phase_model,
+            agent_type="coder",
+            **thinking_kwargs,
+        )
+
+        attempt_count = self.recovery_manager.get_attempt_count(subtask_id)
+        recovery_hints = (
+            self.recovery_manager.get_recovery_hints(subtask_id)
+            if attempt_count > 0
+            else None
+        )
+        plan = load_implementation_plan(self.spec_dir)
+        phase = find_phase_for_subtask(plan, subtask_id) if plan else {}
+
+        prompt = generate_subtask_prompt(
+            spec_dir=worktree.spec_dir,
+            project_dir=worktree.path,
+            subtask=subtask,
+            phase=phase or {},
+            attempt_count=attempt_count,
+            recovery_hints=recovery_hints,
+        )
+        context = load_subtask_context(worktree.spec_dir, worktree.path, subtask)
+        if context.get("patterns") or context.get("files_to_modify"):
+            prompt += "\n\n" + format_context_for_prompt(context)
+        graphiti_context = await get_graphiti_context(
+            self.spec_dir, self.project_dir, subtask
+        )
+        if graphiti_context:
+            prompt += "\n\n" + graphiti_context
+
+        print_status(
+            f"Session {session_num}: {highlight(subtask_id)} "
+            f"- {subtask.get('description', 'No description')}",
+            "info",
+        )
+        async with client:
+            status, _response, error_info = await run_agent_session(
+                client, prompt, self.spec_dir, self.verbose, phase=LogPhase.CODING
+            )
+        return status, error_info
+
+    def _record_failure(self, subtask_id: str, session_num: int, error: str) -> None:
+        """Record a failed attempt; the subtask stays pending in the shared plan."""
+        self.recovery_manager.record_attempt(
+            subtask_id=subtask_id,
+            session=session_num,
+            success=False,
+            approach="Parallel session ended without completion",
+            error=error,
+        )
+        attempt_count = self.recovery_manager.get_attempt_count(subtask_id)
+        if attempt_count >= MAX_SUBTASK_RETRIES:
+            self.recovery_manager.mark_subtask_stuck(
+                subtask_id, f"Failed after {attempt_count} attempts: {error}"
+            )
+            print_status(
+                f"Subtask {subtask_id} marked as STUCK after {attempt_count} attempts",
+                "error",
+            )
+
+    def _remove_stale_worktrees(self) -> None:
+        """Remove sub-worktrees left behind by an interrupted run."""
+        root = self.project_dir / SUBTASK_WORKTREES_DIR
+        if not root.is_dir():
+            return
+        for path in root.iterdir():
+            run_git(["worktree", "remove", "--force", str(path)], cwd=self.project_dir)
+            shutil.rmtree(path, ignore_errors=True)
+        run_git(["worktree", "prune"], cwd=self.project_dir)
@@ -15,7 +15,7 @@ from core.error_utils import (
     is_rate_limit_error,
     is_tool_concurrency_error,
 )
-from core.file_utils import write_json_atomic
+from core.plan_store import PlanStore
 from debug import debug, debug_detailed, debug_error, debug_section, debug_success
 from insight_extractor import extract_session_insights
 from linear_updater import (
@@ -280,8 +280,7 @@ async def post_session_processing(
                 if subtask_found:
                     # Save plan atomically to prevent corruption
                     try:
-                        plan_path = spec_dir / "implementation_plan.json"
-                        write_json_atomic(plan_path, plan, indent=2)
+                        PlanStore.for_spec(spec_dir).write(plan)
                         print_status(
                             f"Subtask {subtask_id} reset to pending status", "success"
                         )
@@ -5,10 +5,11 @@ Build Progress Tools
 Tools for tracking and reporting build progress.
 """
 
-import json
 from pathlib import Path
 from typing import Any
 
+from core.plan_store import PlanStore
+
 try:
     from claude_agent_sdk import tool
 
@@ -44,9 +45,9 @@ def create_progress_tools(spec_dir: Path, project_dir: Path) -> list:
     )
     async def get_build_progress(args: dict[str, Any]) -> dict[str, Any]:
         """Get current build progress."""
-        plan_file = spec_dir / "implementation_plan.json"
+        store = PlanStore.for_spec(spec_dir)
 
-        if not plan_file.exists():
+        if not store.path.exists():
             return {
                 "content": [
                     {
@@ -57,21 +58,13 @@ def create_progress_tools(spec_dir: Path, project_dir: Path) -> list:
             }
 
         try:
-            with open(plan_file, encoding="utf-8") as f:
-                plan = json.load(f)
-
-            stats = {
-                "total": 0,
-                "completed": 0,
-                "in_progress": 0,
-                "pending": 0,
-                "failed": 0,
-            }
+            view = store.view()
+            stats = view.counts
 
             phases_summary = []
             next_subtask = None
 
-            for phase in plan.get("phases", []):
+            for phase in view.phases:
                 phase_id = phase.get("id") or phase.get("phase")
                 phase_name = phase.get("name", phase_id)
                 phase_subtasks = phase.get("subtasks", [])
@@ -79,18 +72,11 @@ def create_progress_tools(spec_dir: Path, project_dir: Path) -> list:
                 phase_stats = {"completed": 0, "total": len(phase_subtasks)}
 
                 for subtask in phase_subtasks:
-                    stats["total"] += 1
                     status = subtask.get("status", "pending")
 
                     if status == "completed":
-                        stats["completed"] += 1
                         phase_stats["completed"] += 1
-                    elif status == "in_progress":
-                        stats["in_progress"] += 1
-                    elif status == "failed":
-                        stats["failed"] += 1
-                    else:
-                        stats["pending"] += 1
+                    elif status not in ("in_progress", "failed"):
                         # Track next subtask to work on
                         if next_subtask is None:
                             next_subtask = {
@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from core.file_utils import write_json_atomic
+from core.plan_store import PlanStore
 from spec.validate_pkg.auto_fix import auto_fix_plan
 
 try:
@@ -101,8 +101,8 @@ def create_subtask_tools(spec_dir: Path, project_dir: Path) -> list:
                 ]
             }
 
-        plan_file = spec_dir / "implementation_plan.json"
-        if not plan_file.exists():
+        store = PlanStore.for_spec(spec_dir)
+        if not store.path.exists():
             return {
                 "content": [
                     {
@@ -113,10 +113,11 @@ def create_subtask_tools(spec_dir: Path, project_dir: Path) -> list:
             }
 
         try:
-            with open(plan_file, encoding="utf-8") as f:
-                plan = json.load(f)
-
-            subtask_found = _update_subtask_in_plan(plan, subtask_id, status, notes)
+            # Read-modify-write under the plan lock; nothing is written if
+            # the subtask is not found
+            subtask_found = store.update(
+                lambda plan: _update_subtask_in_plan(plan, subtask_id, status, notes)
+            )
 
             if not subtask_found:
                 return {
@@ -128,9 +129,6 @@ def create_subtask_tools(spec_dir: Path, project_dir: Path) -> list:
                     ]
                 }
 
-            # Use atomic write to prevent file corruption
-            write_json_atomic(plan_file, plan, indent=2)
-
             return {
                 "content": [
                     {
@@ -145,15 +143,13 @@ def create_subtask_tools(spec_dir: Path, project_dir: Path) -> list:
             if auto_fix_plan(spec_dir):
                 # Retry after fix
                 try:
-                    with open(plan_file, encoding="utf-8") as f:
-                        plan = json.load(f)
-
-                    subtask_found = _update_subtask_in_plan(
-                        plan, subtask_id, status, notes
+                    subtask_found = store.update(
+                        lambda plan: _update_subtask_in_plan(
+                            plan, subtask_id, status, notes
+                        )
                     )
 
                     if subtask_found:
-                        write_json_atomic(plan_file, plan, indent=2)
                         return {
                             "content": [
                                 {
@@ -5,12 +5,12 @@ Utility Functions for Agent System
 Helper functions for git operations, plan management, and file syncing.
 """
 
-import json
 import logging
 import shutil
 from pathlib import Path
 
 from core.git_executable import run_git
+from core.plan_store import PlanStore
 
 logger = logging.getLogger(__name__)
 
@@ -44,14 +44,7 @@ def get_commit_count(project_dir: Path) -> int:
 
 def load_implementation_plan(spec_dir: Path) -> dict | None:
     """Load the implementation plan JSON."""
-    plan_file = spec_dir / "implementation_plan.json"
-    if not plan_file.exists():
-        return None
-    try:
-        with open(plan_file, encoding="utf-8") as f:
-            return json.load(f)
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
-        return None
+    return PlanStore.for_spec(spec_dir).load()
 
 
 def find_subtask_in_plan(plan: dict, subtask_id: str) -> dict | None:
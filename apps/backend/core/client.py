@@ -12,13 +12,15 @@ The client factory now uses AGENT_CONFIGS from agents/tools_pkg/models.py as the
 single source of truth for phase-aware tool and MCP server configuration.
 """
 
-import copy
 import json
 import logging
 import os
 import threading
 import time
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Callable
 
 from core.fast_mode import ensure_fast_mode_in_user_settings
@@ -34,52 +36,95 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 # Caches project index and capabilities to avoid reloading on every create_client() call.
 # This significantly reduces the time to create new agent sessions.
+#
+# Every client of a project shares one read-only ProjectSnapshot, so a cache hit
+# costs no copying. The snapshot is replaced when .auto-claude/project_index.json
+# changes (by mtime, size and inode), not after a fixed TTL.
 
-_PROJECT_INDEX_CACHE: dict[str, tuple[dict[str, Any], dict[str, bool], float]] = {}
-_CACHE_TTL_SECONDS = 300  # 5 minute TTL
+
+def freeze_json(value: Any) -> Any:
+    """Read-only view of parsed JSON: dicts become MappingProxyType, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_json(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_json(item) for item in value)
+    return value
+
+
+def thaw_json(value: Any) -> Any:
+    """Mutable deep copy of a value frozen by freeze_json()."""
+    if isinstance(value, Mapping):
+        return {key: thaw_json(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_json(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ProjectSnapshot:
+    """Read-only project index and capabilities, shared by all clients of a project."""
+
+    index: Mapping[str, Any]
+    capabilities: Mapping[str, bool]
+    # (mtime, size, inode) of project_index.json when loaded; None if it was missing
+    version: tuple | None
+
+    def mutable_index(self) -> dict[str, Any]:
+        """Private copy of the index for callers that need to modify it."""
+        return thaw_json(self.index)
+
+    def mutable_capabilities(self) -> dict[str, bool]:
+        """Private copy of the capabilities for callers that need to modify them."""
+        return dict(self.capabilities)
+
+
+_PROJECT_INDEX_CACHE: dict[str, ProjectSnapshot] = {}
 _CACHE_LOCK = threading.Lock()  # Protects _PROJECT_INDEX_CACHE access
 
 
-def _get_cached_project_data(
-    project_dir: Path,
-) -> tuple[dict[str, Any], dict[str, bool]]:
+def _project_index_version(project_dir: Path) -> tuple | None:
+    try:
+        st = os.stat(project_dir / ".auto-claude" / "project_index.json")
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def get_project_snapshot(project_dir: Path) -> ProjectSnapshot:
     """
-    Get project index and capabilities with caching.
+    Get the shared, read-only project index and capabilities.
 
     Args:
         project_dir: Path to the project directory
 
     Returns:
-        Tuple of (project_index, project_capabilities)
+        The project's current ProjectSnapshot
     """
-
     key = str(project_dir.resolve())
-    now = time.time()
+    version = _project_index_version(project_dir)
     debug = os.environ.get("DEBUG", "").lower() in ("true", "1")
 
-    # Check cache with lock
     with _CACHE_LOCK:
-        if key in _PROJECT_INDEX_CACHE:
-            cached_index, cached_capabilities, cached_time = _PROJECT_INDEX_CACHE[key]
-            cache_age = now - cached_time
-            if cache_age < _CACHE_TTL_SECONDS:
-                if debug:
-                    print(
-                        f"[ClientCache] Cache HIT for project index (age: {cache_age:.1f}s / TTL: {_CACHE_TTL_SECONDS}s)"
-                    )
-                logger.debug(f"Using cached project index for {project_dir}")
-                # Return deep copies to prevent callers from corrupting the cache
-                return copy.deepcopy(cached_index), copy.deepcopy(cached_capabilities)
-            elif debug:
-                print(
-                    f"[ClientCache] Cache EXPIRED for project index (age: {cache_age:.1f}s > TTL: {_CACHE_TTL_SECONDS}s)"
-                )
-
-    # Cache miss or expired - load fresh data (outside lock to avoid blocking)
+        cached = _PROJECT_INDEX_CACHE.get(key)
+    if cached is not None and cached.version == version:
+        if debug:
+            print("[ClientCache] Cache HIT for project index")
+        logger.debug(f"Using cached project index for {project_dir}")
+        return cached
+    if cached is not None and debug:
+        print("[ClientCache] project_index.json changed, reloading")
+
+    # Cache miss or stale - load fresh data (outside lock to avoid blocking).
+    # If the file changes while loading, the snapshot keeps the older version
+    # and is simply reloaded on the next call.
     load_start = time.time()
     logger.debug(f"Loading project index for {project_dir}")
     project_index = load_project_index(project_dir)
-    project_capabilities = detect_project_capabilities(project_index)
+    snapshot = ProjectSnapshot(
+        index=freeze_json(project_index),
+        capabilities=freeze_json(detect_project_capabilities(project_index)),
+        version=version,
+    )
 
     if debug:
         load_duration = (time.time() - load_start) * 1000
@@ -87,25 +132,30 @@ def _get_cached_project_data(
             f"[ClientCache] Cache MISS - loaded project index in {load_duration:.1f}ms"
         )
 
-    # Store in cache with lock - use double-checked locking pattern
-    # Re-check if another thread populated the cache while we were loading
     with _CACHE_LOCK:
-        if key in _PROJECT_INDEX_CACHE:
-            cached_index, cached_capabilities, cached_time = _PROJECT_INDEX_CACHE[key]
-            cache_age = time.time() - cached_time
-            if cache_age < _CACHE_TTL_SECONDS:
-                # Another thread already cached valid data while we were loading
-                if debug:
-                    print(
-                        "[ClientCache] Cache was populated by another thread, using cached data"
-                    )
-                # Return deep copies to prevent callers from corrupting the cache
-                return copy.deepcopy(cached_index), copy.deepcopy(cached_capabilities)
-        # Either no cache entry or it's expired - store our fresh data
-        _PROJECT_INDEX_CACHE[key] = (project_index, project_capabilities, time.time())
+        cached = _PROJECT_INDEX_CACHE.get(key)
+        if cached is not None and cached.version == version:
+            # Another thread loaded the same version while we were loading
+            return cached
+        _PROJECT_INDEX_CACHE[key] = snapshot
+    return snapshot
 
-    # Return the freshly loaded data (no need to copy since it's not from cache)
-    return project_index, project_capabilities
+
+def _get_cached_project_data(
+    project_dir: Path,
+) -> tuple[Mapping[str, Any], Mapping[str, bool]]:
+    """
+    Get project index and capabilities with caching.
+
+    Args:
+        project_dir: Path to the project directory
+
+    Returns:
+        Tuple of (project_index, project_capabilities), both read-only and
+        shared (see ProjectSnapshot for mutable copies)
+    """
+    snapshot = get_project_snapshot(project_dir)
+    return snapshot.index, snapshot.capabilities
 
 
 def invalidate_project_cache(project_dir: Path | None = None) -> None:
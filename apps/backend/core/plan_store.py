@@ -0,0 +1,279 @@
+"""
+Implementation Plan Store
+=========================
+
+One place to read and update a spec's implementation_plan.json.
+
+The plan is read by progress reporting, the coder loop, the MCP tools and QA
+several times per agent iteration, and written by the agent, the tools and
+the parallel scheduler. PlanStore:
+- Parses the file once per version; the parsed plan is cached per spec and
+  checked against the file's (mtime, size, inode) on every read
+- Hands out PlanView snapshots whose counters and lookups are computed once
+  per version
+- Updates the plan read-modify-write under an exclusive file lock, with an
+  optional compare-and-swap on the version the caller last saw, and writes
+  it atomically
+
+Usage:
+    from core.plan_store import PlanStore
+
+    store = PlanStore.for_spec(spec_dir)
+    view = store.read()  # None if missing or unreadable
+    if view and view.is_complete:
+        ...
+    store.update(lambda plan: plan.update(status="human_review"))
+"""
+
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from core.file_utils import write_json_atomic
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - Unix
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+PLAN_FILENAME = "implementation_plan.json"
+
+# Subtask statuses counted separately; anything else counts as pending
+SUBTASK_STATUSES = ("completed", "in_progress", "pending", "failed")
+
+# A plan rewritten within one filesystem timestamp tick of being read can
+# keep its (mtime, size, inode), so a parse is only cached once the file's
+# mtime is at least this old
+MTIME_SETTLE_NS = 1_000_000_000
+
+# What callers that tolerate a missing or broken plan catch
+READ_ERRORS = (OSError, json.JSONDecodeError, UnicodeDecodeError)
+
+
+class PlanConflictError(Exception):
+    """The plan changed since the version an update was based on."""
+
+
+def copy_json(value: Any) -> Any:
+    """Deep copy of parsed JSON (much cheaper than copy.deepcopy)."""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+class PlanView:
+    """
+    Read-only snapshot of one version of the plan.
+
+    data is shared by every reader of this version: never modify it. Use
+    copy() for a private, mutable plan dict.
+    """
+
+    def __init__(self, data: dict, version: tuple):
+        self.data = data
+        self.version = version
+
+    def copy(self) -> dict:
+        return copy_json(self.data)
+
+    @cached_property
+    def phases(self) -> list[dict]:
+        return self.data.get("phases", [])
+
+    @cached_property
+    def counts(self) -> dict[str, int]:
+        """Subtasks by status: completed, in_progress, pending, failed, total."""
+        counts = dict.fromkeys(SUBTASK_STATUSES, 0)
+        counts["total"] = 0
+        for phase in self.phases:
+            for subtask in phase.get("subtasks", []):
+                counts["total"] += 1
+                status = subtask.get("status", "pending")
+                counts[status if status in SUBTASK_STATUSES else "pending"] += 1
+        return counts
+
+    @property
+    def completed(self) -> int:
+        return self.counts["completed"]
+
+    @property
+    def total(self) -> int:
+        return self.counts["total"]
+
+    @property
+    def is_complete(self) -> bool:
+        return self.total > 0 and self.completed == self.total
+
+    @cached_property
+    def _subtask_index(self) -> dict[str, tuple[dict, dict]]:
+        index: dict[str, tuple[dict, dict]] = {}
+        for phase in self.phases:
+            for subtask in phase.get("subtasks", []):
+                index.setdefault(subtask.get("id"), (phase, subtask))
+        return index
+
+    def find_subtask(self, subtask_id: str) -> dict | None:
+        found = self._subtask_index.get(subtask_id)
+        return found[1] if found else None
+
+    def find_phase_for_subtask(self, subtask_id: str) -> dict | None:
+        found = self._subtask_index.get(subtask_id)
+        return found[0] if found else None
+
+
+def _lock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class PlanStore:
+    """Cached reads and locked updates of one implementation_plan.json."""
+
+    _stores: dict[str, "PlanStore"] = {}
+
+    def __init__(self, spec_dir: Path):
+        self.spec_dir = Path(spec_dir)
+        self.path = self.spec_dir / PLAN_FILENAME
+        # The plan itself is replaced on every write, so lock a separate file
+        self._lock_path = self.spec_dir / f".{PLAN_FILENAME}.lock"
+        self._view: PlanView | None = None
+
+    @classmethod
+    def for_spec(cls, spec_dir: Path) -> "PlanStore":
+        """The shared store (and cache) for a spec directory."""
+        key = os.path.abspath(spec_dir)
+        store = cls._stores.get(key)
+        if store is None:
+            store = cls._stores[key] = cls(spec_dir)
+        return store
+
+    @staticmethod
+    def _version(st: os.stat_result) -> tuple:
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def view(self) -> PlanView:
+        """
+        The current plan.
+
+        Raises:
+            FileNotFoundError: No plan yet
+            OSError, json.JSONDecodeError, UnicodeDecodeError: Unreadable plan
+        """
+        cached = self._view
+        if cached is not None and cached.version == self._version(os.stat(self.path)):
+            return cached
+        with open(self.path, encoding="utf-8") as f:
+            # Version of the file actually read, even if it is replaced meanwhile
+            st = os.fstat(f.fileno())
+            data = json.load(f)
+        view = PlanView(data, self._version(st))
+        settled = time.time_ns() - st.st_mtime_ns >= MTIME_SETTLE_NS
+        self._view = view if settled else None
+        return view
+
+    def read(self) -> PlanView | None:
+        """The current plan, or None if it is missing or unreadable."""
+        try:
+            return self.view()
+        except READ_ERRORS:
+            return None
+
+    def load(self) -> dict | None:
+        """A private, mutable copy of the plan (None if missing/unreadable)."""
+        view = self.read()
+        return view.copy() if view is not None else None
+
+    @contextmanager
+    def _locked(self):
+        self.spec_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock_fd(fd)
+            try:
+                yield
+            finally:
+                _unlock_fd(fd)
+        finally:
+            os.close(fd)
+
+    def _check_version(self, expected_version: tuple | None) -> None:
+        if expected_version is None:
+            return
+        try:
+            current = self._version(os.stat(self.path))
+        except FileNotFoundError:
+            current = None
+        if current != expected_version:
+            raise PlanConflictError(f"{self.path} changed since it was read")
+
+    def _write(self, data: dict) -> None:
+        write_json_atomic(self.path, data, indent=2)
+        # Just written, so not settled yet: the next read parses the file
+        self._view = None
+
+    def update(
+        self,
+        mutate: Callable[[dict], Any],
+        expected_version: tuple | None = None,
+    ) -> Any:
+        """
+        Read-modify-write the plan under the plan lock.
+
+        Args:
+            mutate: Called with a private copy of the current plan to modify
+                in place. If it returns False the plan is not written.
+            expected_version: PlanView.version the change is based on; raise
+                PlanConflictError if the plan has changed since
+
+        Returns:
+            Whatever mutate returned
+
+        Raises:
+            PlanConflictError: expected_version is stale
+            FileNotFoundError, json.JSONDecodeError, ...: As for view()
+        """
+        with self._locked():
+            self._check_version(expected_version)
+            plan = self.view().copy()
+            result = mutate(plan)
+            if result is not False:
+                self._write(plan)
+            return result
+
+    def write(self, plan: dict, expected_version: tuple | None = None) -> None:
+        """
+        Replace the whole plan under the plan lock.
+
+        Args:
+            plan: The new plan (copied; the caller keeps ownership)
+            expected_version: As for update(); None writes unconditionally
+        """
+        with self._locked():
+            self._check_version(expected_version)
+            self._write(copy_json(plan))
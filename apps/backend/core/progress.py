@@ -15,6 +15,7 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 from core.plan_normalization import normalize_subtask_aliases
+from core.plan_store import PlanStore, copy_json
 from ui import (
     Icons,
     bold,
@@ -40,27 +41,10 @@ def count_subtasks(spec_dir: Path) -> tuple[int, int]:
     Returns:
         (completed_count, total_count)
     """
-    plan_file = spec_dir / "implementation_plan.json"
-
-    if not plan_file.exists():
-        return 0, 0
-
-    try:
-        with open(plan_file, encoding="utf-8") as f:
-            plan = json.load(f)
-
-        total = 0
-        completed = 0
-
-        for phase in plan.get("phases", []):
-            for subtask in phase.get("subtasks", []):
-                total += 1
-                if subtask.get("status") == "completed":
-                    completed += 1
-
-        return completed, total
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+    view = PlanStore.for_spec(spec_dir).read()
+    if view is None:
         return 0, 0
+    return view.completed, view.total
 
 
 def count_subtasks_detailed(spec_dir: Path) -> dict:
@@ -70,35 +54,16 @@ def count_subtasks_detailed(spec_dir: Path) -> dict:
     Returns:
         Dict with completed, in_progress, pending, failed counts
     """
-    plan_file = spec_dir / "implementation_plan.json"
-
-    result = {
-        "completed": 0,
-        "in_progress": 0,
-        "pending": 0,
-        "failed": 0,
-        "total": 0,
-    }
-
-    if not plan_file.exists():
-        return result
-
-    try:
-        with open(plan_file, encoding="utf-8") as f:
-            plan = json.load(f)
-
-        for phase in plan.get("phases", []):
-            for subtask in phase.get("subtasks", []):
-                result["total"] += 1
-                status = subtask.get("status", "pending")
-                if status in result:
-                    result[status] += 1
-                else:
-                    result["pending"] += 1
-
-        return result
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
-        return result
+    view = PlanStore.for_spec(spec_dir).read()
+    if view is None:
+        return {
+            "completed": 0,
+            "in_progress": 0,
+            "pending": 0,
+            "failed": 0,
+            "total": 0,
+        }
+    return dict(view.counts)
 
 
 def is_build_complete(spec_dir: Path) -> bool:
@@ -185,8 +150,7 @@ def print_progress_summary(spec_dir: Path, show_next: bool = True) -> None:
 
         # Phase summary
         try:
-            with open(spec_dir / "implementation_plan.json", encoding="utf-8") as f:
-                plan = json.load(f)
+            plan = PlanStore.for_spec(spec_dir).view().data
 
             print("\nPhases:")
             for phase in plan.get("phases", []):
@@ -290,9 +254,8 @@ def get_plan_summary(spec_dir: Path) -> dict:
     Returns:
         Dictionary with plan statistics
     """
-    plan_file = spec_dir / "implementation_plan.json"
-
-    if not plan_file.exists():
+    view = PlanStore.for_spec(spec_dir).read()
+    if view is None:
         return {
             "workflow_type": None,
             "total_phases": 0,
@@ -304,103 +267,155 @@ def get_plan_summary(spec_dir: Path) -> dict:
             "phases": [],
         }
 
-    try:
-        with open(plan_file, encoding="utf-8") as f:
-            plan = json.load(f)
-
-        summary = {
-            "workflow_type": plan.get("workflow_type"),
-            "total_phases": len(plan.get("phases", [])),
-            "total_subtasks": 0,
-            "completed_subtasks": 0,
-            "pending_subtasks": 0,
-            "in_progress_subtasks": 0,
-            "failed_subtasks": 0,
-            "phases": [],
-        }
+    counts = view.counts
+    summary = {
+        "workflow_type": view.data.get("workflow_type"),
+        "total_phases": len(view.phases),
+        "total_subtasks": counts["total"],
+        "completed_subtasks": counts["completed"],
+        "pending_subtasks": counts["pending"],
+        "in_progress_subtasks": counts["in_progress"],
+        "failed_subtasks": counts["failed"],
+        "phases": [],
+    }
 
-        for phase in plan.get("phases", []):
-            phase_info = {
+    for phase in view.phases:
+        subtasks = phase.get("subtasks", [])
+        summary["phases"].append(
+            {
                 "id": phase.get("id"),
                 "phase": phase.get("phase"),
                 "name": phase.get("name"),
                 "depends_on": phase.get("depends_on", []),
-                "subtasks": [],
-                "completed": 0,
-                "total": 0,
-            }
-
-            for subtask in phase.get("subtasks", []):
-                status = subtask.get("status", "pending")
-                summary["total_subtasks"] += 1
-                phase_info["total"] += 1
-
-                if status == "completed":
-                    summary["completed_subtasks"] += 1
-                    phase_info["completed"] += 1
-                elif status == "in_progress":
-                    summary["in_progress_subtasks"] += 1
-                elif status == "failed":
-                    summary["failed_subtasks"] += 1
-                else:
-                    summary["pending_subtasks"] += 1
-
-                phase_info["subtasks"].append(
+                "subtasks": [
                     {
                         "id": subtask.get("id"),
                         "description": subtask.get("description"),
-                        "status": status,
+                        "status": subtask.get("status", "pending"),
                         "service": subtask.get("service"),
                     }
-                )
+                    for subtask in subtasks
+                ],
+                "completed": sum(
+                    1 for subtask in subtasks if subtask.get("status") == "completed"
+                ),
+                "total": len(subtasks),
+            }
+        )
 
-            summary["phases"].append(phase_info)
+    return summary
 
-        return summary
 
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+def get_current_phase(spec_dir: Path) -> dict | None:
+    """Get the current phase being worked on."""
+    view = PlanStore.for_spec(spec_dir).read()
+    if view is None:
+        return None
+
+    for phase in view.phases:
+        subtasks = phase.get("subtasks", phase.get("chunks", []))
+        # Phase is current if it has incomplete subtasks and dependencies are met
+        has_incomplete = any(s.get("status") != "completed" for s in subtasks)
+        if has_incomplete:
+            return {
+                "id": phase.get("id"),
+                "phase": phase.get("phase"),
+                "name": phase.get("name"),
+                "completed": sum(1 for s in subtasks if s.get("status") == "completed"),
+                "total": len(subtasks),
+            }
+
+    return None
+
+
+def _load_stuck_subtask_ids(spec_dir: Path) -> set:
+    """IDs of subtasks the recovery manager has marked as stuck."""
+    attempt_history_file = spec_dir / "memory" / "attempt_history.json"
+    if not attempt_history_file.exists():
+        return set()
+    try:
+        with open(attempt_history_file, encoding="utf-8") as f:
+            attempt_history = json.load(f)
         return {
-            "workflow_type": None,
-            "total_phases": 0,
-            "total_subtasks": 0,
-            "completed_subtasks": 0,
-            "pending_subtasks": 0,
-            "in_progress_subtasks": 0,
-            "failed_subtasks": 0,
-            "phases": [],
+            entry["subtask_id"]
+            for entry in attempt_history.get("stuck_subtasks", [])
+            if "subtask_id" in entry
         }
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        # If we can't read the file, continue without stuck checking
+        return set()
 
 
-def get_current_phase(spec_dir: Path) -> dict | None:
-    """Get the current phase being worked on."""
-    plan_file = spec_dir / "implementation_plan.json"
+def _phase_id(phase: dict):
+    phase_id_value = phase.get("id")
+    return phase_id_value if phase_id_value is not None else phase.get("phase")
 
-    if not plan_file.exists():
-        return None
 
-    try:
-        with open(plan_file, encoding="utf-8") as f:
-            plan = json.load(f)
-
-        for phase in plan.get("phases", []):
-            subtasks = phase.get("subtasks", phase.get("chunks", []))
-            # Phase is current if it has incomplete subtasks and dependencies are met
-            has_incomplete = any(s.get("status") != "completed" for s in subtasks)
-            if has_incomplete:
-                return {
-                    "id": phase.get("id"),
-                    "phase": phase.get("phase"),
-                    "name": phase.get("name"),
-                    "completed": sum(
-                        1 for s in subtasks if s.get("status") == "completed"
-                    ),
-                    "total": len(subtasks),
-                }
+def _completed_phase_keys(phases: list) -> set:
+    """Keys (as used in depends_on) of phases whose subtasks are all completed."""
+    completed = set()
+    for i, phase in enumerate(phases):
+        phase_id_raw = _phase_id(phase)
+        phase_id_key = str(phase_id_raw) if phase_id_raw is not None else f"unknown:{i}"
+        subtasks = phase.get("subtasks", phase.get("chunks", []))
+        if all(s.get("status") == "completed" for s in subtasks):
+            completed.add(phase_id_key)
+    return completed
 
-        return None
 
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
-        return None
+def _phase_dependencies(phase: dict) -> list:
+    depends_on_raw = phase.get("depends_on", [])
+    if isinstance(depends_on_raw, list):
+        return [str(d) for d in depends_on_raw if d is not None]
+    if depends_on_raw is None:
+        return []
+    return [str(depends_on_raw)]
+
+
+def _ready_subtasks(spec_dir: Path, first_only: bool):
+    """
+    Yield (phase, subtask) for pending subtasks whose phase dependencies are met.
+
+    A phase that is not parallel_safe yields only its first pending subtask.
+    """
+    view = PlanStore.for_spec(spec_dir).read()
+    if view is None:
+        return
+
+    stuck_subtask_ids = _load_stuck_subtask_ids(spec_dir)
+    phases = view.phases
+    completed_phases = _completed_phase_keys(phases)
+
+    for phase in phases:
+        # Check if dependencies are satisfied
+        if not all(dep in completed_phases for dep in _phase_dependencies(phase)):
+            continue
+
+        for subtask in phase.get("subtasks", phase.get("chunks", [])):
+            status = subtask.get("status", "pending")
+
+            # Skip stuck subtasks
+            if subtask.get("id") in stuck_subtask_ids:
+                continue
+
+            if status in {"pending", "not_started", "not started"}:
+                yield phase, subtask
+                if first_only:
+                    return
+                if not phase.get("parallel_safe", False):
+                    break
+
+
+def _subtask_with_phase(phase: dict, subtask: dict) -> dict:
+    # Callers may modify the result; the plan view is shared
+    subtask_out, _changed = normalize_subtask_aliases(copy_json(subtask))
+    subtask_out["status"] = "pending"
+    return {
+        **subtask_out,
+        "phase_id": _phase_id(phase),
+        "phase_name": phase.get("name"),
+        "phase_num": phase.get("phase"),
+    }
 
 
 def get_next_subtask(spec_dir: Path) -> dict | None:
@@ -415,91 +430,32 @@ def get_next_subtask(spec_dir: Path) -> dict | None:
     Returns:
         The next subtask dict to work on, or None if all complete
     """
-    plan_file = spec_dir / "implementation_plan.json"
-
-    if not plan_file.exists():
-        return None
+    for phase, subtask in _ready_subtasks(spec_dir, first_only=True):
+        return _subtask_with_phase(phase, subtask)
+    return None
 
-    # Load stuck subtasks from recovery manager's attempt history
-    stuck_subtask_ids = set()
-    attempt_history_file = spec_dir / "memory" / "attempt_history.json"
-    if attempt_history_file.exists():
-        try:
-            with open(attempt_history_file, encoding="utf-8") as f:
-                attempt_history = json.load(f)
-            # Collect IDs of subtasks marked as stuck
-            stuck_subtask_ids = {
-                entry["subtask_id"]
-                for entry in attempt_history.get("stuck_subtasks", [])
-                if "subtask_id" in entry
-            }
-        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
-            # If we can't read the file, continue without stuck checking
-            pass
 
-    try:
-        with open(plan_file, encoding="utf-8") as f:
-            plan = json.load(f)
-
-        phases = plan.get("phases", [])
-
-        # Build a map of phase completion
-        phase_complete: dict[str, bool] = {}
-        for i, phase in enumerate(phases):
-            phase_id_value = phase.get("id")
-            phase_id_raw = (
-                phase_id_value if phase_id_value is not None else phase.get("phase")
-            )
-            phase_id_key = (
-                str(phase_id_raw) if phase_id_raw is not None else f"unknown:{i}"
-            )
-            subtasks = phase.get("subtasks", phase.get("chunks", []))
-            phase_complete[phase_id_key] = all(
-                s.get("status") == "completed" for s in subtasks
-            )
-
-        # Find next available subtask
-        for phase in phases:
-            phase_id_value = phase.get("id")
-            phase_id = (
-                phase_id_value if phase_id_value is not None else phase.get("phase")
-            )
-            depends_on_raw = phase.get("depends_on", [])
-            if isinstance(depends_on_raw, list):
-                depends_on = [str(d) for d in depends_on_raw if d is not None]
-            elif depends_on_raw is None:
-                depends_on = []
-            else:
-                depends_on = [str(depends_on_raw)]
-
-            # Check if dependencies are satisfied
-            deps_satisfied = all(phase_complete.get(dep, False) for dep in depends_on)
-            if not deps_satisfied:
-                continue
+def get_ready_subtasks(spec_dir: Path) -> list[dict]:
+    """
+    Find every subtask that could be started now, in plan order.
 
-            # Find first pending subtask in this phase (skip stuck subtasks)
-            for subtask in phase.get("subtasks", phase.get("chunks", [])):
-                status = subtask.get("status", "pending")
-                subtask_id = subtask.get("id")
-
-                # Skip stuck subtasks
-                if subtask_id in stuck_subtask_ids:
-                    continue
-
-                if status in {"pending", "not_started", "not started"}:
-                    subtask_out, _changed = normalize_subtask_aliases(subtask)
-                    subtask_out["status"] = "pending"
-                    return {
-                        **subtask_out,
-                        "phase_id": phase_id,
-                        "phase_name": phase.get("name"),
-                        "phase_num": phase.get("phase"),
-                    }
+    Like get_next_subtask, but looks past the first phase: all pending subtasks
+    of parallel_safe phases are returned, and one subtask of each other phase
+    whose dependencies are complete.
 
-        return None
+    Args:
+        spec_dir: Directory containing implementation_plan.json
 
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
-        return None
+    Returns:
+        Subtask dicts as returned by get_next_subtask, plus "parallel_safe"
+    """
+    return [
+        {
+            **_subtask_with_phase(phase, subtask),
+            "parallel_safe": bool(phase.get("parallel_safe", False)),
+        }
+        for phase, subtask in _ready_subtasks(spec_dir, first_only=False)
+    ]
 
 
 def format_duration(seconds: float) -> str:
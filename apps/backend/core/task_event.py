@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
+from core.plan_store import PlanStore
+
 TASK_EVENT_PREFIX = "__TASK_EVENT__:"
 _DEBUG = os.environ.get("DEBUG", "").lower() in ("1", "true", "yes")
 
@@ -38,18 +40,13 @@ def _load_task_metadata(spec_dir: Path) -> dict:
 
 
 def _load_last_sequence(spec_dir: Path) -> int:
-    plan_path = spec_dir / "implementation_plan.json"
-    if not plan_path.exists():
-        return 0
-    try:
-        with open(plan_path, encoding="utf-8") as f:
-            plan = json.load(f)
-        last_event = plan.get("lastEvent") or {}
-        seq = last_event.get("sequence")
-        if isinstance(seq, int) and seq >= 0:
-            return seq + 1
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+    view = PlanStore.for_spec(spec_dir).read()
+    if view is None:
         return 0
+    last_event = view.data.get("lastEvent") or {}
+    seq = last_event.get("sequence")
+    if isinstance(seq, int) and seq >= 0:
+        return seq + 1
     return 0
 
 
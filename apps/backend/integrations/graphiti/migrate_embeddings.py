@@ -4,10 +4,15 @@ Embedding Provider Migration Utility
 =====================================
 
 Migrates Graphiti memory data from one embedding provider to another by:
-1. Reading all episodes from the source database
-2. Re-embedding content with the new provider
+1. Reading episodes from the source database, a page at a time
+2. Re-embedding content with the new provider, in batches of episodes added
+   through Graphiti's bulk API with bounded concurrency
 3. Storing in a provider-specific target database
 
+Progress is checkpointed next to the target database, so an interrupted
+migration resumes where it stopped (use --restart to start over), and
+throughput and ETA are logged after every batch.
+
 This handles the dimension mismatch issue when switching between providers
 (e.g., OpenAI 1536D → Ollama embeddinggemma 768D).
 
@@ -23,12 +28,21 @@ Usage:
 
     # Dry run to see what would be migrated
     python integrations/graphiti/migrate_embeddings.py --dry-run
+
+    # Larger batches, more concurrent batches
+    python integrations/graphiti/migrate_embeddings.py \
+        --from-provider openai --to-provider ollama \
+        --batch-size 50 --concurrency 8
 """
 
 import argparse
 import asyncio
+import json
 import logging
+import os
 import sys
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
@@ -42,6 +56,149 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Episodes read from the source database per query
+PAGE_SIZE = 500
+
+# Episodes per bulk add. Each yields several entity and fact texts, which the
+# embedder splits into requests within the provider's input limit.
+DEFAULT_BATCH_SIZE = 20
+
+# Batches added at the same time
+DEFAULT_CONCURRENCY = 4
+
+EPISODE_FIELDS = (
+    "uuid",
+    "name",
+    "content",
+    "created_at",
+    "valid_at",
+    "group_id",
+    "source",
+    "source_description",
+)
+
+
+def _episode_type(source: str | None):
+    from graphiti_core.nodes import EpisodeType
+
+    if source == "message":
+        return EpisodeType.message
+    elif source == "json":
+        return EpisodeType.json
+    return EpisodeType.text
+
+
+def _reference_time(valid_at):
+    if isinstance(valid_at, str):
+        return datetime.fromisoformat(valid_at.replace("Z", "+00:00"))
+    return valid_at
+
+
+def _group_id(episode: dict) -> str:
+    return episode.get("group_id") or "default"
+
+
+def _cursor_key(episode: dict) -> tuple[str, str]:
+    """Position of an episode in source order (created_at, uuid)."""
+    created_at = episode.get("created_at")
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    return (str(created_at or ""), str(episode.get("uuid") or ""))
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+@dataclass
+class MigrationCheckpoint:
+    """
+    Progress of a migration between two databases.
+
+    Every episode up to and including cursor is done; done holds the
+    episodes after it that finished early, since batches run concurrently.
+    """
+
+    source_database: str
+    target_database: str
+    cursor: list[str] | None = None
+    done: dict[str, list[str]] = field(default_factory=dict)
+    succeeded: int = 0
+    failed: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "source_database": self.source_database,
+            "target_database": self.target_database,
+            "cursor": self.cursor,
+            "done": self.done,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MigrationCheckpoint":
+        return cls(
+            source_database=data["source_database"],
+            target_database=data["target_database"],
+            cursor=data.get("cursor"),
+            done=data.get("done", {}),
+            succeeded=data.get("succeeded", 0),
+            failed=data.get("failed", 0),
+        )
+
+    def is_done(self, episode: dict) -> bool:
+        key = list(_cursor_key(episode))
+        if self.cursor is not None and key <= self.cursor:
+            return True
+        return key[1] in self.done
+
+    def advance(self, cursor: tuple[str, str]) -> None:
+        """Move the cursor, forgetting early finishers it now covers."""
+        self.cursor = list(cursor)
+        self.done = {uuid: key for uuid, key in self.done.items() if key > self.cursor}
+
+
+class MigrationProgress:
+    """Throughput and ETA of a running migration."""
+
+    def __init__(self, total: int | None, already_done: int = 0, clock=time.monotonic):
+        self.total = total
+        self.already_done = already_done
+        self.processed = 0
+        self._clock = clock
+        self._started = clock()
+
+    def record(self, count: int) -> None:
+        self.processed += count
+
+    def rate(self) -> float:
+        elapsed = self._clock() - self._started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> float | None:
+        rate = self.rate()
+        if self.total is None or rate <= 0:
+            return None
+        remaining = self.total - self.already_done - self.processed
+        return max(remaining, 0) / rate
+
+    def describe(self) -> str:
+        done = self.already_done + self.processed
+        text = f"Migrated {done}/{self.total if self.total is not None else '?'}"
+        text += f" episodes ({self.rate():.1f}/s"
+        eta = self.eta_seconds()
+        if eta is not None:
+            text += f", ETA {_format_duration(eta)}"
+        return text + ")"
+
 
 class EmbeddingMigrator:
     """Handles migration of embeddings between providers."""
@@ -51,6 +208,9 @@ class EmbeddingMigrator:
         source_config: GraphitiConfig,
         target_config: GraphitiConfig,
         dry_run: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        page_size: int = PAGE_SIZE,
     ):
         """
         Initialize the migrator.
@@ -59,12 +219,20 @@ class EmbeddingMigrator:
             source_config: Config for source database
             target_config: Config for target database
             dry_run: If True, don't actually perform migration
+            batch_size: Episodes per bulk add to the target database
+            concurrency: Batches added at the same time
+            page_size: Episodes read from the source database per query
         """
         self.source_config = source_config
         self.target_config = target_config
         self.dry_run = dry_run
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.page_size = max(1, page_size)
         self.source_client = None
         self.target_client = None
+        self._processed = 0
+        self._total: int | None = None
 
     async def initialize(self) -> bool:
         """Initialize source and target clients."""
@@ -99,19 +267,52 @@ class EmbeddingMigrator:
 
         return True
 
-    async def get_source_episodes(self) -> list[dict]:
+    async def count_source_episodes(self) -> int | None:
+        """Number of episodes in the source database, or None if unknown."""
+        if self.source_client is None:
+            return None
+        try:
+            records, _, _ = await self.source_client._driver.execute_query(
+                "MATCH (e:Episodic) RETURN count(e) AS total"
+            )
+            total = records[0].get("total") if records else None
+            return total if isinstance(total, int) else None
+        except Exception as e:
+            logger.debug(f"Failed to count episodes: {e}")
+            return None
+
+    async def get_source_episodes(
+        self, after: tuple[str, str] | None = None, limit: int | None = None
+    ) -> list[dict]:
         """
-        Retrieve all episodes from source database.
+        Retrieve episodes from source database, in creation order.
+
+        Args:
+            after: Only return episodes after this (created_at, uuid) position
+            limit: Maximum number of episodes to return (all if None)
 
         Returns:
             List of episode data dictionaries
         """
-        logger.info("Fetching episodes from source database...")
+        if limit is None:
+            logger.info("Fetching episodes from source database...")
 
         try:
-            # Query all episodic nodes
-            query = """
+            # Query episodic nodes, keyset-paginated on (created_at, uuid)
+            where = ""
+            params = {}
+            if after is not None:
+                where = """
+                WHERE e.created_at > $after_created_at
+                    OR (e.created_at = $after_created_at AND e.uuid > $after_uuid)
+                """
+                params = {
+                    "after_created_at": _reference_time(after[0]),
+                    "after_uuid": after[1],
+                }
+            query = f"""
                 MATCH (e:Episodic)
+                {where}
                 RETURN
                     e.uuid AS uuid,
                     e.name AS name,
@@ -121,27 +322,22 @@ class EmbeddingMigrator:
                     e.group_id AS group_id,
                     e.source AS source,
                     e.source_description AS source_description
-                ORDER BY e.created_at
+                ORDER BY e.created_at, e.uuid
             """
+            if limit is not None:
+                query += f" LIMIT {int(limit)}"
 
-            records, _, _ = await self.source_client._driver.execute_query(query)
-
-            episodes = []
-            for record in records:
-                episodes.append(
-                    {
-                        "uuid": record.get("uuid"),
-                        "name": record.get("name"),
-                        "content": record.get("content"),
-                        "created_at": record.get("created_at"),
-                        "valid_at": record.get("valid_at"),
-                        "group_id": record.get("group_id"),
-                        "source": record.get("source"),
-                        "source_description": record.get("source_description"),
-                    }
-                )
+            records, _, _ = await self.source_client._driver.execute_query(
+                query, **params
+            )
 
-            logger.info(f"Found {len(episodes)} episodes to migrate")
+            episodes = [
+                {name: record.get(name) for name in EPISODE_FIELDS}
+                for record in records
+            ]
+
+            if limit is None:
+                logger.info(f"Found {len(episodes)} episodes to migrate")
             return episodes
 
         except Exception as e:
@@ -162,32 +358,19 @@ class EmbeddingMigrator:
             logger.info(f"[DRY RUN] Would migrate: {episode['name']}")
             return True
 
-        try:
-            from graphiti_core.nodes import EpisodeType
-
-            # Determine episode type
-            source = episode.get("source", "text")
-            if source == "message":
-                episode_type = EpisodeType.message
-            elif source == "json":
-                episode_type = EpisodeType.json
-            else:
-                episode_type = EpisodeType.text
-
-            # Parse timestamps
-            valid_at = episode.get("valid_at")
-            if isinstance(valid_at, str):
-                valid_at = datetime.fromisoformat(valid_at.replace("Z", "+00:00"))
+        from integrations.graphiti.queries_pkg.search_cache import add_episode
 
+        try:
             # Re-embed and save with new provider
-            await self.target_client.graphiti.add_episode(
+            await add_episode(
+                self.target_client,
                 name=episode["name"],
                 episode_body=episode["content"] or "",
-                source=episode_type,
+                source=_episode_type(episode.get("source", "text")),
                 source_description=episode.get(
                     "source_description", "Migrated episode"
                 ),
-                reference_time=valid_at,
+                reference_time=_reference_time(episode.get("valid_at")),
                 group_id=episode.get("group_id", "default"),
             )
 
@@ -198,30 +381,220 @@ class EmbeddingMigrator:
             logger.error(f"Failed to migrate episode {episode['name']}: {e}")
             return False
 
-    async def migrate_all(self) -> dict:
+    async def migrate_batch(self, episodes: list[dict]) -> list[bool]:
+        """
+        Migrate a batch of episodes, in one bulk add per group if possible.
+
+        Falls back to migrating one episode at a time when the bulk API is
+        unavailable, and for the groups whose bulk add failed; groups that
+        were bulk added are not migrated again.
+
+        Returns:
+            Success flag for each episode, in order
+        """
+        graphiti = getattr(self.target_client, "graphiti", None)
+        added: set[str] = set()
+        if (
+            not self.dry_run
+            and len(episodes) > 1
+            and hasattr(graphiti, "add_episode_bulk")
+        ):
+            added = await self._add_bulk(episodes)
+
+        results = []
+        for episode in episodes:
+            self._processed += 1
+            if _group_id(episode) in added:
+                logger.debug(f"Migrated: {episode['name']}")
+                results.append(True)
+                continue
+            logger.info(f"Processing episode {self._processed}/{self._total or '?'}")
+            results.append(await self.migrate_episode(episode))
+        return results
+
+    async def _add_bulk(self, episodes: list[dict]) -> set[str]:
+        """
+        Bulk add episodes, with one add_episode_bulk call per group.
+
+        Returns:
+            Ids of the groups that were added; the others failed (or the
+            bulk API is unavailable) and still need migrating
+        """
+        from integrations.graphiti.queries_pkg.search_cache import add_episode_bulk
+
+        try:
+            from graphiti_core.utils.bulk_utils import RawEpisode
+        except ImportError as e:
+            logger.warning(f"Bulk add unavailable, migrating one by one: {e}")
+            return set()
+
+        by_group: dict[str, list[dict]] = {}
+        for episode in episodes:
+            by_group.setdefault(_group_id(episode), []).append(episode)
+
+        added = set()
+        for group_id, group_episodes in by_group.items():
+            try:
+                await add_episode_bulk(
+                    self.target_client,
+                    [
+                        RawEpisode(
+                            name=episode["name"],
+                            content=episode["content"] or "",
+                            source=_episode_type(episode.get("source", "text")),
+                            source_description=episode.get("source_description")
+                            or "Migrated episode",
+                            reference_time=_reference_time(episode.get("valid_at"))
+                            or datetime.now().astimezone(),
+                        )
+                        for episode in group_episodes
+                    ],
+                    group_id,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Bulk add of {len(group_episodes)} episodes to group "
+                    f"{group_id} failed, migrating them one by one: {e}"
+                )
+                continue
+            added.add(group_id)
+        return added
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def checkpoint_path(self) -> Path | None:
+        """Where this migration's progress is kept (None if not resumable)."""
+        db_path = getattr(self.target_config, "db_path", None)
+        source = getattr(self.source_config, "database", None)
+        target = getattr(self.target_config, "database", None)
+        if not all(isinstance(value, str) for value in (db_path, source, target)):
+            return None
+        return Path(db_path).expanduser() / ".migrations" / f"{source}__{target}.json"
+
+    def _load_checkpoint(self, path: Path | None) -> MigrationCheckpoint | None:
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return MigrationCheckpoint.from_dict(json.load(f))
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable migration checkpoint {path}: {e}")
+            return None
+
+    def _save_checkpoint(
+        self, path: Path | None, checkpoint: MigrationCheckpoint
+    ) -> None:
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(checkpoint.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to save migration checkpoint: {e}")
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
+    async def migrate_all(self, restart: bool = False) -> dict:
         """
         Migrate all episodes from source to target.
 
+        Episodes are read a page at a time and migrated in batches, with up
+        to `concurrency` batches in flight. Unless this is a dry run, progress
+        is checkpointed after every batch and a later run resumes from it.
+
+        Args:
+            restart: Ignore an existing checkpoint and migrate everything
+
         Returns:
             Migration statistics dictionary
         """
-        episodes = await self.get_source_episodes()
+        path = None if self.dry_run else self.checkpoint_path()
+        checkpoint = None if restart else self._load_checkpoint(path)
+        if checkpoint is not None:
+            logger.info(
+                f"Resuming migration: {checkpoint.succeeded + checkpoint.failed} "
+                f"episodes already processed ({path})"
+            )
+        else:
+            checkpoint = MigrationCheckpoint(
+                source_database=str(getattr(self.source_config, "database", "")),
+                target_database=str(getattr(self.target_config, "database", "")),
+            )
+        resumed = checkpoint.succeeded + checkpoint.failed
 
-        stats = {
-            "total": len(episodes),
-            "succeeded": 0,
-            "failed": 0,
-            "dry_run": self.dry_run,
-        }
+        self._total = await self.count_source_episodes()
+        self._processed = resumed
+        progress = MigrationProgress(self._total, already_done=resumed)
 
-        for i, episode in enumerate(episodes, 1):
-            logger.info(f"Processing episode {i}/{len(episodes)}")
-            if await self.migrate_episode(episode):
-                stats["succeeded"] += 1
-            else:
-                stats["failed"] += 1
+        # Batches in source order; the cursor only moves past finished ones
+        in_flight: list[list] = []
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: set[asyncio.Task] = set()
 
-        return stats
+        def settle() -> None:
+            while in_flight and in_flight[0][1]:
+                checkpoint.advance(in_flight.pop(0)[0])
+            self._save_checkpoint(path, checkpoint)
+
+        async def run_batch(entry: list, batch: list[dict]) -> None:
+            try:
+                results = await self.migrate_batch(batch)
+            except Exception as e:
+                logger.error(f"Failed to migrate batch: {e}")
+                results = [False] * len(batch)
+            finally:
+                semaphore.release()
+            succeeded = sum(1 for ok in results if ok)
+            checkpoint.succeeded += succeeded
+            checkpoint.failed += len(batch) - succeeded
+            for episode in batch:
+                key = _cursor_key(episode)
+                checkpoint.done[key[1]] = list(key)
+            entry[1] = True
+            progress.record(len(batch))
+            settle()
+            logger.info(progress.describe())
+
+        after = None if checkpoint.cursor is None else tuple(checkpoint.cursor)
+        while True:
+            page = await self.get_source_episodes(after=after, limit=self.page_size)
+            if not page:
+                break
+            todo = [episode for episode in page if not checkpoint.is_done(episode)]
+            for start in range(0, len(todo), self.batch_size):
+                batch = todo[start : start + self.batch_size]
+                await semaphore.acquire()
+                entry = [_cursor_key(batch[-1]), False]
+                in_flight.append(entry)
+                task = asyncio.create_task(run_batch(entry, batch))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if len(page) < self.page_size:
+                break
+            after = _cursor_key(page[-1])
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+        if path is not None and path.exists():
+            # Finished; a later run starts over
+            path.unlink()
+
+        processed = checkpoint.succeeded + checkpoint.failed
+        return {
+            "total": self._total if self._total is not None else processed,
+            "succeeded": checkpoint.succeeded,
+            "failed": checkpoint.failed,
+            "resumed": resumed,
+            "dry_run": self.dry_run,
+        }
 
     async def close(self):
         """Close client connections."""
@@ -290,7 +663,8 @@ async def interactive_migration():
         f"to {current_config.embedder_provider}"
     )
     print(
-        "Re-embedding may take several minutes depending on the number of episodes.\n"
+        "Re-embedding may take a while depending on the number of episodes.\n"
+        "If interrupted, run the migration again to resume where it stopped.\n"
     )
 
     confirm = input("Continue? (yes/no): ").strip().lower()
@@ -360,13 +734,15 @@ async def automatic_migration(args):
         source_config=source_config,
         target_config=target_config,
         dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
     )
 
     if not await migrator.initialize():
         logger.error("Failed to initialize migration")
         return
 
-    stats = await migrator.migrate_all()
+    stats = await migrator.migrate_all(restart=args.restart)
     await migrator.close()
 
     logger.info(f"Migration complete: {stats}")
@@ -395,6 +771,23 @@ def main():
     parser.add_argument(
         "--auto-confirm", action="store_true", help="Skip confirmation prompts"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Episodes per bulk add (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Batches migrated at the same time (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore saved progress and migrate every episode again",
+    )
 
     args = parser.parse_args()
 
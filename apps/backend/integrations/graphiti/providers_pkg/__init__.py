@@ -12,6 +12,7 @@ This package provides:
 - Graceful error handling with helpful messages
 - Health checks and validation utilities
 - Convenience functions for graph-based memory queries
+- On-disk caching of embeddings (embedder_cache)
 
 Usage:
     from graphiti_providers import create_llm_client, create_embedder
@@ -0,0 +1,427 @@
+"""
+Embedding Cache
+===============
+
+Caching wrapper for Graphiti embedders. Texts embedded before (the same
+query across retrieval calls, an episode on retry, entities re-embedded by
+a migration) are answered from disk instead of the provider:
+- Entries are keyed by (provider, model, dimension, sha256(text)); each
+  (provider, model, dimension) has its own store
+- Vectors live in a raw float32 file opened with numpy.memmap; each row
+  starts with the text's digest, so a slot reused by another process is
+  detected instead of returning the wrong vector
+- A small JSON sidecar maps digest -> (slot, last use); once a store holds
+  GRAPHITI_EMBEDDING_CACHE_SIZE entries (default 8192), the least recently
+  used slots are overwritten
+- create_batch() sends only the cache misses to the provider, in requests
+  of at most the provider's input limit (BATCH_LIMITS); concurrent create()
+  calls for the same text share one provider call
+- Cache failures never fail an embedding; the provider is used instead
+
+Stores live next to the graph databases, in {db_path}/.embedding_cache/
+(hidden, so database listings skip it).
+Set GRAPHITI_EMBEDDING_CACHE=false to disable.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    from graphiti_core.embedder.client import EmbedderClient
+except ImportError:  # graphiti-core not installed; nothing to wrap
+    EmbedderClient = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - Unix
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_CAPACITY = 8192
+
+# Most inputs each provider accepts in one embedding request
+BATCH_LIMITS = {
+    "openai": 2048,
+    "azure_openai": 2048,
+    "openrouter": 2048,
+    "voyage": 128,
+    "google": 100,
+    # Local server; bounded to keep request memory predictable
+    "ollama": 64,
+}
+DEFAULT_BATCH_LIMIT = 100
+
+# Row header: the first 16 bytes of the text's sha256, as 4 float32 cells
+_DIGEST_BYTES = 16
+_HEADER_CELLS = _DIGEST_BYTES // 4
+
+
+def is_embedding_cache_enabled() -> bool:
+    """Check the GRAPHITI_EMBEDDING_CACHE switch (on by default)."""
+    return os.environ.get("GRAPHITI_EMBEDDING_CACHE", "true").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+def _capacity_from_env() -> int:
+    try:
+        return max(1, int(os.environ.get("GRAPHITI_EMBEDDING_CACHE_SIZE", "")))
+    except ValueError:
+        return DEFAULT_CAPACITY
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()[:_DIGEST_BYTES]
+
+
+def embedding_model_name(config) -> str:
+    """Model (or deployment) the configured embedder provider uses."""
+    return {
+        "openai": config.openai_embedding_model,
+        "voyage": config.voyage_embedding_model,
+        "azure_openai": config.azure_openai_embedding_deployment,
+        "ollama": config.ollama_embedding_model,
+        "google": config.google_embedding_model,
+        "openrouter": config.openrouter_embedding_model,
+    }.get(config.embedder_provider, "")
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive cross-process lock on path."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+class EmbeddingStore:
+    """Memory-mapped LRU store of vectors for one (provider, model, dimension)."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        provider: str,
+        model: str,
+        dimension: int,
+        capacity: int | None = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.dimension = dimension
+        self.capacity = capacity or _capacity_from_env()
+        key = f"{provider}\0{model}\0{dimension}"
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{provider}_{model}_{dimension}")
+        name = f"{safe}_{hashlib.sha256(key.encode()).hexdigest()[:8]}"
+        self.data_file = self.cache_dir / f"{name}.f32"
+        self.index_file = self.cache_dir / f"{name}.idx.json"
+        self._lock_file = self.cache_dir / f"{name}.lock"
+        self._row_cells = _HEADER_CELLS + dimension
+        # digest hex -> [slot, last used]
+        self._slots: dict[str, list] = {}
+        self._index_mtime: float | None = None
+
+    # ------------------------------------------------------------------
+    # Sidecar index
+    # ------------------------------------------------------------------
+
+    def _refresh_index(self, force: bool = False) -> None:
+        """Reload the sidecar if another process changed it."""
+        try:
+            mtime = self.index_file.stat().st_mtime_ns
+        except OSError:
+            return
+        if not force and mtime == self._index_mtime:
+            return
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug(f"Ignoring unreadable embedding cache index: {e}")
+            return
+        if (
+            index.get("version") != INDEX_VERSION
+            or index.get("dimension") != self.dimension
+        ):
+            return
+        slots = index.get("slots", {})
+        # Keep more recent uses seen by this process
+        for digest, record in self._slots.items():
+            if digest in slots and slots[digest][0] == record[0]:
+                slots[digest][1] = max(slots[digest][1], record[1])
+        self._slots = slots
+        self._index_mtime = mtime
+
+    def _write_index(self) -> None:
+        tmp_path = self.index_file.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "dimension": self.dimension,
+                    "slots": self._slots,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.index_file)
+        self._index_mtime = self.index_file.stat().st_mtime_ns
+
+    # ------------------------------------------------------------------
+    # Vector data
+    # ------------------------------------------------------------------
+
+    def _rows(self) -> int:
+        try:
+            return self.data_file.stat().st_size // (self._row_cells * 4)
+        except OSError:
+            return 0
+
+    def _open_matrix(self, rows: int, mode: str = "r") -> np.ndarray | None:
+        if rows == 0:
+            return None
+        return np.memmap(
+            self.data_file, dtype=np.float32, mode=mode, shape=(rows, self._row_cells)
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_many(self, digests: list[bytes]) -> dict[bytes, list[float]]:
+        """Cached vectors for the digests that have one."""
+        self._refresh_index()
+        rows = self._rows()
+        matrix = self._open_matrix(rows)
+        found: dict[bytes, list[float]] = {}
+        if matrix is None:
+            return found
+        now = time.time()
+        for digest in digests:
+            record = self._slots.get(digest.hex())
+            if record is None or record[0] >= rows:
+                continue
+            row = matrix[record[0]]
+            if row[:_HEADER_CELLS].tobytes() != digest:
+                # Slot reused by another process since our index was read
+                continue
+            found[digest] = row[_HEADER_CELLS:].tolist()
+            record[1] = now
+        return found
+
+    def put_many(self, vectors: dict[bytes, list[float]]) -> int:
+        """Store vectors, evicting least recently used slots when full."""
+        vectors = {d: v for d, v in vectors.items() if len(v) == self.dimension}
+        if not vectors:
+            return 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self._lock_file):
+            self._refresh_index(force=True)
+            rows = self._rows()
+            now = time.time()
+            new = [d for d in vectors if d.hex() not in self._slots]
+            free = max(0, self.capacity - rows)
+            evict = len(new) - min(free, len(new))
+            reused = []
+            if evict:
+                keep = {d.hex() for d in vectors}
+                victims = heapq.nsmallest(
+                    evict,
+                    (
+                        (record[1], digest)
+                        for digest, record in self._slots.items()
+                        if digest not in keep
+                    ),
+                )
+                for _, digest in victims:
+                    reused.append(self._slots.pop(digest)[0])
+
+            total_rows = rows + len(new) - len(reused)
+            if total_rows > rows:
+                with open(self.data_file, "ab") as f:
+                    f.truncate(total_rows * self._row_cells * 4)
+            next_row = rows
+            for digest in new:
+                if reused:
+                    slot = reused.pop()
+                else:
+                    slot = next_row
+                    next_row += 1
+                self._slots[digest.hex()] = [slot, now]
+
+            matrix = self._open_matrix(total_rows, mode="r+")
+            for digest, vector in vectors.items():
+                record = self._slots[digest.hex()]
+                record[1] = now
+                matrix[record[0], :_HEADER_CELLS] = np.frombuffer(digest, np.float32)
+                matrix[record[0], _HEADER_CELLS:] = vector
+            matrix.flush()
+            del matrix
+            self._write_index()
+        return len(vectors)
+
+    def __len__(self) -> int:
+        self._refresh_index()
+        return len(self._slots)
+
+
+def _single_text(input_data: Any) -> str | None:
+    """The text create() embeds, or None for token input."""
+    if isinstance(input_data, str):
+        return input_data
+    if isinstance(input_data, list) and input_data and isinstance(input_data[0], str):
+        # Providers return the first input's embedding
+        return input_data[0]
+    return None
+
+
+class CachingEmbedder(EmbedderClient or object):
+    """Embedder that answers repeated texts from an EmbeddingStore."""
+
+    def __init__(
+        self,
+        embedder: Any,
+        store: EmbeddingStore,
+        max_batch_size: int = DEFAULT_BATCH_LIMIT,
+    ):
+        self.embedder = embedder
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.config = getattr(embedder, "config", None)
+        self.hits = 0
+        self.misses = 0
+        self._in_flight: dict[bytes, asyncio.Future] = {}
+
+    def _lookup(self, digests: list[bytes]) -> dict[bytes, list[float]]:
+        try:
+            return self.store.get_many(digests)
+        except Exception as e:
+            logger.debug(f"Embedding cache lookup failed: {e}")
+            return {}
+
+    def _store(self, vectors: dict[bytes, list[float]]) -> None:
+        try:
+            self.store.put_many(vectors)
+        except Exception as e:
+            logger.debug(f"Embedding cache store failed: {e}")
+
+    async def create(self, input_data: Any) -> list[float]:
+        text = _single_text(input_data)
+        if text is None:
+            return await self.embedder.create(input_data)
+
+        digest = text_digest(text)
+        cached = self._lookup([digest]).get(digest)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        in_flight = self._in_flight.get(digest)
+        if in_flight is not None:
+            self.hits += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[digest] = future
+        try:
+            vector = await self.embedder.create(input_data)
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here so unawaited futures don't log the error
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(digest, None)
+        future.set_result(vector)
+        self._store({digest: list(vector)})
+        return vector
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        digests = [text_digest(text) for text in input_data_list]
+        found = self._lookup(digests)
+
+        missing: dict[bytes, str] = {}
+        for digest, text in zip(digests, input_data_list):
+            if digest not in found:
+                missing.setdefault(digest, text)
+        self.hits += len(digests) - len(missing)
+        self.misses += len(missing)
+
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.max_batch_size):
+            chunk = pending[start : start + self.max_batch_size]
+            vectors = await self.embedder.create_batch([text for _, text in chunk])
+            fresh = {digest: list(v) for (digest, _), v in zip(chunk, vectors)}
+            self._store(fresh)
+            found.update(fresh)
+        return [found[digest] for digest in digests]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def wrap_with_cache(embedder: Any, config) -> Any:
+    """
+    Wrap an embedder with the on-disk cache, when it can be used.
+
+    Returns the embedder unchanged if the cache is disabled, graphiti-core
+    is missing, or the configuration has no usable database path.
+    """
+    if EmbedderClient is None or not is_embedding_cache_enabled():
+        return embedder
+    db_path = getattr(config, "db_path", None)
+    if not isinstance(db_path, str) or not db_path:
+        return embedder
+
+    embedder_config = getattr(embedder, "config", None)
+    dimension = getattr(embedder_config, "embedding_dim", None)
+    if not isinstance(dimension, int) or dimension <= 0:
+        dimension = config.get_embedding_dimension()
+    store = EmbeddingStore(
+        Path(db_path).expanduser() / ".embedding_cache",
+        config.embedder_provider,
+        embedding_model_name(config),
+        dimension,
+    )
+    return CachingEmbedder(
+        embedder,
+        store,
+        BATCH_LIMITS.get(config.embedder_provider, DEFAULT_BATCH_LIMIT),
+    )
@@ -74,7 +74,8 @@ def create_embedder(config: "GraphitiConfig") -> Any:
         config: GraphitiConfig with provider settings
 
     Returns:
-        Embedder instance for Graphiti
+        Embedder instance for Graphiti, wrapped with the on-disk embedding
+        cache (see embedder_cache) unless it is disabled
 
     Raises:
         ProviderNotInstalled: If required packages are missing
@@ -85,16 +86,21 @@ def create_embedder(config: "GraphitiConfig") -> Any:
     logger.info(f"Creating embedder for provider: {provider}")
 
     if provider == "openai":
-        return create_openai_embedder(config)
+        embedder = create_openai_embedder(config)
     elif provider == "voyage":
-        return create_voyage_embedder(config)
+        embedder = create_voyage_embedder(config)
     elif provider == "azure_openai":
-        return create_azure_openai_embedder(config)
+        embedder = create_azure_openai_embedder(config)
     elif provider == "ollama":
-        return create_ollama_embedder(config)
+        embedder = create_ollama_embedder(config)
     elif provider == "google":
-        return create_google_embedder(config)
+        embedder = create_google_embedder(config)
     elif provider == "openrouter":
-        return create_openrouter_embedder(config)
+        embedder = create_openrouter_embedder(config)
     else:
         raise ProviderError(f"Unknown embedder provider: {provider}")
+
+    # Imported here so creating LLM clients doesn't load numpy
+    from .embedder_cache import wrap_with_cache
+
+    return wrap_with_cache(embedder, config)
@@ -4,8 +4,10 @@ Graphiti Memory System - Modular Architecture
 This package provides a clean separation of concerns for Graphiti memory:
 - graphiti.py: Main facade and coordination
 - client.py: Database connection management
+- kuzu_connections.py: Read/write connection routing and database lease
 - queries.py: Episode storage operations
 - search.py: Semantic search and retrieval
+- episode_queue.py: Write-behind queue for episode storage
 - schema.py: Data structures and constants
 
 Public API exports maintain backward compatibility with the original
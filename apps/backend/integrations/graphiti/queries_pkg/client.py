@@ -113,6 +113,7 @@ class GraphitiClient:
         self._llm_client = None
         self._embedder = None
         self._initialized = False
+        self._lease = None
 
     @property
     def graphiti(self):
@@ -124,6 +125,10 @@ class GraphitiClient:
         """Check if client is initialized."""
         return self._initialized
 
+    def database_contended(self) -> bool:
+        """Whether another process is waiting to open this client's database."""
+        return self._lease is not None and self._lease.has_waiters()
+
     async def initialize(self, state: GraphitiState | None = None) -> bool:
         """
         Initialize the Graphiti client with configured providers.
@@ -211,6 +216,10 @@ class GraphitiClient:
                 return False
 
             try:
+                from integrations.graphiti.queries_pkg.kuzu_connections import (
+                    DatabaseLease,
+                )
+
                 # Use our patched KuzuDriver that properly creates FTS indexes
                 # The original graphiti-core KuzuDriver has build_indices_and_constraints()
                 # as a no-op, which causes FTS search failures
@@ -220,6 +229,13 @@ class GraphitiClient:
 
                 db_path = self.config.get_db_path()
 
+                # Wait for other processes using this database to hand it
+                # over; the lock retries below cover processes that don't
+                # take the lease
+                self._lease = DatabaseLease(db_path)
+                if not await self._lease.acquire():
+                    logger.debug(f"Opening {db_path} without a lease")
+
                 # Retry with exponential backoff for lock contention
                 for attempt in range(MAX_LOCK_RETRIES + 1):
                     try:
@@ -247,6 +263,7 @@ class GraphitiClient:
                             llm_provider=self.config.llm_provider,
                             embedder_provider=self.config.embedder_provider,
                         )
+                        self._release_lease()
                         return False
 
                 logger.info(f"Initialized LadybugDB driver (patched) at: {db_path}")
@@ -300,6 +317,7 @@ class GraphitiClient:
                 llm_provider=self.config.llm_provider,
                 embedder_provider=self.config.embedder_provider,
             )
+            self._release_lease()
             return False
 
         except Exception as e:
@@ -310,6 +328,7 @@ class GraphitiClient:
                 llm_provider=self.config.llm_provider,
                 embedder_provider=self.config.embedder_provider,
             )
+            self._release_lease()
             return False
 
     async def close(self) -> None:
@@ -328,3 +347,9 @@ class GraphitiClient:
                 self._llm_client = None
                 self._embedder = None
                 self._initialized = False
+        self._release_lease()
+
+    def _release_lease(self) -> None:
+        if self._lease is not None:
+            self._lease.release()
+            self._lease = None
@@ -0,0 +1,427 @@
+"""
+Write-behind episode queue for Graphiti memory.
+
+Adding an episode runs LLM entity extraction and embedding, which used to
+happen in the agent's critical path after every session. With the queue:
+- Episodes are appended to a journal under .auto-claude/graphiti_queue/
+  (one per group) and the save returns as soon as the journal is written
+- A background task ingests them in batches, through Graphiti's bulk
+  episode API (one call per group, removed from the journal as each group
+  is added) where available and one at a time otherwise
+- Episodes with the same group, name and body are ingested once
+- Failed episodes are retried with exponential backoff and dropped after
+  MAX_ATTEMPTS
+- flush() (called by GraphitiMemory.close()) ingests everything pending;
+  episodes left in the journal by a crash are picked up by the next process
+  that writes to the group
+- One process at a time ingests a journal; the others only append
+
+Set GRAPHITI_WRITE_BEHIND=false to add episodes synchronously.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from core.sentry import capture_exception
+
+from .search_cache import add_episode, add_episode_bulk
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - Unix
+    msvcrt = None
+
+# Episodes ingested per bulk call
+BATCH_SIZE = 10
+
+# Attempts per episode before it is dropped
+MAX_ATTEMPTS = 5
+
+INITIAL_BACKOFF_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 300.0
+
+
+def is_write_behind_enabled() -> bool:
+    """Check the GRAPHITI_WRITE_BEHIND switch (on by default)."""
+    return os.environ.get("GRAPHITI_WRITE_BEHIND", "true").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+def _lock_fd(fd: int, blocking: bool = True) -> bool:
+    """Exclusively lock an open file; False if non-blocking and held."""
+    try:
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(fd, flags)
+        elif msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        if blocking:
+            raise
+        return False
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _is_duplicate_error(error: Exception) -> bool:
+    # Graphiti's deduplication warning: the episode is already in the graph
+    return "duplicate_facts" in str(error)
+
+
+class EpisodeQueue:
+    """Journaled queue of episodes for one Graphiti group."""
+
+    def __init__(
+        self,
+        journal_dir: Path,
+        client,
+        group_id: str,
+        batch_size: int = BATCH_SIZE,
+        clock=time.time,
+    ):
+        self.client = client
+        self.group_id = group_id
+        self.batch_size = batch_size
+        self._clock = clock
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", group_id)
+        self.journal_dir = Path(journal_dir)
+        self.journal_path = self.journal_dir / f"{safe_name}.jsonl"
+        # Never replaced, unlike the journal, so locks on it stay meaningful
+        self._journal_lock_path = self.journal_dir / f"{safe_name}.lock"
+        self._owner_lock_path = self.journal_dir / f"{safe_name}.owner"
+        self._task: asyncio.Task | None = None
+        self._sleeping = False
+        self._stopping = False
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, path: Path, blocking: bool = True):
+        """Hold an exclusive lock on path; yields False if not acquired."""
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            acquired = _lock_fd(fd, blocking)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    _unlock_fd(fd)
+        finally:
+            os.close(fd)
+
+    def _read(self) -> list[dict]:
+        if not self.journal_path.exists():
+            return []
+        entries = []
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-append
+                    logger.debug("Skipping unreadable episode journal line")
+        return entries
+
+    def _write(self, entries: list[dict]) -> None:
+        tmp_path = self.journal_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def pending(self) -> list[dict]:
+        """Episodes waiting to be ingested."""
+        with self._locked(self._journal_lock_path):
+            return self._read()
+
+    def enqueue(self, **episode) -> bool:
+        """
+        Journal an episode (add_episode keyword arguments) for ingestion.
+
+        Returns:
+            False if the journal could not be written; the caller should then
+            add the episode directly
+        """
+        body = episode.get("episode_body", "")
+        group_id = episode.get("group_id") or self.group_id
+        source = episode.get("source")
+        reference_time = episode.get("reference_time")
+        key = hashlib.sha256(
+            json.dumps([group_id, episode.get("name"), body]).encode()
+        ).hexdigest()[:24]
+        entry = {
+            "key": key,
+            "name": episode.get("name"),
+            "episode_body": body,
+            "source": getattr(source, "value", source),
+            "source_description": episode.get("source_description", ""),
+            "reference_time": reference_time.isoformat() if reference_time else None,
+            "group_id": group_id,
+            "attempts": 0,
+            "next_attempt": 0.0,
+        }
+        try:
+            with self._locked(self._journal_lock_path):
+                if any(e.get("key") == key for e in self._read()):
+                    logger.debug(f"Episode already queued: {entry['name']}")
+                else:
+                    with open(self.journal_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry) + "\n")
+                        f.flush()
+                        os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"Failed to journal episode, adding directly: {e}")
+            return False
+
+        self._start_worker()
+        return True
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def _start_worker(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is loop
+        ):
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Ingest until the journal is empty, waiting out retry backoff."""
+        while True:
+            try:
+                remaining = await self.drain()
+            except Exception as e:
+                # Episodes stay journaled; flush() or the next write retries
+                logger.warning(f"Episode queue worker stopped: {e}")
+                return
+            if not remaining or self._stopping:
+                return
+            wait = min(e.get("next_attempt", 0.0) for e in remaining) - self._clock()
+            self._sleeping = True
+            try:
+                await asyncio.sleep(max(wait, 0.1))
+            finally:
+                self._sleeping = False
+
+    async def drain(self, force: bool = False) -> list[dict] | None:
+        """
+        Ingest the episodes that are due (all of them if force).
+
+        Returns:
+            Episodes still pending, or None if another process or task is
+            ingesting this journal
+        """
+        with self._locked(self._owner_lock_path, blocking=False) as owner:
+            if not owner:
+                return None
+            tried: set[str] = set()
+            while True:
+                now = self._clock()
+                batch = [
+                    e
+                    for e in self.pending()
+                    if e["key"] not in tried
+                    and (force or e.get("next_attempt", 0.0) <= now)
+                ][: self.batch_size]
+                if not batch:
+                    return self.pending()
+                tried.update(e["key"] for e in batch)
+                done, failed = await self._ingest(batch)
+                self._settle(done, failed)
+
+    async def _ingest(self, batch: list[dict]) -> tuple[set[str], dict[str, str]]:
+        """
+        Add a batch to the graph.
+
+        Groups that were bulk added are settled right away; only the
+        episodes of the other groups are added one by one.
+
+        Returns:
+            (done keys, failed key -> error) of the episodes added one by one
+        """
+        done: set[str] = set()
+        failed: dict[str, str] = {}
+        graphiti = self.client.graphiti
+
+        remaining = batch
+        if len(batch) > 1 and hasattr(graphiti, "add_episode_bulk"):
+            added = await self._add_bulk(batch)
+            remaining = [e for e in batch if e["group_id"] not in added]
+
+        for entry in remaining:
+            try:
+                await add_episode(self.client, **self._episode_kwargs(entry))
+                done.add(entry["key"])
+            except Exception as e:
+                if _is_duplicate_error(e):
+                    done.add(entry["key"])
+                else:
+                    failed[entry["key"]] = str(e)
+        return done, failed
+
+    async def _add_bulk(self, batch: list[dict]) -> set[str]:
+        """
+        Bulk add a batch, with one add_episode_bulk call per group.
+
+        Each group's episodes leave the journal as soon as its call returns.
+
+        Returns:
+            Ids of the groups that were added; the others failed (or the
+            bulk API is unavailable) and still need adding
+        """
+        try:
+            from graphiti_core.utils.bulk_utils import RawEpisode
+        except ImportError:
+            return set()
+
+        by_group: dict[str, list[dict]] = {}
+        for entry in batch:
+            by_group.setdefault(entry["group_id"], []).append(entry)
+        added = set()
+        for group_id, entries in by_group.items():
+            try:
+                episodes = []
+                for entry in entries:
+                    kwargs = self._episode_kwargs(entry)
+                    episodes.append(
+                        RawEpisode(
+                            name=kwargs["name"],
+                            content=kwargs["episode_body"],
+                            source=kwargs["source"],
+                            source_description=kwargs["source_description"],
+                            reference_time=kwargs["reference_time"],
+                        )
+                    )
+                await add_episode_bulk(self.client, episodes, group_id)
+            except Exception as e:
+                logger.debug(
+                    f"Bulk add of {len(entries)} episodes to group {group_id} "
+                    f"failed, adding them one by one: {e}"
+                )
+                continue
+            self._settle({entry["key"] for entry in entries}, {})
+            added.add(group_id)
+        return added
+
+    @staticmethod
+    def _episode_kwargs(entry: dict) -> dict:
+        from graphiti_core.nodes import EpisodeType
+
+        reference_time = entry.get("reference_time")
+        return {
+            "name": entry["name"],
+            "episode_body": entry["episode_body"],
+            "source": EpisodeType(entry.get("source") or "text"),
+            "source_description": entry.get("source_description", ""),
+            "reference_time": datetime.fromisoformat(reference_time)
+            if reference_time
+            else datetime.now().astimezone(),
+            "group_id": entry["group_id"],
+        }
+
+    def _settle(self, done: set[str], failed: dict[str, str]) -> None:
+        """Remove ingested episodes and schedule retries of failed ones."""
+        if not done and not failed:
+            return
+        now = self._clock()
+        with self._locked(self._journal_lock_path):
+            remaining = []
+            for entry in self._read():
+                key = entry.get("key")
+                if key in done:
+                    continue
+                if key in failed:
+                    entry["attempts"] = entry.get("attempts", 0) + 1
+                    if entry["attempts"] >= MAX_ATTEMPTS:
+                        logger.warning(
+                            f"Dropping episode {entry.get('name')} after "
+                            f"{entry['attempts']} attempts: {failed[key]}"
+                        )
+                        capture_exception(
+                            RuntimeError(failed[key]),
+                            operation="episode_queue_ingest",
+                            group_id=entry.get("group_id"),
+                            episode_name=entry.get("name"),
+                        )
+                        continue
+                    backoff = min(
+                        INITIAL_BACKOFF_SECONDS * (2 ** (entry["attempts"] - 1)),
+                        MAX_BACKOFF_SECONDS,
+                    )
+                    entry["next_attempt"] = now + backoff
+                remaining.append(entry)
+            self._write(remaining)
+
+    async def flush(self) -> int:
+        """
+        Try to ingest every pending episode once, ignoring backoff.
+
+        Returns:
+            Number of episodes still pending (kept in the journal)
+        """
+        task = self._task
+        self._task = None
+        if (
+            task is not None
+            and not task.done()
+            and task.get_loop() is asyncio.get_running_loop()
+        ):
+            # Let a batch in flight finish; only interrupt a backoff wait
+            self._stopping = True
+            if self._sleeping:
+                task.cancel()
+            try:
+                await asyncio.gather(task, return_exceptions=True)
+            finally:
+                self._stopping = False
+        try:
+            remaining = await self.drain(force=True)
+            if remaining is None:
+                remaining = self.pending()
+        except OSError as e:
+            logger.warning(f"Failed to flush episode queue: {e}")
+            return -1
+        if remaining:
+            logger.info(
+                f"{len(remaining)} episodes left in {self.journal_path} for later"
+            )
+        return len(remaining)
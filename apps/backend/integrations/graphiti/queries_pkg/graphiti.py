@@ -17,9 +17,11 @@ from core.sentry import capture_exception
 from graphiti_config import GraphitiConfig, GraphitiState
 
 from .client import GraphitiClient
+from .episode_queue import EpisodeQueue, is_write_behind_enabled
 from .queries import GraphitiQueries
 from .schema import MAX_CONTEXT_RESULTS, GroupIdMode
 from .search import GraphitiSearch
+from .search_cache import search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +69,7 @@ class GraphitiMemory:
         self._client: GraphitiClient | None = None
         self._queries: GraphitiQueries | None = None
         self._search: GraphitiSearch | None = None
+        self._episode_queue: EpisodeQueue | None = None
 
         self._available = False
 
@@ -97,6 +100,10 @@ class GraphitiMemory:
             and self.state.initialized
         )
 
+    def database_contended(self) -> bool:
+        """Whether another process is waiting for this memory's database."""
+        return self._client is not None and self._client.database_contended()
+
     @property
     def group_id(self) -> str:
         """
@@ -174,10 +181,17 @@ class GraphitiMemory:
                 self.state.save(self.spec_dir)
 
             # Create query and search modules
+            if is_write_behind_enabled():
+                self._episode_queue = EpisodeQueue(
+                    self.project_dir / ".auto-claude" / "graphiti_queue",
+                    self._client,
+                    self.group_id,
+                )
             self._queries = GraphitiQueries(
                 self._client,
                 self.group_id,
                 self.spec_context_id,
+                queue=self._episode_queue,
             )
 
             self._search = GraphitiSearch(
@@ -210,8 +224,14 @@ class GraphitiMemory:
     async def close(self) -> None:
         """
         Close the Graphiti client and clean up connections.
+
+        Episodes waiting in the write-behind queue are ingested first.
         """
         if self._client:
+            if self._episode_queue is not None:
+                # Ingest queued episodes while the client is still open
+                await self._episode_queue.flush()
+                self._episode_queue = None
             await self._client.close()
             self._client = None
             self._queries = None
@@ -481,6 +501,41 @@ class GraphitiMemory:
             )
             return [], []
 
+    async def get_subtask_context(
+        self,
+        query: str,
+        num_results: int = 5,
+        num_patterns: int = 3,
+        min_score: float = 0.5,
+        history_limit: int = 3,
+    ) -> dict[str, list[dict]]:
+        """
+        Get relevant context, patterns, gotchas and session history for a task.
+
+        Runs the retrievals concurrently and searches the query once; see
+        GraphitiSearch.get_subtask_context().
+
+        Returns:
+            Dict with "context", "patterns", "gotchas" and "session_history"
+        """
+        empty = {"context": [], "patterns": [], "gotchas": [], "session_history": []}
+        if not await self._ensure_initialized():
+            return empty
+
+        try:
+            return await self._search.get_subtask_context(
+                query, num_results, num_patterns, min_score, history_limit
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get subtask context: {e}")
+            self._record_error(f"get_subtask_context failed: {e}")
+            capture_exception(
+                e,
+                component="graphiti",
+                operation="get_subtask_context",
+            )
+            return empty
+
     # Status and utility methods
 
     def get_status_summary(self) -> dict:
@@ -504,6 +559,7 @@ class GraphitiMemory:
             "episode_count": self.state.episode_count if self.state else 0,
             "last_session": self.state.last_session if self.state else None,
             "errors": len(self.state.error_log) if self.state else 0,
+            "search_cache": search_cache.stats(),
         }
 
     async def _ensure_initialized(self) -> bool:
@@ -0,0 +1,226 @@
+"""
+Reader/writer connections and cross-process coordination for LadybugDB.
+
+An embedded LadybugDB/Kuzu database runs many read transactions at once but
+one write transaction at a time, and only one process can have it open for
+writing. Instead of one connection for everything:
+- KuzuConnectionManager sends read-only queries (searches, lookups) to a pool
+  of GRAPHITI_READ_CONNECTIONS connections (default 4) and queues writes, in
+  order, on a single writer connection
+- DatabaseLease makes processes that open the same database take turns: a
+  process waits for the lease instead of retrying the database lock, and the
+  holder can see that others are waiting so it closes the database as soon
+  as it is idle (see memory.graphiti_pool)
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - Unix
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READ_CONNECTIONS = 4
+
+# Seconds to wait for another process to hand over the database
+DEFAULT_LEASE_TIMEOUT = 30.0
+
+# Waiters refresh their marker while waiting; older markers are leftovers
+# from processes that died waiting
+WAITER_STALE_SECONDS = 5.0
+
+_WRITE_CLAUSE = re.compile(
+    r"\b(CREATE|MERGE|SET|DELETE|REMOVE|DROP|ALTER|COPY|INSTALL|LOAD|"
+    r"CREATE_FTS_INDEX|DROP_FTS_INDEX|BEGIN|COMMIT|ROLLBACK|CHECKPOINT)\b",
+    re.IGNORECASE,
+)
+
+
+def read_connections_from_env() -> int:
+    try:
+        return max(0, int(os.environ.get("GRAPHITI_READ_CONNECTIONS", "")))
+    except ValueError:
+        return DEFAULT_READ_CONNECTIONS
+
+
+def is_write_query(query: str) -> bool:
+    """Whether a Cypher query may modify the database."""
+    return _WRITE_CLAUSE.search(query) is not None
+
+
+class KuzuConnectionManager:
+    """
+    Routes queries to a pool of read connections or the single writer.
+
+    Has the AsyncConnection interface, so a driver can use it as its client.
+    """
+
+    def __init__(self, writer: Any, reader: Any | None = None):
+        """
+        Args:
+            writer: AsyncConnection with one connection, used for writes
+            reader: AsyncConnection with several connections, used for reads
+                (the writer serves reads too if None)
+        """
+        self.writer = writer
+        self.reader = reader or writer
+        self._write_lock = asyncio.Lock()
+
+    async def execute(self, query: str, parameters: dict[str, Any] | None = None):
+        if is_write_query(query):
+            # asyncio.Lock wakes waiters first come, first served
+            async with self._write_lock:
+                return await self.writer.execute(query, parameters=parameters)
+        return await self.reader.execute(query, parameters=parameters)
+
+    def close(self) -> None:
+        connections = [self.writer]
+        if self.reader is not self.writer:
+            connections.append(self.reader)
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.debug(f"Error closing LadybugDB connection: {e}")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.writer, name)
+
+
+# Leases held by this process, by lock path: [fd, holders]. File locks are
+# per open file, so clients in one process share a lease instead of
+# waiting on each other.
+_held_leases: dict[str, list[int]] = {}
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class DatabaseLease:
+    """Cross-process turn-taking for one database path."""
+
+    def __init__(self, db_path: str | Path, clock=time.time):
+        db_path = Path(db_path)
+        # Hidden, so database listings skip them
+        self.lock_path = db_path.with_name(f".{db_path.name}.lease")
+        self.waiters_dir = db_path.with_name(f".{db_path.name}.waiters")
+        self._clock = clock
+        self._held = False
+
+    @property
+    def held(self) -> bool:
+        return self._held
+
+    def _try_acquire(self) -> bool:
+        key = str(self.lock_path)
+        held = _held_leases.get(key)
+        if held is not None:
+            held[1] += 1
+            return True
+        # The database's parent directory exists (GraphitiConfig.get_db_path)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if not _try_lock(fd):
+            os.close(fd)
+            return False
+        _held_leases[key] = [fd, 1]
+        return True
+
+    async def acquire(self, timeout: float = DEFAULT_LEASE_TIMEOUT) -> bool:
+        """
+        Wait for this process's turn on the database.
+
+        Returns:
+            False if the lease could not be taken within timeout (or the
+            lock file is unusable); callers then open the database anyway
+        """
+        if self._held:
+            return True
+        marker = self.waiters_dir / f"{os.getpid()}-{id(self)}"
+        deadline = self._clock() + timeout
+        delay = 0.05
+        try:
+            while True:
+                if self._try_acquire():
+                    self._held = True
+                    return True
+                if self._clock() >= deadline:
+                    logger.debug(
+                        f"Timed out waiting for database lease {self.lock_path}"
+                    )
+                    return False
+                # Tell the holder someone is waiting (and that we're alive)
+                self.waiters_dir.mkdir(parents=True, exist_ok=True)
+                marker.touch()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.5)
+        except OSError as e:
+            logger.debug(f"Database lease unavailable: {e}")
+            return False
+        finally:
+            try:
+                marker.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def has_waiters(self) -> bool:
+        """Whether another process is waiting for this database."""
+        if not self._held:
+            return False
+        now = self._clock()
+        try:
+            for marker in self.waiters_dir.iterdir():
+                try:
+                    if now - marker.stat().st_mtime < WAITER_STALE_SECONDS:
+                        return True
+                except OSError:
+                    continue
+        except OSError:
+            pass
+        return False
+
+    def release(self) -> None:
+        if not self._held:
+            return
+        self._held = False
+        key = str(self.lock_path)
+        held = _held_leases.get(key)
+        if held is None:
+            return
+        held[1] -= 1
+        if held[1] > 0:
+            return
+        del _held_leases[key]
+        try:
+            _unlock(held[0])
+        finally:
+            os.close(held[0])
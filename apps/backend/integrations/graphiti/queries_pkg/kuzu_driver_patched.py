@@ -5,7 +5,9 @@ The original graphiti-core KuzuDriver has two bugs:
 1. build_indices_and_constraints() is a no-op, so FTS indexes are never created
 2. execute_query() filters out None parameters, but queries still reference them
 
-This patched driver fixes both issues for LadybugDB compatibility.
+This patched driver fixes both issues for LadybugDB compatibility. It also
+runs read-only queries on a pool of connections, with writes queued on a
+single writer connection (see kuzu_connections).
 """
 
 import logging
@@ -21,10 +23,16 @@ except ImportError:  # pragma: no cover
     # since the module is imported once before tests can mock anything.
     import real_ladybug as kuzu  # type: ignore
 
+from .kuzu_connections import KuzuConnectionManager, read_connections_from_env
+
 logger = logging.getLogger(__name__)
 
 
-def create_patched_kuzu_driver(db: str = ":memory:", max_concurrent_queries: int = 1):
+def create_patched_kuzu_driver(
+    db: str = ":memory:",
+    max_concurrent_queries: int = 1,
+    read_connections: int | None = None,
+):
     from graphiti_core.driver.driver import GraphProvider
     from graphiti_core.driver.kuzu_driver import KuzuDriver as OriginalKuzuDriver
     from graphiti_core.graph_queries import get_fulltext_indices
@@ -36,16 +44,28 @@ def create_patched_kuzu_driver(db: str = ":memory:", max_concurrent_queries: int
         Fixes two bugs in graphiti-core:
         1. FTS indexes are never created (build_indices_and_constraints is a no-op)
         2. None parameters are filtered out, causing "Parameter not found" errors
+
+        Queries that only read go to a pool of read_connections connections;
+        the parent's connection (max_concurrent_queries=1) is the writer.
         """
 
         def __init__(
             self,
             db: str = ":memory:",
             max_concurrent_queries: int = 1,
+            read_connections: int | None = None,
         ):
             # Store database path before calling parent (which creates the Database)
             self._database = db  # Required by Graphiti for group_id checks
             super().__init__(db, max_concurrent_queries)
+            if read_connections is None:
+                read_connections = read_connections_from_env()
+            reader = None
+            if read_connections > 0:
+                reader = kuzu.AsyncConnection(
+                    self.db, max_concurrent_queries=read_connections
+                )
+            self.client = KuzuConnectionManager(self.client, reader)
 
         async def execute_query(
             self, cypher_query_: str, **kwargs: Any
@@ -176,4 +196,19 @@ def create_patched_kuzu_driver(db: str = ":memory:", max_concurrent_queries: int
             # Run the parent schema setup (creates tables)
             super().setup_schema()
 
-    return PatchedKuzuDriver(db=db, max_concurrent_queries=max_concurrent_queries)
+        async def close(self):
+            """Close the connections and the database, releasing its file lock."""
+            try:
+                self.client.close()
+            except Exception as e:
+                logger.debug(f"Error closing LadybugDB connections: {e}")
+            try:
+                self.db.close()
+            except Exception as e:
+                logger.debug(f"Error closing LadybugDB database: {e}")
+
+    return PatchedKuzuDriver(
+        db=db,
+        max_concurrent_queries=max_concurrent_queries,
+        read_connections=read_connections,
+    )
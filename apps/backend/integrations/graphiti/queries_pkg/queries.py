@@ -7,6 +7,7 @@ Handles episode storage, retrieval, and filtering operations.
 import json
 import logging
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 from core.sentry import capture_exception
 
@@ -17,6 +18,10 @@ from .schema import (
     EPISODE_TYPE_SESSION_INSIGHT,
     EPISODE_TYPE_TASK_OUTCOME,
 )
+from .search_cache import add_episode
+
+if TYPE_CHECKING:
+    from .episode_queue import EpisodeQueue
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +34,13 @@ class GraphitiQueries:
     to the knowledge graph.
     """
 
-    def __init__(self, client, group_id: str, spec_context_id: str):
+    def __init__(
+        self,
+        client,
+        group_id: str,
+        spec_context_id: str,
+        queue: "EpisodeQueue | None" = None,
+    ):
         """
         Initialize query manager.
 
@@ -37,10 +48,20 @@ class GraphitiQueries:
             client: GraphitiClient instance
             group_id: Group ID for memory namespace
             spec_context_id: Spec-specific context ID
+            queue: Write-behind queue; episodes are journaled for background
+                ingestion instead of being added inline
         """
         self.client = client
         self.group_id = group_id
         self.spec_context_id = spec_context_id
+        self.queue = queue
+
+    async def _add_episode(self, **kwargs) -> None:
+        """Add (or queue) an episode and invalidate cached searches of its group."""
+        if self.queue is not None and self.queue.enqueue(**kwargs):
+            return
+        kwargs.setdefault("group_id", self.group_id)
+        await add_episode(self.client, **kwargs)
 
     async def add_session_insight(
         self,
@@ -68,7 +89,7 @@ class GraphitiQueries:
                 **insights,
             }
 
-            await self.client.graphiti.add_episode(
+            await self._add_episode(
                 name=f"session_{session_num:03d}_{self.spec_context_id}",
                 episode_body=json.dumps(episode_content),
                 source=EpisodeType.text,
@@ -119,7 +140,7 @@ class GraphitiQueries:
                 "files": discoveries,
             }
 
-            await self.client.graphiti.add_episode(
+            await self._add_episode(
                 name=f"codebase_discovery_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
                 episode_body=json.dumps(episode_content),
                 source=EpisodeType.text,
@@ -162,7 +183,7 @@ class GraphitiQueries:
                 "pattern": pattern,
             }
 
-            await self.client.graphiti.add_episode(
+            await self._add_episode(
                 name=f"pattern_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
                 episode_body=json.dumps(episode_content),
                 source=EpisodeType.text,
@@ -205,7 +226,7 @@ class GraphitiQueries:
                 "gotcha": gotcha,
             }
 
-            await self.client.graphiti.add_episode(
+            await self._add_episode(
                 name=f"gotcha_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
                 episode_body=json.dumps(episode_content),
                 source=EpisodeType.text,
@@ -260,7 +281,7 @@ class GraphitiQueries:
                 **(metadata or {}),
             }
 
-            await self.client.graphiti.add_episode(
+            await self._add_episode(
                 name=f"task_outcome_{task_id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
                 episode_body=json.dumps(episode_content),
                 source=EpisodeType.text,
@@ -320,7 +341,7 @@ class GraphitiQueries:
                         "gotchas": file_insight.get("gotchas", []),
                     }
 
-                    await self.client.graphiti.add_episode(
+                    await self._add_episode(
                         name=f"file_insight_{file_insight.get('path', 'unknown').replace('/', '_')}",
                         episode_body=json.dumps(episode_content),
                         source=EpisodeType.text,
@@ -363,7 +384,7 @@ class GraphitiQueries:
                         "example": example,
                     }
 
-                    await self.client.graphiti.add_episode(
+                    await self._add_episode(
                         name=f"pattern_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S%f')}",
                         episode_body=json.dumps(episode_content),
                         source=EpisodeType.text,
@@ -404,7 +425,7 @@ class GraphitiQueries:
                         "solution": solution,
                     }
 
-                    await self.client.graphiti.add_episode(
+                    await self._add_episode(
                         name=f"gotcha_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S%f')}",
                         episode_body=json.dumps(episode_content),
                         source=EpisodeType.text,
@@ -441,7 +462,7 @@ class GraphitiQueries:
                         "changed_files": insights.get("changed_files", []),
                     }
 
-                    await self.client.graphiti.add_episode(
+                    await self._add_episode(
                         name=f"task_outcome_{subtask_id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
                         episode_body=json.dumps(episode_content),
                         source=EpisodeType.text,
@@ -474,7 +495,7 @@ class GraphitiQueries:
                         "success": insights.get("success", False),
                     }
 
-                    await self.client.graphiti.add_episode(
+                    await self._add_episode(
                         name=f"recommendations_{insights.get('subtask_id', 'unknown')}",
                         episode_body=json.dumps(episode_content),
                         source=EpisodeType.text,
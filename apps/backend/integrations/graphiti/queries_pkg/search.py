@@ -4,6 +4,7 @@ Semantic search operations for Graphiti memory.
 Handles context retrieval, history queries, and similarity searches.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
@@ -19,9 +20,38 @@ from .schema import (
     MAX_CONTEXT_RESULTS,
     GroupIdMode,
 )
+from .search_cache import database_namespace, search_cache
 
 logger = logging.getLogger(__name__)
 
+# Query used to find session insights (fixed, not derived from the task)
+SESSION_HISTORY_QUERY = "session insight completed subtasks recommendations"
+
+
+def _result_content(result):
+    """Episode content or edge fact of a search result."""
+    return getattr(result, "content", None) or getattr(result, "fact", None)
+
+
+def _result_score(result) -> float:
+    """Score of a search result, treating None as 0.0."""
+    raw_score = getattr(result, "score", None)
+    return raw_score if raw_score is not None else 0.0
+
+
+def _typed_episode(content, episode_type: str) -> dict | None:
+    """Decode content as a JSON episode of the given type, or None."""
+    if not content or episode_type not in str(content):
+        return None
+    try:
+        data = json.loads(content) if isinstance(content, str) else content
+    except (json.JSONDecodeError, TypeError):
+        return None
+    # Ensure data is a dict before processing (fixes ACS-215)
+    if not isinstance(data, dict) or data.get("type") != episode_type:
+        return None
+    return data
+
 
 class GraphitiSearch:
     """
@@ -54,6 +84,129 @@ class GraphitiSearch:
         self.group_id_mode = group_id_mode
         self.project_dir = project_dir
 
+    async def _search(
+        self,
+        query: str,
+        group_ids: list[str],
+        num_results: int,
+        search_type: str,
+    ) -> list:
+        """Run a Graphiti search, answering repeats from the search cache."""
+        namespace = database_namespace(self.client)
+        if namespace is None or not search_cache.enabled:
+            return await self.client.graphiti.search(
+                query=query, group_ids=group_ids, num_results=num_results
+            )
+
+        key = search_cache.key(namespace, group_ids, query, num_results, search_type)
+        cached = search_cache.get(key)
+        if cached is not None:
+            return cached
+        generations = search_cache.generations(key)
+        stamps = search_cache.stamps(key)
+        results = await self.client.graphiti.search(
+            query=query, group_ids=group_ids, num_results=num_results
+        )
+        search_cache.put(key, results, generations, stamps)
+        return results
+
+    def _context_group_ids(self, include_project_context: bool) -> list[str]:
+        """Group IDs to search for context (adds project-wide in SPEC mode)."""
+        group_ids = [self.group_id]
+
+        # In spec mode, optionally include project context too
+        if self.group_id_mode == GroupIdMode.SPEC and include_project_context:
+            project_name = self.project_dir.name
+            path_hash = hashlib.md5(
+                str(self.project_dir.resolve()).encode(), usedforsecurity=False
+            ).hexdigest()[:8]
+            project_group_id = f"project_{project_name}_{path_hash}"
+            if project_group_id != self.group_id:
+                group_ids.append(project_group_id)
+
+        return group_ids
+
+    @staticmethod
+    def _context_items(results, min_score: float = 0.0) -> list[dict]:
+        """Convert search results to context items."""
+        context_items = []
+        for result in results:
+            # Extract content from result
+            content = _result_content(result) or str(result)
+
+            context_items.append(
+                {
+                    "content": content,
+                    "score": _result_score(result),
+                    "type": getattr(result, "type", "unknown"),
+                }
+            )
+
+        # Filter by minimum score if specified
+        if min_score > 0:
+            context_items = [
+                item for item in context_items if (item.get("score", 0.0)) >= min_score
+            ]
+        return context_items
+
+    def _session_insights(self, results, limit: int, spec_only: bool) -> list[dict]:
+        """Pick the latest session insights out of search results."""
+        sessions = []
+        for result in results:
+            data = _typed_episode(_result_content(result), EPISODE_TYPE_SESSION_INSIGHT)
+            if data is None:
+                continue
+            # Filter by spec if requested
+            if spec_only and data.get("spec_id") != self.spec_context_id:
+                continue
+            sessions.append(data)
+
+        # Sort by session number and return latest
+        sessions.sort(key=lambda x: x.get("session_number", 0), reverse=True)
+        return sessions[:limit]
+
+    @staticmethod
+    def _patterns(results, min_score: float) -> list[dict]:
+        """Pattern episodes scoring at least min_score, best first."""
+        patterns = []
+        for result in results:
+            score = _result_score(result)
+            if score < min_score:
+                continue
+            data = _typed_episode(_result_content(result), EPISODE_TYPE_PATTERN)
+            if data is not None:
+                patterns.append(
+                    {
+                        "pattern": data.get("pattern", ""),
+                        "applies_to": data.get("applies_to", ""),
+                        "example": data.get("example", ""),
+                        "score": score,
+                    }
+                )
+        patterns.sort(key=lambda x: x.get("score", 0), reverse=True)
+        return patterns
+
+    @staticmethod
+    def _gotchas(results, min_score: float) -> list[dict]:
+        """Gotcha episodes scoring at least min_score, best first."""
+        gotchas = []
+        for result in results:
+            score = _result_score(result)
+            if score < min_score:
+                continue
+            data = _typed_episode(_result_content(result), EPISODE_TYPE_GOTCHA)
+            if data is not None:
+                gotchas.append(
+                    {
+                        "gotcha": data.get("gotcha", ""),
+                        "trigger": data.get("trigger", ""),
+                        "solution": data.get("solution", ""),
+                        "score": score,
+                    }
+                )
+        gotchas.sort(key=lambda x: x.get("score", 0), reverse=True)
+        return gotchas
+
     async def get_relevant_context(
         self,
         query: str,
@@ -74,53 +227,14 @@ class GraphitiSearch:
             List of relevant context items with content, score, and type
         """
         try:
-            # Determine which group IDs to search
-            group_ids = [self.group_id]
-
-            # In spec mode, optionally include project context too
-            if self.group_id_mode == GroupIdMode.SPEC and include_project_context:
-                project_name = self.project_dir.name
-                path_hash = hashlib.md5(
-                    str(self.project_dir.resolve()).encode(), usedforsecurity=False
-                ).hexdigest()[:8]
-                project_group_id = f"project_{project_name}_{path_hash}"
-                if project_group_id != self.group_id:
-                    group_ids.append(project_group_id)
-
-            results = await self.client.graphiti.search(
-                query=query,
-                group_ids=group_ids,
-                num_results=min(num_results, MAX_CONTEXT_RESULTS),
+            results = await self._search(
+                query,
+                self._context_group_ids(include_project_context),
+                min(num_results, MAX_CONTEXT_RESULTS),
+                "context",
             )
 
-            context_items = []
-            for result in results:
-                # Extract content from result
-                content = (
-                    getattr(result, "content", None)
-                    or getattr(result, "fact", None)
-                    or str(result)
-                )
-
-                # Normalize score to float, treating None as 0.0
-                raw_score = getattr(result, "score", None)
-                score = raw_score if raw_score is not None else 0.0
-
-                context_items.append(
-                    {
-                        "content": content,
-                        "score": score,
-                        "type": getattr(result, "type", "unknown"),
-                    }
-                )
-
-            # Filter by minimum score if specified
-            if min_score > 0:
-                context_items = [
-                    item
-                    for item in context_items
-                    if (item.get("score", 0.0)) >= min_score
-                ]
+            context_items = self._context_items(results, min_score)
 
             logger.info(
                 f"Found {len(context_items)} relevant context items for: {query[:50]}..."
@@ -153,39 +267,13 @@ class GraphitiSearch:
             List of session insight summaries
         """
         try:
-            results = await self.client.graphiti.search(
-                query="session insight completed subtasks recommendations",
-                group_ids=[self.group_id],
-                num_results=limit * 2,  # Get more to filter
+            results = await self._search(
+                SESSION_HISTORY_QUERY,
+                [self.group_id],
+                limit * 2,  # Get more to filter
+                "session_history",
             )
-
-            sessions = []
-            for result in results:
-                content = getattr(result, "content", None) or getattr(
-                    result, "fact", None
-                )
-                if content and EPISODE_TYPE_SESSION_INSIGHT in str(content):
-                    try:
-                        data = (
-                            json.loads(content) if isinstance(content, str) else content
-                        )
-                        # Ensure data is a dict before processing (fixes ACS-215)
-                        if not isinstance(data, dict):
-                            continue
-                        if data.get("type") == EPISODE_TYPE_SESSION_INSIGHT:
-                            # Filter by spec if requested
-                            if (
-                                spec_only
-                                and data.get("spec_id") != self.spec_context_id
-                            ):
-                                continue
-                            sessions.append(data)
-                    except (json.JSONDecodeError, TypeError, AttributeError):
-                        continue
-
-            # Sort by session number and return latest
-            sessions.sort(key=lambda x: x.get("session_number", 0), reverse=True)
-            return sessions[:limit]
+            return self._session_insights(results, limit, spec_only)
 
         except Exception as e:
             logger.warning(f"Failed to get session history: {e}")
@@ -212,38 +300,27 @@ class GraphitiSearch:
             List of similar task outcomes with success/failure info
         """
         try:
-            results = await self.client.graphiti.search(
-                query=f"task outcome: {task_description}",
-                group_ids=[self.group_id],
-                num_results=limit * 2,
+            results = await self._search(
+                f"task outcome: {task_description}",
+                [self.group_id],
+                limit * 2,
+                "task_outcomes",
             )
 
             outcomes = []
             for result in results:
-                content = getattr(result, "content", None) or getattr(
-                    result, "fact", None
+                data = _typed_episode(
+                    _result_content(result), EPISODE_TYPE_TASK_OUTCOME
                 )
-                if content and EPISODE_TYPE_TASK_OUTCOME in str(content):
-                    try:
-                        data = (
-                            json.loads(content) if isinstance(content, str) else content
-                        )
-                        # Ensure data is a dict before processing (fixes ACS-215)
-                        if not isinstance(data, dict):
-                            continue
-                        if data.get("type") == EPISODE_TYPE_TASK_OUTCOME:
-                            raw_score = getattr(result, "score", None)
-                            score = raw_score if raw_score is not None else 0.0
-                            outcomes.append(
-                                {
-                                    "task_id": data.get("task_id"),
-                                    "success": data.get("success"),
-                                    "outcome": data.get("outcome"),
-                                    "score": score,
-                                }
-                            )
-                    except (json.JSONDecodeError, TypeError, AttributeError):
-                        continue
+                if data is not None:
+                    outcomes.append(
+                        {
+                            "task_id": data.get("task_id"),
+                            "success": data.get("success"),
+                            "outcome": data.get("outcome"),
+                            "score": _result_score(result),
+                        }
+                    )
 
             return outcomes[:limit]
 
@@ -278,87 +355,21 @@ class GraphitiSearch:
         Returns:
             Tuple of (patterns, gotchas) lists
         """
-        patterns = []
-        gotchas = []
-
         try:
             # Search with query focused on patterns
-            pattern_results = await self.client.graphiti.search(
-                query=f"pattern: {query}",
-                group_ids=[self.group_id],
-                num_results=num_results * 2,
+            pattern_results = await self._search(
+                f"pattern: {query}", [self.group_id], num_results * 2, "patterns"
             )
-
-            for result in pattern_results:
-                content = getattr(result, "content", None) or getattr(
-                    result, "fact", None
-                )
-                raw_score = getattr(result, "score", None)
-                score = raw_score if raw_score is not None else 0.0
-
-                if score < min_score:
-                    continue
-
-                if content and EPISODE_TYPE_PATTERN in str(content):
-                    try:
-                        data = (
-                            json.loads(content) if isinstance(content, str) else content
-                        )
-                        # Ensure data is a dict before processing (fixes ACS-215)
-                        if not isinstance(data, dict):
-                            continue
-                        if data.get("type") == EPISODE_TYPE_PATTERN:
-                            patterns.append(
-                                {
-                                    "pattern": data.get("pattern", ""),
-                                    "applies_to": data.get("applies_to", ""),
-                                    "example": data.get("example", ""),
-                                    "score": score,
-                                }
-                            )
-                    except (json.JSONDecodeError, TypeError, AttributeError):
-                        continue
+            patterns = self._patterns(pattern_results, min_score)
 
             # Search with query focused on gotchas
-            gotcha_results = await self.client.graphiti.search(
-                query=f"gotcha pitfall avoid: {query}",
-                group_ids=[self.group_id],
-                num_results=num_results * 2,
+            gotcha_results = await self._search(
+                f"gotcha pitfall avoid: {query}",
+                [self.group_id],
+                num_results * 2,
+                "gotchas",
             )
-
-            for result in gotcha_results:
-                content = getattr(result, "content", None) or getattr(
-                    result, "fact", None
-                )
-                raw_score = getattr(result, "score", None)
-                score = raw_score if raw_score is not None else 0.0
-
-                if score < min_score:
-                    continue
-
-                if content and EPISODE_TYPE_GOTCHA in str(content):
-                    try:
-                        data = (
-                            json.loads(content) if isinstance(content, str) else content
-                        )
-                        # Ensure data is a dict before processing (fixes ACS-215)
-                        if not isinstance(data, dict):
-                            continue
-                        if data.get("type") == EPISODE_TYPE_GOTCHA:
-                            gotchas.append(
-                                {
-                                    "gotcha": data.get("gotcha", ""),
-                                    "trigger": data.get("trigger", ""),
-                                    "solution": data.get("solution", ""),
-                                    "score": score,
-                                }
-                            )
-                    except (json.JSONDecodeError, TypeError, AttributeError):
-                        continue
-
-            # Sort by score and limit
-            patterns.sort(key=lambda x: x.get("score", 0), reverse=True)
-            gotchas.sort(key=lambda x: x.get("score", 0), reverse=True)
+            gotchas = self._gotchas(gotcha_results, min_score)
 
             logger.info(
                 f"Found {len(patterns)} patterns and {len(gotchas)} gotchas for: {query[:50]}..."
@@ -374,3 +385,88 @@ class GraphitiSearch:
                 operation="get_patterns_and_gotchas",
             )
             return [], []
+
+    async def get_subtask_context(
+        self,
+        query: str,
+        num_results: int = 5,
+        num_patterns: int = 3,
+        min_score: float = 0.5,
+        history_limit: int = 3,
+    ) -> dict[str, list[dict]]:
+        """
+        Retrieve context, patterns, gotchas and session history at once.
+
+        The query search and the session history search run concurrently.
+        Relevant context, patterns and gotchas all come from one search of
+        the query, so it is embedded once instead of three times (the
+        separate methods each search a differently prefixed query).
+
+        Args:
+            query: Search query (task description)
+            num_results: Max relevant context items
+            num_patterns: Max patterns and max gotchas
+            min_score: Minimum relevance score for patterns and gotchas
+            history_limit: Max session insights
+
+        Returns:
+            Dict with "context", "patterns", "gotchas" and "session_history"
+        """
+        group_ids = self._context_group_ids(include_project_context=True)
+        query_results, history_results = await asyncio.gather(
+            self._search(
+                query,
+                group_ids,
+                # Patterns and gotchas were searched num_results * 2 each
+                max(min(num_results, MAX_CONTEXT_RESULTS), num_patterns * 4),
+                "context",
+            ),
+            self._search(
+                SESSION_HISTORY_QUERY,
+                [self.group_id],
+                history_limit * 2,  # Get more to filter
+                "session_history",
+            ),
+            return_exceptions=True,
+        )
+
+        context = {"context": [], "patterns": [], "gotchas": [], "session_history": []}
+        if isinstance(query_results, Exception):
+            logger.warning(f"Failed to search context: {query_results}")
+            capture_exception(
+                query_results,
+                query_summary=query[:100] if query else "",
+                group_id=self.group_id,
+                operation="get_subtask_context",
+            )
+        else:
+            context["context"] = self._context_items(query_results[:num_results])
+            # Patterns and gotchas are only learned from this memory's own group
+            own_results = query_results
+            if len(group_ids) > 1:
+                own_results = [
+                    r
+                    for r in query_results
+                    if getattr(r, "group_id", None) == self.group_id
+                ]
+            context["patterns"] = self._patterns(own_results, min_score)[:num_patterns]
+            context["gotchas"] = self._gotchas(own_results, min_score)[:num_patterns]
+
+        if isinstance(history_results, Exception):
+            logger.warning(f"Failed to get session history: {history_results}")
+            capture_exception(
+                history_results,
+                group_id=self.group_id,
+                operation="get_subtask_context",
+            )
+        else:
+            context["session_history"] = self._session_insights(
+                history_results, history_limit, spec_only=True
+            )
+
+        logger.info(
+            f"Found {len(context['context'])} context items, "
+            f"{len(context['patterns'])} patterns and {len(context['gotchas'])} "
+            f"gotchas for: {query[:50]}..."
+        )
+        return context
@@ -0,0 +1,260 @@
+"""
+Search result cache for Graphiti memory.
+
+Repeated searches within a build (the same subtask context, PR review
+memory lookups, ideation graph hints) return cached results instead of
+running another hybrid search (query embedding, BM25 and graph traversal):
+- Results are keyed by (database, group_ids, normalized query, num_results,
+  search type) and shared by every GraphitiMemory in the process
+- Each group has a generation counter, bumped by every write to the graph
+  (add_episode / add_episode_bulk below, which all writers go through);
+  entries recorded under an older generation are dropped on lookup
+- Writes by other processes (agents, the memory query server) are seen
+  through a stamp file per group under the database directory
+  (<db_path>/.search_stamps/), rewritten on every bump and checked before a
+  cached result is served
+- Entries are bounded by count (least recently used dropped first) and age
+- Hit, miss, invalidation and eviction counters are kept for status output
+
+Configure with GRAPHITI_SEARCH_CACHE_TTL (seconds, default 300; 0 disables
+the cache) and GRAPHITI_SEARCH_CACHE_SIZE (entries, default 256).
+"""
+
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_MAX_ENTRIES = 256
+
+# Per-group write stamps shared between processes, relative to db_path
+# (hidden, so database listings skip it)
+STAMP_DIR = ".search_stamps"
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def database_namespace(client) -> tuple[str, str] | None:
+    """
+    Identify the database a GraphitiClient searches.
+
+    Returns None when it cannot be identified, in which case results are
+    not cached.
+    """
+    config = getattr(client, "config", None)
+    db_path = getattr(config, "db_path", None)
+    database = getattr(config, "database", None)
+    if isinstance(db_path, str) and isinstance(database, str):
+        return db_path, database
+    return None
+
+
+def _stamp_path(namespace: tuple[str, str], group_id: str) -> Path | None:
+    """Stamp file of a group, or None if the database directory is missing."""
+    db_path, database = namespace
+    root = Path(db_path).expanduser()
+    if not root.is_dir():
+        return None
+    name = hashlib.sha256(group_id.encode()).hexdigest()[:24]
+    return root / STAMP_DIR / database / name
+
+
+def _read_stamp(namespace: tuple[str, str], group_id: str) -> str:
+    path = _stamp_path(namespace, group_id)
+    if path is None:
+        return ""
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
+def _write_stamp(namespace: tuple[str, str], group_id: str) -> None:
+    path = _stamp_path(namespace, group_id)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(f"{time.time_ns()}:{os.getpid()}", encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not stamp search cache write for {group_id}: {e}")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so trivially different queries match."""
+    return " ".join(query.split()).casefold()
+
+
+@dataclass
+class _CacheEntry:
+    results: list
+    generations: tuple[int, ...]
+    stamps: tuple[str, ...]
+    stored_at: float
+
+
+class SearchResultCache:
+    """LRU/TTL cache of search results with per-group write generations."""
+
+    def __init__(
+        self,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        clock=time.monotonic,
+    ):
+        if ttl_seconds is None:
+            ttl_seconds = _env_number("GRAPHITI_SEARCH_CACHE_TTL", DEFAULT_TTL_SECONDS)
+        if max_entries is None:
+            max_entries = int(
+                _env_number("GRAPHITI_SEARCH_CACHE_SIZE", DEFAULT_MAX_ENTRIES)
+            )
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+        self._generations: dict[tuple, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def key(
+        self,
+        namespace: tuple[str, str],
+        group_ids: list[str],
+        query: str,
+        num_results: int,
+        search_type: str,
+    ) -> tuple:
+        return (
+            namespace,
+            tuple(sorted(group_ids)),
+            normalize_query(query),
+            num_results,
+            search_type,
+        )
+
+    def generations(self, key: tuple) -> tuple[int, ...]:
+        """Current write generations of the groups a key covers."""
+        namespace, group_ids = key[0], key[1]
+        return tuple(self._generations.get((namespace, g), 0) for g in group_ids)
+
+    def stamps(self, key: tuple) -> tuple[str, ...]:
+        """Shared write stamps of the groups a key covers (all processes)."""
+        namespace, group_ids = key[0], key[1]
+        return tuple(_read_stamp(namespace, g) for g in group_ids)
+
+    def get(self, key: tuple) -> list | None:
+        """Cached results for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.generations != self.generations(key) or (
+            entry.stamps != self.stamps(key)
+        ):
+            del self._entries[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        if self._clock() - entry.stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(entry.results)
+
+    def put(
+        self,
+        key: tuple,
+        results: list,
+        generations: tuple[int, ...] | None = None,
+        stamps: tuple[str, ...] | None = None,
+    ) -> None:
+        """
+        Store results for key.
+
+        Args:
+            generations: Generations read before the search started, so a
+                write landing during the search invalidates its results
+            stamps: Shared stamps read before the search started, likewise
+        """
+        if not self.enabled:
+            return
+        self._entries[key] = _CacheEntry(
+            results=list(results),
+            generations=self.generations(key) if generations is None else generations,
+            stamps=self.stamps(key) if stamps is None else stamps,
+            stored_at=self._clock(),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def bump(self, namespace: tuple[str, str] | None, group_id: str) -> None:
+        """
+        Record a write to a group, invalidating searches that cover it here
+        and, through its stamp file, in every other process.
+        """
+        if namespace is None:
+            return
+        generation_key = (namespace, group_id)
+        self._generations[generation_key] = self._generations.get(generation_key, 0) + 1
+        _write_stamp(namespace, group_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+# Shared by every GraphitiSearch/GraphitiQueries in the process
+search_cache = SearchResultCache()
+
+
+async def add_episode(client, **kwargs) -> None:
+    """
+    Add an episode through client.graphiti and invalidate cached searches of
+    its group (even after a failed add, which may have written part of it).
+    """
+    try:
+        await client.graphiti.add_episode(**kwargs)
+    finally:
+        search_cache.bump(database_namespace(client), kwargs.get("group_id") or "")
+
+
+async def add_episode_bulk(client, episodes: list, group_id: str) -> None:
+    """Bulk add episodes to one group, like add_episode."""
+    try:
+        await client.graphiti.add_episode_bulk(episodes, group_id=group_id)
+    finally:
+        search_cache.bump(database_namespace(client), group_id)
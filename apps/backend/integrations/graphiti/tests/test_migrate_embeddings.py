@@ -13,6 +13,7 @@ Tests cover:
 - main() function
 """
 
+import json
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -2372,3 +2373,242 @@ class TestMigrateAllEdgeCases:
         assert stats["total"] == 5
         assert stats["succeeded"] == 3
         assert stats["failed"] == 2
+
+
+# =============================================================================
+# Tests for the paged, checkpointed pipeline
+# =============================================================================
+
+
+def _paged_episodes(count):
+    return [
+        {
+            "uuid": f"ep{i:02d}",
+            "name": f"episode_{i}",
+            "content": f"content{i}",
+            "created_at": f"2024-01-01T00:00:{i:02d}+00:00",
+            "valid_at": f"2024-01-01T00:00:{i:02d}+00:00",
+            "group_id": "test_group",
+            "source": "text",
+            "source_description": f"Test {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def _pipeline_migrator(tmp_path, episodes, **kwargs):
+    from types import SimpleNamespace
+
+    from integrations.graphiti.migrate_embeddings import (
+        EmbeddingMigrator,
+        _cursor_key,
+    )
+
+    migrator = EmbeddingMigrator(
+        source_config=SimpleNamespace(database="source_db"),
+        target_config=SimpleNamespace(db_path=str(tmp_path), database="target_db"),
+        **kwargs,
+    )
+    pages = []
+
+    async def get_source_episodes(after=None, limit=None):
+        remaining = [e for e in episodes if after is None or _cursor_key(e) > after]
+        pages.append(after)
+        return remaining[:limit]
+
+    migrator.get_source_episodes = get_source_episodes
+    migrator.count_source_episodes = AsyncMock(return_value=len(episodes))
+    migrator.pages = pages
+    return migrator
+
+
+class Interrupted(BaseException):
+    """Stands in for the process being stopped mid-migration."""
+
+
+class TestMigrationPipeline:
+    """Tests for paging, batching and checkpoint/resume in migrate_all."""
+
+    @pytest.mark.asyncio
+    async def test_migrate_all_pages_and_batches(self, tmp_path):
+        episodes = _paged_episodes(7)
+        migrator = _pipeline_migrator(
+            tmp_path, episodes, batch_size=2, page_size=3, concurrency=2
+        )
+        batches = []
+
+        async def migrate_batch(batch):
+            batches.append([e["uuid"] for e in batch])
+            return [True] * len(batch)
+
+        migrator.migrate_batch = migrate_batch
+
+        stats = await migrator.migrate_all()
+
+        assert sorted(uuid for batch in batches for uuid in batch) == [
+            e["uuid"] for e in episodes
+        ]
+        assert max(len(batch) for batch in batches) == 2
+        assert len(migrator.pages) == 3
+        assert stats == {
+            "total": 7,
+            "succeeded": 7,
+            "failed": 0,
+            "resumed": 0,
+            "dry_run": False,
+        }
+        # Finished migrations leave no checkpoint behind
+        assert not migrator.checkpoint_path().exists()
+
+    @pytest.mark.asyncio
+    async def test_interrupted_migration_resumes(self, tmp_path):
+        episodes = _paged_episodes(6)
+        migrator = _pipeline_migrator(tmp_path, episodes, batch_size=2, page_size=6)
+        migrated = []
+
+        async def interrupted_batch(batch):
+            if batch[0]["uuid"] == "ep02":
+                raise Interrupted()
+            migrated.extend(e["uuid"] for e in batch)
+            return [True] * len(batch)
+
+        migrator.migrate_batch = interrupted_batch
+        with pytest.raises(Interrupted):
+            await migrator.migrate_all()
+
+        checkpoint = json.loads(migrator.checkpoint_path().read_text(encoding="utf-8"))
+        assert checkpoint["cursor"][1] == "ep01"
+        assert checkpoint["succeeded"] == 4
+
+        resumed = _pipeline_migrator(tmp_path, episodes, batch_size=2, page_size=6)
+
+        async def migrate_batch(batch):
+            migrated.extend(e["uuid"] for e in batch)
+            return [True] * len(batch)
+
+        resumed.migrate_batch = migrate_batch
+        stats = await resumed.migrate_all()
+
+        assert sorted(migrated) == [e["uuid"] for e in episodes]
+        assert stats["succeeded"] == 6
+        assert stats["resumed"] == 4
+
+    @pytest.mark.asyncio
+    async def test_migrate_batch_uses_bulk_add(self, tmp_path):
+        import sys
+        from types import SimpleNamespace
+
+        episodes = _paged_episodes(3)
+        migrator = _pipeline_migrator(tmp_path, episodes)
+        migrator.target_client = MagicMock()
+        migrator.target_client.graphiti.add_episode_bulk = AsyncMock()
+        fake_modules = {
+            "graphiti_core": MagicMock(),
+            "graphiti_core.nodes": SimpleNamespace(
+                EpisodeType=SimpleNamespace(text="text", message="message", json="json")
+            ),
+            "graphiti_core.utils": MagicMock(),
+            "graphiti_core.utils.bulk_utils": SimpleNamespace(
+                RawEpisode=lambda **kwargs: kwargs
+            ),
+        }
+
+        with patch.dict(sys.modules, fake_modules):
+            results = await migrator.migrate_batch(episodes)
+
+        assert results == [True, True, True]
+        call = migrator.target_client.graphiti.add_episode_bulk.call_args
+        assert [e["name"] for e in call.args[0]] == [e["name"] for e in episodes]
+        assert call.kwargs["group_id"] == "test_group"
+        migrator.target_client.graphiti.add_episode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_bulk_group_falls_back_alone(self, tmp_path):
+        import sys
+        from types import SimpleNamespace
+
+        episodes = _paged_episodes(4)
+        episodes[2]["group_id"] = episodes[3]["group_id"] = "other_group"
+        migrator = _pipeline_migrator(tmp_path, episodes)
+        migrator.target_client = MagicMock()
+        graphiti = migrator.target_client.graphiti
+
+        async def add_episode_bulk(raw_episodes, group_id):
+            if group_id == "other_group":
+                raise RuntimeError("bulk add failed")
+
+        graphiti.add_episode_bulk = AsyncMock(side_effect=add_episode_bulk)
+        graphiti.add_episode = AsyncMock()
+        fake_modules = {
+            "graphiti_core": MagicMock(),
+            "graphiti_core.nodes": SimpleNamespace(
+                EpisodeType=SimpleNamespace(text="text", message="message", json="json")
+            ),
+            "graphiti_core.utils": MagicMock(),
+            "graphiti_core.utils.bulk_utils": SimpleNamespace(
+                RawEpisode=lambda **kwargs: kwargs
+            ),
+        }
+
+        with patch.dict(sys.modules, fake_modules):
+            results = await migrator.migrate_batch(episodes)
+
+        assert results == [True, True, True, True]
+        # Only the failed group is migrated again, one episode at a time
+        assert [c.kwargs["name"] for c in graphiti.add_episode.call_args_list] == [
+            "episode_2",
+            "episode_3",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_migrated_groups_invalidate_cached_searches(
+        self, tmp_path, monkeypatch
+    ):
+        import sys
+        from types import SimpleNamespace
+
+        from integrations.graphiti.queries_pkg import (
+            search_cache as search_cache_module,
+        )
+        from integrations.graphiti.queries_pkg.search_cache import SearchResultCache
+
+        cache = SearchResultCache(ttl_seconds=60)
+        monkeypatch.setattr(search_cache_module, "search_cache", cache)
+        episodes = _paged_episodes(3)
+        episodes[2]["group_id"] = "other_group"
+        migrator = _pipeline_migrator(tmp_path, episodes)
+        migrator.target_client = MagicMock()
+        migrator.target_client.config = SimpleNamespace(
+            db_path=str(tmp_path), database="target_db"
+        )
+        migrator.target_client.graphiti.add_episode_bulk = AsyncMock()
+        fake_modules = {
+            "graphiti_core": MagicMock(),
+            "graphiti_core.nodes": SimpleNamespace(
+                EpisodeType=SimpleNamespace(text="text", message="message", json="json")
+            ),
+            "graphiti_core.utils": MagicMock(),
+            "graphiti_core.utils.bulk_utils": SimpleNamespace(
+                RawEpisode=lambda **kwargs: kwargs
+            ),
+        }
+
+        with patch.dict(sys.modules, fake_modules):
+            await migrator.migrate_batch(episodes)
+
+        key = cache.key(
+            (str(tmp_path), "target_db"), ["test_group", "other_group"], "q", 5, "x"
+        )
+        assert cache.generations(key) == (1, 1)
+
+    def test_progress_reports_throughput_and_eta(self):
+        from integrations.graphiti.migrate_embeddings import MigrationProgress
+
+        now = [0.0]
+        progress = MigrationProgress(total=1000, already_done=100, clock=lambda: now[0])
+        now[0] = 10.0
+        progress.record(50)
+
+        assert progress.rate() == 5.0
+        assert progress.eta_seconds() == 170.0
+        assert progress.describe() == "Migrated 150/1000 episodes (5.0/s, ETA 2m50s)"
@@ -55,6 +55,8 @@ async def get_graphiti_memory(
     Note:
         This function is async and calls initialize() on the memory instance
         before returning, following the GitHub pattern for proper initialization.
+        The instance is leased from the process-wide pool (see graphiti_pool);
+        close() returns it to the pool, so callers still close it when done.
     """
     if not is_graphiti_memory_enabled():
         return None
@@ -62,17 +64,14 @@ async def get_graphiti_memory(
     try:
         from integrations.graphiti.memory import GraphitiMemory, GroupIdMode
 
+        from .graphiti_pool import get_memory_pool
+
         if project_dir is None:
             project_dir = spec_dir.parent.parent
         # Use project-wide shared memory for cross-spec learning
-        memory = GraphitiMemory(
-            spec_dir, project_dir, group_id_mode=GroupIdMode.PROJECT
+        return await get_memory_pool().acquire(
+            spec_dir, project_dir, GroupIdMode.PROJECT, factory=GraphitiMemory
         )
-
-        # Initialize the memory instance (following GitHub pattern)
-        await memory.initialize()
-
-        return memory
     except ImportError:
         return None
     except Exception as e:
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Graphiti Memory Pool
+====================
+
+Process-wide pool of initialized GraphitiMemory instances, so subtasks and
+sessions that run one after another (and the memory tools used during a
+session) reuse one database connection and one set of provider clients
+instead of opening them again for every retrieval and save:
+- Instances are keyed by (project dir, spec dir, group id mode, provider
+  configuration); changing the provider configuration opens a new instance
+- Leases are reference counted, so concurrent callers share an instance;
+  closing a lease returns it to the pool
+- An instance nobody holds is closed after GRAPHITI_MEMORY_POOL_IDLE_SECONDS
+  (default 60) so other processes can take the database lock; 0 closes it
+  on release, as before pooling
+- An instance nobody holds is closed right away when another process is
+  waiting for its database (see kuzu_connections.DatabaseLease)
+- Instances that failed to initialize are never pooled
+- Instances belong to the event loop that opened them; callers on another
+  loop (each asyncio.run() starts a new one) get their own, and idle
+  instances from a loop that has ended are abandoned, never awaited
+"""
+
+import asyncio
+import atexit
+import dataclasses
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds an unused instance stays open
+DEFAULT_IDLE_SECONDS = 60.0
+
+# How often idle instances check for other processes waiting on the database
+CONTENTION_CHECK_SECONDS = 1.0
+
+
+def _idle_seconds_from_env() -> float:
+    value = os.environ.get("GRAPHITI_MEMORY_POOL_IDLE_SECONDS", "")
+    try:
+        return max(0.0, float(value)) if value else DEFAULT_IDLE_SECONDS
+    except ValueError:
+        return DEFAULT_IDLE_SECONDS
+
+
+def _config_key() -> tuple:
+    """Current provider configuration, as a hashable tuple."""
+    from graphiti_config import GraphitiConfig
+
+    return dataclasses.astuple(GraphitiConfig.from_env())
+
+
+def _database_contended(memory: Any) -> bool:
+    check = getattr(memory, "database_contended", None)
+    try:
+        return callable(check) and check() is True
+    except Exception:
+        return False
+
+
+async def _close_quietly(memory: Any) -> None:
+    try:
+        await memory.close()
+    except Exception:
+        logger.debug("Failed to close Graphiti memory connection", exc_info=True)
+
+
+@dataclass
+class _PoolEntry:
+    memory: Any
+    loop: asyncio.AbstractEventLoop | None = None
+    refs: int = 0
+    idle_since: float = 0.0
+    timer: asyncio.TimerHandle | None = None
+
+
+class PooledGraphitiMemory:
+    """
+    A lease on a GraphitiMemory instance.
+
+    Behaves like the memory it wraps; close() hands it back to the pool
+    instead of closing the connection.
+    """
+
+    def __init__(self, pool: "GraphitiMemoryPool | None", key: tuple, memory: Any):
+        self._pool = pool
+        self._key = key
+        self._memory = memory
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._memory, name)
+
+    async def close(self) -> None:
+        """Release the lease (idempotent)."""
+        if self._released:
+            return
+        self._released = True
+        if self._pool is None:
+            await _close_quietly(self._memory)
+        else:
+            await self._pool.release(self._key, self._memory)
+
+
+class GraphitiMemoryPool:
+    """Reference-counted GraphitiMemory instances shared across a process."""
+
+    def __init__(
+        self,
+        idle_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._idle_seconds = idle_seconds
+        self._clock = clock
+        self._entries: dict[tuple, _PoolEntry] = {}
+        self._opening: dict[tuple, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def idle_seconds(self) -> float:
+        if self._idle_seconds is None:
+            return _idle_seconds_from_env()
+        return self._idle_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(spec_dir: Path, project_dir: Path, group_id_mode: str) -> tuple:
+        return (
+            str(Path(project_dir).resolve()),
+            str(Path(spec_dir).resolve()),
+            str(group_id_mode),
+            _config_key(),
+        )
+
+    async def acquire(
+        self,
+        spec_dir: Path,
+        project_dir: Path,
+        group_id_mode: str,
+        factory: Callable[..., Any],
+    ) -> PooledGraphitiMemory:
+        """
+        Lease an initialized memory, opening one if none is pooled.
+
+        Args:
+            factory: Called as factory(spec_dir, project_dir, group_id_mode=...)
+                to create a GraphitiMemory when the pool has none
+
+        Returns:
+            A lease; close() it when done. If initialization failed, the
+            lease holds an unpooled memory (check is_enabled as before)
+        """
+        key = self.key_for(spec_dir, project_dir, group_id_mode)
+        loop = asyncio.get_running_loop()
+        self._drop_foreign_entries(loop)
+        await self._close_expired()
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None and entry.loop is not loop:
+                # Leased on another (still running) event loop
+                return await self._open_unpooled(
+                    spec_dir, project_dir, group_id_mode, factory
+                )
+            if entry is not None:
+                entry.refs += 1
+                if entry.timer is not None:
+                    entry.timer.cancel()
+                    entry.timer = None
+                return PooledGraphitiMemory(self, key, entry.memory)
+
+            opening = self._opening.get(key)
+            if opening is None:
+                break
+            if opening.get_loop() is not loop:
+                # Opened from another event loop; don't share across loops
+                return await self._open_unpooled(
+                    spec_dir, project_dir, group_id_mode, factory
+                )
+            # Another caller is opening this memory; use theirs
+            await asyncio.shield(opening)
+
+        self._opening[key] = loop.create_future()
+        try:
+            memory = factory(spec_dir, project_dir, group_id_mode=group_id_mode)
+            await memory.initialize()
+        finally:
+            self._opening.pop(key).set_result(None)
+
+        if not memory.is_initialized:
+            return PooledGraphitiMemory(None, key, memory)
+        self._entries[key] = _PoolEntry(memory=memory, loop=loop, refs=1)
+        return PooledGraphitiMemory(self, key, memory)
+
+    async def _open_unpooled(self, spec_dir, project_dir, group_id_mode, factory):
+        memory = factory(spec_dir, project_dir, group_id_mode=group_id_mode)
+        await memory.initialize()
+        return PooledGraphitiMemory(None, (), memory)
+
+    async def release(self, key: tuple, memory: Any) -> None:
+        """Return a leased memory; closes it once idle for idle_seconds."""
+        entry = self._entries.get(key)
+        if entry is None or entry.memory is not memory:
+            # Evicted (pool closed) while leased
+            await _close_quietly(memory)
+            return
+
+        entry.refs -= 1
+        if entry.refs > 0:
+            return
+
+        idle_seconds = self.idle_seconds
+        if (
+            idle_seconds <= 0
+            or not memory.is_initialized
+            or _database_contended(memory)
+        ):
+            del self._entries[key]
+            await _close_quietly(memory)
+            return
+
+        entry.idle_since = self._clock()
+        self._schedule_expiry(key, entry, idle_seconds)
+
+    def _schedule_expiry(self, key: tuple, entry: _PoolEntry, delay: float) -> None:
+        entry.timer = asyncio.get_running_loop().call_later(
+            min(delay, CONTENTION_CHECK_SECONDS), self._expire, key, entry
+        )
+
+    def _expire(self, key: tuple, entry: _PoolEntry) -> None:
+        if self._entries.get(key) is not entry or entry.refs:
+            return
+        remaining = self.idle_seconds - (self._clock() - entry.idle_since)
+        if remaining > 0 and not _database_contended(entry.memory):
+            self._schedule_expiry(key, entry, remaining)
+            return
+        del self._entries[key]
+        self._close_in_background(entry.memory)
+
+    def _close_in_background(self, memory: Any) -> None:
+        """Close memory on the running loop without waiting for it."""
+        task = asyncio.ensure_future(_close_quietly(memory))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _drop_foreign_entries(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Evict instances opened on another event loop.
+
+        Their connections are bound to that loop and can't be awaited from
+        this one. Idle instances are closed on their own loop if it is still
+        running, and abandoned if it has ended (their timers went with it).
+        Leased instances stay until released, unless their loop has ended.
+        """
+        for key, entry in list(self._entries.items()):
+            if entry.loop is loop:
+                continue
+            closed = entry.loop is None or entry.loop.is_closed()
+            if entry.refs and not closed:
+                continue
+            del self._entries[key]
+            if not closed and entry.loop.is_running():
+                entry.loop.call_soon_threadsafe(self._close_in_background, entry.memory)
+            else:
+                logger.debug(
+                    "Abandoning Graphiti memory connection from an ended event loop"
+                )
+
+    async def _close_expired(self) -> None:
+        """Close idle instances on the running loop that are past their time."""
+        loop = asyncio.get_running_loop()
+        now = self._clock()
+        idle_seconds = self.idle_seconds
+        for key, entry in list(self._entries.items()):
+            if entry.loop is not loop:
+                continue
+            if entry.refs == 0 and now - entry.idle_since >= idle_seconds:
+                del self._entries[key]
+                if entry.timer is not None:
+                    entry.timer.cancel()
+                await _close_quietly(entry.memory)
+
+    async def close_all(self) -> None:
+        """
+        Close every pooled instance; leases still out close on release.
+
+        Instances from other event loops are handled as in
+        _drop_foreign_entries() rather than awaited here.
+        """
+        loop = asyncio.get_running_loop()
+        self._drop_foreign_entries(loop)
+        entries, self._entries = self._entries, {}
+        for entry in entries.values():
+            if entry.loop is not loop:
+                # Leased on another running loop; closes there on release
+                continue
+            if entry.timer is not None:
+                entry.timer.cancel()
+            if entry.refs == 0:
+                await _close_quietly(entry.memory)
+
+
+_pool = GraphitiMemoryPool()
+
+
+def get_memory_pool() -> GraphitiMemoryPool:
+    """The process-wide GraphitiMemory pool."""
+    return _pool
+
+
+async def close_graphiti_memory_pool() -> None:
+    """Close all pooled GraphitiMemory instances."""
+    await _pool.close_all()
+
+
+@atexit.register
+def _close_pool_at_exit() -> None:
+    if not len(_pool):
+        return
+    try:
+        asyncio.run(close_graphiti_memory_pool())
+    except Exception:
+        logger.debug("Failed to close Graphiti memory pool at exit", exc_info=True)
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Memory Query Server for auto-claude-ui.
+
+Long-lived counterpart to query_memory.py. The Electron main process starts
+it once (``python query_memory.py serve``) and sends one JSON request per
+line on stdin instead of spawning a subprocess per query, so repeated
+queries skip interpreter start-up, the kuzu/LadybugDB import and opening
+the database.
+
+- Database connections (with the FTS extension loaded) and the Graphiti
+  client used for semantic search stay open between requests
+- Keyword search goes through Graphiti's Episodic full-text index
+- Listings and searches are paged with opaque cursors; listings use keyset
+  pagination on (created_at, uuid), so later pages cost the same as the first
+- Open databases are held under their DatabaseLease and closed as soon as
+  another process (e.g. an agent) waits for one, or after idle_timeout
+  seconds without requests; the next request reopens them
+
+Protocol (one JSON object per line):
+    request:  {"id": 1, "command": "get-memories", "db_path": "...",
+               "database": "...", "limit": 20, "cursor": null}
+    response: {"id": 1, "success": true, "data": {..., "next_cursor": "..."}}
+
+Commands: ping, get-status, get-memories, search, semantic-search,
+get-entities, add-episode, shutdown. Command arguments use the same names as
+the query_memory.py CLI options; semantic-search also accepts
+"embedder_env", environment variables configuring the embedder (applied to
+that search's client only, not to the server's environment).
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from query_memory import (
+    MemoryQueryError,
+    add_episode,
+    apply_monkeypatch,
+    create_semantic_client,
+    fetch_entities,
+    fetch_memories,
+    get_status,
+    load_fts_extension,
+    open_database,
+    search_memories,
+    semantic_search,
+)
+
+# Seconds without requests before database locks are released. Agents don't
+# wait this out: databases are held under their DatabaseLease and handed over
+# as soon as another process waits for the lease
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+# Seconds between checks for idleness and for processes waiting on a database
+RELEASE_CHECK_INTERVAL = 1.0
+
+# Seconds to wait for another process to hand over a database before opening
+# it anyway (kept below the UI's 10s request timeout)
+LEASE_TIMEOUT = 5.0
+
+# Open cursors kept per server (least recently used are dropped)
+MAX_CURSORS = 256
+
+
+@dataclass
+class _DatabaseHandle:
+    """An open database, and the Graphiti client owning it if any."""
+
+    db: Any
+    conn: Any
+    fts: bool
+    client: Any = None
+    config: Any = None
+    embedder_key: tuple = ()
+    lease: Any = None
+
+    def contended(self) -> bool:
+        """Whether another process is waiting to open this database."""
+        if self.client is not None:
+            return self.client.database_contended()
+        return self.lease is not None and self.lease.has_waiters()
+
+
+class MemoryQueryServer:
+    """Answers memory queries over warm database connections."""
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_cursors: int = MAX_CURSORS,
+        clock=time.monotonic,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_cursors = max_cursors
+        self._clock = clock
+        self._handles: dict[tuple[str, str], _DatabaseHandle] = {}
+        self._cursors: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.RLock()
+        self._loop = asyncio.new_event_loop()
+        self._last_request = clock()
+        self._timer: threading.Timer | None = None
+        self._stopped = False
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def handle(self, request: dict) -> dict:
+        """Answer one request; never raises."""
+        response: dict[str, Any] = {"id": request.get("id")}
+        command = request.get("command")
+        handler = {
+            "ping": self._ping,
+            "get-status": self._get_status,
+            "get-memories": self._get_memories,
+            "search": self._search,
+            "semantic-search": self._semantic_search,
+            "get-entities": self._get_entities,
+            "add-episode": self._add_episode,
+        }.get(command)
+
+        with self._lock:
+            self._last_request = self._clock()
+            try:
+                if handler is None:
+                    raise MemoryQueryError(f"Unknown command: {command}")
+                if command != "ping" and not (
+                    request.get("db_path") and request.get("database")
+                ):
+                    raise MemoryQueryError("db_path and database are required")
+                response.update(success=True, data=handler(request))
+            except MemoryQueryError as e:
+                response.update(success=False, error=str(e))
+            except Exception as e:
+                response.update(success=False, error=f"{command} failed: {e}")
+        return response
+
+    def _ping(self, request: dict) -> dict:
+        return {"open_databases": len(self._handles), "cursors": len(self._cursors)}
+
+    def _get_status(self, request: dict) -> dict:
+        def connect(db_path: str, database: str):
+            try:
+                return self._handle(db_path, database).conn, None
+            except Exception as e:
+                return None, str(e)
+
+        return get_status(request["db_path"], request["database"], connect=connect)
+
+    def _get_memories(self, request: dict) -> dict:
+        handle, limit, state = self._page_request(request)
+        memories, last_key = fetch_memories(handle.conn, limit, state.get("after"))
+        return {
+            "memories": memories,
+            "count": len(memories),
+            "next_cursor": self._next_cursor(request, last_key and {"after": last_key}),
+        }
+
+    def _get_entities(self, request: dict) -> dict:
+        handle, limit, state = self._page_request(request)
+        entities, last_key = fetch_entities(handle.conn, limit, state.get("after"))
+        return {
+            "entities": entities,
+            "count": len(entities),
+            "next_cursor": self._next_cursor(request, last_key and {"after": last_key}),
+        }
+
+    def _search(self, request: dict) -> dict:
+        handle, limit, state = self._page_request(request)
+        query = state.get("query", request.get("query") or "")
+        offset = state.get("offset", 0)
+
+        memories, used_fts = search_memories(
+            handle.conn, query, limit, offset, use_fts=handle.fts
+        )
+        more = len(memories) == limit
+        return {
+            "memories": memories,
+            "count": len(memories),
+            "query": query,
+            "search_type": "keyword",
+            "fulltext": used_fts,
+            "next_cursor": self._next_cursor(
+                request, more and {"query": query, "offset": offset + limit}
+            ),
+        }
+
+    def _semantic_search(self, request: dict) -> dict:
+        embedder_env = {
+            k: str(v) for k, v in (request.get("embedder_env") or {}).items()
+        }
+
+        # No embedder configured, fall back to keyword search
+        provider = embedder_env.get(
+            "GRAPHITI_EMBEDDER_PROVIDER", os.environ.get("GRAPHITI_EMBEDDER_PROVIDER")
+        )
+        if not (provider or "").lower():
+            return self._search(request)
+
+        try:
+            handle = self._semantic_handle(
+                request["db_path"], request["database"], embedder_env
+            )
+            return self._loop.run_until_complete(
+                semantic_search(
+                    handle.client,
+                    handle.config,
+                    request.get("query") or "",
+                    int(request.get("limit") or 20),
+                )
+            )
+        except Exception as e:
+            # Any error, fall back to keyword search
+            sys.stderr.write(f"Semantic search failed, falling back to keyword: {e}\n")
+            return self._search(request)
+
+    def _add_episode(self, request: dict) -> dict:
+        handle = self._handle(request["db_path"], request["database"], create=True)
+        data = add_episode(
+            handle.conn,
+            request["name"],
+            request.get("content") or "",
+            request.get("episode_type") or "session_insight",
+            request.get("group_id"),
+        )
+        # Listing cursors would skip the new episode, and cached searches of
+        # its group are out of date
+        self._cursors.clear()
+        _invalidate_searches(
+            request["db_path"], request["database"], request.get("group_id")
+        )
+        return data
+
+    # ------------------------------------------------------------------
+    # Cursors
+    # ------------------------------------------------------------------
+
+    def _page_request(self, request: dict) -> tuple[_DatabaseHandle, int, dict]:
+        """Resolve the database, page size and cursor state of a request."""
+        limit = int(request.get("limit") or 20)
+        state: dict = {}
+        token = request.get("cursor")
+        if token:
+            state = self._cursors.get(token)
+            if state is None or state["key"] != self._cursor_key(request):
+                raise MemoryQueryError("Unknown or expired cursor")
+            self._cursors.move_to_end(token)
+            limit = state["limit"]
+        return self._handle(request["db_path"], request["database"]), limit, state
+
+    @staticmethod
+    def _cursor_key(request: dict) -> tuple:
+        return (request.get("command"), request["db_path"], request["database"])
+
+    def _next_cursor(self, request: dict, state: dict | None) -> str | None:
+        """Store the state for the next page; None when this was the last."""
+        if not state:
+            return None
+        token = secrets.token_urlsafe(12)
+        self._cursors[token] = {
+            **state,
+            "key": self._cursor_key(request),
+            "limit": int(request.get("limit") or 20),
+        }
+        while len(self._cursors) > self.max_cursors:
+            self._cursors.popitem(last=False)
+        return token
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _handle(
+        self, db_path: str, database: str, create: bool = False
+    ) -> _DatabaseHandle:
+        """Get the open handle for a database, opening it if needed."""
+        key = (db_path, database)
+        handle = self._handles.get(key)
+        if handle is None:
+            if not apply_monkeypatch():
+                raise MemoryQueryError("Neither kuzu nor LadybugDB is installed")
+            lease = _database_lease(db_path, database)
+            if lease is not None:
+                self._loop.run_until_complete(lease.acquire(LEASE_TIMEOUT))
+            try:
+                db, conn = open_database(db_path, database, create=create)
+            except BaseException:
+                if lease is not None:
+                    lease.release()
+                raise
+            handle = _DatabaseHandle(
+                db=db, conn=conn, fts=load_fts_extension(conn), lease=lease
+            )
+            self._handles[key] = handle
+        return handle
+
+    def _semantic_handle(
+        self, db_path: str, database: str, embedder_env: dict
+    ) -> _DatabaseHandle:
+        """
+        Get a handle whose database is owned by an initialized Graphiti client.
+
+        The database is opened once per process: a plain handle is closed
+        before the client opens it, and keyword queries then share the
+        client's database.
+        """
+        key = (db_path, database)
+        embedder_key = tuple(sorted(embedder_env.items()))
+        handle = self._handles.get(key)
+        if handle is not None and handle.client is not None:
+            if handle.embedder_key == embedder_key:
+                return handle
+        if handle is not None:
+            self._close(key)
+
+        client, config = self._loop.run_until_complete(
+            create_semantic_client(db_path, database, env=embedder_env)
+        )
+        db = client.graphiti.driver.db
+        conn = _connection_for(db)
+        self._handles[key] = _DatabaseHandle(
+            db=db,
+            conn=conn,
+            fts=load_fts_extension(conn),
+            client=client,
+            config=config,
+            embedder_key=embedder_key,
+        )
+        return self._handles[key]
+
+    def _close(self, key: tuple[str, str]) -> None:
+        handle = self._handles.pop(key, None)
+        if handle is None:
+            return
+        for resource in (handle.conn, None if handle.client else handle.db):
+            try:
+                if resource is not None:
+                    resource.close()
+            except Exception:
+                pass
+        if handle.client is not None:
+            try:
+                self._loop.run_until_complete(handle.client.close())
+            except Exception as e:
+                sys.stderr.write(f"Error closing Graphiti client: {e}\n")
+        if handle.lease is not None:
+            handle.lease.release()
+
+    def release(self) -> None:
+        """Close every open database so other processes can lock it."""
+        with self._lock:
+            for key in list(self._handles):
+                self._close(key)
+
+    def _release_if_idle(self) -> None:
+        """Close all databases when idle, and any another process waits for."""
+        with self._lock:
+            if self._clock() - self._last_request >= self.idle_timeout:
+                self.release()
+                return
+            for key, handle in list(self._handles.items()):
+                if handle.contended():
+                    self._close(key)
+
+    def _schedule_release(self) -> None:
+        """Check for idleness (and waiting processes) while databases are open."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._stopped or not self._handles:
+                return
+            self._timer = threading.Timer(
+                min(self.idle_timeout, RELEASE_CHECK_INTERVAL), self._check_release
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _check_release(self) -> None:
+        self._release_if_idle()
+        self._schedule_release()
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def serve(self, stdin=None, stdout=None) -> None:
+        """Answer requests from stdin until it closes or "shutdown" arrives."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        try:
+            for line in stdin:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    response = {"id": None, "success": False, "error": str(e)}
+                else:
+                    if request.get("command") == "shutdown":
+                        stdout.write(
+                            json.dumps({"id": request.get("id"), "success": True})
+                            + "\n"
+                        )
+                        stdout.flush()
+                        break
+                    response = self.handle(request)
+                stdout.write(json.dumps(response, default=str) + "\n")
+                stdout.flush()
+                self._schedule_release()
+        finally:
+            with self._lock:
+                self._stopped = True
+                if self._timer is not None:
+                    self._timer.cancel()
+            self.release()
+            self._loop.close()
+
+
+def _invalidate_searches(db_path: str, database: str, group_id: str | None) -> None:
+    """
+    Invalidate cached searches of the group in every process: bumping it
+    rewrites the group's shared stamp file, which the agents' search caches
+    check before serving a result.
+    """
+    try:
+        from integrations.graphiti.queries_pkg.search_cache import search_cache
+    except ImportError:
+        return
+    search_cache.bump((db_path, database), group_id or "")
+
+
+def _database_lease(db_path: str, database: str):
+    """The DatabaseLease agents take before opening a database, if available."""
+    try:
+        from integrations.graphiti.queries_pkg.kuzu_connections import (
+            DatabaseLease,
+        )
+    except ImportError:
+        return None
+    return DatabaseLease(Path(db_path).expanduser() / database)
+
+
+def _connection_for(db):
+    """Open a connection on an existing database."""
+    try:
+        import kuzu
+    except ImportError:
+        import real_ladybug as kuzu
+    return kuzu.Connection(db)
+
+
+if __name__ == "__main__":
+    MemoryQueryServer().serve()
@@ -13,6 +13,7 @@ from core.progress import (
     get_next_subtask,
     get_plan_summary,
     get_progress_percentage,
+    get_ready_subtasks,
     is_build_complete,
     print_build_complete_banner,
     print_paused_banner,
@@ -28,6 +29,7 @@ __all__ = [
     "get_next_subtask",
     "get_plan_summary",
     "get_progress_percentage",
+    "get_ready_subtasks",
     "is_build_complete",
     "print_build_complete_banner",
     "print_paused_banner",
@@ -13,6 +13,9 @@ from .project_context import (
     load_project_index,
     should_refresh_project_index,
 )
+
+# Import prompt cache utilities
+from .prompt_cache import get_prompt_timings, reset_prompt_cache
 from .prompt_generator import (
     format_context_for_prompt,
     generate_environment_context,
@@ -52,4 +55,7 @@ __all__ = [
     "detect_project_capabilities",
     "get_mcp_tools_for_project",
     "should_refresh_project_index",
+    # prompt_cache functions
+    "get_prompt_timings",
+    "reset_prompt_cache",
 ]
@@ -0,0 +1,254 @@
+"""
+Prompt Assembly Cache
+=====================
+
+Caches the expensive parts of prompt assembly between agent sessions.
+
+The coder loop, the parallel scheduler and QA rebuild their prompts before
+every session, although most of the inputs rarely change in between. This
+module:
+- Loads the markdown templates once per process
+- Memoizes prompt fragments, keyed by the mtimes of the files they are built
+  from and by the repository's git HEAD (see file_state and git_head_state)
+- Records how long each prompt part took to build and how large it is (see
+  get_prompt_timings)
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Memoized fragments kept per process (least recently used are dropped)
+MAX_CACHED_FRAGMENTS = 256
+
+_LOCK = threading.Lock()
+_TEMPLATES: dict[str, str] = {}
+_PRELOADED_DIRS: set[str] = set()
+_FRAGMENTS: OrderedDict[tuple, Any] = OrderedDict()
+
+
+@dataclass
+class PromptPartTiming:
+    """Build statistics for one prompt part."""
+
+    name: str
+    builds: int = 0
+    cache_hits: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+    last_size: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+_TIMINGS: dict[str, PromptPartTiming] = {}
+
+
+# =============================================================================
+# Templates
+# =============================================================================
+
+
+def preload_templates(directory: Path) -> None:
+    """Read every markdown template under directory (once per process)."""
+    key = str(directory)
+    with _LOCK:
+        if key in _PRELOADED_DIRS:
+            return
+        _PRELOADED_DIRS.add(key)
+    for path in sorted(directory.rglob("*.md")):
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Could not preload prompt template {path}: {e}")
+            continue
+        with _LOCK:
+            _TEMPLATES.setdefault(str(path), text)
+
+
+def load_template(path: Path) -> str:
+    """
+    Load a prompt template, reading it from disk only the first time.
+
+    Raises:
+        FileNotFoundError: If the template doesn't exist
+    """
+    key = str(path)
+    text = _TEMPLATES.get(key)
+    if text is not None:
+        return text
+    if not path.exists():
+        raise FileNotFoundError(f"Prompt file not found: {path}")
+    text = path.read_text(encoding="utf-8")
+    with _LOCK:
+        return _TEMPLATES.setdefault(key, text)
+
+
+# =============================================================================
+# Fragment keys
+# =============================================================================
+
+
+def file_state(*paths: Path) -> tuple:
+    """(path, mtime, size) of each file; mtime and size are None if missing."""
+    state = []
+    for path in paths:
+        try:
+            st = path.stat()
+            state.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            state.append((str(path), None, None))
+    return tuple(state)
+
+
+def _find_git_dir(start: Path) -> Path | None:
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            # Worktrees and submodules: ".git" is a file pointing at the git dir
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if not content.startswith("gitdir:"):
+                return None
+            return directory / content[len("gitdir:") :].strip()
+    return None
+
+
+def git_head_state(project_dir: Path) -> tuple | None:
+    """
+    What HEAD and the local branches point at, read without running git.
+
+    Changes whenever a commit is made, HEAD moves to another branch, or a
+    branch is created or deleted.
+
+    Returns:
+        A hashable state, or None if project_dir isn't in a git repository
+    """
+    try:
+        git_dir = _find_git_dir(project_dir.resolve())
+        if git_dir is None:
+            return None
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.exists():
+            common_dir = git_dir / commondir_file.read_text(encoding="utf-8").strip()
+
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        commit = None
+        if head.startswith("ref: "):
+            ref_file = common_dir / head[len("ref: ") :]
+            if ref_file.exists():
+                commit = ref_file.read_text(encoding="utf-8").strip()
+        return (
+            head,
+            commit,
+            file_state(common_dir / "packed-refs", common_dir / "refs" / "heads"),
+        )
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+# =============================================================================
+# Memoized fragments and timings
+# =============================================================================
+
+
+def _record(name: str, seconds: float | None, size: int) -> None:
+    with _LOCK:
+        timing = _TIMINGS.get(name)
+        if timing is None:
+            timing = _TIMINGS[name] = PromptPartTiming(name)
+        if seconds is None:
+            timing.cache_hits += 1
+            return
+        timing.builds += 1
+        timing.total_seconds += seconds
+        timing.last_seconds = seconds
+        timing.last_size = size
+    logger.debug(f"Built prompt part {name} in {seconds * 1000:.1f}ms ({size} chars)")
+
+
+def _size(value: Any) -> int:
+    return len(value) if isinstance(value, str) else 0
+
+
+def timed_build(name: str, build: Callable[[], Any]) -> Any:
+    """Run build() and record how long it took under name."""
+    start = time.perf_counter()
+    result = build()
+    _record(name, time.perf_counter() - start, _size(result))
+    return result
+
+
+def timed_prompt_part(name: str) -> Callable:
+    """Decorator recording build timings for a function returning prompt text."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return timed_build(name, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def cached_fragment(name: str, key: Hashable, build: Callable[[], Any]) -> Any:
+    """
+    Memoize a prompt fragment.
+
+    Args:
+        name: Name of the prompt part (also used for its timings)
+        key: Everything the fragment depends on, e.g. paths, file_state()
+            of its input files and git_head_state()
+        build: Builds the fragment on a cache miss; exceptions propagate and
+            nothing is cached
+
+    Returns:
+        The cached or freshly built fragment
+    """
+    cache_key = (name, key)
+    with _LOCK:
+        if cache_key in _FRAGMENTS:
+            _FRAGMENTS.move_to_end(cache_key)
+            value = _FRAGMENTS[cache_key]
+            hit = True
+        else:
+            hit = False
+    if hit:
+        _record(name, None, 0)
+        return value
+
+    value = timed_build(name, build)
+    with _LOCK:
+        _FRAGMENTS[cache_key] = value
+        _FRAGMENTS.move_to_end(cache_key)
+        while len(_FRAGMENTS) > MAX_CACHED_FRAGMENTS:
+            _FRAGMENTS.popitem(last=False)
+    return value
+
+
+def get_prompt_timings() -> dict[str, dict]:
+    """Build statistics by prompt part, slowest (in total) first."""
+    with _LOCK:
+        timings = sorted(_TIMINGS.values(), key=lambda t: t.total_seconds, reverse=True)
+        return {t.name: t.to_dict() for t in timings}
+
+
+def reset_prompt_cache() -> None:
+    """Forget cached templates, fragments and timings."""
+    with _LOCK:
+        _TEMPLATES.clear()
+        _PRELOADED_DIRS.clear()
+        _FRAGMENTS.clear()
+        _TIMINGS.clear()
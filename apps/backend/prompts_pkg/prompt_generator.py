@@ -16,6 +16,8 @@ import json
 import re
 from pathlib import Path
 
+from .prompt_cache import cached_fragment, file_state, timed_prompt_part
+
 # Worktree path patterns for detection
 # Matches paths like: .auto-claude/worktrees/tasks/{spec-name}/
 WORKTREE_PATH_PATTERNS = [
@@ -147,6 +149,15 @@ def generate_environment_context(project_dir: Path, spec_dir: Path) -> str:
     Returns:
         Markdown string with environment context
     """
+    # Depends only on the two paths (resolving them touches the filesystem)
+    return cached_fragment(
+        "environment_context",
+        (str(project_dir), str(spec_dir)),
+        lambda: _build_environment_context(project_dir, spec_dir),
+    )
+
+
+def _build_environment_context(project_dir: Path, spec_dir: Path) -> str:
     relative_spec = get_relative_spec_path(spec_dir, project_dir)
 
     # Check if we're in an isolated worktree
@@ -186,6 +197,7 @@ coder prompt for detailed examples.
     return "".join(sections)
 
 
+@timed_prompt_part("subtask_prompt")
 def generate_subtask_prompt(
     spec_dir: Path,
     project_dir: Path,
@@ -444,14 +456,7 @@ def load_subtask_context(
         full_path = project_dir / pattern_path
         if full_path.exists():
             try:
-                lines = full_path.read_text(encoding="utf-8").split("\n")
-                if len(lines) > max_file_lines:
-                    content = "\n".join(lines[:max_file_lines])
-                    content += (
-                        f"\n\n... (truncated, {len(lines) - max_file_lines} more lines)"
-                    )
-                else:
-                    content = "\n".join(lines)
+                content = _load_file_excerpt(full_path, max_file_lines)
                 context["patterns"][pattern_path] = content
             except Exception:
                 context["patterns"][pattern_path] = "(Could not read file)"
@@ -461,14 +466,7 @@ def load_subtask_context(
         full_path = project_dir / file_path
         if full_path.exists():
             try:
-                lines = full_path.read_text(encoding="utf-8").split("\n")
-                if len(lines) > max_file_lines:
-                    content = "\n".join(lines[:max_file_lines])
-                    content += (
-                        f"\n\n... (truncated, {len(lines) - max_file_lines} more lines)"
-                    )
-                else:
-                    content = "\n".join(lines)
+                content = _load_file_excerpt(full_path, max_file_lines)
                 context["files_to_modify"][file_path] = content
             except Exception:
                 context["files_to_modify"][file_path] = "(Could not read file)"
@@ -476,6 +474,23 @@ def load_subtask_context(
     return context
 
 
+def _load_file_excerpt(full_path: Path, max_file_lines: int) -> str:
+    """The first max_file_lines lines of a file, reread only when it changes."""
+
+    def build() -> str:
+        lines = full_path.read_text(encoding="utf-8").split("\n")
+        if len(lines) > max_file_lines:
+            content = "\n".join(lines[:max_file_lines])
+            content += f"\n\n... (truncated, {len(lines) - max_file_lines} more lines)"
+        else:
+            content = "\n".join(lines)
+        return content
+
+    return cached_fragment(
+        "file_excerpt", (file_state(full_path), max_file_lines), build
+    )
+
+
 def format_context_for_prompt(context: dict) -> str:
     """
     Format loaded context into a prompt section.
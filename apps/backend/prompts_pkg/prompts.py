@@ -17,6 +17,14 @@ from .project_context import (
     get_mcp_tools_for_project,
     load_project_index,
 )
+from .prompt_cache import (
+    cached_fragment,
+    file_state,
+    git_head_state,
+    load_template,
+    preload_templates,
+    timed_prompt_part,
+)
 
 
 def _validate_branch_name(branch: str | None) -> str | None:
@@ -111,6 +119,24 @@ _get_base_branch_from_metadata = get_base_branch_from_metadata
 
 
 def _detect_base_branch(spec_dir: Path, project_dir: Path) -> str:
+    """
+    Detect the base branch for a project/task (see _resolve_base_branch).
+
+    Memoized on the task metadata, DEFAULT_BRANCH and the git refs, so the
+    git lookups don't run again for every prompt.
+    """
+    key = (
+        str(project_dir.resolve()),
+        file_state(spec_dir / "task_metadata.json"),
+        os.getenv("DEFAULT_BRANCH"),
+        git_head_state(project_dir),
+    )
+    return cached_fragment(
+        "base_branch", key, lambda: _resolve_base_branch(spec_dir, project_dir)
+    )
+
+
+def _resolve_base_branch(spec_dir: Path, project_dir: Path) -> str:
     """
     Detect the base branch for a project/task.
 
@@ -198,7 +224,7 @@ def get_planner_prompt(spec_dir: Path) -> str:
             "Make sure the auto-claude/prompts/planner.md file exists."
         )
 
-    prompt = prompt_file.read_text(encoding="utf-8")
+    prompt = _load_prompt_file("planner.md")
 
     # Inject spec directory information at the beginning
     spec_context = f"""## SPEC LOCATION
@@ -227,12 +253,25 @@ def get_coding_prompt(spec_dir: Path) -> str:
     """
     Load the coding agent prompt with spec path injected.
 
+    Rebuilt only when the recovery history or human input changes.
+
     Args:
         spec_dir: Directory containing the spec.md and implementation_plan.json
 
     Returns:
         The coding agent prompt content with spec path
     """
+    key = (
+        str(spec_dir),
+        file_state(
+            spec_dir / "memory" / "attempt_history.json",
+            spec_dir / "HUMAN_INPUT.md",
+        ),
+    )
+    return cached_fragment("coding_prompt", key, lambda: _build_coding_prompt(spec_dir))
+
+
+def _build_coding_prompt(spec_dir: Path) -> str:
     prompt_file = PROMPTS_DIR / "coder.md"
 
     if not prompt_file.exists():
@@ -241,7 +280,7 @@ def get_coding_prompt(spec_dir: Path) -> str:
             "Make sure the auto-claude/prompts/coder.md file exists."
         )
 
-    prompt = prompt_file.read_text(encoding="utf-8")
+    prompt = _load_prompt_file("coder.md")
 
     spec_context = f"""## SPEC LOCATION
 
@@ -369,7 +408,7 @@ def get_followup_planner_prompt(spec_dir: Path) -> str:
             "Make sure the auto-claude/prompts/followup_planner.md file exists."
         )
 
-    prompt = prompt_file.read_text(encoding="utf-8")
+    prompt = _load_prompt_file("followup_planner.md")
 
     # Inject spec directory information at the beginning
     spec_context = f"""## SPEC LOCATION (FOLLOW-UP MODE)
@@ -439,6 +478,8 @@ def _load_prompt_file(filename: str) -> str:
     """
     Load a prompt file from the prompts directory.
 
+    All templates are read once per process (see prompt_cache).
+
     Args:
         filename: Relative path to prompt file (e.g., "qa_reviewer.md" or "mcp_tools/electron_validation.md")
 
@@ -448,10 +489,8 @@ def _load_prompt_file(filename: str) -> str:
     Raises:
         FileNotFoundError: If prompt file doesn't exist
     """
-    prompt_file = PROMPTS_DIR / filename
-    if not prompt_file.exists():
-        raise FileNotFoundError(f"Prompt file not found: {prompt_file}")
-    return prompt_file.read_text(encoding="utf-8")
+    preload_templates(PROMPTS_DIR)
+    return load_template(PROMPTS_DIR / filename)
 
 
 def get_qa_reviewer_prompt(spec_dir: Path, project_dir: Path) -> str:
@@ -477,6 +516,23 @@ def get_qa_reviewer_prompt(spec_dir: Path, project_dir: Path) -> str:
     # Detect the base branch for this task (from task_metadata.json or auto-detect)
     base_branch = _detect_base_branch(spec_dir, project_dir)
 
+    # Rebuilt only when the base branch or the project index changes
+    key = (
+        str(spec_dir),
+        str(project_dir),
+        base_branch,
+        file_state(project_dir / ".auto-claude" / "project_index.json"),
+    )
+    return cached_fragment(
+        "qa_reviewer_prompt",
+        key,
+        lambda: _build_qa_reviewer_prompt(spec_dir, project_dir, base_branch),
+    )
+
+
+def _build_qa_reviewer_prompt(
+    spec_dir: Path, project_dir: Path, base_branch: str
+) -> str:
     # Load base QA reviewer prompt
     base_prompt = _load_prompt_file("qa_reviewer.md")
 
@@ -635,6 +691,7 @@ This shows only changes made in the spec branch since it diverged from `{base_br
     return spec_context + base_prompt
 
 
+@timed_prompt_part("qa_fixer_prompt")
 def get_qa_fixer_prompt(spec_dir: Path, project_dir: Path) -> str:
     """
     Load the QA fixer prompt with spec paths injected.
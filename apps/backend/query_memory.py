@@ -11,6 +11,11 @@ Usage:
     python query_memory.py search <db-path> <database> <query> [--limit N]
     python query_memory.py semantic-search <db-path> <database> <query> [--limit N]
     python query_memory.py get-entities <db-path> <database> [--limit N]
+    python query_memory.py serve [--idle-timeout SECONDS]
+
+The serve command keeps one process alive and answers JSON-line requests on
+stdin (see memory_query_server.py), so repeated UI queries skip interpreter
+start-up, imports and database opening.
 
 Output:
     JSON to stdout with structure: {"success": bool, "data": ..., "error": ...}
@@ -22,6 +27,7 @@ import json
 import os
 import re
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -99,26 +105,27 @@ def get_db_connection(db_path: str, database: str):
         return None, str(e)
 
 
-def cmd_get_status(args):
-    """Get memory database status."""
-    db_path = Path(args.db_path)
-    database = args.database
+def get_status(db_path: str, database: str, connect=get_db_connection) -> dict:
+    """
+    Get memory database status.
+
+    Args:
+        connect: Callable (db_path, database) -> (conn, error) used to verify
+            the database can be opened
+    """
+    db_path = Path(db_path)
 
     # Check if kuzu/LadybugDB is available
     db_backend = apply_monkeypatch()
     if not db_backend:
-        output_json(
-            True,
-            data={
-                "available": False,
-                "ladybugInstalled": False,
-                "databasePath": str(db_path),
-                "database": database,
-                "databaseExists": False,
-                "message": "Neither kuzu nor LadybugDB is installed",
-            },
-        )
-        return
+        return {
+            "available": False,
+            "ladybugInstalled": False,
+            "databasePath": str(db_path),
+            "database": database,
+            "databaseExists": False,
+            "message": "Neither kuzu nor LadybugDB is installed",
+        }
 
     full_path = db_path / database
     db_exists = full_path.exists()
@@ -133,7 +140,7 @@ def cmd_get_status(args):
             databases.append(item.name)
 
     # Try to connect and verify
-    conn, error = get_db_connection(str(db_path), database)
+    conn, error = connect(str(db_path), database)
     connected = conn is not None
 
     if connected:
@@ -145,161 +152,309 @@ def cmd_get_status(args):
             connected = False
             error = str(e)
 
-    output_json(
-        True,
-        data={
-            "available": True,
-            "ladybugInstalled": True,
-            "databasePath": str(db_path),
-            "database": database,
-            "databaseExists": db_exists,
-            "connected": connected,
-            "databases": databases,
-            "error": error,
-        },
-    )
+    return {
+        "available": True,
+        "ladybugInstalled": True,
+        "databasePath": str(db_path),
+        "database": database,
+        "databaseExists": db_exists,
+        "connected": connected,
+        "databases": databases,
+        "error": error,
+    }
 
 
-def cmd_get_memories(args):
-    """Get episodic memories from the database."""
-    if not apply_monkeypatch():
-        output_error("Neither kuzu nor LadybugDB is installed")
-        return
+def cmd_get_status(args):
+    """Get memory database status."""
+    output_json(True, data=get_status(args.db_path, args.database))
+
+
+class MemoryQueryError(Exception):
+    """A memory query failed in a way the caller should report."""
+
+
+def _episode_columns(var: str = "e") -> str:
+    """Columns returned for Episodic nodes; row order matches _episode_from_row."""
+    return f"""
+        {var}.uuid as uuid, {var}.name as name, {var}.created_at as created_at,
+        {var}.content as content, {var}.source_description as description,
+        {var}.group_id as group_id
+    """
 
-    conn, error = get_db_connection(args.db_path, args.database)
-    if not conn:
-        output_error(error or "Failed to connect to database")
-        return
 
+# Columns returned for Entity nodes; row order matches _entity_from_row
+ENTITY_COLUMNS = """
+    e.uuid as uuid, e.name as name, e.summary as summary,
+    e.created_at as created_at
+"""
+
+# Graphiti's full-text index over Episodic content (see
+# kuzu_driver_patched.build_indices_and_constraints)
+EPISODE_FTS_INDEX = "episode_content"
+
+
+def load_fts_extension(conn) -> bool:
+    """Load the FTS extension on a connection; False if unavailable."""
     try:
-        limit = args.limit or 20
+        conn.execute("LOAD EXTENSION fts")
+        return True
+    except Exception as e:
+        return "already loaded" in str(e).lower()
 
-        # Query episodic nodes with parameterized query
-        query = """
-            MATCH (e:Episodic)
-            RETURN e.uuid as uuid, e.name as name, e.created_at as created_at,
-                   e.content as content, e.source_description as description,
-                   e.group_id as group_id
-            ORDER BY e.created_at DESC
-            LIMIT $limit
-        """
 
-        result = conn.execute(query, parameters={"limit": limit})
+def _missing_table(error: Exception, label: str) -> bool:
+    """Whether a query failed only because the node table does not exist yet."""
+    message = str(error)
+    return label in message and (
+        "not exist" in message.lower() or "cannot" in message.lower()
+    )
 
-        # Process results without pandas (iterate through result set directly)
-        memories = []
-        while result.has_next():
-            row = result.get_next()
-            # Row order: uuid, name, created_at, content, description, group_id
-            uuid_val = serialize_value(row[0]) if len(row) > 0 else None
-            name_val = serialize_value(row[1]) if len(row) > 1 else ""
-            created_at_val = serialize_value(row[2]) if len(row) > 2 else None
-            content_val = serialize_value(row[3]) if len(row) > 3 else ""
-            description_val = serialize_value(row[4]) if len(row) > 4 else ""
-            group_id_val = serialize_value(row[5]) if len(row) > 5 else ""
 
-            memory = {
-                "id": uuid_val or name_val or "unknown",
-                "name": name_val or "",
-                "type": infer_episode_type(name_val or "", content_val or ""),
-                "timestamp": created_at_val or datetime.now().isoformat(),
-                "content": content_val or description_val or name_val or "",
-                "description": description_val or "",
-                "group_id": group_id_val or "",
-            }
+def _episode_from_row(row, score: float | None = None) -> dict:
+    """Convert an Episodic row (EPISODE_COLUMNS order) to a memory dict."""
+    uuid_val = serialize_value(row[0]) if len(row) > 0 else None
+    name_val = serialize_value(row[1]) if len(row) > 1 else ""
+    created_at_val = serialize_value(row[2]) if len(row) > 2 else None
+    content_val = serialize_value(row[3]) if len(row) > 3 else ""
+    description_val = serialize_value(row[4]) if len(row) > 4 else ""
+    group_id_val = serialize_value(row[5]) if len(row) > 5 else ""
+
+    memory = {
+        "id": uuid_val or name_val or "unknown",
+        "name": name_val or "",
+        "type": infer_episode_type(name_val or "", content_val or ""),
+        "timestamp": created_at_val or datetime.now().isoformat(),
+        "content": content_val or description_val or name_val or "",
+        "description": description_val or "",
+        "group_id": group_id_val or "",
+    }
+    if score is not None:
+        memory["score"] = score
+
+    # Extract session number if present
+    session_num = extract_session_number(name_val or "")
+    if session_num:
+        memory["session_number"] = session_num
+    return memory
+
+
+def _entity_from_row(row) -> dict | None:
+    """Convert an Entity row (ENTITY_COLUMNS order); None if it has no summary."""
+    uuid_val = serialize_value(row[0]) if len(row) > 0 else None
+    name_val = serialize_value(row[1]) if len(row) > 1 else ""
+    summary_val = serialize_value(row[2]) if len(row) > 2 else ""
+    created_at_val = serialize_value(row[3]) if len(row) > 3 else None
+
+    if not summary_val:
+        return None
+
+    return {
+        "id": uuid_val or name_val or "unknown",
+        "name": name_val or "",
+        "type": infer_entity_type(name_val or ""),
+        "timestamp": created_at_val or datetime.now().isoformat(),
+        "content": summary_val or "",
+    }
+
 
-            # Extract session number if present
-            session_num = extract_session_number(name_val or "")
-            if session_num:
-                memory["session_number"] = session_num
+def _page_newest(conn, label: str, columns: str, limit: int, after: tuple | None):
+    """
+    Page through nodes newest first, using keyset pagination.
+
+    Args:
+        after: (created_at, uuid) of the last row of the previous page, as
+            returned by the database
+
+    Returns:
+        Rows in ENTITY_COLUMNS or _episode_columns() order
+    """
+    where = ""
+    parameters = {"limit": limit}
+    if after is not None:
+        where = """
+            WHERE e.created_at < $after_ts
+               OR (e.created_at = $after_ts AND e.uuid < $after_uuid)
+        """
+        parameters.update(after_ts=after[0], after_uuid=after[1])
+
+    result = conn.execute(
+        f"""
+            MATCH (e:{label})
+            {where}
+            RETURN {columns}
+            ORDER BY e.created_at DESC, e.uuid DESC
+            LIMIT $limit
+        """,
+        parameters=parameters,
+    )
+
+    rows = []
+    while result.has_next():
+        rows.append(result.get_next())
+    return rows
 
-            memories.append(memory)
 
-        output_json(True, data={"memories": memories, "count": len(memories)})
+def fetch_memories(conn, limit: int = 20, after: tuple | None = None):
+    """
+    Get episodic memories, newest first.
 
+    Returns:
+        (memories, (created_at, uuid) of the last row or None)
+    """
+    try:
+        rows = _page_newest(conn, "Episodic", _episode_columns(), limit, after)
     except Exception as e:
         # Table might not exist yet
-        if "Episodic" in str(e) and (
-            "not exist" in str(e).lower() or "cannot" in str(e).lower()
-        ):
-            output_json(True, data={"memories": [], "count": 0})
-        else:
-            output_error(f"Query failed: {e}")
+        if _missing_table(e, "Episodic"):
+            return [], None
+        raise MemoryQueryError(f"Query failed: {e}") from e
 
+    last_key = (rows[-1][2], rows[-1][0]) if len(rows) == limit else None
+    return [_episode_from_row(row) for row in rows], last_key
 
-def cmd_search(args):
-    """Search memories by keyword."""
-    if not apply_monkeypatch():
-        output_error("Neither kuzu nor LadybugDB is installed")
-        return
 
-    conn, error = get_db_connection(args.db_path, args.database)
-    if not conn:
-        output_error(error or "Failed to connect to database")
-        return
+def fetch_entities(conn, limit: int = 20, after: tuple | None = None):
+    """
+    Get entity memories (patterns, gotchas, etc.), newest first.
 
+    Returns:
+        (entities, (created_at, uuid) of the last row or None)
+    """
     try:
-        limit = args.limit or 20
-        search_query = args.query.lower()
+        rows = _page_newest(conn, "Entity", ENTITY_COLUMNS, limit, after)
+    except Exception as e:
+        if _missing_table(e, "Entity"):
+            return [], None
+        raise MemoryQueryError(f"Query failed: {e}") from e
+
+    last_key = (rows[-1][3], rows[-1][0]) if len(rows) == limit else None
+    entities = [entity for entity in map(_entity_from_row, rows) if entity]
+    return entities, last_key
+
+
+def _fts_search(conn, query: str, limit: int, offset: int) -> list[dict]:
+    """Keyword search through Graphiti's Episodic full-text index."""
+    result = conn.execute(
+        f"""
+            CALL QUERY_FTS_INDEX(
+                'Episodic', '{EPISODE_FTS_INDEX}', cast($query AS STRING),
+                TOP := $top
+            )
+            RETURN {_episode_columns("node")}, score
+            ORDER BY score DESC
+            SKIP $skip
+            LIMIT $limit
+        """,
+        parameters={
+            "query": query,
+            "top": offset + limit,
+            "skip": offset,
+            "limit": limit,
+        },
+    )
+
+    memories = []
+    while result.has_next():
+        row = result.get_next()
+        memories.append(_episode_from_row(row[:-1], score=float(row[-1])))
+    return memories
 
-        # Search in episodic nodes using CONTAINS with parameterized query
-        query = """
+
+def _scan_search(conn, query: str, limit: int, offset: int) -> list[dict]:
+    """Keyword search by scanning Episodic nodes (no full-text index)."""
+    result = conn.execute(
+        f"""
             MATCH (e:Episodic)
             WHERE toLower(e.name) CONTAINS $search_query
                OR toLower(e.content) CONTAINS $search_query
                OR toLower(e.source_description) CONTAINS $search_query
-            RETURN e.uuid as uuid, e.name as name, e.created_at as created_at,
-                   e.content as content, e.source_description as description,
-                   e.group_id as group_id
-            ORDER BY e.created_at DESC
+            RETURN {_episode_columns()}
+            ORDER BY e.created_at DESC, e.uuid DESC
+            SKIP $skip
             LIMIT $limit
-        """
-
-        result = conn.execute(
-            query, parameters={"search_query": search_query, "limit": limit}
-        )
+        """,
+        parameters={"search_query": query.lower(), "skip": offset, "limit": limit},
+    )
 
-        # Process results without pandas
-        memories = []
-        while result.has_next():
-            row = result.get_next()
-            # Row order: uuid, name, created_at, content, description, group_id
-            uuid_val = serialize_value(row[0]) if len(row) > 0 else None
-            name_val = serialize_value(row[1]) if len(row) > 1 else ""
-            created_at_val = serialize_value(row[2]) if len(row) > 2 else None
-            content_val = serialize_value(row[3]) if len(row) > 3 else ""
-            description_val = serialize_value(row[4]) if len(row) > 4 else ""
-            group_id_val = serialize_value(row[5]) if len(row) > 5 else ""
+    memories = []
+    while result.has_next():
+        # Keyword match score
+        memories.append(_episode_from_row(result.get_next(), score=1.0))
+    return memories
 
-            memory = {
-                "id": uuid_val or name_val or "unknown",
-                "name": name_val or "",
-                "type": infer_episode_type(name_val or "", content_val or ""),
-                "timestamp": created_at_val or datetime.now().isoformat(),
-                "content": content_val or description_val or name_val or "",
-                "description": description_val or "",
-                "group_id": group_id_val or "",
-                "score": 1.0,  # Keyword match score
-            }
 
-            session_num = extract_session_number(name_val or "")
-            if session_num:
-                memory["session_number"] = session_num
+def search_memories(
+    conn, query: str, limit: int = 20, offset: int = 0, use_fts: bool = True
+) -> tuple[list[dict], bool]:
+    """
+    Search memories by keyword.
 
-            memories.append(memory)
+    Uses the Episodic full-text index when the connection has the FTS
+    extension loaded and the index exists (ranked by BM25 score), otherwise
+    scans all Episodic nodes.
 
-        output_json(
-            True,
-            data={"memories": memories, "count": len(memories), "query": args.query},
-        )
+    Returns:
+        (memories, whether the full-text index was used)
+    """
+    if use_fts:
+        try:
+            return _fts_search(conn, query, limit, offset), True
+        except Exception as e:
+            if _missing_table(e, "Episodic"):
+                return [], False
+            # Index not built (e.g. database created by add-episode) -
+            # fall back to scanning
+            sys.stderr.write(f"FTS search unavailable, scanning: {e}\n")
 
+    try:
+        return _scan_search(conn, query, limit, offset), False
     except Exception as e:
-        if "Episodic" in str(e) and (
-            "not exist" in str(e).lower() or "cannot" in str(e).lower()
-        ):
-            output_json(True, data={"memories": [], "count": 0, "query": args.query})
-        else:
-            output_error(f"Search failed: {e}")
+        if _missing_table(e, "Episodic"):
+            return [], False
+        raise MemoryQueryError(f"Search failed: {e}") from e
+
+
+def cmd_get_memories(args):
+    """Get episodic memories from the database."""
+    if not apply_monkeypatch():
+        output_error("Neither kuzu nor LadybugDB is installed")
+        return
+
+    conn, error = get_db_connection(args.db_path, args.database)
+    if not conn:
+        output_error(error or "Failed to connect to database")
+        return
+
+    try:
+        memories, _ = fetch_memories(conn, args.limit or 20)
+    except MemoryQueryError as e:
+        output_error(str(e))
+        return
+    output_json(True, data={"memories": memories, "count": len(memories)})
+
+
+def cmd_search(args):
+    """Search memories by keyword."""
+    if not apply_monkeypatch():
+        output_error("Neither kuzu nor LadybugDB is installed")
+        return
+
+    conn, error = get_db_connection(args.db_path, args.database)
+    if not conn:
+        output_error(error or "Failed to connect to database")
+        return
+
+    try:
+        memories, _ = search_memories(
+            conn, args.query, args.limit or 20, use_fts=load_fts_extension(conn)
+        )
+    except MemoryQueryError as e:
+        output_error(str(e))
+        return
+    output_json(
+        True,
+        data={"memories": memories, "count": len(memories), "query": args.query},
+    )
 
 
 def cmd_semantic_search(args):
@@ -332,10 +487,40 @@ def cmd_semantic_search(args):
         return cmd_search(args)
 
 
-async def _async_semantic_search(args):
-    """Async implementation of semantic search using GraphitiClient."""
+@contextmanager
+def _environment(overrides: dict[str, str] | None):
+    """Apply environment variable overrides, restoring the old values after."""
+    saved = {key: os.environ.get(key) for key in overrides or {}}
+    os.environ.update(overrides or {})
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+async def create_semantic_client(
+    db_path: str, database: str, env: dict[str, str] | None = None
+):
+    """
+    Create and initialize a GraphitiClient for semantic search.
+
+    Args:
+        env: Environment variables configuring the embedder; they only
+            apply to this client and are not left in os.environ
+
+    Returns:
+        (client, config)
+
+    Raises:
+        MemoryQueryError: If dependencies or embedder configuration are missing
+            or initialization fails
+    """
     if not apply_monkeypatch():
-        return {"success": False, "error": "LadybugDB not installed"}
+        raise MemoryQueryError("LadybugDB not installed")
 
     try:
         # Add auto-claude to path for imports
@@ -346,110 +531,114 @@ async def _async_semantic_search(args):
         # Import Graphiti components
         from integrations.graphiti.config import GraphitiConfig
         from integrations.graphiti.queries_pkg.client import GraphitiClient
+    except ImportError as e:
+        raise MemoryQueryError(f"Missing dependencies: {e}") from e
 
-        # Create config from environment
+    # Create config from environment
+    with _environment(env):
         config = GraphitiConfig.from_env()
 
-        # Override database location from CLI args
-        # Note: We only override db_path/database for CLI-specified locations.
-        # The config.enabled flag is respected - if the user has disabled memory,
-        # this CLI tool should not be used. The caller (main()) routes to this
-        # function only when semantic-search command is explicitly requested.
-        config.db_path = args.db_path
-        config.database = args.database
-
-        # Validate embedder configuration using public API
-        validation_errors = config.get_validation_errors()
-        if validation_errors:
-            return {
-                "success": False,
-                "error": f"Embedder provider not properly configured: {'; '.join(validation_errors)}",
-            }
+    # Override database location from CLI args
+    # Note: We only override db_path/database for CLI-specified locations.
+    # The config.enabled flag is respected - if the user has disabled memory,
+    # this CLI tool should not be used. The caller (main()) routes to this
+    # function only when semantic-search command is explicitly requested.
+    config.db_path = db_path
+    config.database = database
+
+    # Validate embedder configuration using public API
+    validation_errors = config.get_validation_errors()
+    if validation_errors:
+        raise MemoryQueryError(
+            f"Embedder provider not properly configured: {'; '.join(validation_errors)}"
+        )
 
-        # Initialize client
-        client = GraphitiClient(config)
-        initialized = await client.initialize()
+    # Initialize client
+    client = GraphitiClient(config)
+    if not await client.initialize():
+        raise MemoryQueryError("Failed to initialize Graphiti client")
+    return client, config
 
-        if not initialized:
-            return {"success": False, "error": "Failed to initialize Graphiti client"}
 
-        try:
-            # Perform semantic search using Graphiti
-            limit = args.limit or 20
-            search_query = args.query
-
-            # Use Graphiti's search method
-            search_results = await client.graphiti.search(
-                query=search_query,
-                num_results=limit,
-            )
+async def semantic_search(client, config, query: str, limit: int = 20) -> dict:
+    """Run a semantic search on an initialized GraphitiClient."""
+    search_query = query
+
+    # Use Graphiti's search method
+    search_results = await client.graphiti.search(
+        query=search_query,
+        num_results=limit,
+    )
 
-            # Transform results to our format
-            memories = []
-            for result in search_results:
-                # Handle both edge and episode results
-                if hasattr(result, "fact"):
-                    # Edge result (relationship)
-                    memory = {
-                        "id": getattr(result, "uuid", "unknown"),
-                        "name": result.fact[:100] if result.fact else "",
-                        "type": "session_insight",
-                        "timestamp": getattr(
-                            result, "created_at", datetime.now().isoformat()
-                        ),
-                        "content": result.fact or "",
-                        "score": getattr(result, "score", 1.0),
-                    }
-                elif hasattr(result, "content"):
-                    # Episode result
-                    memory = {
-                        "id": getattr(result, "uuid", "unknown"),
-                        "name": getattr(result, "name", "")[:100],
-                        "type": infer_episode_type(
-                            getattr(result, "name", ""), getattr(result, "content", "")
-                        ),
-                        "timestamp": getattr(
-                            result, "created_at", datetime.now().isoformat()
-                        ),
-                        "content": result.content or "",
-                        "score": getattr(result, "score", 1.0),
-                    }
-                else:
-                    # Generic result
-                    memory = {
-                        "id": str(getattr(result, "uuid", "unknown")),
-                        "name": str(result)[:100],
-                        "type": "session_insight",
-                        "timestamp": datetime.now().isoformat(),
-                        "content": str(result),
-                        "score": 1.0,
-                    }
-
-                session_num = extract_session_number(memory.get("name", ""))
-                if session_num:
-                    memory["session_number"] = session_num
-
-                memories.append(memory)
-
-            return {
-                "success": True,
-                "data": {
-                    "memories": memories,
-                    "count": len(memories),
-                    "query": search_query,
-                    "search_type": "semantic",
-                    "embedder": config.embedder_provider,
-                },
+    # Transform results to our format
+    memories = []
+    for result in search_results:
+        # Handle both edge and episode results
+        if hasattr(result, "fact"):
+            # Edge result (relationship)
+            memory = {
+                "id": getattr(result, "uuid", "unknown"),
+                "name": result.fact[:100] if result.fact else "",
+                "type": "session_insight",
+                "timestamp": getattr(result, "created_at", datetime.now().isoformat()),
+                "content": result.fact or "",
+                "score": getattr(result, "score", 1.0),
+            }
+        elif hasattr(result, "content"):
+            # Episode result
+            memory = {
+                "id": getattr(result, "uuid", "unknown"),
+                "name": getattr(result, "name", "")[:100],
+                "type": infer_episode_type(
+                    getattr(result, "name", ""), getattr(result, "content", "")
+                ),
+                "timestamp": getattr(result, "created_at", datetime.now().isoformat()),
+                "content": result.content or "",
+                "score": getattr(result, "score", 1.0),
+            }
+        else:
+            # Generic result
+            memory = {
+                "id": str(getattr(result, "uuid", "unknown")),
+                "name": str(result)[:100],
+                "type": "session_insight",
+                "timestamp": datetime.now().isoformat(),
+                "content": str(result),
+                "score": 1.0,
             }
 
-        finally:
-            await client.close()
+        session_num = extract_session_number(memory.get("name", ""))
+        if session_num:
+            memory["session_number"] = session_num
 
-    except ImportError as e:
-        return {"success": False, "error": f"Missing dependencies: {e}"}
+        memories.append(memory)
+
+    return {
+        "memories": memories,
+        "count": len(memories),
+        "query": search_query,
+        "search_type": "semantic",
+        "embedder": config.embedder_provider,
+    }
+
+
+async def _async_semantic_search(args):
+    """Async implementation of semantic search using GraphitiClient."""
+    try:
+        client, config = await create_semantic_client(args.db_path, args.database)
+    except MemoryQueryError as e:
+        return {"success": False, "error": str(e)}
     except Exception as e:
         return {"success": False, "error": f"Semantic search failed: {e}"}
 
+    try:
+        data = await semantic_search(client, config, args.query, args.limit or 20)
+        return {"success": True, "data": data}
+    except Exception as e:
+        return {"success": False, "error": f"Semantic search failed: {e}"}
+    finally:
+        await client.close()
+
 
 def cmd_get_entities(args):
     """Get entity memories (patterns, gotchas, etc.) from the database."""
@@ -463,50 +652,120 @@ def cmd_get_entities(args):
         return
 
     try:
-        limit = args.limit or 20
-
-        # Query entity nodes with parameterized query
-        query = """
-            MATCH (e:Entity)
-            RETURN e.uuid as uuid, e.name as name, e.summary as summary,
-                   e.created_at as created_at
-            ORDER BY e.created_at DESC
-            LIMIT $limit
-        """
+        entities, _ = fetch_entities(conn, args.limit or 20)
+    except MemoryQueryError as e:
+        output_error(str(e))
+        return
+    output_json(True, data={"entities": entities, "count": len(entities)})
 
-        result = conn.execute(query, parameters={"limit": limit})
 
-        # Process results without pandas
-        entities = []
-        while result.has_next():
-            row = result.get_next()
-            # Row order: uuid, name, summary, created_at
-            uuid_val = serialize_value(row[0]) if len(row) > 0 else None
-            name_val = serialize_value(row[1]) if len(row) > 1 else ""
-            summary_val = serialize_value(row[2]) if len(row) > 2 else ""
-            created_at_val = serialize_value(row[3]) if len(row) > 3 else None
+def open_database(db_path: str, database: str, create: bool = False):
+    """
+    Open a database and connection.
 
-            if not summary_val:
-                continue
+    Args:
+        create: Create the database (and its parent directory) if missing
 
-            entity = {
-                "id": uuid_val or name_val or "unknown",
-                "name": name_val or "",
-                "type": infer_entity_type(name_val or ""),
-                "timestamp": created_at_val or datetime.now().isoformat(),
-                "content": summary_val or "",
-            }
-            entities.append(entity)
+    Returns:
+        (db, conn)
+    """
+    try:
+        import kuzu
+    except ImportError:
+        import real_ladybug as kuzu
+
+    full_path = Path(db_path) / database
+    if not full_path.exists():
+        if not create:
+            raise MemoryQueryError(f"Database not found at {full_path}")
+        # For new databases, create the parent directory
+        Path(db_path).mkdir(parents=True, exist_ok=True)
+
+    # Open database (creates it if it doesn't exist)
+    db = kuzu.Database(str(full_path))
+    return db, kuzu.Connection(db)
+
+
+def add_episode(
+    conn,
+    name: str,
+    content: str,
+    episode_type: str = "session_insight",
+    group_id: str | None = None,
+) -> dict:
+    """
+    Insert an episode, creating the Episodic table if needed.
 
-        output_json(True, data={"entities": entities, "count": len(entities)})
+    Raises:
+        MemoryQueryError: If the insert fails
+    """
+    import uuid as uuid_module
 
+    # Parse content from JSON if provided
+    if content:
+        try:
+            # Try to parse as JSON to validate
+            parsed = json.loads(content)
+            # Re-serialize to ensure consistent formatting
+            content = json.dumps(parsed)
+        except json.JSONDecodeError:
+            # If not valid JSON, use as-is
+            pass
+
+    # Generate unique ID
+    episode_uuid = str(uuid_module.uuid4())
+    created_at = datetime.now().isoformat()
+
+    # Always try to create the Episodic table if it doesn't exist
+    # This handles both new databases and existing databases without the table
+    try:
+        conn.execute("""
+            CREATE NODE TABLE IF NOT EXISTS Episodic (
+                uuid STRING PRIMARY KEY,
+                name STRING,
+                content STRING,
+                source_description STRING,
+                group_id STRING,
+                created_at STRING
+            )
+        """)
+    except Exception as schema_err:
+        # Table might already exist with different schema - that's ok
+        # The insert will fail if schema is incompatible
+        sys.stderr.write(f"Schema creation note: {schema_err}\n")
+
+    # Insert the episode
+    try:
+        insert_query = """
+            CREATE (e:Episodic {
+                uuid: $uuid,
+                name: $name,
+                content: $content,
+                source_description: $description,
+                group_id: $group_id,
+                created_at: $created_at
+            })
+        """
+        conn.execute(
+            insert_query,
+            parameters={
+                "uuid": episode_uuid,
+                "name": name,
+                "content": content,
+                "description": f"[{episode_type}] {name}",
+                "group_id": group_id or "",
+                "created_at": created_at,
+            },
+        )
     except Exception as e:
-        if "Entity" in str(e) and (
-            "not exist" in str(e).lower() or "cannot" in str(e).lower()
-        ):
-            output_json(True, data={"entities": [], "count": 0})
-        else:
-            output_error(f"Query failed: {e}")
+        raise MemoryQueryError(f"Failed to insert episode: {e}") from e
+
+    return {
+        "id": episode_uuid,
+        "name": name,
+        "type": episode_type,
+        "timestamp": created_at,
+    }
 
 
 def cmd_add_episode(args):
@@ -529,96 +788,26 @@ def cmd_add_episode(args):
         return
 
     try:
-        import uuid as uuid_module
-
-        try:
-            import kuzu
-        except ImportError:
-            import real_ladybug as kuzu
-
-        # Parse content from JSON if provided
-        content = args.content
-        if content:
-            try:
-                # Try to parse as JSON to validate
-                parsed = json.loads(content)
-                # Re-serialize to ensure consistent formatting
-                content = json.dumps(parsed)
-            except json.JSONDecodeError:
-                # If not valid JSON, use as-is
-                pass
-
-        # Generate unique ID
-        episode_uuid = str(uuid_module.uuid4())
-        created_at = datetime.now().isoformat()
-
-        # Get database path - create directory if needed
-        full_path = Path(args.db_path) / args.database
-        if not full_path.exists():
-            # For new databases, create the parent directory
-            Path(args.db_path).mkdir(parents=True, exist_ok=True)
-
-        # Open database (creates it if it doesn't exist)
-        db = kuzu.Database(str(full_path))
-        conn = kuzu.Connection(db)
-
-        # Always try to create the Episodic table if it doesn't exist
-        # This handles both new databases and existing databases without the table
-        try:
-            conn.execute("""
-                CREATE NODE TABLE IF NOT EXISTS Episodic (
-                    uuid STRING PRIMARY KEY,
-                    name STRING,
-                    content STRING,
-                    source_description STRING,
-                    group_id STRING,
-                    created_at STRING
-                )
-            """)
-        except Exception as schema_err:
-            # Table might already exist with different schema - that's ok
-            # The insert will fail if schema is incompatible
-            sys.stderr.write(f"Schema creation note: {schema_err}\n")
-
-        # Insert the episode
-        try:
-            insert_query = """
-                CREATE (e:Episodic {
-                    uuid: $uuid,
-                    name: $name,
-                    content: $content,
-                    source_description: $description,
-                    group_id: $group_id,
-                    created_at: $created_at
-                })
-            """
-            conn.execute(
-                insert_query,
-                parameters={
-                    "uuid": episode_uuid,
-                    "name": args.name,
-                    "content": content,
-                    "description": f"[{args.episode_type}] {args.name}",
-                    "group_id": args.group_id or "",
-                    "created_at": created_at,
-                },
-            )
+        _, conn = open_database(args.db_path, args.database, create=True)
+        data = add_episode(
+            conn, args.name, args.content, args.episode_type, args.group_id
+        )
+    except MemoryQueryError as e:
+        output_error(str(e))
+        return
+    except Exception as e:
+        output_error(f"Failed to add episode: {e}")
+        return
+    output_json(True, data=data)
 
-            output_json(
-                True,
-                data={
-                    "id": episode_uuid,
-                    "name": args.name,
-                    "type": args.episode_type,
-                    "timestamp": created_at,
-                },
-            )
 
-        except Exception as e:
-            output_error(f"Failed to insert episode: {e}")
+def cmd_serve(args):
+    """Run the long-lived memory query server until stdin closes."""
+    from memory_query_server import DEFAULT_IDLE_TIMEOUT, MemoryQueryServer
 
-    except Exception as e:
-        output_error(f"Failed to add episode: {e}")
+    if args.idle_timeout is None:
+        args.idle_timeout = DEFAULT_IDLE_TIMEOUT
+    MemoryQueryServer(idle_timeout=args.idle_timeout).serve()
 
 
 def infer_episode_type(name: str, content: str = "") -> str:
@@ -734,6 +923,19 @@ def main():
         "--group-id", dest="group_id", help="Optional group ID for namespacing"
     )
 
+    # serve command (long-lived query server, see memory_query_server.py)
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serve JSON-line requests on stdin/stdout with warm connections",
+    )
+    serve_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Seconds of inactivity before releasing database locks "
+        "(default: 300; released earlier when another process needs them)",
+    )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -749,6 +951,7 @@ def main():
         "semantic-search": cmd_semantic_search,
         "get-entities": cmd_get_entities,
         "add-episode": cmd_add_episode,
+        "serve": cmd_serve,
     }
 
     handler = commands.get(args.command)
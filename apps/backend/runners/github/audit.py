@@ -11,6 +11,7 @@ Features:
 - Actor tracking (user/bot/automation)
 - Duration and token usage tracking
 - Log rotation with configurable retention
+- Indexed queries and pre-aggregated statistics (audit_index.py)
 """
 
 from __future__ import annotations
@@ -26,6 +27,11 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+try:
+    from .audit_index import AuditLogIndex, empty_stats
+except (ImportError, ValueError, SystemError):
+    from audit_index import AuditLogIndex, empty_stats
+
 # Configure module logger
 logger = logging.getLogger(__name__)
 
@@ -161,6 +167,24 @@ class AuditEntry:
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), default=str)
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AuditEntry:
+        return cls(
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            correlation_id=data["correlation_id"],
+            action=AuditAction(data["action"]),
+            actor_type=ActorType(data["actor_type"]),
+            actor_id=data.get("actor_id"),
+            repo=data.get("repo"),
+            pr_number=data.get("pr_number"),
+            issue_number=data.get("issue_number"),
+            result=data["result"],
+            duration_ms=data.get("duration_ms"),
+            error=data.get("error"),
+            details=data.get("details", {}),
+            token_usage=data.get("token_usage"),
+        )
+
 
 class AuditLogger:
     """
@@ -213,6 +237,7 @@ class AuditLogger:
         self.retention_days = retention_days
         self.max_file_size_mb = max_file_size_mb
         self.enabled = enabled
+        self._index = AuditLogIndex(self.log_dir)
 
         if enabled:
             self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -369,8 +394,13 @@ class AuditLogger:
 
         try:
             log_file = self._get_log_file_path()
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(entry.to_json() + "\n")
+            line = (entry.to_json() + "\n").encode("utf-8")
+            with open(log_file, "ab") as f:
+                f.write(line)
+                f.flush()
+                # Appends are atomic, so this is where the line really landed
+                offset = f.tell() - len(line)
+            self._index.record_append(log_file, entry.to_dict(), offset, len(line))
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
 
@@ -583,60 +613,43 @@ class AuditLogger:
 
         results = []
 
-        for log_file in sorted(self.log_dir.glob("audit_*.jsonl"), reverse=True):
+        # Candidate lines come from the partition indexes; filters are
+        # re-checked exactly on the parsed entries.
+        candidates = self._index.iter_entries(
+            filters={
+                "correlation_id": correlation_id,
+                "action": action.value if action else None,
+                "repo": repo,
+                "pr_number": pr_number,
+                "issue_number": issue_number,
+            },
+            since=since,
+        )
+        for data in candidates:
             try:
-                with open(log_file, encoding="utf-8") as f:
-                    for line in f:
-                        if not line.strip():
-                            continue
-
-                        try:
-                            data = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-
-                        # Apply filters
-                        if (
-                            correlation_id
-                            and data.get("correlation_id") != correlation_id
-                        ):
-                            continue
-                        if action and data.get("action") != action.value:
-                            continue
-                        if repo and data.get("repo") != repo:
-                            continue
-                        if pr_number and data.get("pr_number") != pr_number:
-                            continue
-                        if issue_number and data.get("issue_number") != issue_number:
-                            continue
-                        if since:
-                            entry_time = datetime.fromisoformat(data["timestamp"])
-                            if entry_time < since:
-                                continue
-
-                        # Reconstruct entry
-                        entry = AuditEntry(
-                            timestamp=datetime.fromisoformat(data["timestamp"]),
-                            correlation_id=data["correlation_id"],
-                            action=AuditAction(data["action"]),
-                            actor_type=ActorType(data["actor_type"]),
-                            actor_id=data.get("actor_id"),
-                            repo=data.get("repo"),
-                            pr_number=data.get("pr_number"),
-                            issue_number=data.get("issue_number"),
-                            result=data["result"],
-                            duration_ms=data.get("duration_ms"),
-                            error=data.get("error"),
-                            details=data.get("details", {}),
-                            token_usage=data.get("token_usage"),
-                        )
-                        results.append(entry)
-
-                        if len(results) >= limit:
-                            return results
-
-            except Exception as e:
-                logger.error(f"Error reading audit log {log_file}: {e}")
+                # Apply filters
+                if correlation_id and data.get("correlation_id") != correlation_id:
+                    continue
+                if action and data.get("action") != action.value:
+                    continue
+                if repo and data.get("repo") != repo:
+                    continue
+                if pr_number and data.get("pr_number") != pr_number:
+                    continue
+                if issue_number and data.get("issue_number") != issue_number:
+                    continue
+                if since:
+                    entry_time = datetime.fromisoformat(data["timestamp"])
+                    if entry_time < since:
+                        continue
+
+                results.append(AuditEntry.from_dict(data))
+            except (KeyError, ValueError) as e:
+                logger.error(f"Skipping malformed audit entry: {e}")
+                continue
+
+            if len(results) >= limit:
+                return results
 
         return results
 
@@ -652,46 +665,17 @@ class AuditLogger:
         """
         Get aggregate statistics from audit logs.
 
+        Counts cover all matching entries (not a sampled subset) and are
+        read from pre-aggregated hourly rollups.
+
         Returns:
             Dictionary with counts by action, result, and actor type
         """
-        entries = self.query_logs(repo=repo, since=since, limit=10000)
-
-        stats = {
-            "total_entries": len(entries),
-            "by_action": {},
-            "by_result": {},
-            "by_actor_type": {},
-            "total_duration_ms": 0,
-            "total_input_tokens": 0,
-            "total_output_tokens": 0,
-        }
-
-        for entry in entries:
-            # Count by action
-            action = entry.action.value
-            stats["by_action"][action] = stats["by_action"].get(action, 0) + 1
-
-            # Count by result
-            result = entry.result
-            stats["by_result"][result] = stats["by_result"].get(result, 0) + 1
-
-            # Count by actor type
-            actor = entry.actor_type.value
-            stats["by_actor_type"][actor] = stats["by_actor_type"].get(actor, 0) + 1
-
-            # Sum durations
-            if entry.duration_ms:
-                stats["total_duration_ms"] += entry.duration_ms
-
-            # Sum token usage
-            if entry.token_usage:
-                stats["total_input_tokens"] += entry.token_usage.get("input_tokens", 0)
-                stats["total_output_tokens"] += entry.token_usage.get(
-                    "output_tokens", 0
-                )
+        if not self.enabled or not self.log_dir.exists():
+            return empty_stats()
 
-        return stats
+        # Served from hourly rollups; only a partial first hour is scanned
+        return self._index.statistics(repo=repo, since=since)
 
 
 # Convenience functions for quick logging
@@ -0,0 +1,563 @@
+"""
+Audit Log Query Index
+=====================
+
+Indexes the daily audit_*.jsonl partitions written by audit.py so queries
+and statistics do not re-parse the whole history:
+- One sidecar index per partition (stored in <log_dir>/.index/)
+- Posting lists: correlation_id / action / repo / pr_number / issue_number
+  -> byte offsets of matching lines
+- Min/max timestamps so whole partitions can be skipped by time
+- Sparse time checkpoints (timestamp -> offset) for range scans
+- Hourly rollups (counts, durations, token usage) per repo
+
+Indexes are maintained incrementally: each refresh only parses the bytes
+appended since the last one, so entries written by other processes are
+picked up too. A partition whose file shrank or was replaced (rotation) is
+re-indexed from scratch.
+
+The hourly rollups of all partitions are also kept merged in memory. The
+logger's own appends update them directly (record_append), and a refresh
+only revisits the partitions when the log directory's mtime or today's
+partition has changed, so statistics() does not touch every sidecar.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+try:
+    from .file_lock import atomic_write
+except (ImportError, ValueError, SystemError):
+    from file_lock import atomic_write
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEXED_FIELDS = ("correlation_id", "action", "repo", "pr_number", "issue_number")
+CHECKPOINT_INTERVAL = 256  # Entries between time checkpoints
+PERSIST_EVERY = 500  # Newly indexed entries before the sidecar is rewritten
+_HEAD_BYTES = 256  # Prefix hashed to detect a replaced (rotated) file
+# Allowance for slightly out-of-order lines from concurrent writers
+_ORDER_SLACK = timedelta(minutes=1)
+
+
+def empty_stats() -> dict[str, Any]:
+    """Statistics in the shape returned by AuditLogger.get_statistics()."""
+    return {
+        "total_entries": 0,
+        "by_action": {},
+        "by_result": {},
+        "by_actor_type": {},
+        "total_duration_ms": 0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+    }
+
+
+def add_entry_stats(stats: dict[str, Any], data: dict[str, Any]) -> None:
+    """Add one raw log entry to a statistics dict."""
+    stats["total_entries"] += 1
+    for key, value in (
+        ("by_action", data.get("action")),
+        ("by_result", data.get("result")),
+        ("by_actor_type", data.get("actor_type")),
+    ):
+        if value is not None:
+            stats[key][value] = stats[key].get(value, 0) + 1
+    if data.get("duration_ms"):
+        stats["total_duration_ms"] += data["duration_ms"]
+    token_usage = data.get("token_usage")
+    if token_usage:
+        stats["total_input_tokens"] += token_usage.get("input_tokens", 0)
+        stats["total_output_tokens"] += token_usage.get("output_tokens", 0)
+
+
+def merge_stats(target: dict[str, Any], source: dict[str, Any]) -> None:
+    """Add source statistics into target."""
+    for key in (
+        "total_entries",
+        "total_duration_ms",
+        "total_input_tokens",
+        "total_output_tokens",
+    ):
+        target[key] += source.get(key, 0)
+    for key in ("by_action", "by_result", "by_actor_type"):
+        for name, count in source.get(key, {}).items():
+            target[key][name] = target[key].get(name, 0) + count
+
+
+def _parse_timestamp(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+def _hour_key(ts: datetime) -> str:
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H")
+
+
+def _hour_start(key: str) -> datetime:
+    return datetime.strptime(key, "%Y-%m-%dT%H").replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class PartitionIndex:
+    """Sidecar index for one audit log partition file."""
+
+    name: str
+    size: int = 0
+    head: str = ""
+    count: int = 0
+    min_ts: str | None = None
+    max_ts: str | None = None
+    postings: dict[str, dict[str, list[int]]] = field(
+        default_factory=lambda: {f: {} for f in INDEXED_FIELDS}
+    )
+    checkpoints: list[list[Any]] = field(default_factory=list)  # [[ts, offset]]
+    rollups: dict[str, dict[str, dict[str, Any]]] = field(default_factory=dict)
+    unsaved: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "name": self.name,
+            "size": self.size,
+            "head": self.head,
+            "count": self.count,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts,
+            "postings": self.postings,
+            "checkpoints": self.checkpoints,
+            "rollups": self.rollups,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PartitionIndex:
+        return cls(
+            name=data["name"],
+            size=data.get("size", 0),
+            head=data.get("head", ""),
+            count=data.get("count", 0),
+            min_ts=data.get("min_ts"),
+            max_ts=data.get("max_ts"),
+            postings=data.get("postings") or {f: {} for f in INDEXED_FIELDS},
+            checkpoints=data.get("checkpoints", []),
+            rollups=data.get("rollups", {}),
+        )
+
+    def overlaps(self, since: datetime | None) -> bool:
+        if since is None or self.max_ts is None:
+            return self.count > 0
+        return _parse_timestamp(self.max_ts) >= since
+
+    def add(self, data: dict[str, Any], offset: int) -> None:
+        """Index one parsed log line starting at offset."""
+        ts_value = data["timestamp"]
+        ts = _parse_timestamp(ts_value)
+        if self.min_ts is None or ts < _parse_timestamp(self.min_ts):
+            self.min_ts = ts_value
+        if self.max_ts is None or ts > _parse_timestamp(self.max_ts):
+            self.max_ts = ts_value
+        if self.count % CHECKPOINT_INTERVAL == 0:
+            self.checkpoints.append([ts_value, offset])
+
+        for name in INDEXED_FIELDS:
+            value = data.get(name)
+            if value is None or value == "":
+                continue
+            self.postings[name].setdefault(str(value), []).append(offset)
+
+        hour = self.rollups.setdefault(_hour_key(ts), {})
+        bucket = hour.setdefault(data.get("repo") or "", empty_stats())
+        add_entry_stats(bucket, data)
+
+        self.count += 1
+        self.unsaved += 1
+
+    def offsets_for(self, filters: dict[str, Any]) -> list[int] | None:
+        """
+        Offsets of lines matching all indexed filters (None = no filter).
+        """
+        result: set[int] | None = None
+        for name, value in filters.items():
+            offsets = set(self.postings.get(name, {}).get(str(value), ()))
+            result = offsets if result is None else result & offsets
+            if not result:
+                return []
+        return None if result is None else sorted(result)
+
+    def scan_start(self, since: datetime | None) -> int:
+        """Byte offset from which entries at or after since can appear."""
+        if since is None:
+            return 0
+        start = 0
+        for ts_value, offset in self.checkpoints:
+            if _parse_timestamp(ts_value) + _ORDER_SLACK < since:
+                start = offset
+            else:
+                break
+        return start
+
+
+class AuditLogIndex:
+    """
+    Incrementally maintained index over an audit log directory.
+
+    Usage:
+        index = AuditLogIndex(Path(".auto-claude/github/audit"))
+        for data in index.iter_entries(filters={"correlation_id": cid}):
+            ...
+        stats = index.statistics(repo="owner/repo", since=cutoff)
+    """
+
+    def __init__(self, log_dir: Path, pattern: str = "audit_*.jsonl"):
+        self.log_dir = log_dir
+        self.pattern = pattern
+        self.index_dir = log_dir / ".index"
+        self._partitions: dict[str, PartitionIndex] = {}
+        self._ordered: list[PartitionIndex] = []
+        # Merged rollups of all partitions: {hour: {repo: stats}}, plus
+        # all-time totals per repo and overall
+        self._rollups: dict[str, dict[str, dict[str, Any]]] = {}
+        self._repo_totals: dict[str, dict[str, Any]] = {}
+        self._totals = empty_stats()
+        # _signature() as of the last full refresh (None = refresh needed)
+        self._seen: tuple | None = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _sidecar_path(self, name: str) -> Path:
+        return self.index_dir / f"{name}.idx.json"
+
+    @staticmethod
+    def _read_head(log_file: Path) -> str:
+        with open(log_file, "rb") as f:
+            return hashlib.sha256(f.read(_HEAD_BYTES)).hexdigest()[:16]
+
+    def _load_sidecar(self, name: str) -> PartitionIndex | None:
+        path = self._sidecar_path(name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            return PartitionIndex.from_dict(data)
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Discarding unreadable audit index {path}: {e}")
+            return None
+
+    def _save_sidecar(self, partition: PartitionIndex) -> None:
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self._sidecar_path(partition.name)) as f:
+                json.dump(partition.to_dict(), f, separators=(",", ":"))
+            partition.unsaved = 0
+        except OSError as e:
+            logger.warning(f"Failed to save audit index for {partition.name}: {e}")
+
+    def _catch_up(self, partition: PartitionIndex, log_file: Path, size: int) -> None:
+        """Index complete lines appended since the partition was last indexed."""
+        with open(log_file, "rb") as f:
+            f.seek(partition.size)
+            offset = partition.size
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Partial line still being written
+                line_offset = offset
+                offset += len(raw)
+                if not raw.strip():
+                    continue
+                try:
+                    data = json.loads(raw)
+                    partition.add(data, line_offset)
+                except (json.JSONDecodeError, KeyError, ValueError):
+                    continue
+            partition.size = offset
+
+    def _active_name(self) -> str:
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        return self.pattern.replace("*", today)
+
+    def _signature(self) -> tuple | None:
+        """
+        What changes whenever the partitions do.
+
+        Creating, rotating (renaming) or deleting a partition changes the
+        directory's mtime; entries are only appended to today's partition.
+        """
+        try:
+            directory = self.log_dir.stat()
+        except OSError:
+            return None
+        name = self._active_name()
+        try:
+            active = (self.log_dir / name).stat()
+            state = (active.st_size, active.st_mtime_ns)
+        except OSError:
+            state = None
+        return (directory.st_mtime_ns, name, state)
+
+    def refresh(self) -> list[PartitionIndex]:
+        """
+        Bring all partition indexes up to date.
+
+        Cheap when nothing changed since the last refresh: only the log
+        directory and today's partition are stat()ed.
+
+        Returns:
+            Partitions sorted newest first (by file name)
+        """
+        with self._lock:
+            try:
+                # Up front, so saving sidecars doesn't change the signature
+                self.index_dir.mkdir(exist_ok=True)
+            except OSError:
+                pass
+            signature = self._signature()
+            if signature is not None and signature == self._seen:
+                return list(self._ordered)
+            if signature is None:
+                self._partitions = {}
+                self._ordered = []
+                self._rebuild_rollups()
+                self._seen = None
+                return []
+
+            current = {}
+            for log_file in self.log_dir.glob(self.pattern):
+                name = log_file.name
+                try:
+                    size = log_file.stat().st_size
+                    partition = self._partitions.get(name) or self._load_sidecar(name)
+                    head = self._read_head(log_file) if size else ""
+                    if (
+                        partition is None
+                        or size < partition.size
+                        or (partition.size and partition.head != head)
+                    ):
+                        partition = PartitionIndex(name=name)
+                    partition.head = head
+                    if size > partition.size:
+                        self._catch_up(partition, log_file, size)
+                    if partition.unsaved >= PERSIST_EVERY or (
+                        partition.unsaved and not self._is_active(name)
+                    ):
+                        self._save_sidecar(partition)
+                    current[name] = partition
+                except OSError as e:
+                    logger.error(f"Error indexing audit log {log_file}: {e}")
+
+            self._partitions = current
+            self._ordered = [current[name] for name in sorted(current, reverse=True)]
+            self._remove_orphan_sidecars(current)
+            self._rebuild_rollups()
+            self._seen = signature
+            return list(self._ordered)
+
+    def record_append(
+        self, log_file: Path, data: dict[str, Any], offset: int, length: int
+    ) -> None:
+        """
+        Index an entry this process appended at offset (length bytes).
+
+        Updates the partition and the merged rollups in place. If anything
+        else changed the log directory meanwhile (another writer, a new or
+        rotated partition), the next refresh rescans as usual.
+        """
+        with self._lock:
+            partition = self._partitions.get(log_file.name)
+            previous = self._seen
+            if previous is None or partition is None or partition.size != offset:
+                return
+            try:
+                partition.add(data, offset)
+            except (KeyError, ValueError):
+                return
+            partition.size = offset + length
+            entry = empty_stats()
+            add_entry_stats(entry, data)
+            hour = _hour_key(_parse_timestamp(data["timestamp"]))
+            self._add_rollup(hour, data.get("repo") or "", entry)
+
+            signature = self._signature()
+            if (
+                signature is not None
+                and signature[:2] == previous[:2]
+                and signature[2] is not None
+                and signature[2][0] == partition.size
+            ):
+                self._seen = signature
+            if partition.unsaved >= PERSIST_EVERY:
+                self._save_sidecar(partition)
+
+    def _rebuild_rollups(self) -> None:
+        self._rollups = {}
+        self._repo_totals = {}
+        self._totals = empty_stats()
+        for partition in self._partitions.values():
+            for hour, buckets in partition.rollups.items():
+                for repo, bucket in buckets.items():
+                    self._add_rollup(hour, repo, bucket)
+
+    def _add_rollup(self, hour: str, repo: str, stats: dict[str, Any]) -> None:
+        merge_stats(
+            self._rollups.setdefault(hour, {}).setdefault(repo, empty_stats()), stats
+        )
+        merge_stats(self._repo_totals.setdefault(repo, empty_stats()), stats)
+        merge_stats(self._totals, stats)
+
+    def flush(self) -> None:
+        """Persist any partition indexes with unsaved entries."""
+        with self._lock:
+            for partition in self._partitions.values():
+                if partition.unsaved:
+                    self._save_sidecar(partition)
+
+    def _is_active(self, name: str) -> bool:
+        """Whether a partition is today's file (still receiving writes)."""
+        return name == self._active_name()
+
+    def _remove_orphan_sidecars(self, current: dict[str, PartitionIndex]) -> None:
+        if not self.index_dir.exists():
+            return
+        for sidecar in self.index_dir.glob("*.idx.json"):
+            if sidecar.name[: -len(".idx.json")] not in current:
+                try:
+                    sidecar.unlink()
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def iter_entries(
+        self,
+        filters: dict[str, Any] | None = None,
+        since: datetime | None = None,
+    ):
+        """
+        Yield raw entry dicts matching the indexed filters.
+
+        Partitions are visited newest first and lines in file order, like a
+        full scan would. Callers still apply exact filtering (e.g. since).
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v}
+        for partition in self.refresh():
+            if not partition.overlaps(since):
+                continue
+            log_file = self.log_dir / partition.name
+            offsets = partition.offsets_for(filters)
+            try:
+                with open(log_file, "rb") as f:
+                    if offsets is None:
+                        f.seek(partition.scan_start(since))
+                        end = partition.size
+                        while f.tell() < end:
+                            raw = f.readline()
+                            if not raw:
+                                break
+                            data = self._parse(raw)
+                            if data is not None:
+                                yield data
+                    else:
+                        for offset in offsets:
+                            f.seek(offset)
+                            data = self._parse(f.readline())
+                            if data is not None:
+                                yield data
+            except OSError as e:
+                logger.error(f"Error reading audit log {log_file}: {e}")
+
+    @staticmethod
+    def _parse(raw: bytes) -> dict[str, Any] | None:
+        if not raw.strip():
+            return None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+
+    def statistics(
+        self,
+        repo: str | None = None,
+        since: datetime | None = None,
+    ) -> dict[str, Any]:
+        """
+        Aggregate statistics from the merged hourly rollups.
+
+        Without since, the all-time totals are returned directly. Otherwise
+        whole hours come from the rollups and only the hour containing since
+        is scanned (from the nearest time checkpoint).
+        """
+        partitions = self.refresh()
+        stats = empty_stats()
+        partial_hour = None
+        with self._lock:
+            if since is None:
+                totals = self._repo_totals.get(repo) if repo else self._totals
+                if totals:
+                    merge_stats(stats, totals)
+                return stats
+            for hour, buckets in self._rollups.items():
+                start = _hour_start(hour)
+                if start + timedelta(hours=1) <= since:
+                    continue
+                if start < since:
+                    partial_hour = hour
+                    continue
+                if repo:
+                    if repo in buckets:
+                        merge_stats(stats, buckets[repo])
+                else:
+                    for bucket in buckets.values():
+                        merge_stats(stats, bucket)
+
+        if partial_hour is not None:
+            start = _hour_start(partial_hour)
+            for partition in partitions:
+                if partial_hour in partition.rollups:
+                    self._scan_partial_hour(partition, stats, repo, since, start)
+        return stats
+
+    def _scan_partial_hour(
+        self,
+        partition: PartitionIndex,
+        stats: dict[str, Any],
+        repo: str | None,
+        since: datetime,
+        hour_start: datetime,
+    ) -> None:
+        hour_end = hour_start + timedelta(hours=1)
+        log_file = self.log_dir / partition.name
+        try:
+            with open(log_file, "rb") as f:
+                f.seek(partition.scan_start(since))
+                while f.tell() < partition.size:
+                    data = self._parse(f.readline())
+                    if data is None:
+                        continue
+                    ts = _parse_timestamp(data["timestamp"])
+                    if ts >= hour_end + _ORDER_SLACK:
+                        break
+                    if ts < since or ts >= hour_end:
+                        continue
+                    if repo and data.get("repo") != repo:
+                        continue
+                    add_entry_stats(stats, data)
+        except (OSError, KeyError, ValueError) as e:
+            logger.error(f"Error scanning audit log {log_file}: {e}")
@@ -4,7 +4,7 @@ Issue Batching Service
 
 Groups similar issues together for combined auto-fix:
 - Uses semantic similarity from duplicates.py
-- Creates issue clusters using agglomerative clustering
+- Creates issue clusters using sparse agglomerative clustering (issue_clustering.py)
 - Generates combined specs for issue batches
 - Tracks batch state and progress
 """
@@ -27,12 +27,26 @@ try:
     from .batch_validator import BatchValidator
     from .duplicates import SIMILAR_THRESHOLD
     from .file_lock import locked_json_write
+    from .issue_clustering import (
+        agglomerative_cluster,
+        sparse_from_pairs,
+        split_into_groups,
+    )
 except (ImportError, ValueError, SystemError):
     from batch_validator import BatchValidator
     from duplicates import SIMILAR_THRESHOLD
     from file_lock import locked_json_write
+    from issue_clustering import (
+        agglomerative_cluster,
+        sparse_from_pairs,
+        split_into_groups,
+    )
     from phase_config import resolve_model_id
 
+# Largest pre-group sent to a single Claude batching call. Bigger label or
+# keyword groups are split by keyword similarity first.
+MAX_AGENT_GROUP_SIZE = 40
+
 
 class ClaudeBatchAnalyzer:
     """
@@ -537,8 +551,11 @@ class IssueBatcher:
         # For issues without grouping labels, try keyword-based grouping
         keyword_groups = self._group_by_title_keywords(no_label_issues)
 
-        # Combine all pre-groups
-        pre_groups = list(label_groups.values()) + keyword_groups
+        # Combine all pre-groups, splitting oversized ones into
+        # keyword-coherent chunks that fit in one Claude call
+        pre_groups = []
+        for group in list(label_groups.values()) + keyword_groups:
+            pre_groups.extend(split_into_groups(group, MAX_AGENT_GROUP_SIZE))
 
         # Log pre-grouping results
         total_issues = sum(len(g) for g in pre_groups)
@@ -730,53 +747,20 @@ class IssueBatcher:
         similarity_matrix: dict[tuple[int, int], float],
     ) -> list[list[int]]:
         """
-        Cluster issues using simple agglomerative approach.
+        Cluster issues using average-linkage agglomerative clustering.
+
+        The similarity matrix is treated as sparse (only known pairs count),
+        and merges are driven by a priority queue, so this stays fast for
+        thousands of issues.
 
         Returns list of clusters, each cluster is a list of issue numbers.
         """
-        issue_numbers = [i["number"] for i in issues]
-
-        # Start with each issue in its own cluster
-        clusters: list[set[int]] = [{n} for n in issue_numbers]
-
-        # Merge clusters that have similar issues
-        def cluster_similarity(c1: set[int], c2: set[int]) -> float:
-            """Average similarity between clusters."""
-            scores = []
-            for a in c1:
-                for b in c2:
-                    if (a, b) in similarity_matrix:
-                        scores.append(similarity_matrix[(a, b)])
-            return sum(scores) / len(scores) if scores else 0.0
-
-        # Iteratively merge most similar clusters
-        while len(clusters) > 1:
-            best_score = 0.0
-            best_pair = (-1, -1)
-
-            for i in range(len(clusters)):
-                for j in range(i + 1, len(clusters)):
-                    score = cluster_similarity(clusters[i], clusters[j])
-                    if score > best_score:
-                        best_score = score
-                        best_pair = (i, j)
-
-            # Stop if best similarity is below threshold
-            if best_score < self.similarity_threshold:
-                break
-
-            # Merge clusters
-            i, j = best_pair
-            merged = clusters[i] | clusters[j]
-
-            # Don't exceed max batch size
-            if len(merged) > self.max_batch_size:
-                break
-
-            clusters = [c for k, c in enumerate(clusters) if k not in (i, j)]
-            clusters.append(merged)
-
-        return [list(c) for c in clusters]
+        return agglomerative_cluster(
+            [i["number"] for i in issues],
+            sparse_from_pairs(similarity_matrix),
+            threshold=self.similarity_threshold,
+            max_cluster_size=self.max_batch_size,
+        )
 
     def _extract_common_themes(
         self,
@@ -858,6 +842,7 @@ class IssueBatcher:
 
         # Cluster issues
         clusters = self._cluster_issues(available_issues, similarity_matrix)
+        issues_by_number = {i["number"]: i for i in available_issues}
 
         # Create initial batches from clusters
         initial_batches = []
@@ -876,7 +861,7 @@ class IssueBatcher:
             )
 
             # Build batch items
-            cluster_issues = [i for i in available_issues if i["number"] in cluster]
+            cluster_issues = [issues_by_number[n] for n in cluster]
             items = []
             for issue in cluster_issues:
                 similarity = (
@@ -10,6 +10,9 @@ Features:
 - Index pruning on startup
 - GDPR-compliant deletion (full purge)
 - Storage usage metrics
+- Cleanup candidates come from the storage ledger (storage_ledger.py),
+  after each directory is reconciled with one scandir: only records old
+  enough to be due (or new to the ledger) are opened
 
 Usage:
     cleaner = DataCleaner(state_dir=Path(".auto-claude/github"))
@@ -38,8 +41,16 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
-from .purge_strategy import PurgeResult, PurgeStrategy
-from .storage_metrics import StorageMetrics, StorageMetricsCalculator
+try:
+    from .file_lock import atomic_write, remove_file
+    from .purge_strategy import PurgeResult, PurgeStrategy
+    from .storage_ledger import StorageLedger
+    from .storage_metrics import StorageMetrics, StorageMetricsCalculator
+except (ImportError, ValueError, SystemError):
+    from file_lock import atomic_write, remove_file
+    from purge_strategy import PurgeResult, PurgeStrategy
+    from storage_ledger import StorageLedger
+    from storage_metrics import StorageMetrics, StorageMetricsCalculator
 
 
 class RetentionPolicy(str, Enum):
@@ -207,19 +218,26 @@ class DataCleaner:
         """
         result = CleanupResult(dry_run=dry_run)
         now = datetime.now(timezone.utc)
+        if not self.state_dir.exists():
+            result.completed_at = datetime.now(timezone.utc)
+            return result
 
-        # Directories to clean
-        directories = [
-            (self.state_dir / "pr", "pr_reviews"),
-            (self.state_dir / "issues", "issues"),
-            (self.state_dir / "autofix", "autofix"),
-        ]
+        ledger = StorageLedger.open(self.state_dir)
 
-        for dir_path, dir_type in directories:
-            if not dir_path.exists():
-                continue
+        # Nothing newer than the shortest retention period can be due, so
+        # only older records (or ones of unknown age) are opened
+        shortest_days = older_than_days or min(
+            self.config.get_retention_days(policy) for policy in DEFAULT_RETENTION
+        )
+        earliest_cutoff = now - timedelta(days=shortest_days)
 
-            for file_path in dir_path.glob("*.json"):
+        # Directories to clean
+        directories = ["pr", "issues", "autofix"]
+
+        for directory in directories:
+            # Picks up files written without file_lock.py (older versions)
+            ledger.sync_directory(directory)
+            for file_path in ledger.records_older_than(directory, earliest_cutoff):
                 try:
                     cleaned = await self._process_file(
                         file_path, now, older_than_days, dry_run, result
@@ -233,7 +251,7 @@ class DataCleaner:
         await self._prune_indexes(dry_run, result)
 
         # Clean up audit logs
-        await self._clean_audit_logs(now, older_than_days, dry_run, result)
+        await self._clean_audit_logs(ledger, now, older_than_days, dry_run, result)
 
         result.completed_at = datetime.now(timezone.utc)
         return result
@@ -253,9 +271,7 @@ class DataCleaner:
         except (OSError, json.JSONDecodeError, UnicodeDecodeError):
             # Corrupted file, mark for deletion
             if not dry_run:
-                file_size = file_path.stat().st_size
-                file_path.unlink()
-                result.freed_bytes += file_size
+                result.freed_bytes += remove_file(file_path)
             return True
 
         # Get status and timestamp
@@ -289,7 +305,7 @@ class DataCleaner:
                     result.archived_count += 1
                 else:
                     # Delete
-                    file_path.unlink()
+                    remove_file(file_path)
 
                 result.freed_bytes += file_size
 
@@ -327,11 +343,11 @@ class DataCleaner:
         data["_archived_at"] = datetime.now(timezone.utc).isoformat()
         data["_original_path"] = str(file_path)
 
-        with open(archive_path, "w", encoding="utf-8") as f:
+        with atomic_write(archive_path) as f:
             json.dump(data, f, indent=2)
 
         # Remove original
-        file_path.unlink()
+        remove_file(file_path)
 
     async def _prune_indexes(
         self,
@@ -375,7 +391,7 @@ class DataCleaner:
                     for key in to_remove:
                         del items[key]
 
-                    with open(index_path, "w", encoding="utf-8") as f:
+                    with atomic_write(index_path) as f:
                         json.dump(index_data, f, indent=2)
 
                 result.pruned_index_entries += pruned
@@ -385,32 +401,24 @@ class DataCleaner:
 
     async def _clean_audit_logs(
         self,
+        ledger: StorageLedger,
         now: datetime,
         older_than_days: int | None,
         dry_run: bool,
         result: CleanupResult,
     ) -> None:
         """Clean old audit logs."""
-        audit_dir = self.state_dir / "audit"
-        if not audit_dir.exists():
-            return
-
         # Default 30 day retention for audit logs (overridable)
         retention_days = older_than_days or 30
         cutoff = now - timedelta(days=retention_days)
 
-        for log_file in audit_dir.glob("*.log"):
+        # Audit logs are appended to directly, so refresh their ledger rows
+        ledger.refresh_volatile()
+        for log_file in ledger.files_modified_before("audit", "*.log", cutoff):
             try:
-                # Check file modification time
-                mtime = datetime.fromtimestamp(
-                    log_file.stat().st_mtime, tz=timezone.utc
-                )
-                if mtime < cutoff:
-                    file_size = log_file.stat().st_size
-                    if not dry_run:
-                        log_file.unlink()
-                        result.freed_bytes += file_size
-                    result.deleted_count += 1
+                if not dry_run:
+                    result.freed_bytes += remove_file(log_file)
+                result.deleted_count += 1
             except OSError as e:
                 result.errors.append(f"Error cleaning audit log {log_file}: {e}")
 
@@ -374,16 +374,28 @@ class ConfidenceScorer:
             return 0.5  # Neutral if no history
 
         try:
-            # Get accuracy stats
-            stats = self.learning_tracker.get_accuracy()
-            factors.historical_sample_size = stats.total_predictions
+            # Prefer the constant-time running summary over a full recompute
+            get_summary = getattr(self.learning_tracker, "get_accuracy_summary", None)
+            if get_summary is not None:
+                summary = get_summary()
+                total = summary.total_predictions
+                # Recency-weighted accuracy once recent outcomes exist
+                accuracy = (
+                    summary.decayed_accuracy
+                    if summary.decayed_samples >= 1
+                    else summary.accuracy
+                )
+            else:
+                stats = self.learning_tracker.get_accuracy()
+                total, accuracy = stats.total_predictions, stats.accuracy
+            factors.historical_sample_size = total
 
-            if stats.total_predictions >= self.MIN_SAMPLE_SIZE:
-                factors.historical_accuracy = stats.accuracy
-                return stats.accuracy
+            if total >= self.MIN_SAMPLE_SIZE:
+                factors.historical_accuracy = accuracy
+                return accuracy
             else:
                 # Not enough data, return neutral with penalty
-                return 0.5 * (stats.total_predictions / self.MIN_SAMPLE_SIZE)
+                return 0.5 * (total / self.MIN_SAMPLE_SIZE)
 
         except Exception as e:
             # Log the error for debugging while returning neutral score
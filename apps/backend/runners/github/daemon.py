@@ -0,0 +1,873 @@
+"""
+GitHub Automation Daemon
+========================
+
+Long-lived runner process that executes runner.py commands as jobs:
+- Imports, resolved config (token/repo) and orchestrators (with their
+  rate limiter, audit and learning state) stay warm between jobs
+- Jobs are submitted over a local Unix socket or stdin/stdout using
+  line-delimited JSON-RPC 2.0
+- Jobs are dispatched by a WorkScheduler (work_scheduler.py): fair across
+  repos by schedule_weight, up to a global and a per-repo limit, within
+  per-repo AI budget shares and paced against the GitHub quota. Weights and
+  per-repo toggles come from repos/multi_repo_config.json in the state
+  directory; repos not listed there get the defaults
+- Progress callbacks and command output are streamed to subscribed
+  connections as notifications
+- The queue is persisted in the state store (state_store.py): queued jobs,
+  and jobs interrupted by a restart, are picked up again on start
+- One daemon per state directory: an exclusive lock on LOCK_FILE is held
+  while serving, so a second daemon refuses to start instead of taking over
+  the socket and requeueing jobs that are still running
+
+Usage:
+    python runner.py daemon                      # JSON-RPC over stdin/stdout
+    python runner.py daemon --socket /tmp/gh.sock
+
+Requests (one JSON object per line):
+    {"jsonrpc": "2.0", "id": 1, "method": "submit",
+     "params": {"argv": ["review-pr", "123", "--force"]}}
+
+    Methods: submit, status, list, cancel, subscribe, unsubscribe, ping,
+    shutdown. "argv" takes the same arguments as runner.py; global options
+    default to the ones the daemon was started with.
+
+Notifications:
+    {"jsonrpc": "2.0", "method": "job.progress", "params": {"job_id": ..., ...}}
+    {"jsonrpc": "2.0", "method": "job.output", "params": {"job_id": ..., "line": ...}}
+    {"jsonrpc": "2.0", "method": "job.finished", "params": {<job>}}
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import errno
+import io
+import json
+import logging
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+try:
+    from .multi_repo import MultiRepoConfig, RepoConfig
+    from .rate_limiter import RateLimiter
+    from .state_store import GitHubStateStore
+    from .work_scheduler import WorkItem, WorkKind, WorkScheduler
+except (ImportError, ValueError, SystemError):
+    from multi_repo import MultiRepoConfig, RepoConfig
+    from rate_limiter import RateLimiter
+    from state_store import GitHubStateStore
+    from work_scheduler import WorkItem, WorkKind, WorkScheduler
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - Unix
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_JOBS = 4
+DEFAULT_MAX_JOBS_PER_REPO = 1
+# Jobs interrupted this many times (daemon crash or restart) are failed
+MAX_JOB_ATTEMPTS = 3
+# Finished jobs are kept this long for status/list queries
+FINISHED_JOB_RETENTION_SECONDS = 7 * 86400
+# Per-repo weights and toggles, relative to the state directory
+MULTI_REPO_CONFIG_FILE = Path("repos") / "multi_repo_config.json"
+# Held by the serving daemon, relative to the state directory
+LOCK_FILE = "daemon.lock"
+
+# Scheduler work kind by command; other commands (issue queue and batch
+# housekeeping) are scheduled as triage
+COMMAND_KINDS = {
+    "review-pr": WorkKind.PR_REVIEW,
+    "followup-review-pr": WorkKind.FOLLOWUP_REVIEW,
+    "auto-fix": WorkKind.AUTOFIX,
+}
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+CommandHandler = Callable[[argparse.Namespace], Awaitable[int]]
+
+# Job whose task is currently running (copied into the job's task context)
+_current_job: contextvars.ContextVar[DaemonJob | None] = contextvars.ContextVar(
+    "github_daemon_job", default=None
+)
+
+
+class JobStatus(str, Enum):
+    """Daemon job status."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+@dataclass
+class DaemonJob:
+    """A runner command queued in the daemon."""
+
+    job_id: str
+    argv: list[str]
+    command: str
+    repo: str = ""
+    status: JobStatus = JobStatus.QUEUED
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    started_at: str | None = None
+    finished_at: str | None = None
+    exit_code: int | None = None
+    error: str | None = None
+    attempts: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "argv": self.argv,
+            "command": self.command,
+            "repo": self.repo,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "exit_code": self.exit_code,
+            "error": self.error,
+            "attempts": self.attempts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DaemonJob:
+        return cls(
+            job_id=data["job_id"],
+            argv=list(data["argv"]),
+            command=data["command"],
+            repo=data.get("repo", ""),
+            status=JobStatus(data.get("status", "queued")),
+            created_at=data["created_at"],
+            started_at=data.get("started_at"),
+            finished_at=data.get("finished_at"),
+            exit_code=data.get("exit_code"),
+            error=data.get("error"),
+            attempts=data.get("attempts", 0),
+        )
+
+
+def _disabled_error(job: DaemonJob) -> str:
+    repo = job.repo or "this repo"
+    return f"{job.command} is disabled for {repo} in the multi-repo config"
+
+
+class RPCError(Exception):
+    """Error returned to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class DaemonAlreadyRunningError(RuntimeError):
+    """Another daemon is serving the same state directory or socket."""
+
+
+def _try_lock(fd: int) -> bool:
+    """Exclusively lock an open file without blocking; False if held."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _socket_in_use(socket_path: Path) -> bool:
+    """Whether a process is still accepting connections on socket_path."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+        return True
+    except OSError as e:
+        if e.errno in (errno.ECONNREFUSED, errno.ENOENT):
+            return False
+        raise
+    finally:
+        probe.close()
+
+
+class _Connection:
+    """A client connection; sends are thread-safe and never block the caller."""
+
+    def __init__(self, write: Callable[[str], Awaitable[None]]):
+        self._write = write
+        self._loop = asyncio.get_running_loop()
+        self._outbox: asyncio.Queue[str | None] = asyncio.Queue()
+        self._writer = asyncio.create_task(self._drain())
+        self.closed = False
+
+    def send(self, message: dict[str, Any]) -> None:
+        if self.closed:
+            return
+        line = json.dumps(message, default=str)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._outbox.put_nowait(line)
+        else:
+            self._loop.call_soon_threadsafe(self._outbox.put_nowait, line)
+
+    def notify(self, method: str, params: dict[str, Any]) -> None:
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def _drain(self) -> None:
+        while True:
+            line = await self._outbox.get()
+            if line is None:
+                return
+            try:
+                await self._write(line)
+            except (OSError, ConnectionError) as e:
+                logger.debug(f"[Daemon] Connection write failed: {e}")
+                self.closed = True
+                return
+
+    async def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._outbox.put_nowait(None)
+        await self._writer
+
+
+class _JobOutput(io.TextIOBase):
+    """
+    sys.stdout replacement that turns output written by a job's task into
+    job.output notifications; other output goes to the fallback stream.
+    """
+
+    def __init__(self, daemon: GitHubDaemon, fallback: Any):
+        self._daemon = daemon
+        self._fallback = fallback
+        self._partial: dict[str, str] = {}
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        job = _current_job.get()
+        if job is None:
+            self._fallback.write(text)
+            return len(text)
+        buffered = self._partial.pop(job.job_id, "") + text
+        *lines, rest = buffered.split("\n")
+        for line in lines:
+            self._daemon.emit(job, "job.output", {"line": line})
+        if rest:
+            self._partial[job.job_id] = rest
+        return len(text)
+
+    def flush(self) -> None:
+        if _current_job.get() is None:
+            self._fallback.flush()
+
+    def finish(self, job: DaemonJob) -> None:
+        rest = self._partial.pop(job.job_id, "")
+        if rest:
+            self._daemon.emit(job, "job.output", {"line": rest})
+
+
+class GitHubDaemon:
+    """
+    Job queue and JSON-RPC server for runner commands.
+
+    Args:
+        state_dir: GitHub state directory holding the persistent queue
+        parser: runner.py argument parser, used to parse job argv
+        commands: Command name -> async handler(args) -> exit code
+        prepare_args: Called (in a worker thread) with parsed job args before
+            a job is queued and again before it runs; returns the repo used
+            for per-repo limits and may cache resolved settings on args
+        max_jobs: Jobs running at once
+        max_jobs_per_repo: Jobs running at once for the same repo
+        repos: Per-repo scheduling weights and toggles (defaults to
+            MULTI_REPO_CONFIG_FILE in state_dir, if present)
+        rate_limiter: AI budget and GitHub quota the scheduler paces jobs
+            against (defaults to the process-wide RateLimiter)
+    """
+
+    def __init__(
+        self,
+        state_dir: Path,
+        parser: argparse.ArgumentParser,
+        commands: dict[str, CommandHandler],
+        prepare_args: Callable[[argparse.Namespace], str] | None = None,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        max_jobs_per_repo: int = DEFAULT_MAX_JOBS_PER_REPO,
+        repos: MultiRepoConfig | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._store = GitHubStateStore.open(self.state_dir)
+        self._parser = parser
+        self._commands = commands
+        self._prepare_args = prepare_args
+        self.max_jobs = max(1, max_jobs)
+        self.max_jobs_per_repo = max(1, max_jobs_per_repo)
+        if repos is None:
+            config_file = self.state_dir / MULTI_REPO_CONFIG_FILE
+            repos = (
+                MultiRepoConfig.load(config_file)
+                if config_file.exists()
+                else MultiRepoConfig(base_dir=config_file.parent)
+            )
+        self.scheduler = WorkScheduler(
+            repos,
+            max_sessions=self.max_jobs,
+            max_sessions_per_repo=self.max_jobs_per_repo,
+            rate_limiter=rate_limiter or RateLimiter.get_instance(),
+        )
+
+        # Shared across jobs so orchestrators stay warm (see runner.py)
+        self.orchestrator_cache: dict[Any, Any] = {}
+
+        self._pending: dict[str, tuple[DaemonJob, WorkItem]] = {}
+        self._running: dict[str, tuple[DaemonJob, asyncio.Task]] = {}
+        self._retry: asyncio.TimerHandle | None = None
+        self._subscribers: dict[str, set[_Connection]] = {}
+        self._connections: set[_Connection] = set()
+        self._output: _JobOutput | None = None
+        self._stopped: asyncio.Event | None = None
+        self._stopping = False
+        self._lock_fd: int | None = None
+
+    # ------------------------------------------------------------------
+    # Single instance
+    # ------------------------------------------------------------------
+
+    def acquire_lock(self) -> None:
+        """
+        Become the only daemon serving state_dir.
+
+        Raises:
+            DaemonAlreadyRunningError: If another process holds the lock
+        """
+        if self._lock_fd is not None:
+            return
+        lock_path = self.state_dir / LOCK_FILE
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        if not _try_lock(fd):
+            try:
+                owner = os.read(fd, 32).decode("ascii", "replace").strip()
+            except OSError:
+                owner = ""  # Windows: the locked byte can't be read
+            finally:
+                os.close(fd)
+            raise DaemonAlreadyRunningError(
+                f"Another daemon (pid {owner or 'unknown'}) is serving {self.state_dir}"
+            )
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, f"{os.getpid()}\n".encode("ascii"))
+        self._lock_fd = fd
+
+    def release_lock(self) -> None:
+        """Let another daemon serve state_dir."""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    def _save(self, job: DaemonJob) -> None:
+        self._store.put_job(job.to_dict())
+
+    def _work_item(self, job: DaemonJob, args: argparse.Namespace | None) -> WorkItem:
+        if self.scheduler.config.get_repo(job.repo) is None:
+            self.scheduler.config.add_repo(RepoConfig(repo=job.repo))
+        number = getattr(args, "pr_number", None) or getattr(args, "issue_number", None)
+        return WorkItem(
+            repo=job.repo,
+            kind=COMMAND_KINDS.get(job.command, WorkKind.TRIAGE),
+            number=number or 0,
+            job_id=job.job_id,
+        )
+
+    def _enqueue(self, job: DaemonJob, args: argparse.Namespace | None) -> bool:
+        """Hand a job to the scheduler; False if its repo config disables it."""
+        item = self._work_item(job, args)
+        if not self.scheduler.submit(item):
+            return False
+        self._pending[job.job_id] = (job, item)
+        return True
+
+    def recover(self) -> list[DaemonJob]:
+        """
+        Load queued jobs and requeue jobs interrupted by a restart.
+
+        Takes the state directory lock first: jobs marked running are only
+        orphaned if no other daemon is serving.
+
+        Raises:
+            DaemonAlreadyRunningError: If another daemon serves state_dir
+        """
+        self.acquire_lock()
+        self._store.prune_jobs(
+            [s.value for s in FINISHED_STATUSES],
+            time.time() - FINISHED_JOB_RETENTION_SECONDS,
+        )
+        pending = []
+        rows = self._store.jobs_in_status(
+            [JobStatus.QUEUED.value, JobStatus.RUNNING.value]
+        )
+        for data in rows:
+            job = DaemonJob.from_dict(data)
+            if job.status == JobStatus.RUNNING:
+                if job.attempts >= MAX_JOB_ATTEMPTS:
+                    self._finish(job, JobStatus.FAILED, error="Interrupted too often")
+                    continue
+                logger.info(f"[Daemon] Requeueing interrupted job {job.job_id}")
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                self._save(job)
+            try:
+                args = self._parse(job.argv)
+            except RPCError:
+                args = None  # Fails again when run
+            if not self._enqueue(job, args):
+                self._finish(job, JobStatus.FAILED, error=_disabled_error(job))
+                continue
+            pending.append(job)
+        return pending
+
+    def _parse(self, argv: list[str]) -> argparse.Namespace:
+        try:
+            args = self._parser.parse_args(argv)
+        except SystemExit as e:
+            raise RPCError(INVALID_PARAMS, f"Invalid arguments: {argv}") from e
+        if getattr(args, "command", None) not in self._commands:
+            raise RPCError(INVALID_PARAMS, f"Unknown command: {args.command}")
+        return args
+
+    async def _prepare(self, args: argparse.Namespace) -> str:
+        if self._prepare_args is None:
+            return getattr(args, "repo", None) or ""
+        try:
+            return await asyncio.to_thread(self._prepare_args, args)
+        except SystemExit as e:
+            raise RPCError(INVALID_PARAMS, "Could not resolve GitHub config") from e
+
+    async def submit(self, argv: list[str]) -> DaemonJob:
+        """Validate and queue a command."""
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+            raise RPCError(INVALID_PARAMS, "argv must be a list of strings")
+        args = self._parse(argv)
+        repo = await self._prepare(args)
+        job = DaemonJob(
+            job_id=uuid.uuid4().hex[:12],
+            argv=argv,
+            command=args.command,
+            repo=repo,
+        )
+        if not self._enqueue(job, args):
+            raise RPCError(INVALID_PARAMS, _disabled_error(job))
+        self._save(job)
+        self._schedule()
+        return job
+
+    def get_job(self, job_id: str) -> DaemonJob | None:
+        if job_id in self._pending:
+            return self._pending[job_id][0]
+        if job_id in self._running:
+            return self._running[job_id][0]
+        data = self._store.get_job(job_id)
+        return DaemonJob.from_dict(data) if data else None
+
+    def cancel(self, job_id: str) -> bool:
+        if job_id in self._pending:
+            job, item = self._pending.pop(job_id)
+            self.scheduler.cancel(item)
+            self._finish(job, JobStatus.CANCELLED)
+            return True
+        if job_id in self._running:
+            self._running[job_id][1].cancel()
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _schedule(self) -> None:
+        """Start the queued jobs the scheduler picks, within its limits."""
+        if self._stopping:
+            return
+        while (item := self.scheduler.next_item()) is not None:
+            job, _ = self._pending.pop(item.job_id)
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now(timezone.utc).isoformat()
+            job.attempts += 1
+            self._save(job)
+            task = asyncio.create_task(self._run(job, item))
+            self._running[job.job_id] = (job, task)
+
+        # Jobs waiting for GitHub quota or the next budget period: nothing
+        # else wakes them if no job is running, so retry once they may start
+        wait = self.scheduler.retry_wait()
+        if wait is not None and self._retry is None:
+            self._retry = asyncio.get_running_loop().call_later(
+                wait, self._retry_schedule
+            )
+
+    def _retry_schedule(self) -> None:
+        self._retry = None
+        self._schedule()
+
+    async def _run(self, job: DaemonJob, item: WorkItem) -> None:
+        _current_job.set(job)
+        status, exit_code, error = JobStatus.FAILED, None, None
+        try:
+            args = self._parse(job.argv)
+            await self._prepare(args)
+            args.orchestrator_cache = self.orchestrator_cache
+            args.progress_callback = self.progress
+            exit_code = await self._commands[args.command](args)
+            status = JobStatus.COMPLETED if exit_code == 0 else JobStatus.FAILED
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Daemon shutdown: leave it queued for the next start
+                status = JobStatus.QUEUED
+            else:
+                status = JobStatus.CANCELLED
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except RPCError as e:
+            error = e.message
+        except Exception as e:
+            logger.error(f"[Daemon] Job {job.job_id} failed: {e}", exc_info=True)
+            error = str(e)
+        finally:
+            if self._output is not None:
+                self._output.finish(job)
+            self._running.pop(job.job_id, None)
+            self.scheduler.complete(item, failed=status != JobStatus.COMPLETED)
+            if status == JobStatus.QUEUED:
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                self._save(job)
+            else:
+                self._finish(job, status, exit_code, error)
+            self._schedule()
+
+    def _finish(
+        self,
+        job: DaemonJob,
+        status: JobStatus,
+        exit_code: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        job.status = status
+        job.exit_code = exit_code
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc).isoformat()
+        self._save(job)
+        self.emit(job, "job.finished", job.to_dict())
+        self._subscribers.pop(job.job_id, None)
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def emit(self, job: DaemonJob, method: str, params: dict[str, Any]) -> None:
+        """Send a notification about a job to its subscribers."""
+        payload = {"job_id": job.job_id, **params}
+        for connection in list(self._subscribers.get(job.job_id, ())):
+            connection.notify(method, payload)
+
+    def progress(self, callback: Any) -> None:
+        """Progress callback passed to orchestrators; routes by current job."""
+        job = _current_job.get()
+        if job is None:
+            return
+        self.emit(
+            job,
+            "job.progress",
+            {
+                "phase": callback.phase,
+                "progress": callback.progress,
+                "message": callback.message,
+                "issue_number": callback.issue_number,
+                "pr_number": callback.pr_number,
+            },
+        )
+
+    def _subscribe(self, connection: _Connection, job_id: str) -> None:
+        self._subscribers.setdefault(job_id, set()).add(connection)
+
+    # ------------------------------------------------------------------
+    # JSON-RPC
+    # ------------------------------------------------------------------
+
+    async def _call(
+        self, connection: _Connection, method: str, params: dict[str, Any]
+    ) -> Any:
+        if method == "ping":
+            return {
+                "pid": os.getpid(),
+                "queued": len(self._pending),
+                "running": len(self._running),
+            }
+        if method == "submit":
+            job = await self.submit(params.get("argv"))
+            if params.get("subscribe", True):
+                self._subscribe(connection, job.job_id)
+            return job.to_dict()
+        if method in ("status", "cancel", "subscribe", "unsubscribe"):
+            job_id = params.get("job_id")
+            job = self.get_job(job_id) if isinstance(job_id, str) else None
+            if job is None:
+                raise RPCError(INVALID_PARAMS, f"Unknown job: {job_id}")
+            if method == "cancel":
+                return {"cancelled": self.cancel(job_id)}
+            if method == "subscribe" and job.status not in FINISHED_STATUSES:
+                self._subscribe(connection, job_id)
+            if method == "unsubscribe":
+                self._subscribers.get(job_id, set()).discard(connection)
+            return job.to_dict()
+        if method == "list":
+            status = params.get("status")
+            if status is not None and status not in {s.value for s in JobStatus}:
+                raise RPCError(INVALID_PARAMS, f"Unknown status: {status}")
+            limit = params.get("limit", 50)
+            if not isinstance(limit, int) or limit <= 0:
+                raise RPCError(INVALID_PARAMS, "limit must be a positive integer")
+            return self._store.recent_jobs(status, limit)
+        if method == "shutdown":
+            asyncio.get_running_loop().call_soon(self.stop)
+            return {"stopping": True}
+        raise RPCError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+
+    async def handle_line(self, connection: _Connection, line: str) -> None:
+        """Handle one JSON-RPC request line and send its response."""
+        line = line.strip()
+        if not line:
+            return
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise RPCError(PARSE_ERROR, f"Parse error: {e}") from e
+            if not isinstance(request, dict) or not isinstance(
+                request.get("method"), str
+            ):
+                raise RPCError(INVALID_REQUEST, "Invalid request")
+            request_id = request.get("id")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, "params must be an object")
+            result = await self._call(connection, request["method"], params)
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RPCError as e:
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": e.code, "message": e.message},
+            }
+        except Exception as e:
+            logger.error(f"[Daemon] Request failed: {e}", exc_info=True)
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": INTERNAL_ERROR, "message": str(e)},
+            }
+        if request_id is not None or "error" in response:
+            connection.send(response)
+
+    def _drop_connection(self, connection: _Connection) -> None:
+        self._connections.discard(connection)
+        for subscribers in self._subscribers.values():
+            subscribers.discard(connection)
+
+    async def _serve_connection(
+        self,
+        reader: Callable[[], Awaitable[str]],
+        write: Callable[[str], Awaitable[None]],
+    ) -> None:
+        connection = _Connection(write)
+        self._connections.add(connection)
+        try:
+            while not connection.closed:
+                line = await reader()
+                if not line:
+                    break
+                await self.handle_line(connection, line)
+        finally:
+            self._drop_connection(connection)
+            await connection.close()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def stop(self) -> None:
+        """Stop accepting requests; running jobs are requeued for next start."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _shutdown(self) -> None:
+        self._stopping = True
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+        tasks = [task for _, task in self._running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for connection in list(self._connections):
+            await connection.close()
+
+    async def serve(self, socket_path: Path | None = None) -> None:
+        """
+        Serve until shutdown: on a Unix socket if socket_path is given,
+        otherwise on stdin/stdout (command output then goes to stderr).
+
+        Raises:
+            DaemonAlreadyRunningError: If another daemon serves state_dir or
+                is listening on socket_path
+        """
+        self.acquire_lock()
+        try:
+            if socket_path is not None:
+                self._claim_socket(Path(socket_path))
+            await self._serve_locked(socket_path)
+        finally:
+            self.release_lock()
+
+    async def _serve_locked(self, socket_path: Path | None) -> None:
+        self._stopped = asyncio.Event()
+        real_stdout = sys.stdout
+        self._output = _JobOutput(
+            self, real_stdout if socket_path is not None else sys.stderr
+        )
+        sys.stdout = self._output
+        try:
+            self.recover()
+            self._schedule()
+            logger.info(
+                f"[Daemon] Serving on {socket_path or 'stdio'} "
+                f"(max_jobs={self.max_jobs}, per_repo={self.max_jobs_per_repo})"
+            )
+            if socket_path is not None:
+                await self._serve_socket(Path(socket_path))
+            else:
+                await self._serve_stdio(real_stdout)
+        finally:
+            await self._shutdown()
+            sys.stdout = real_stdout
+            self._output = None
+
+    async def _serve_stdio(self, stdout: Any) -> None:
+        loop = asyncio.get_running_loop()
+        lines: asyncio.Queue[str] = asyncio.Queue()
+
+        def pump(stdin: Any) -> None:
+            # Daemon thread, so a blocked readline() never delays exit
+            try:
+                for line in iter(stdin.readline, ""):
+                    loop.call_soon_threadsafe(lines.put_nowait, line)
+                loop.call_soon_threadsafe(lines.put_nowait, "")
+            except RuntimeError:
+                pass  # Event loop already closed
+
+        threading.Thread(
+            target=pump, args=(sys.stdin,), name="github-daemon-stdin", daemon=True
+        ).start()
+
+        async def read() -> str:
+            return await lines.get()
+
+        async def write(line: str) -> None:
+            stdout.write(line + "\n")
+            stdout.flush()
+
+        client = asyncio.create_task(self._serve_connection(read, write))
+        stopped = asyncio.create_task(self._stopped.wait())
+        await asyncio.wait({client, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        client.cancel()
+
+    @staticmethod
+    def _claim_socket(socket_path: Path) -> None:
+        """Remove a socket left behind by a dead daemon, never a live one."""
+        try:
+            mode = socket_path.lstat().st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise DaemonAlreadyRunningError(f"{socket_path} exists and is not a socket")
+        if _socket_in_use(socket_path):
+            raise DaemonAlreadyRunningError(
+                f"Another daemon is listening on {socket_path}"
+            )
+        logger.info(f"[Daemon] Removing stale socket {socket_path}")
+        socket_path.unlink(missing_ok=True)
+
+    async def _serve_socket(self, socket_path: Path) -> None:
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            async def read() -> str:
+                return (await reader.readline()).decode("utf-8")
+
+            async def write(line: str) -> None:
+                writer.write(line.encode("utf-8") + b"\n")
+                await writer.drain()
+
+            try:
+                await self._serve_connection(read, write)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(handle, path=str(socket_path))
+        os.chmod(socket_path, 0o600)
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            socket_path.unlink(missing_ok=True)
@@ -5,15 +5,17 @@ Semantic Duplicate Detection
 Uses embeddings-based similarity to detect duplicate issues:
 - Replaces simple word overlap with semantic similarity
 - Integrates with OpenAI/Voyage AI embeddings
-- Caches embeddings with TTL
+- Caches full, title and body embeddings with TTL in a memory-mapped
+  binary store (embedding_cache.py)
+- Scores candidates with a vectorized embedding index (embedding_index.py)
 - Extracts entities (error codes, file paths, function names)
 - Provides similarity breakdown by component
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
 import logging
 import re
 from dataclasses import dataclass, field
@@ -21,6 +23,15 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+try:
+    from .embedding_cache import EmbeddingCacheStore
+    from .embedding_index import EmbeddingIndex
+except (ImportError, ValueError, SystemError):
+    from embedding_cache import EmbeddingCacheStore
+    from embedding_index import EmbeddingIndex
+
 logger = logging.getLogger(__name__)
 
 # Thresholds for duplicate detection
@@ -28,6 +39,15 @@ DUPLICATE_THRESHOLD = 0.85  # Cosine similarity for "definitely duplicate"
 SIMILAR_THRESHOLD = 0.70  # Cosine similarity for "potentially related"
 EMBEDDING_CACHE_TTL_HOURS = 24
 
+# Embedding request batching: (max inputs, max estimated tokens) per request
+EMBEDDING_BATCH_LIMITS: dict[str, tuple[int, int | None]] = {
+    "openai": (2048, 250_000),
+    "voyage": (128, 100_000),
+    "local": (64, None),
+}
+EMBEDDING_MAX_CONCURRENCY = 4  # Concurrent embedding requests per provider
+EMBEDDING_MAX_INPUT_CHARS = 8000  # Per-text truncation before embedding
+
 
 @dataclass
 class EntityExtraction:
@@ -99,25 +119,40 @@ class SimilarityResult:
 
 @dataclass
 class CachedEmbedding:
-    """Cached embedding with metadata."""
+    """
+    Cached embedding with metadata.
+
+    Vectors loaded from the binary cache are read-only numpy views into the
+    memory-mapped data file; freshly computed ones are plain lists.
+    """
 
     issue_number: int
     content_hash: str
-    embedding: list[float]
+    embedding: list[float] | np.ndarray
     created_at: str
     expires_at: str
+    title_embedding: list[float] | np.ndarray | None = None
+    body_embedding: list[float] | np.ndarray | None = None
 
     def is_expired(self) -> bool:
         expires = datetime.fromisoformat(self.expires_at)
         return datetime.now(timezone.utc) > expires
 
+    def is_complete(self, has_body: bool) -> bool:
+        """Whether all component embeddings needed for comparison are cached."""
+        if self.title_embedding is None:
+            return False
+        return self.body_embedding is not None or not has_body
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "issue_number": self.issue_number,
             "content_hash": self.content_hash,
-            "embedding": self.embedding,
+            "embedding": _as_list(self.embedding),
             "created_at": self.created_at,
             "expires_at": self.expires_at,
+            "title_embedding": _as_list(self.title_embedding),
+            "body_embedding": _as_list(self.body_embedding),
         }
 
     @classmethod
@@ -125,6 +160,12 @@ class CachedEmbedding:
         return cls(**data)
 
 
+def _as_list(vector: list[float] | np.ndarray | None) -> list[float] | None:
+    if vector is None:
+        return None
+    return np.asarray(vector).tolist()
+
+
 class EntityExtractor:
     """Extracts entities from issue content."""
 
@@ -209,6 +250,10 @@ class EmbeddingProvider:
     - OpenAI (text-embedding-3-small)
     - Voyage AI (voyage-large-2)
     - Local (sentence-transformers)
+
+    get_embeddings() packs many texts into as few requests as each
+    provider's batch and token limits allow and runs up to max_concurrency
+    requests at once. A failed request only loses the texts in its batch.
     """
 
     def __init__(
@@ -216,10 +261,16 @@ class EmbeddingProvider:
         provider: str = "openai",
         api_key: str | None = None,
         model: str | None = None,
+        base_url: str | None = None,
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
     ):
         self.provider = provider
         self.api_key = api_key
         self.model = model or self._default_model()
+        self.base_url = base_url
+        self.max_concurrency = max(1, max_concurrency)
+        self._openai_client: Any = None
+        self._local_model: Any = None
 
     def _default_model(self) -> str:
         defaults = {
@@ -229,62 +280,157 @@ class EmbeddingProvider:
         }
         return defaults.get(self.provider, "text-embedding-3-small")
 
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 characters per token)."""
+        return len(text) // 4 + 1
+
+    def _pack_batches(self, texts: list[str]) -> list[list[int]]:
+        """Group text indices into requests within the provider's limits."""
+        max_inputs, max_tokens = EMBEDDING_BATCH_LIMITS.get(
+            self.provider, EMBEDDING_BATCH_LIMITS["local"]
+        )
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+        for i, text in enumerate(texts):
+            tokens = self._estimate_tokens(text)
+            if current and (
+                len(current) >= max_inputs
+                or (max_tokens is not None and current_tokens + tokens > max_tokens)
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
     async def get_embedding(self, text: str) -> list[float]:
         """Get embedding for text."""
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, texts: list[str]) -> list[list[float] | None]:
+        """
+        Get embeddings for many texts with batched, concurrent requests.
+
+        Identical texts are only embedded once.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts; None for texts whose batch
+            failed while other batches succeeded
+
+        Raises:
+            Exception: The first batch's error, if every batch failed
+        """
+        if not texts:
+            return []
+
+        # Deduplicate (after truncation) while preserving first-seen order
+        positions: dict[str, int] = {}
+        for text in texts:
+            positions.setdefault(text[:EMBEDDING_MAX_INPUT_CHARS], len(positions))
+        unique_texts = list(positions)
+        vectors: list[list[float] | None] = [None] * len(unique_texts)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_batch(batch: list[int]) -> None:
+            async with semaphore:
+                embedded = await self._embed_batch([unique_texts[i] for i in batch])
+            if len(embedded) != len(batch):
+                raise Exception(
+                    f"{self.provider} returned {len(embedded)} embeddings "
+                    f"for {len(batch)} inputs"
+                )
+            for i, vector in zip(batch, embedded):
+                vectors[i] = vector
+
+        batches = self._pack_batches(unique_texts)
+        results = await asyncio.gather(
+            *(run_batch(batch) for batch in batches), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for error in errors:
+            if not isinstance(error, Exception):
+                raise error  # Cancellation
+        if errors and len(errors) == len(batches):
+            raise errors[0]
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error embedding a batch of {len(batch)} texts with "
+                    f"{self.provider}: {result}"
+                )
+        return [vectors[positions[text[:EMBEDDING_MAX_INPUT_CHARS]]] for text in texts]
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed one packed batch with the configured provider."""
         if self.provider == "openai":
-            return await self._openai_embedding(text)
+            return await self._openai_embeddings(texts)
         elif self.provider == "voyage":
-            return await self._voyage_embedding(text)
+            return await self._voyage_embeddings(texts)
         else:
-            return await self._local_embedding(text)
+            return await self._local_embeddings(texts)
 
-    async def _openai_embedding(self, text: str) -> list[float]:
-        """Get embedding from OpenAI."""
+    async def _openai_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Get embeddings from OpenAI."""
         try:
             import openai
 
-            client = openai.AsyncOpenAI(api_key=self.api_key)
-            response = await client.embeddings.create(
+            if self._openai_client is None:
+                self._openai_client = openai.AsyncOpenAI(
+                    api_key=self.api_key, base_url=self.base_url
+                )
+            response = await self._openai_client.embeddings.create(
                 model=self.model,
-                input=text[:8000],  # Limit input
+                input=texts,
             )
-            return response.data[0].embedding
+            return [item.embedding for item in sorted(response.data, key=_by_index)]
         except Exception as e:
             logger.error(f"OpenAI embedding error: {e}")
             raise Exception(
                 f"OpenAI embeddings required but failed: {e}. Configure OPENAI_API_KEY or use 'local' provider."
             )
 
-    async def _voyage_embedding(self, text: str) -> list[float]:
-        """Get embedding from Voyage AI."""
+    async def _voyage_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Get embeddings from Voyage AI."""
         try:
             import httpx
 
-            async with httpx.AsyncClient() as client:
+            base_url = self.base_url or "https://api.voyageai.com/v1"
+            async with httpx.AsyncClient(timeout=60.0) as client:
                 response = await client.post(
-                    "https://api.voyageai.com/v1/embeddings",
+                    f"{base_url.rstrip('/')}/embeddings",
                     headers={"Authorization": f"Bearer {self.api_key}"},
                     json={
                         "model": self.model,
-                        "input": text[:8000],
+                        "input": texts,
                     },
                 )
                 data = response.json()
-                return data["data"][0]["embedding"]
+                return [
+                    item["embedding"] for item in sorted(data["data"], key=_by_index)
+                ]
         except Exception as e:
             logger.error(f"Voyage embedding error: {e}")
             raise Exception(
                 f"Voyage embeddings required but failed: {e}. Configure VOYAGE_API_KEY or use 'local' provider."
             )
 
-    async def _local_embedding(self, text: str) -> list[float]:
-        """Get embedding from local model."""
+    async def _local_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Get embeddings from local model."""
         try:
-            from sentence_transformers import SentenceTransformer
+            if self._local_model is None:
+                from sentence_transformers import SentenceTransformer
 
-            model = SentenceTransformer(self.model)
-            embedding = model.encode(text[:8000])
-            return embedding.tolist()
+                self._local_model = SentenceTransformer(self.model)
+            # encode() is CPU-bound; keep the event loop responsive
+            embeddings = await asyncio.to_thread(self._local_model.encode, texts)
+            return [embedding.tolist() for embedding in embeddings]
         except Exception as e:
             logger.error(f"Local embedding error: {e}")
             raise Exception(
@@ -292,10 +438,22 @@ class EmbeddingProvider:
             )
 
 
+def _by_index(item: Any) -> int:
+    """Sort key for embedding API results, which carry their input index."""
+    if isinstance(item, dict):
+        return item.get("index", 0)
+    return getattr(item, "index", 0) or 0
+
+
 class DuplicateDetector:
     """
     Semantic duplicate detection for GitHub issues.
 
+    Embeddings (full text, title-only and body-only) are cached per issue and
+    kept in a per-repo EmbeddingIndex, so a lookup against thousands of open
+    issues is a single matrix-vector product and never re-embeds known content.
+    Entity overlap is only computed for the top candidates.
+
     Usage:
         detector = DuplicateDetector(
             cache_dir=Path(".auto-claude/github/embeddings"),
@@ -332,9 +490,12 @@ class DuplicateDetector:
         )
         self.entity_extractor = EntityExtractor()
 
-    def _get_cache_file(self, repo: str) -> Path:
-        safe_name = repo.replace("/", "_")
-        return self.cache_dir / f"{safe_name}_embeddings.json"
+        # In-memory state per repo: parsed cache file and vectorized index
+        self._caches: dict[str, dict[int, CachedEmbedding]] = {}
+        self._indexes: dict[str, EmbeddingIndex] = {}
+
+    def _get_store(self, repo: str) -> EmbeddingCacheStore:
+        return EmbeddingCacheStore(self.cache_dir, repo)
 
     def _content_hash(self, title: str, body: str) -> str:
         """Generate hash of issue content."""
@@ -342,31 +503,135 @@ class DuplicateDetector:
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
     def _load_cache(self, repo: str) -> dict[int, CachedEmbedding]:
-        """Load embedding cache for a repo."""
-        cache_file = self._get_cache_file(repo)
-        if not cache_file.exists():
-            return {}
+        """Load embedding cache for a repo (vectors are memory-mapped)."""
+        cache = {}
+        for record in self._get_store(repo).load():
+            embedding = CachedEmbedding.from_dict(record)
+            cache[embedding.issue_number] = embedding
+        return cache
+
+    def _save_cache(self, repo: str, entries: list[CachedEmbedding]) -> None:
+        """Append new or updated embeddings to the repo's cache."""
+        try:
+            self._get_store(repo).put_many(entries)
+        except Exception as e:
+            logger.warning(f"Failed to save embedding cache for {repo}: {e}")
+
+    def _get_repo_cache(self, repo: str) -> dict[int, CachedEmbedding]:
+        """Return the in-memory cache for a repo, loading it from disk once."""
+        if repo not in self._caches:
+            self._caches[repo] = self._load_cache(repo)
+        return self._caches[repo]
+
+    def _get_index(self, repo: str) -> EmbeddingIndex:
+        if repo not in self._indexes:
+            self._indexes[repo] = EmbeddingIndex()
+        return self._indexes[repo]
+
+    def _new_cache_entry(
+        self, issue_number: int, content_hash: str, embedding: list[float]
+    ) -> CachedEmbedding:
+        now = datetime.now(timezone.utc)
+        return CachedEmbedding(
+            issue_number=issue_number,
+            content_hash=content_hash,
+            embedding=embedding,
+            created_at=now.isoformat(),
+            expires_at=(now + timedelta(hours=self.cache_ttl_hours)).isoformat(),
+        )
 
-        with open(cache_file, encoding="utf-8") as f:
-            data = json.load(f)
+    async def _ensure_embeddings(
+        self,
+        repo: str,
+        issues: list[dict[str, Any]],
+    ) -> tuple[EmbeddingIndex, int]:
+        """
+        Make sure every issue has cached full/title/body embeddings and is
+        present in the repo index with its current content.
 
-        cache = {}
-        for item in data.get("embeddings", []):
-            embedding = CachedEmbedding.from_dict(item)
-            if not embedding.is_expired():
-                cache[embedding.issue_number] = embedding
+        Missing or stale embeddings for all issues are requested in one
+        batched get_embeddings() call, and the cache file is written at most
+        once per call.
 
-        return cache
+        Returns:
+            (index, number of issues that are indexed with current content)
+        """
+        cache = self._get_repo_cache(repo)
+        index = self._get_index(repo)
 
-    def _save_cache(self, repo: str, cache: dict[int, CachedEmbedding]) -> None:
-        """Save embedding cache for a repo."""
-        cache_file = self._get_cache_file(repo)
-        data = {
-            "embeddings": [e.to_dict() for e in cache.values()],
-            "last_updated": datetime.now(timezone.utc).isoformat(),
-        }
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        # Plan which component texts each issue still needs
+        plan: list[tuple[int, str, str, dict[str, str]]] = []
+        requested: dict[str, None] = {}
+        for issue in issues:
+            number = issue["number"]
+            title = issue.get("title", "") or ""
+            body = issue.get("body", "") or ""
+            content_hash = self._content_hash(title, body)
+
+            cached = cache.get(number)
+            if cached is not None and (
+                cached.content_hash != content_hash or cached.is_expired()
+            ):
+                cached = None
+
+            needs: dict[str, str] = {}
+            if cached is None:
+                needs["full"] = f"{title}\n\n{body}"
+            if cached is None or cached.title_embedding is None:
+                needs["title"] = title
+            if body and (cached is None or cached.body_embedding is None):
+                needs["body"] = body
+            for text in needs.values():
+                requested[text] = None
+            plan.append((number, body, content_hash, needs))
+
+        vectors: dict[str, list[float]] = {}
+        if requested:
+            texts = list(requested)
+            try:
+                embedded = await self.embedding_provider.get_embeddings(texts)
+                vectors = {
+                    text: vector
+                    for text, vector in zip(texts, embedded)
+                    if vector is not None
+                }
+            except Exception as e:
+                logger.error(f"Error computing embeddings for {len(texts)} texts: {e}")
+
+        # Store results in the cache in bulk and refresh the index
+        updated: list[CachedEmbedding] = []
+        ready = 0
+        for number, body, content_hash, needs in plan:
+            if any(text not in vectors for text in needs.values()):
+                continue
+            if "full" in needs:
+                cache[number] = self._new_cache_entry(
+                    number, content_hash, vectors[needs["full"]]
+                )
+            cached = cache[number]
+            if "title" in needs:
+                cached.title_embedding = vectors[needs["title"]]
+            if "body" in needs:
+                cached.body_embedding = vectors[needs["body"]]
+            if needs:
+                updated.append(cached)
+
+            try:
+                if index.content_hash(number) != content_hash:
+                    index.upsert(
+                        number,
+                        content_hash,
+                        cached.embedding,
+                        cached.title_embedding,
+                        cached.body_embedding if body else None,
+                    )
+                ready += 1
+            except ValueError as e:
+                logger.error(f"Error indexing embedding for #{number}: {e}")
+
+        self._save_cache(repo, updated)
+
+        return index, ready
 
     async def get_embedding(
         self,
@@ -376,7 +641,7 @@ class DuplicateDetector:
         body: str,
     ) -> list[float]:
         """Get embedding for an issue, using cache if available."""
-        cache = self._load_cache(repo)
+        cache = self._get_repo_cache(repo)
         content_hash = self._content_hash(title, body)
 
         # Check cache
@@ -390,15 +655,10 @@ class DuplicateDetector:
         embedding = await self.embedding_provider.get_embedding(content)
 
         # Cache it
-        now = datetime.now(timezone.utc)
-        cache[issue_number] = CachedEmbedding(
-            issue_number=issue_number,
-            content_hash=content_hash,
-            embedding=embedding,
-            created_at=now.isoformat(),
-            expires_at=(now + timedelta(hours=self.cache_ttl_hours)).isoformat(),
+        cache[issue_number] = self._new_cache_entry(
+            issue_number, content_hash, embedding
         )
-        self._save_cache(repo, cache)
+        self._save_cache(repo, [cache[issue_number]])
 
         return embedding
 
@@ -407,58 +667,27 @@ class DuplicateDetector:
         if len(a) != len(b):
             return 0.0
 
-        dot_product = sum(x * y for x, y in zip(a, b))
-        magnitude_a = sum(x * x for x in a) ** 0.5
-        magnitude_b = sum(x * x for x in b) ** 0.5
+        vec_a = np.asarray(a, dtype=np.float64)
+        vec_b = np.asarray(b, dtype=np.float64)
+        magnitude_a = float(np.linalg.norm(vec_a))
+        magnitude_b = float(np.linalg.norm(vec_b))
 
         if magnitude_a == 0 or magnitude_b == 0:
             return 0.0
 
-        return dot_product / (magnitude_a * magnitude_b)
+        return float(vec_a @ vec_b) / (magnitude_a * magnitude_b)
 
-    async def compare_issues(
+    def _build_result(
         self,
-        repo: str,
+        index: EmbeddingIndex,
         issue_a: dict[str, Any],
         issue_b: dict[str, Any],
     ) -> SimilarityResult:
-        """Compare two issues for similarity."""
-        # Get embeddings
-        embed_a = await self.get_embedding(
-            repo,
-            issue_a["number"],
-            issue_a.get("title", ""),
-            issue_a.get("body", ""),
-        )
-        embed_b = await self.get_embedding(
-            repo,
-            issue_b["number"],
-            issue_b.get("title", ""),
-            issue_b.get("body", ""),
+        """Build a SimilarityResult for two issues already in the index."""
+        overall_score, title_score, body_score = index.pair_scores(
+            issue_a["number"], issue_b["number"]
         )
 
-        # Calculate embedding similarity
-        overall_score = self.cosine_similarity(embed_a, embed_b)
-
-        # Get title-only embeddings
-        title_embed_a = await self.embedding_provider.get_embedding(
-            issue_a.get("title", "")
-        )
-        title_embed_b = await self.embedding_provider.get_embedding(
-            issue_b.get("title", "")
-        )
-        title_score = self.cosine_similarity(title_embed_a, title_embed_b)
-
-        # Get body-only score (if bodies exist)
-        body_a = issue_a.get("body", "")
-        body_b = issue_b.get("body", "")
-        if body_a and body_b:
-            body_embed_a = await self.embedding_provider.get_embedding(body_a)
-            body_embed_b = await self.embedding_provider.get_embedding(body_b)
-            body_score = self.cosine_similarity(body_embed_a, body_embed_b)
-        else:
-            body_score = 0.0
-
         # Extract and compare entities
         entities_a = self.entity_extractor.extract(
             f"{issue_a.get('title', '')} {issue_a.get('body', '')}"
@@ -493,6 +722,20 @@ class DuplicateDetector:
             explanation=explanation,
         )
 
+    async def compare_issues(
+        self,
+        repo: str,
+        issue_a: dict[str, Any],
+        issue_b: dict[str, Any],
+    ) -> SimilarityResult:
+        """Compare two issues for similarity."""
+        index, ready = await self._ensure_embeddings(repo, [issue_a, issue_b])
+        if ready < 2:
+            raise ValueError(
+                f"Could not embed issues #{issue_a['number']} and #{issue_b['number']}"
+            )
+        return self._build_result(index, issue_a, issue_b)
+
     def _generate_explanation(
         self,
         overall: float,
@@ -547,16 +790,33 @@ class DuplicateDetector:
             "title": title,
             "body": body,
         }
+        candidates = {
+            issue["number"]: issue
+            for issue in open_issues
+            if issue.get("number") is not None and issue["number"] != issue_number
+        }
 
-        results = []
-        for issue in open_issues:
-            if issue.get("number") == issue_number:
-                continue
+        index, _ = await self._ensure_embeddings(
+            repo, [*candidates.values(), target_issue]
+        )
+        query = index.vector(issue_number)
+        if query is None:
+            return []
+
+        matches = index.search(
+            query,
+            k=limit,
+            candidates=candidates.keys(),
+            exclude=(issue_number,),
+            min_score=self.similar_threshold,
+        )
 
+        results = []
+        for number, _score in matches:
             try:
-                result = await self.compare_issues(repo, target_issue, issue)
-                if result.is_similar:
-                    results.append(result)
+                results.append(
+                    self._build_result(index, target_issue, candidates[number])
+                )
             except Exception as e:
                 logger.error(f"Error comparing issues: {e}")
 
@@ -564,6 +824,35 @@ class DuplicateDetector:
         results.sort(key=lambda r: r.overall_score, reverse=True)
         return results[:limit]
 
+    async def find_duplicate_pairs(
+        self,
+        repo: str,
+        issues: list[dict[str, Any]],
+        threshold: float | None = None,
+    ) -> list[SimilarityResult]:
+        """
+        Find every pair of similar issues in one pass (batch triage).
+
+        Uses an all-pairs matrix product over the indexed embeddings instead
+        of comparing issues one pair at a time.
+
+        Args:
+            repo: Repository in owner/repo format
+            issues: Issues to compare with each other
+            threshold: Minimum overall similarity (defaults to similar_threshold)
+
+        Returns:
+            List of SimilarityResult sorted by similarity
+        """
+        min_score = self.similar_threshold if threshold is None else threshold
+        by_number = {issue["number"]: issue for issue in issues}
+        index, _ = await self._ensure_embeddings(repo, list(by_number.values()))
+
+        results = []
+        for a, b, _score in index.all_pairs(min_score, candidates=by_number.keys()):
+            results.append(self._build_result(index, by_number[a], by_number[b]))
+        return results
+
     async def precompute_embeddings(
         self,
         repo: str,
@@ -579,23 +868,11 @@ class DuplicateDetector:
         Returns:
             Number of embeddings computed
         """
-        count = 0
-        for issue in issues:
-            try:
-                await self.get_embedding(
-                    repo,
-                    issue["number"],
-                    issue.get("title", ""),
-                    issue.get("body", ""),
-                )
-                count += 1
-            except Exception as e:
-                logger.error(f"Error computing embedding for #{issue['number']}: {e}")
-
+        _, count = await self._ensure_embeddings(repo, issues)
         return count
 
     def clear_cache(self, repo: str) -> None:
         """Clear embedding cache for a repo."""
-        cache_file = self._get_cache_file(repo)
-        if cache_file.exists():
-            cache_file.unlink()
+        self._caches.pop(repo, None)
+        self._indexes.pop(repo, None)
+        self._get_store(repo).clear()
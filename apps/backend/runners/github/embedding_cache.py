@@ -0,0 +1,337 @@
+"""
+Binary Embedding Cache
+======================
+
+Memory-mapped on-disk store for issue embeddings, used by duplicates.py:
+- Vectors live in a raw float32 file opened with numpy.memmap (zero-copy loads)
+- Each issue occupies one slot of three rows: full, title-only, body-only
+- A small JSON sidecar maps issue number -> slot, content hash and expiry
+- New embeddings are appended; replaced or expired slots become tombstones
+- Tombstones are compacted into a new data generation once they pile up
+
+Files per repo (in cache_dir):
+    {repo}_embeddings.idx.json      sidecar index
+    {repo}_embeddings.{gen}.f32     vector data for the current generation
+
+Compaction writes a new generation and then swaps the sidecar, so a crash
+at any point leaves a consistent index.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    from .file_lock import atomic_write
+except (ImportError, ValueError, SystemError):
+    from file_lock import atomic_write
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+VECTORS_PER_SLOT = 3  # full, title, body
+COMPACT_MIN_DEAD_SLOTS = 64
+COMPACT_DEAD_RATIO = 0.5  # Compact when dead slots exceed this share of live ones
+_COMPACT_CHUNK_SLOTS = 1024
+
+_FLAG_TITLE = 1
+_FLAG_BODY = 2
+
+
+class EmbeddingCacheStore:
+    """
+    Append-only, memory-mapped embedding cache for one repository.
+
+    Usage:
+        store = EmbeddingCacheStore(cache_dir, "owner/repo")
+        records = store.load()           # list of CachedEmbedding dicts
+        store.put_many([cached, ...])    # append new/updated embeddings
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        repo: str,
+        compact_min_dead: int = COMPACT_MIN_DEAD_SLOTS,
+        compact_ratio: float = COMPACT_DEAD_RATIO,
+    ):
+        self.cache_dir = cache_dir
+        self.safe_name = repo.replace("/", "_")
+        self.compact_min_dead = compact_min_dead
+        self.compact_ratio = compact_ratio
+
+    @property
+    def index_file(self) -> Path:
+        return self.cache_dir / f"{self.safe_name}_embeddings.idx.json"
+
+    @property
+    def legacy_file(self) -> Path:
+        """Pre-binary cache format (JSON float lists)."""
+        return self.cache_dir / f"{self.safe_name}_embeddings.json"
+
+    def _data_file(self, generation: int) -> Path:
+        return self.cache_dir / f"{self.safe_name}_embeddings.{generation}.f32"
+
+    # ------------------------------------------------------------------
+    # Sidecar index
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _empty_index() -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "dimension": None,
+            "generation": 0,
+            "records": {},
+        }
+
+    def _read_index(self) -> dict[str, Any] | None:
+        if not self.index_file.exists():
+            return None
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable embedding index: {e}")
+            return None
+        if index.get("version") != INDEX_VERSION:
+            return None
+        return index
+
+    def _write_index(self, index: dict[str, Any]) -> None:
+        index["last_updated"] = datetime.now(timezone.utc).isoformat()
+        with atomic_write(self.index_file) as f:
+            json.dump(index, f, separators=(",", ":"))
+
+    # ------------------------------------------------------------------
+    # Vector data
+    # ------------------------------------------------------------------
+
+    def _slot_bytes(self, dimension: int) -> int:
+        return VECTORS_PER_SLOT * dimension * 4
+
+    def _open_matrix(self, index: dict[str, Any]) -> np.ndarray | None:
+        """Memory-map the current data file as (slots, 3, dimension)."""
+        dimension = index.get("dimension")
+        data_file = self._data_file(index["generation"])
+        if not dimension or not data_file.exists():
+            return None
+        slots = data_file.stat().st_size // self._slot_bytes(dimension)
+        if slots == 0:
+            return None
+        return np.memmap(
+            data_file,
+            dtype=np.float32,
+            mode="r",
+            shape=(slots, VECTORS_PER_SLOT, dimension),
+        )
+
+    def _append_slots(self, index: dict[str, Any], block: np.ndarray) -> int:
+        """Append slots to the data file and return the first new slot."""
+        data_file = self._data_file(index["generation"])
+        slot_bytes = self._slot_bytes(index["dimension"])
+        data_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(data_file, "ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size % slot_bytes:
+                # Drop a partially written slot left by an interrupted append
+                size -= size % slot_bytes
+                f.truncate(size)
+                f.seek(size)
+            f.write(np.ascontiguousarray(block, dtype=np.float32).tobytes())
+        return size // slot_bytes
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def load(self) -> list[dict[str, Any]]:
+        """
+        Load unexpired cache records.
+
+        Vectors are read-only views into the memory-mapped data file, so
+        loading does not copy or parse them.
+        """
+        index = self._read_index()
+        if index is None:
+            self._migrate_legacy()
+            index = self._read_index()
+            if index is None:
+                return []
+
+        matrix = self._open_matrix(index)
+        if matrix is None:
+            return []
+
+        now = datetime.now(timezone.utc)
+        records = []
+        for number, (slot, content_hash, created_at, expires_at, flags) in index[
+            "records"
+        ].items():
+            if slot >= matrix.shape[0] or _is_expired(expires_at, now):
+                continue
+            records.append(
+                {
+                    "issue_number": int(number),
+                    "content_hash": content_hash,
+                    "embedding": matrix[slot, 0],
+                    "created_at": created_at,
+                    "expires_at": expires_at,
+                    "title_embedding": matrix[slot, 1] if flags & _FLAG_TITLE else None,
+                    "body_embedding": matrix[slot, 2] if flags & _FLAG_BODY else None,
+                }
+            )
+        return records
+
+    def put_many(self, entries: list[Any]) -> None:
+        """
+        Append new or updated cache entries (CachedEmbedding objects).
+
+        Older slots for the same issues become tombstones and are reclaimed
+        by compaction.
+        """
+        if not entries:
+            return
+
+        index = self._read_index() or self._empty_index()
+        dimension = len(entries[0].embedding)
+        if index["dimension"] not in (None, dimension):
+            logger.info(
+                f"Embedding dimension changed ({index['dimension']} -> "
+                f"{dimension}); resetting cache for {self.safe_name}"
+            )
+            self.clear()
+            index = self._empty_index()
+        index["dimension"] = dimension
+
+        block = np.zeros((len(entries), VECTORS_PER_SLOT, dimension), np.float32)
+        flags = []
+        for i, entry in enumerate(entries):
+            block[i, 0] = entry.embedding
+            entry_flags = 0
+            if entry.title_embedding is not None:
+                block[i, 1] = entry.title_embedding
+                entry_flags |= _FLAG_TITLE
+            if entry.body_embedding is not None:
+                block[i, 2] = entry.body_embedding
+                entry_flags |= _FLAG_BODY
+            flags.append(entry_flags)
+
+        first_slot = self._append_slots(index, block)
+        records = index["records"]
+        for i, entry in enumerate(entries):
+            records[str(entry.issue_number)] = [
+                first_slot + i,
+                entry.content_hash,
+                entry.created_at,
+                entry.expires_at,
+                flags[i],
+            ]
+        index["slots"] = first_slot + len(entries)
+
+        if self._should_compact(index):
+            self._compact(index)
+        else:
+            self._write_index(index)
+
+    def _should_compact(self, index: dict[str, Any]) -> bool:
+        now = datetime.now(timezone.utc)
+        live = sum(
+            1 for record in index["records"].values() if not _is_expired(record[3], now)
+        )
+        dead = index.get("slots", 0) - live
+        return dead >= self.compact_min_dead and dead > live * self.compact_ratio
+
+    def _compact(self, index: dict[str, Any]) -> None:
+        """Copy live slots into a new data generation, dropping tombstones."""
+        matrix = self._open_matrix(index)
+        if matrix is None:
+            self._write_index(index)
+            return
+
+        now = datetime.now(timezone.utc)
+        live = sorted(
+            (
+                (number, record)
+                for number, record in index["records"].items()
+                if record[0] < matrix.shape[0] and not _is_expired(record[3], now)
+            ),
+            key=lambda item: item[1][0],
+        )
+        old_generation = index["generation"]
+        new_generation = old_generation + 1
+        new_file = self._data_file(new_generation)
+
+        with open(new_file, "wb") as f:
+            for start in range(0, len(live), _COMPACT_CHUNK_SLOTS):
+                chunk = live[start : start + _COMPACT_CHUNK_SLOTS]
+                slots = [record[0] for _, record in chunk]
+                f.write(np.ascontiguousarray(matrix[slots]).tobytes())
+
+        compacted = dict(index)
+        compacted["generation"] = new_generation
+        compacted["records"] = {
+            number: [new_slot, *record[1:]]
+            for new_slot, (number, record) in enumerate(live)
+        }
+        compacted["slots"] = len(live)
+        del matrix
+
+        # Swap the sidecar before removing the old generation so the index
+        # never points at missing data.
+        self._write_index(compacted)
+        try:
+            self._data_file(old_generation).unlink()
+        except OSError:
+            # Still mapped elsewhere (e.g. on Windows); removed on clear()
+            pass
+
+    def clear(self) -> None:
+        """Delete all cache files for this repo."""
+        for path in self.cache_dir.glob(f"{self.safe_name}_embeddings.*"):
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove {path}: {e}")
+
+    def _migrate_legacy(self) -> None:
+        """Convert a legacy JSON cache file into the binary format."""
+        if not self.legacy_file.exists():
+            return
+
+        # Imported here to avoid a circular import with duplicates.py
+        try:
+            from .duplicates import CachedEmbedding
+        except (ImportError, ValueError, SystemError):
+            from duplicates import CachedEmbedding
+
+        try:
+            with open(self.legacy_file, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = [
+                entry
+                for entry in (
+                    CachedEmbedding.from_dict(item)
+                    for item in data.get("embeddings", [])
+                )
+                if not entry.is_expired()
+            ]
+            self.put_many(entries)
+            self.legacy_file.unlink()
+            logger.info(
+                f"Migrated {len(entries)} cached embeddings for {self.safe_name} "
+                f"to binary format"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to migrate legacy embedding cache: {e}")
+
+
+def _is_expired(expires_at: str, now: datetime) -> bool:
+    return now > datetime.fromisoformat(expires_at)
@@ -0,0 +1,256 @@
+"""
+Vectorized Embedding Index
+==========================
+
+In-memory similarity engine for issue embeddings, used by duplicates.py:
+- Keeps full, title-only and body-only embeddings per issue
+- Stores them as L2-normalized float32 matrices (one row per issue)
+- Answers top-k queries with a single matrix-vector product
+- Finds all similar pairs with blocked matrix-matrix products for batch triage
+
+Usage:
+    index = EmbeddingIndex()
+    index.upsert(123, content_hash, full, title, body)
+    matches = index.search(query_vector, k=5, min_score=0.70)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Rows scored per block when computing all-pairs similarity. Keeps the
+# temporary score matrix at block x n instead of n x n.
+PAIR_BLOCK_SIZE = 1024
+
+_INITIAL_CAPACITY = 64
+
+
+def normalize(vector: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Return a float32 unit vector (zero vectors stay zero)."""
+    array = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(array))
+    if norm == 0.0:
+        return array.copy()
+    return array / norm
+
+
+class EmbeddingIndex:
+    """
+    Normalized embedding matrices for the issues of one repository.
+
+    Because every stored row is normalized, cosine similarity is a plain dot
+    product and scoring N issues is one BLAS call instead of N Python loops.
+    """
+
+    def __init__(self, dimension: int | None = None):
+        self.dimension = dimension
+        self._size = 0
+        self._numbers: list[int] = []
+        self._hashes: list[str] = []
+        self._rows: dict[int, int] = {}
+        self._full = np.empty((0, 0), dtype=np.float32)
+        self._title = np.empty((0, 0), dtype=np.float32)
+        self._body = np.empty((0, 0), dtype=np.float32)
+        self._has_body = np.empty(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, issue_number: object) -> bool:
+        return issue_number in self._rows
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def _allocate(self, capacity: int) -> None:
+        dim = self.dimension or 0
+        full = np.zeros((capacity, dim), dtype=np.float32)
+        title = np.zeros((capacity, dim), dtype=np.float32)
+        body = np.zeros((capacity, dim), dtype=np.float32)
+        has_body = np.zeros(capacity, dtype=bool)
+        if self._size:
+            full[: self._size] = self._full[: self._size]
+            title[: self._size] = self._title[: self._size]
+            body[: self._size] = self._body[: self._size]
+            has_body[: self._size] = self._has_body[: self._size]
+        self._full, self._title, self._body = full, title, body
+        self._has_body = has_body
+
+    def upsert(
+        self,
+        issue_number: int,
+        content_hash: str,
+        full: Sequence[float],
+        title: Sequence[float],
+        body: Sequence[float] | None = None,
+    ) -> None:
+        """Insert or replace the embeddings for an issue."""
+        full_vec = normalize(full)
+        if self.dimension is None:
+            self.dimension = int(full_vec.shape[0])
+        vectors = [full_vec, normalize(title)]
+        if body is not None:
+            vectors.append(normalize(body))
+        for vec in vectors:
+            if vec.shape[0] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vec.shape[0]} does not match "
+                    f"index dimension {self.dimension}"
+                )
+
+        row = self._rows.get(issue_number)
+        if row is None:
+            if self._size >= self._full.shape[0]:
+                self._allocate(max(_INITIAL_CAPACITY, self._full.shape[0] * 2))
+            row = self._size
+            self._size += 1
+            self._rows[issue_number] = row
+            self._numbers.append(issue_number)
+            self._hashes.append(content_hash)
+        else:
+            self._hashes[row] = content_hash
+
+        self._full[row] = vectors[0]
+        self._title[row] = vectors[1]
+        if body is not None:
+            self._body[row] = vectors[2]
+            self._has_body[row] = True
+        else:
+            self._body[row] = 0.0
+            self._has_body[row] = False
+
+    def remove(self, issue_number: int) -> bool:
+        """Remove an issue, moving the last row into its slot."""
+        row = self._rows.pop(issue_number, None)
+        if row is None:
+            return False
+        last = self._size - 1
+        if row != last:
+            moved = self._numbers[last]
+            self._numbers[row] = moved
+            self._hashes[row] = self._hashes[last]
+            self._full[row] = self._full[last]
+            self._title[row] = self._title[last]
+            self._body[row] = self._body[last]
+            self._has_body[row] = self._has_body[last]
+            self._rows[moved] = row
+        self._numbers.pop()
+        self._hashes.pop()
+        self._size = last
+        return True
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def content_hash(self, issue_number: int) -> str | None:
+        row = self._rows.get(issue_number)
+        return None if row is None else self._hashes[row]
+
+    def vector(self, issue_number: int, kind: str = "full") -> np.ndarray | None:
+        """Return the normalized stored vector ("full", "title" or "body")."""
+        row = self._rows.get(issue_number)
+        if row is None:
+            return None
+        if kind == "title":
+            return self._title[row]
+        if kind == "body":
+            return self._body[row] if self._has_body[row] else None
+        return self._full[row]
+
+    def pair_scores(self, issue_a: int, issue_b: int) -> tuple[float, float, float]:
+        """Return (overall, title, body) cosine scores for two indexed issues."""
+        row_a = self._rows[issue_a]
+        row_b = self._rows[issue_b]
+        overall = float(self._full[row_a] @ self._full[row_b])
+        title = float(self._title[row_a] @ self._title[row_b])
+        if self._has_body[row_a] and self._has_body[row_b]:
+            body = float(self._body[row_a] @ self._body[row_b])
+        else:
+            body = 0.0
+        return overall, title, body
+
+    def _candidate_rows(self, candidates: Iterable[int] | None) -> np.ndarray:
+        if candidates is None:
+            return np.arange(self._size)
+        rows = [self._rows[n] for n in candidates if n in self._rows]
+        return np.unique(np.asarray(rows, dtype=np.int64))
+
+    def search(
+        self,
+        query: Sequence[float] | np.ndarray,
+        k: int,
+        candidates: Iterable[int] | None = None,
+        exclude: Iterable[int] = (),
+        min_score: float = -1.0,
+    ) -> list[tuple[int, float]]:
+        """
+        Return up to k (issue_number, score) pairs most similar to query.
+
+        Args:
+            query: Query embedding (normalized internally)
+            k: Maximum number of matches
+            candidates: Restrict matches to these issue numbers
+            exclude: Issue numbers never returned
+            min_score: Minimum cosine similarity to include
+
+        Returns:
+            Matches sorted by score, descending
+        """
+        if self._size == 0 or k <= 0:
+            return []
+        q = normalize(query)
+        if q.shape[0] != self.dimension:
+            return []
+
+        scores = self._full[: self._size] @ q
+        allowed = np.zeros(self._size, dtype=bool)
+        allowed[self._candidate_rows(candidates)] = True
+        for number in exclude:
+            row = self._rows.get(number)
+            if row is not None:
+                allowed[row] = False
+
+        keep = np.flatnonzero(allowed & (scores >= min_score))
+        if keep.size > k:
+            keep = keep[np.argpartition(scores[keep], -k)[-k:]]
+        order = keep[np.argsort(-scores[keep], kind="stable")]
+        return [(self._numbers[row], float(scores[row])) for row in order]
+
+    def all_pairs(
+        self,
+        min_score: float,
+        candidates: Iterable[int] | None = None,
+    ) -> list[tuple[int, int, float]]:
+        """
+        Return every (issue_a, issue_b, score) pair with score >= min_score.
+
+        Pairs are unordered (each reported once) and sorted by score,
+        descending.
+        """
+        rows = self._candidate_rows(candidates)
+        n = rows.size
+        if n < 2:
+            return []
+
+        matrix = self._full[rows]
+        found: list[tuple[int, int, float]] = []
+        for start in range(0, n, PAIR_BLOCK_SIZE):
+            stop = min(start + PAIR_BLOCK_SIZE, n)
+            block = matrix[start:stop] @ matrix.T
+            # Only keep the strict upper triangle so each pair appears once
+            block[np.arange(stop - start)[:, None] + start >= np.arange(n)] = -np.inf
+            hit_i, hit_j = np.nonzero(block >= min_score)
+            for i, j in zip(hit_i.tolist(), hit_j.tolist()):
+                found.append(
+                    (
+                        self._numbers[rows[start + i]],
+                        self._numbers[rows[j]],
+                        float(block[i, j]),
+                    )
+                )
+        found.sort(key=lambda pair: pair[2], reverse=True)
+        return found
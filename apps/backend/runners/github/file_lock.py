@@ -16,12 +16,15 @@ Example Usage:
     async with locked_write("path/to/file.json", timeout=5.0) as f:
         json.dump(data, f)
 
+Writes and deletes made through this module are reported to the storage
+ledger of the enclosing state directory (storage_ledger.py), if it has one.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import os
 import tempfile
 import time
@@ -31,6 +34,8 @@ from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
 _IS_WINDOWS = os.name == "nt"
 _WINDOWS_LOCK_SIZE = 1024 * 1024
 
@@ -211,6 +216,36 @@ class FileLock:
         return False
 
 
+def _notify_storage(filepath: Path, data: Any = None, deleted: bool = False) -> None:
+    """Report a created, replaced or deleted file to the storage ledger."""
+    try:
+        try:
+            from .storage_ledger import record_change
+        except (ImportError, ValueError, SystemError):
+            from storage_ledger import record_change
+        record_change(filepath, data=data, deleted=deleted)
+    except Exception as e:
+        # Storage accounting must never fail the write itself
+        logger.debug(f"Storage ledger update failed for {filepath}: {e}")
+
+
+def remove_file(filepath: str | Path) -> int:
+    """
+    Delete a file and report it to the storage ledger.
+
+    Returns:
+        Number of bytes freed
+
+    Raises:
+        OSError: If the file cannot be removed
+    """
+    filepath = Path(filepath)
+    size = filepath.stat().st_size
+    filepath.unlink()
+    _notify_storage(filepath, deleted=True)
+    return size
+
+
 @contextmanager
 def atomic_write(filepath: str | Path, mode: str = "w", encoding: str = "utf-8"):
     """
@@ -244,6 +279,7 @@ def atomic_write(filepath: str | Path, mode: str = "w", encoding: str = "utf-8")
 
         # Atomic replace - succeeds or fails completely
         os.replace(tmp_path, filepath)
+        _notify_storage(filepath)
 
     except Exception:
         # Clean up temp file on error
@@ -280,6 +316,19 @@ async def locked_write(
     Raises:
         FileLockTimeout: If lock cannot be acquired within timeout
     """
+    async with _locked_write(filepath, timeout, mode, encoding) as f:
+        yield f
+
+
+@asynccontextmanager
+async def _locked_write(
+    filepath: str | Path,
+    timeout: float,
+    mode: str,
+    encoding: str,
+    record_data: Any = None,
+) -> Any:
+    """locked_write() that also passes the written record to the ledger."""
     filepath = Path(filepath)
 
     # Acquire lock
@@ -308,6 +357,7 @@ async def locked_write(
             await asyncio.get_running_loop().run_in_executor(
                 None, os.replace, tmp_path, filepath
             )
+            _notify_storage(filepath, record_data)
 
         except Exception:
             # Clean up temp file on error
@@ -380,7 +430,7 @@ async def locked_json_write(
     Raises:
         FileLockTimeout: If lock cannot be acquired within timeout
     """
-    async with locked_write(filepath, timeout=timeout) as f:
+    async with _locked_write(filepath, timeout, "w", "utf-8", record_data=data) as f:
         json.dump(data, f, indent=indent)
 
 
@@ -472,6 +522,7 @@ async def locked_json_update(
             await asyncio.get_running_loop().run_in_executor(
                 None, os.replace, tmp_path, filepath
             )
+            _notify_storage(filepath, updated_data)
 
         except Exception:
             try:
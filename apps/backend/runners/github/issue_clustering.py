@@ -0,0 +1,265 @@
+"""
+Issue Clustering Engine
+=======================
+
+Sparse agglomerative clustering used by batch_issues.py:
+- Similarities are sparse adjacency maps (only related pairs are stored)
+- Keyword similarities come from an inverted index, so only issues that
+  share a keyword are ever compared
+- Average-linkage merging is driven by a priority queue with Lance-Williams
+  style updates, so each merge only touches the merged clusters' neighbours
+
+Usage:
+    similarity = build_keyword_similarity(issues)
+    clusters = agglomerative_cluster(
+        [i["number"] for i in issues], similarity, threshold=0.3, max_cluster_size=5
+    )
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+# issue_number -> {other_issue_number: similarity}, stored symmetrically
+SparseSimilarity = dict[int, dict[int, float]]
+
+# Keywords shared by more issues than this carry little signal and would make
+# the candidate pair count quadratic, so they are skipped.
+MAX_KEYWORD_POSTING = 200
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9_\-]{2,}")
+
+_STOPWORDS = frozenset(
+    {
+        "the",
+        "and",
+        "for",
+        "with",
+        "when",
+        "not",
+        "does",
+        "doesn",
+        "can",
+        "cannot",
+        "from",
+        "into",
+        "this",
+        "that",
+        "should",
+        "would",
+        "after",
+        "before",
+        "while",
+        "are",
+        "was",
+        "were",
+        "has",
+        "have",
+        "add",
+        "support",
+        "issue",
+        "bug",
+        "feature",
+        "request",
+    }
+)
+
+
+def extract_keywords(issue: dict[str, Any]) -> set[str]:
+    """Extract normalized title keywords and label names for an issue."""
+    title = (issue.get("title", "") or "").lower()
+    keywords = {
+        token for token in _TOKEN_PATTERN.findall(title) if token not in _STOPWORDS
+    }
+    for label in issue.get("labels", []) or []:
+        name = label.get("name", "") if isinstance(label, dict) else str(label)
+        if name:
+            keywords.add(f"label:{name.lower()}")
+    return keywords
+
+
+def build_keyword_similarity(
+    issues: list[dict[str, Any]],
+    min_score: float = 0.0,
+    max_posting: int = MAX_KEYWORD_POSTING,
+) -> SparseSimilarity:
+    """
+    Build Jaccard keyword similarities through an inverted index.
+
+    Only pairs of issues that share at least one keyword are scored, so the
+    cost is proportional to the number of related pairs rather than n².
+
+    Args:
+        issues: Issue dicts with number, title and labels
+        min_score: Drop pairs scoring below this
+        max_posting: Ignore keywords shared by more issues than this
+
+    Returns:
+        Symmetric sparse similarity map
+    """
+    keyword_sets = {issue["number"]: extract_keywords(issue) for issue in issues}
+
+    postings: dict[str, list[int]] = defaultdict(list)
+    for number, keywords in keyword_sets.items():
+        for keyword in keywords:
+            postings[keyword].append(number)
+
+    shared: dict[tuple[int, int], int] = defaultdict(int)
+    for numbers in postings.values():
+        if len(numbers) < 2 or len(numbers) > max_posting:
+            continue
+        numbers.sort()
+        for i, a in enumerate(numbers):
+            for b in numbers[i + 1 :]:
+                shared[(a, b)] += 1
+
+    similarity: SparseSimilarity = {}
+    for (a, b), count in shared.items():
+        union = len(keyword_sets[a]) + len(keyword_sets[b]) - count
+        score = count / union if union else 0.0
+        if score > 0.0 and score >= min_score:
+            similarity.setdefault(a, {})[b] = score
+            similarity.setdefault(b, {})[a] = score
+    return similarity
+
+
+def sparse_from_pairs(pairs: dict[tuple[int, int], float]) -> SparseSimilarity:
+    """Convert a {(a, b): score} pair map into a symmetric sparse map."""
+    similarity: SparseSimilarity = {}
+    for (a, b), score in pairs.items():
+        if a == b:
+            continue
+        similarity.setdefault(a, {})[b] = score
+        similarity.setdefault(b, {})[a] = score
+    return similarity
+
+
+def agglomerative_cluster(
+    nodes: Iterable[int],
+    similarity: SparseSimilarity,
+    threshold: float,
+    max_cluster_size: int,
+) -> list[list[int]]:
+    """
+    Average-linkage agglomerative clustering over a sparse similarity map.
+
+    Cluster similarity is the average over the known pairs between two
+    clusters (unknown pairs are ignored, not treated as zero). Each cluster
+    pair keeps a running (sum, count), which is combined on merge
+    (Lance-Williams update) instead of being recomputed. Candidate merges sit
+    in a max-heap; entries for clusters that were already merged away are
+    skipped lazily. Cluster ids are never reused, so a live entry's score is
+    always current.
+
+    Merges that would exceed max_cluster_size are skipped and clustering
+    continues with the next best pair.
+
+    Args:
+        nodes: Issue numbers to cluster
+        similarity: Sparse pairwise similarity map
+        threshold: Minimum average similarity for a merge
+        max_cluster_size: Maximum members per cluster
+
+    Returns:
+        Clusters as lists of issue numbers, in first-member order
+    """
+    order = list(dict.fromkeys(nodes))
+    position = {node: i for i, node in enumerate(order)}
+
+    # Cluster ids start as node positions; merged clusters get new ids
+    members: dict[int, list[int]] = {i: [node] for i, node in enumerate(order)}
+    links: dict[int, dict[int, list[float]]] = {i: {} for i in members}
+
+    for node, neighbours in similarity.items():
+        a = position.get(node)
+        if a is None:
+            continue
+        for other, score in neighbours.items():
+            b = position.get(other)
+            if b is None or b == a or b in links[a]:
+                continue
+            links[a][b] = [score, 1]
+            links[b][a] = [score, 1]
+
+    heap: list[tuple[float, int, int]] = []
+
+    def push(a: int, b: int) -> None:
+        total, count = links[a][b]
+        heapq.heappush(heap, (-(total / count), min(a, b), max(a, b)))
+
+    for a, neighbours in links.items():
+        for b in neighbours:
+            if a < b:
+                push(a, b)
+
+    next_id = len(order)
+    while heap:
+        neg_score, a, b = heapq.heappop(heap)
+        if a not in members or b not in members:
+            continue
+        if -neg_score < threshold:
+            break
+        if len(members[a]) + len(members[b]) > max_cluster_size:
+            continue
+
+        merged = next_id
+        next_id += 1
+        members[merged] = members.pop(a) + members.pop(b)
+        merged_links: dict[int, list[float]] = {}
+        for old in (a, b):
+            for other, (total, count) in links.pop(old).items():
+                if other in (a, b):
+                    continue
+                entry = merged_links.setdefault(other, [0.0, 0])
+                entry[0] += total
+                entry[1] += count
+                del links[other][old]
+        links[merged] = merged_links
+        for other, entry in merged_links.items():
+            links[other][merged] = entry
+            push(merged, other)
+
+    clusters = [
+        sorted(cluster, key=position.__getitem__) for cluster in members.values()
+    ]
+    clusters.sort(key=lambda cluster: position[cluster[0]])
+    return clusters
+
+
+def split_into_groups(
+    issues: list[dict[str, Any]],
+    max_group_size: int,
+    threshold: float = 0.2,
+) -> list[list[dict[str, Any]]]:
+    """
+    Split a large issue list into keyword-coherent groups of bounded size.
+
+    Issues are clustered by keyword similarity; leftover small clusters are
+    packed together so every group stays close to max_group_size.
+    """
+    if len(issues) <= max_group_size:
+        return [issues]
+
+    by_number = {issue["number"]: issue for issue in issues}
+    clusters = agglomerative_cluster(
+        by_number,
+        build_keyword_similarity(issues),
+        threshold=threshold,
+        max_cluster_size=max_group_size,
+    )
+
+    # Largest clusters first, then first-fit packing into bounded groups
+    clusters.sort(key=len, reverse=True)
+    groups: list[list[int]] = []
+    for cluster in clusters:
+        for group in groups:
+            if len(group) + len(cluster) <= max_group_size:
+                group.extend(cluster)
+                break
+        else:
+            groups.append(list(cluster))
+    return [[by_number[n] for n in group] for group in groups]
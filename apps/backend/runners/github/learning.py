@@ -21,17 +21,53 @@ Usage:
 
     # Get accuracy metrics
     metrics = tracker.get_accuracy("repo")
+
+Outcomes are kept in the shared SQLite state store (state_store.py), so
+recording a prediction or outcome is a single row write. Running aggregates
+(daily buckets per repo/prediction/outcome, pattern counts and decayed
+accuracy) are updated in the same transaction, so accuracy, pattern and
+dashboard queries never rescan the outcome history.
 """
 
 from __future__ import annotations
 
 import json
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+try:
+    from .state_store import GitHubStateStore
+except (ImportError, ValueError, SystemError):
+    from state_store import GitHubStateStore
+
+logger = logging.getLogger(__name__)
+
+# Half-life for the decayed (recency-weighted) accuracy counters
+ACCURACY_HALF_LIFE_DAYS = 14.0
+
+_SECONDS_PER_DAY = 86400
+
+# Aggregated pattern dimensions: (dimension, pattern_type)
+PATTERN_DIMENSIONS = (
+    ("file_type", "file_type_accuracy"),
+    ("category", "category_accuracy"),
+    ("change_size", "change_size_accuracy"),
+)
+
+
+def _day(ts: datetime) -> int:
+    """Bucket index (days since epoch) for a timestamp."""
+    return int(ts.timestamp() // _SECONDS_PER_DAY)
+
+
+def _decay(age_seconds: float) -> float:
+    """Exponential decay factor for an event age_seconds old."""
+    return 0.5 ** (max(0.0, age_seconds) / (ACCURACY_HALF_LIFE_DAYS * _SECONDS_PER_DAY))
+
 
 class PredictionType(str, Enum):
     """Types of predictions the system makes."""
@@ -225,6 +261,51 @@ class AccuracyStats:
         }
 
 
+@dataclass
+class AccuracySummary:
+    """
+    Constant-time accuracy summary read from the running aggregates.
+
+    decayed_* counters weight each resolved outcome by
+    0.5 ** (age / ACCURACY_HALF_LIFE_DAYS), favouring recent behaviour.
+    """
+
+    total_predictions: int = 0
+    correct_predictions: int = 0
+    incorrect_predictions: int = 0
+    pending_outcomes: int = 0
+    decayed_correct: float = 0.0
+    decayed_incorrect: float = 0.0
+
+    @property
+    def accuracy(self) -> float:
+        resolved = self.correct_predictions + self.incorrect_predictions
+        if resolved == 0:
+            return 0.0
+        return self.correct_predictions / resolved
+
+    @property
+    def decayed_samples(self) -> float:
+        return self.decayed_correct + self.decayed_incorrect
+
+    @property
+    def decayed_accuracy(self) -> float:
+        if self.decayed_samples <= 0:
+            return 0.0
+        return self.decayed_correct / self.decayed_samples
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_predictions": self.total_predictions,
+            "correct_predictions": self.correct_predictions,
+            "incorrect_predictions": self.incorrect_predictions,
+            "pending_outcomes": self.pending_outcomes,
+            "accuracy": self.accuracy,
+            "decayed_accuracy": self.decayed_accuracy,
+            "decayed_samples": self.decayed_samples,
+        }
+
+
 @dataclass
 class LearningPattern:
     """
@@ -285,45 +366,168 @@ class LearningTracker:
 
     def __init__(self, state_dir: Path):
         self.state_dir = state_dir
+        # Legacy per-repo JSON files, imported into the state store once
         self.learning_dir = state_dir / "learning"
-        self.learning_dir.mkdir(parents=True, exist_ok=True)
-
-        self._outcomes: dict[str, ReviewOutcome] = {}
-        self._load_outcomes()
+        self._store = GitHubStateStore.open(state_dir)
+        self._store.run_migration("learning_json", self._migrate_json_files)
+        self._store.run_migration("outcome_aggregates", self.rebuild_aggregates)
 
-    def _get_outcomes_file(self, repo: str) -> Path:
-        safe_name = repo.replace("/", "_")
-        return self.learning_dir / f"{safe_name}_outcomes.json"
+    def _migrate_json_files(self) -> int:
+        """Import legacy {repo}_outcomes.json files."""
+        if not self.learning_dir.exists():
+            return 0
 
-    def _load_outcomes(self) -> None:
-        """Load all outcomes from disk."""
+        count = 0
         for file in self.learning_dir.glob("*_outcomes.json"):
             try:
                 with open(file, encoding="utf-8") as f:
                     data = json.load(f)
-                    for item in data.get("outcomes", []):
-                        outcome = ReviewOutcome.from_dict(item)
-                        self._outcomes[outcome.review_id] = outcome
-            except (json.JSONDecodeError, KeyError):
+                outcomes = [
+                    ReviewOutcome.from_dict(item) for item in data.get("outcomes", [])
+                ]
+            except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+                logger.warning(f"Skipping unreadable outcomes file {file}: {e}")
                 continue
+            for outcome in outcomes:
+                self._store.put_outcome(outcome.to_dict(), replace=False)
+            count += len(outcomes)
+        return count
+
+    def _query(self, **filters: Any) -> list[ReviewOutcome]:
+        return [
+            ReviewOutcome.from_dict(data)
+            for data in self._store.query_outcomes(**filters)
+        ]
+
+    # ------------------------------------------------------------------
+    # Running aggregates
+    # ------------------------------------------------------------------
+
+    def _save_outcome(self, outcome: ReviewOutcome) -> None:
+        """Write an outcome row and move its contribution in the aggregates."""
+        now_ts = datetime.now(timezone.utc).timestamp()
+        with self._store.transaction():
+            previous = self._store.get_outcome(outcome.review_id)
+            if previous is not None:
+                self._apply_aggregates(ReviewOutcome.from_dict(previous), -1, now_ts)
+            self._store.put_outcome(outcome.to_dict())
+            self._apply_aggregates(outcome, 1, now_ts)
+
+    def _apply_aggregates(
+        self, outcome: ReviewOutcome, sign: int, now_ts: float
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) an outcome's aggregate contribution."""
+        was_correct = outcome.was_correct
+        deltas: dict[str, float] = {"count": sign}
+        if was_correct is True:
+            deltas["correct"] = sign
+        elif was_correct is False:
+            deltas["incorrect"] = sign
+        if outcome.actual_outcome == OutcomeType.MERGED and outcome.time_to_outcome:
+            deltas["merge_count"] = sign
+            deltas["merge_seconds"] = sign * outcome.time_to_outcome.total_seconds()
+
+        prediction = outcome.prediction.value
+        self._store.add_outcome_bucket(
+            outcome.repo,
+            prediction,
+            outcome.actual_outcome.value if outcome.actual_outcome else "",
+            _day(outcome.created_at),
+            deltas,
+        )
+        if was_correct is None:
+            return
+
+        correct, incorrect = (sign, 0) if was_correct else (0, sign)
+        for dimension, value in self._pattern_keys(outcome):
+            self._store.add_outcome_pattern(dimension, value, correct, incorrect)
+
+        # Decayed counters are stored as of updated_ts; an event's weight at
+        # now_ts is its decay since it happened, so removal is exact.
+        event_at = outcome.outcome_recorded_at or outcome.created_at
+        weight = sign * _decay(now_ts - event_at.timestamp())
+        decayed_correct = decayed_incorrect = 0.0
+        row = self._store.get_outcome_decay(outcome.repo, prediction)
+        if row is not None:
+            factor = _decay(now_ts - row[2])
+            decayed_correct, decayed_incorrect = row[0] * factor, row[1] * factor
+        if was_correct:
+            decayed_correct += weight
+        else:
+            decayed_incorrect += weight
+        self._store.put_outcome_decay(
+            outcome.repo,
+            prediction,
+            max(0.0, decayed_correct),
+            max(0.0, decayed_incorrect),
+            now_ts,
+        )
+
+    @staticmethod
+    def _pattern_keys(outcome: ReviewOutcome) -> list[tuple[str, str]]:
+        keys = [("file_type", file_type) for file_type in outcome.file_types]
+        keys.extend(("category", category) for category in outcome.categories)
+        keys.append(("change_size", outcome.change_size))
+        return keys
+
+    def rebuild_aggregates(self) -> int:
+        """
+        Recompute all running aggregates from the outcome rows.
+
+        Returns:
+            Number of outcomes aggregated
+        """
+        now_ts = datetime.now(timezone.utc).timestamp()
+        outcomes = self._query()
+        with self._store.transaction():
+            self._store.clear_outcome_aggregates()
+            for outcome in outcomes:
+                self._apply_aggregates(outcome, 1, now_ts)
+        return len(outcomes)
+
+    def check_consistency(self, repair: bool = False) -> list[str]:
+        """
+        Offline check of the running aggregates against a full recomputation.
 
-    def _save_outcomes(self, repo: str) -> None:
-        """Save outcomes for a repo to disk with file locking for concurrency safety."""
-        from .file_lock import FileLock, atomic_write
+        Args:
+            repair: Rebuild the aggregates if they disagree
 
-        file = self._get_outcomes_file(repo)
-        repo_outcomes = [o for o in self._outcomes.values() if o.repo == repo]
+        Returns:
+            Descriptions of mismatches (empty if consistent)
+        """
+        outcomes = self._query()
+        mismatches = []
+
+        scopes: list[str | None] = [None, *sorted({o.repo for o in outcomes})]
+        for repo in scopes:
+            expected = _accuracy_from_outcomes(
+                [o for o in outcomes if repo is None or o.repo == repo]
+            )
+            actual = self.get_accuracy(repo)
+            if _comparable(expected) != _comparable(actual):
+                mismatches.append(
+                    f"accuracy for {repo or 'all repos'}: "
+                    f"expected {expected.to_dict()}, got {actual.to_dict()}"
+                )
 
-        data = {
-            "repo": repo,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-            "outcomes": [o.to_dict() for o in repo_outcomes],
+        expected_patterns: dict[tuple[str, str], list[int]] = {}
+        for outcome in outcomes:
+            if outcome.was_correct is None:
+                continue
+            for key in self._pattern_keys(outcome):
+                counts = expected_patterns.setdefault(key, [0, 0])
+                counts[0 if outcome.was_correct else 1] += 1
+        actual_patterns = {
+            (dimension, value): [correct, incorrect]
+            for dimension, value, correct, incorrect in self._store.outcome_patterns()
         }
+        if expected_patterns != actual_patterns:
+            mismatches.append("pattern counts differ from outcome history")
 
-        # Use file locking and atomic write for safe concurrent access
-        with FileLock(file, timeout=5.0):
-            with atomic_write(file) as f:
-                json.dump(data, f, indent=2)
+        if mismatches and repair:
+            logger.warning(f"Rebuilding learning aggregates: {mismatches}")
+            self.rebuild_aggregates()
+        return mismatches
 
     def record_prediction(
         self,
@@ -366,8 +570,7 @@ class LearningTracker:
             categories=categories or [],
         )
 
-        self._outcomes[review_id] = outcome
-        self._save_outcomes(repo)
+        self._save_outcome(outcome)
 
         return outcome
 
@@ -392,27 +595,24 @@ class LearningTracker:
         Returns:
             Updated ReviewOutcome or None if not found
         """
-        if review_id not in self._outcomes:
-            return None
+        with self._store.transaction():
+            data = self._store.get_outcome(review_id)
+            if data is None:
+                return None
 
-        review_outcome = self._outcomes[review_id]
-        review_outcome.actual_outcome = outcome
-        review_outcome.time_to_outcome = time_to_outcome
-        review_outcome.author_response = author_response
-        review_outcome.outcome_recorded_at = datetime.now(timezone.utc)
+            review_outcome = ReviewOutcome.from_dict(data)
+            review_outcome.actual_outcome = outcome
+            review_outcome.time_to_outcome = time_to_outcome
+            review_outcome.author_response = author_response
+            review_outcome.outcome_recorded_at = datetime.now(timezone.utc)
 
-        self._save_outcomes(repo)
+            self._save_outcome(review_outcome)
 
         return review_outcome
 
     def get_pending_outcomes(self, repo: str | None = None) -> list[ReviewOutcome]:
         """Get predictions that don't have outcomes yet."""
-        pending = []
-        for outcome in self._outcomes.values():
-            if not outcome.is_complete:
-                if repo is None or outcome.repo == repo:
-                    pending.append(outcome)
-        return pending
+        return self._query(repo=repo, pending=True)
 
     def get_accuracy(
         self,
@@ -432,49 +632,63 @@ class LearningTracker:
             AccuracyStats with aggregated metrics
         """
         stats = AccuracyStats()
-        merge_times = []
-
-        for outcome in self._outcomes.values():
-            # Apply filters
-            if repo and outcome.repo != repo:
-                continue
-            if since and outcome.created_at < since:
-                continue
-            if prediction_type and outcome.prediction != prediction_type:
+        merge_totals = [0, 0.0]
+        prediction = prediction_type.value if prediction_type else None
+
+        min_day = None
+        if since is not None:
+            # Whole days after `since` come from the buckets; the partial
+            # first day is read from the (indexed) outcome rows.
+            min_day = _day(since) + 1
+            boundary = datetime.fromtimestamp(min_day * _SECONDS_PER_DAY, timezone.utc)
+            for outcome in self._query(
+                repo=repo or None, since=since, until=boundary, prediction=prediction
+            ):
+                _add_outcome(stats, outcome, merge_totals)
+
+        for row in self._store.sum_outcome_buckets(repo or None, prediction, min_day):
+            type_key, outcome_value, count, correct, incorrect = row[:5]
+            if not count:
                 continue
+            by_type = stats.by_type.setdefault(
+                type_key, {"total": 0, "correct": 0, "incorrect": 0}
+            )
+            stats.total_predictions += count
+            stats.correct_predictions += correct
+            stats.incorrect_predictions += incorrect
+            by_type["total"] += count
+            by_type["correct"] += correct
+            by_type["incorrect"] += incorrect
+            if not outcome_value:
+                stats.pending_outcomes += count
+            merge_totals[0] += row[5]
+            merge_totals[1] += row[6]
+
+        _finish_merge_time(stats, merge_totals)
+        return stats
 
-            stats.total_predictions += 1
-
-            # Track by type
-            type_key = outcome.prediction.value
-            if type_key not in stats.by_type:
-                stats.by_type[type_key] = {"total": 0, "correct": 0, "incorrect": 0}
-            stats.by_type[type_key]["total"] += 1
-
-            if outcome.is_complete:
-                was_correct = outcome.was_correct
-                if was_correct is True:
-                    stats.correct_predictions += 1
-                    stats.by_type[type_key]["correct"] += 1
-                elif was_correct is False:
-                    stats.incorrect_predictions += 1
-                    stats.by_type[type_key]["incorrect"] += 1
-
-                # Track merge times
-                if (
-                    outcome.actual_outcome == OutcomeType.MERGED
-                    and outcome.time_to_outcome
-                ):
-                    merge_times.append(outcome.time_to_outcome)
-            else:
-                stats.pending_outcomes += 1
-
-        # Calculate average merge time
-        if merge_times:
-            avg_seconds = sum(t.total_seconds() for t in merge_times) / len(merge_times)
-            stats.avg_time_to_merge = timedelta(seconds=avg_seconds)
+    def get_accuracy_summary(self, repo: str | None = None) -> AccuracySummary:
+        """
+        Get all-time and decayed accuracy from the running aggregates.
 
-        return stats
+        Cost is independent of the number of recorded outcomes, so this is
+        suitable for per-finding confidence calibration.
+        """
+        summary = AccuracySummary()
+        for row in self._store.sum_outcome_buckets(repo):
+            count, correct, incorrect = row[2:5]
+            summary.total_predictions += count
+            summary.correct_predictions += correct
+            summary.incorrect_predictions += incorrect
+            if not row[1]:
+                summary.pending_outcomes += count
+
+        now_ts = datetime.now(timezone.utc).timestamp()
+        for _, correct, incorrect, updated_ts in self._store.outcome_decay_rows(repo):
+            factor = _decay(now_ts - updated_ts)
+            summary.decayed_correct += correct * factor
+            summary.decayed_incorrect += incorrect * factor
+        return summary
 
     def get_recent_outcomes(
         self,
@@ -482,19 +696,14 @@ class LearningTracker:
         limit: int = 50,
     ) -> list[ReviewOutcome]:
         """Get recent outcomes, most recent first."""
-        outcomes = list(self._outcomes.values())
-
-        if repo:
-            outcomes = [o for o in outcomes if o.repo == repo]
-
-        outcomes.sort(key=lambda o: o.created_at, reverse=True)
-        return outcomes[:limit]
+        return self._query(repo=repo or None, newest_first=True, limit=limit)
 
     def detect_patterns(self, min_sample_size: int = 20) -> list[LearningPattern]:
         """
         Detect learning patterns from outcomes.
 
-        Aggregates data to identify where the system performs well or poorly.
+        Reads the per-dimension counts maintained on every outcome write to
+        identify where the system performs well or poorly.
 
         Args:
             min_sample_size: Minimum samples to create a pattern
@@ -502,101 +711,27 @@ class LearningTracker:
         Returns:
             List of detected patterns
         """
-        patterns = []
-
-        # Pattern: Accuracy by file type
-        by_file_type: dict[str, dict[str, int]] = {}
-        for outcome in self._outcomes.values():
-            if not outcome.is_complete or outcome.was_correct is None:
-                continue
-
-            for file_type in outcome.file_types:
-                if file_type not in by_file_type:
-                    by_file_type[file_type] = {"correct": 0, "incorrect": 0}
-
-                if outcome.was_correct:
-                    by_file_type[file_type]["correct"] += 1
-                else:
-                    by_file_type[file_type]["incorrect"] += 1
-
-        for file_type, counts in by_file_type.items():
-            total = counts["correct"] + counts["incorrect"]
-            if total >= min_sample_size:
-                accuracy = counts["correct"] / total
-                confidence = min(1.0, total / 100)  # More samples = higher confidence
-
-                patterns.append(
-                    LearningPattern(
-                        pattern_id=f"file_type_{file_type}",
-                        pattern_type="file_type_accuracy",
-                        context={"file_type": file_type},
-                        sample_size=total,
-                        accuracy=accuracy,
-                        confidence=confidence,
-                    )
-                )
-
-        # Pattern: Accuracy by category
-        by_category: dict[str, dict[str, int]] = {}
-        for outcome in self._outcomes.values():
-            if not outcome.is_complete or outcome.was_correct is None:
-                continue
-
-            for category in outcome.categories:
-                if category not in by_category:
-                    by_category[category] = {"correct": 0, "incorrect": 0}
-
-                if outcome.was_correct:
-                    by_category[category]["correct"] += 1
-                else:
-                    by_category[category]["incorrect"] += 1
-
-        for category, counts in by_category.items():
-            total = counts["correct"] + counts["incorrect"]
-            if total >= min_sample_size:
-                accuracy = counts["correct"] / total
-                confidence = min(1.0, total / 100)
-
-                patterns.append(
-                    LearningPattern(
-                        pattern_id=f"category_{category}",
-                        pattern_type="category_accuracy",
-                        context={"category": category},
-                        sample_size=total,
-                        accuracy=accuracy,
-                        confidence=confidence,
-                    )
-                )
-
-        # Pattern: Accuracy by change size
-        by_size: dict[str, dict[str, int]] = {}
-        for outcome in self._outcomes.values():
-            if not outcome.is_complete or outcome.was_correct is None:
-                continue
-
-            size = outcome.change_size
-            if size not in by_size:
-                by_size[size] = {"correct": 0, "incorrect": 0}
-
-            if outcome.was_correct:
-                by_size[size]["correct"] += 1
-            else:
-                by_size[size]["incorrect"] += 1
-
-        for size, counts in by_size.items():
-            total = counts["correct"] + counts["incorrect"]
-            if total >= min_sample_size:
-                accuracy = counts["correct"] / total
-                confidence = min(1.0, total / 100)
+        counts_by_dimension: dict[str, list[tuple[str, int, int]]] = {}
+        for dimension, value, correct, incorrect in self._store.outcome_patterns():
+            counts_by_dimension.setdefault(dimension, []).append(
+                (value, correct, incorrect)
+            )
 
+        patterns = []
+        for dimension, pattern_type in PATTERN_DIMENSIONS:
+            for value, correct, incorrect in counts_by_dimension.get(dimension, []):
+                total = correct + incorrect
+                if total < min_sample_size:
+                    continue
                 patterns.append(
                     LearningPattern(
-                        pattern_id=f"change_size_{size}",
-                        pattern_type="change_size_accuracy",
-                        context={"change_size": size},
+                        pattern_id=f"{dimension}_{value}",
+                        pattern_type=pattern_type,
+                        context={dimension: value},
                         sample_size=total,
-                        accuracy=accuracy,
-                        confidence=confidence,
+                        accuracy=correct / total,
+                        # More samples = higher confidence
+                        confidence=min(1.0, total / 100),
                     )
                 )
 
@@ -612,15 +747,16 @@ class LearningTracker:
         week_ago = now - timedelta(days=7)
         month_ago = now - timedelta(days=30)
 
+        all_time = self.get_accuracy(repo)
         return {
-            "all_time": self.get_accuracy(repo).to_dict(),
+            "all_time": all_time.to_dict(),
             "last_week": self.get_accuracy(repo, since=week_ago).to_dict(),
             "last_month": self.get_accuracy(repo, since=month_ago).to_dict(),
             "patterns": [p.to_dict() for p in self.detect_patterns()],
             "recent_outcomes": [
                 o.to_dict() for o in self.get_recent_outcomes(repo, limit=10)
             ],
-            "pending_count": len(self.get_pending_outcomes(repo)),
+            "pending_count": all_time.pending_outcomes,
         }
 
     def check_pr_status(
@@ -642,3 +778,55 @@ class LearningTracker:
         # Implementation depends on gh_provider being async
         # Leaving as stub for now
         return 0
+
+
+def _add_outcome(
+    stats: AccuracyStats, outcome: ReviewOutcome, merge_totals: list
+) -> None:
+    """Accumulate a single outcome into stats (full-scan path)."""
+    stats.total_predictions += 1
+
+    # Track by type
+    type_key = outcome.prediction.value
+    if type_key not in stats.by_type:
+        stats.by_type[type_key] = {"total": 0, "correct": 0, "incorrect": 0}
+    stats.by_type[type_key]["total"] += 1
+
+    if outcome.is_complete:
+        was_correct = outcome.was_correct
+        if was_correct is True:
+            stats.correct_predictions += 1
+            stats.by_type[type_key]["correct"] += 1
+        elif was_correct is False:
+            stats.incorrect_predictions += 1
+            stats.by_type[type_key]["incorrect"] += 1
+
+        # Track merge times
+        if outcome.actual_outcome == OutcomeType.MERGED and outcome.time_to_outcome:
+            merge_totals[0] += 1
+            merge_totals[1] += outcome.time_to_outcome.total_seconds()
+    else:
+        stats.pending_outcomes += 1
+
+
+def _finish_merge_time(stats: AccuracyStats, merge_totals: list) -> None:
+    count, seconds = merge_totals
+    if count:
+        stats.avg_time_to_merge = timedelta(seconds=seconds / count)
+
+
+def _accuracy_from_outcomes(outcomes: list[ReviewOutcome]) -> AccuracyStats:
+    """Recompute accuracy from scratch (used by the consistency check)."""
+    stats = AccuracyStats()
+    merge_totals = [0, 0.0]
+    for outcome in outcomes:
+        _add_outcome(stats, outcome, merge_totals)
+    _finish_merge_time(stats, merge_totals)
+    return stats
+
+
+def _comparable(stats: AccuracyStats) -> dict[str, Any]:
+    data = stats.to_dict()
+    if data["avg_time_to_merge"] is not None:
+        data["avg_time_to_merge"] = round(data["avg_time_to_merge"], 3)
+    return data
@@ -9,17 +9,28 @@ Prevents conflicting operations:
 - Blocks auto-fix if triage = spam/duplicate
 - Requires triage before auto-fix
 - Auto-generated PRs must pass AI review before human notification
+
+Lifecycle records are kept in the shared SQLite state store (state_store.py),
+indexed by repo, state and PR number.
 """
 
 from __future__ import annotations
 
 import json
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+try:
+    from .state_store import GitHubStateStore
+except (ImportError, ValueError, SystemError):
+    from state_store import GitHubStateStore
+
+logger = logging.getLogger(__name__)
+
 
 class IssueLifecycleState(str, Enum):
     """Unified issue lifecycle states."""
@@ -396,21 +407,33 @@ class LifecycleManager:
 
     def __init__(self, state_dir: Path):
         self.state_dir = state_dir
+        # Legacy per-issue JSON files, imported into the state store once
         self.lifecycle_dir = state_dir / "lifecycle"
-        self.lifecycle_dir.mkdir(parents=True, exist_ok=True)
-
-    def _get_file(self, repo: str, issue_number: int) -> Path:
-        safe_repo = repo.replace("/", "_")
-        return self.lifecycle_dir / f"{safe_repo}_{issue_number}.json"
+        self._store = GitHubStateStore.open(state_dir)
+        self._store.run_migration("lifecycle_json", self._migrate_json_files)
+
+    def _migrate_json_files(self) -> int:
+        """Import legacy {repo}_{issue}.json lifecycle files."""
+        if not self.lifecycle_dir.exists():
+            return 0
+
+        count = 0
+        for file in self.lifecycle_dir.glob("*.json"):
+            try:
+                with open(file, encoding="utf-8") as f:
+                    lifecycle = IssueLifecycle.from_dict(json.load(f))
+            except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+                logger.warning(f"Skipping unreadable lifecycle file {file}: {e}")
+                continue
+            self._store.put_lifecycle(lifecycle.to_dict(), replace=False)
+            count += 1
+        return count
 
     def get(self, repo: str, issue_number: int) -> IssueLifecycle | None:
         """Get lifecycle for an issue."""
-        file = self._get_file(repo, issue_number)
-        if not file.exists():
+        data = self._store.get_lifecycle(repo, issue_number)
+        if data is None:
             return None
-
-        with open(file, encoding="utf-8") as f:
-            data = json.load(f)
         return IssueLifecycle.from_dict(data)
 
     def get_or_create(self, repo: str, issue_number: int) -> IssueLifecycle:
@@ -420,14 +443,13 @@ class LifecycleManager:
             return lifecycle
 
         lifecycle = IssueLifecycle(issue_number=issue_number, repo=repo)
-        self.save(lifecycle)
-        return lifecycle
+        self._store.put_lifecycle(lifecycle.to_dict(), replace=False)
+        # Another process may have created it first
+        return self.get(repo, issue_number) or lifecycle
 
     def save(self, lifecycle: IssueLifecycle) -> None:
         """Save lifecycle state."""
-        file = self._get_file(lifecycle.repo, lifecycle.issue_number)
-        with open(file, "w", encoding="utf-8") as f:
-            json.dump(lifecycle.to_dict(), f, indent=2)
+        self._store.put_lifecycle(lifecycle.to_dict())
 
     def transition(
         self,
@@ -439,11 +461,12 @@ class LifecycleManager:
         metadata: dict[str, Any] | None = None,
     ) -> ConflictResult:
         """Transition issue to new state."""
-        lifecycle = self.get_or_create(repo, issue_number)
-        result = lifecycle.transition(new_state, actor, reason, metadata)
+        with self._store.transaction():
+            lifecycle = self.get_or_create(repo, issue_number)
+            result = lifecycle.transition(new_state, actor, reason, metadata)
 
-        if not result.has_conflict:
-            self.save(lifecycle)
+            if not result.has_conflict:
+                self.save(lifecycle)
 
         return result
 
@@ -480,11 +503,12 @@ class LifecycleManager:
         component: str,
     ) -> bool:
         """Acquire lock for an issue."""
-        lifecycle = self.get_or_create(repo, issue_number)
-        if lifecycle.acquire_lock(component):
-            self.save(lifecycle)
-            return True
-        return False
+        with self._store.transaction():
+            lifecycle = self.get_or_create(repo, issue_number)
+            if lifecycle.acquire_lock(component):
+                self.save(lifecycle)
+                return True
+            return False
 
     def release_lock(
         self,
@@ -493,11 +517,12 @@ class LifecycleManager:
         component: str,
     ) -> bool:
         """Release lock for an issue."""
-        lifecycle = self.get(repo, issue_number)
-        if lifecycle and lifecycle.release_lock(component):
-            self.save(lifecycle)
-            return True
-        return False
+        with self._store.transaction():
+            lifecycle = self.get(repo, issue_number)
+            if lifecycle and lifecycle.release_lock(component):
+                self.save(lifecycle)
+                return True
+            return False
 
     def get_all_in_state(
         self,
@@ -505,27 +530,11 @@ class LifecycleManager:
         state: IssueLifecycleState,
     ) -> list[IssueLifecycle]:
         """Get all issues in a specific state."""
-        results = []
-        safe_repo = repo.replace("/", "_")
-
-        for file in self.lifecycle_dir.glob(f"{safe_repo}_*.json"):
-            with open(file, encoding="utf-8") as f:
-                data = json.load(f)
-                lifecycle = IssueLifecycle.from_dict(data)
-                if lifecycle.current_state == state:
-                    results.append(lifecycle)
-
-        return results
+        return [
+            IssueLifecycle.from_dict(data)
+            for data in self._store.lifecycles_in_state(repo, state.value)
+        ]
 
     def get_summary(self, repo: str) -> dict[str, int]:
         """Get count of issues by state."""
-        counts: dict[str, int] = {}
-        safe_repo = repo.replace("/", "_")
-
-        for file in self.lifecycle_dir.glob(f"{safe_repo}_*.json"):
-            with open(file, encoding="utf-8") as f:
-                data = json.load(f)
-                state = data.get("current_state", "new")
-                counts[state] = counts.get(state, 0) + 1
-
-        return counts
+        return self._store.lifecycle_state_counts(repo)
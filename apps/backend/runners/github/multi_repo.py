@@ -54,6 +54,8 @@ class RepoConfig:
         upstream_repo: Upstream repo if this is a fork
         labels: Label configuration overrides
         trust_level: Trust level for this repo
+        schedule_weight: Relative share of scheduler slots and AI budget
+            when work from several repos competes (work_scheduler.py)
     """
 
     repo: str  # owner/repo format
@@ -66,6 +68,7 @@ class RepoConfig:
     )  # e.g., {"auto_fix": ["fix-me"]}
     trust_level: int = 0  # 0-4 trust level
     display_name: str | None = None  # Human-readable name
+    schedule_weight: float = 1.0  # Fair-share weight across repos
 
     # Feature toggles per repo
     auto_fix_enabled: bool = True
@@ -130,6 +133,7 @@ class RepoConfig:
             "auto_fix_enabled": self.auto_fix_enabled,
             "pr_review_enabled": self.pr_review_enabled,
             "triage_enabled": self.triage_enabled,
+            "schedule_weight": self.schedule_weight,
         }
 
     @classmethod
@@ -146,6 +150,7 @@ class RepoConfig:
             auto_fix_enabled=data.get("auto_fix_enabled", True),
             pr_review_enabled=data.get("pr_review_enabled", True),
             triage_enabled=data.get("triage_enabled", True),
+            schedule_weight=data.get("schedule_weight", 1.0),
         )
 
 
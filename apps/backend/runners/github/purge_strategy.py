@@ -6,7 +6,9 @@ Generic GDPR-compliant data purge implementation for GitHub automation system.
 
 Features:
 - Generic purge method for issues, PRs, and repositories
-- Pattern-based file discovery
+- Pattern-based file discovery by listing the state directory, so files
+  the storage ledger never saw are purged too (the ledger is reconciled
+  with what was found and kept for accounting)
 - Optional repository filtering
 - Archive directory cleanup
 - Comprehensive error handling
@@ -23,11 +25,35 @@ Usage:
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    from .file_lock import remove_file
+    from .learning import LearningTracker
+    from .state_store import GitHubStateStore
+    from .storage_ledger import StorageLedger
+except (ImportError, ValueError, SystemError):
+    from file_lock import remove_file
+    from learning import LearningTracker
+    from state_store import GitHubStateStore
+    from storage_ledger import StorageLedger
+
+
+def _tree_bytes(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.stat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return total
+
 
 @dataclass
 class PurgeResult:
@@ -37,6 +63,8 @@ class PurgeResult:
 
     deleted_count: int = 0
     freed_bytes: int = 0
+    # State store rows deleted (repository purges)
+    deleted_rows: int = 0
     errors: list[str] = field(default_factory=list)
     started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     completed_at: datetime | None = None
@@ -49,6 +77,7 @@ class PurgeResult:
         return {
             "deleted_count": self.deleted_count,
             "freed_bytes": self.freed_bytes,
+            "deleted_rows": self.deleted_rows,
             "freed_mb": round(self.freed_mb, 2),
             "errors": self.errors,
             "started_at": self.started_at.isoformat(),
@@ -137,6 +166,10 @@ class PurgeStrategy:
             )
         """
         result = PurgeResult()
+        if not self.state_dir.exists():
+            result.completed_at = datetime.now(timezone.utc)
+            return result
+        ledger = StorageLedger.open(self.state_dir)
 
         # Build file patterns to search for
         patterns = [
@@ -145,15 +178,12 @@ class PurgeStrategy:
             f"*_{value}_*.json",
         ]
 
-        # Search state directory
-        for file_pattern in patterns:
-            for file_path in self.state_dir.rglob(file_pattern):
-                self._try_delete_file(file_path, key, value, repo, result)
-
-        # Search archive directory
-        for file_pattern in patterns:
-            for file_path in self.archive_dir.rglob(file_pattern):
+        # Search the state directory; archived matches are deleted unvalidated
+        for file_path in ledger.scan(patterns):
+            if file_path.relative_to(ledger.state_dir).parts[0] == "archive":
                 self._try_delete_file_simple(file_path, result)
+            else:
+                self._try_delete_file(file_path, key, value, repo, result)
 
         result.completed_at = datetime.now(timezone.utc)
         return result
@@ -163,7 +193,9 @@ class PurgeStrategy:
         Purge all data for a specific repository.
 
         This method handles repository-level purges which have different
-        logic than issue/PR purges (directory-based instead of file-based).
+        logic than issue/PR purges (directory-based instead of file-based),
+        and also deletes the repository's rows from the state store (trust,
+        lifecycle, review outcomes and their aggregates, daemon jobs).
 
         Args:
             repo: Repository in "owner/repo" format
@@ -175,17 +207,18 @@ class PurgeStrategy:
 
         result = PurgeResult()
         safe_name = repo.replace("/", "_")
+        if not self.state_dir.exists():
+            result.completed_at = datetime.now(timezone.utc)
+            return result
+        ledger = StorageLedger.open(self.state_dir)
 
         # Delete files matching repository pattern in subdirectories
         for subdir in ["pr", "issues", "autofix", "trust", "learning"]:
-            dir_path = self.state_dir / subdir
-            if not dir_path.exists():
-                continue
-
-            for file_path in dir_path.glob(f"{safe_name}*.json"):
+            for file_path in ledger.scan(
+                [f"{safe_name}*.json"], subdir, recursive=False
+            ):
                 try:
-                    file_size = file_path.stat().st_size
-                    file_path.unlink()
+                    file_size = remove_file(file_path)
                     result.deleted_count += 1
                     result.freed_bytes += file_size
                 except OSError as e:
@@ -195,13 +228,26 @@ class PurgeStrategy:
         repo_dir = self.state_dir / "repos" / safe_name
         if repo_dir.exists():
             try:
-                freed = self._calculate_directory_size(repo_dir)
+                freed = _tree_bytes(repo_dir)
                 shutil.rmtree(repo_dir)
+                ledger.forget_directory(repo_dir)
                 result.deleted_count += 1
                 result.freed_bytes += freed
             except OSError as e:
                 result.errors.append(f"Error deleting repo directory {repo_dir}: {e}")
 
+        try:
+            store = GitHubStateStore.open(self.state_dir)
+            tracker = LearningTracker(self.state_dir)
+            with store.transaction():
+                deleted = store.purge_repo(repo)
+                if deleted.get("outcomes"):
+                    # Pattern counts aren't per repo; recount without this one
+                    tracker.rebuild_aggregates()
+            result.deleted_rows = sum(deleted.values())
+        except sqlite3.Error as e:
+            result.errors.append(f"Error purging state store rows for {repo}: {e}")
+
         result.completed_at = datetime.now(timezone.utc)
         return result
 
@@ -236,8 +282,7 @@ class PurgeStrategy:
                 return
 
             # Delete the file
-            file_size = file_path.stat().st_size
-            file_path.unlink()
+            file_size = remove_file(file_path)
             result.deleted_count += 1
             result.freed_bytes += file_size
 
@@ -261,28 +306,7 @@ class PurgeStrategy:
             result: PurgeResult to update
         """
         try:
-            file_size = file_path.stat().st_size
-            file_path.unlink()
+            result.freed_bytes += remove_file(file_path)
             result.deleted_count += 1
-            result.freed_bytes += file_size
         except OSError as e:
             result.errors.append(f"Error deleting {file_path}: {e}")
-
-    def _calculate_directory_size(self, path: Path) -> int:
-        """
-        Calculate total size of all files in a directory recursively.
-
-        Args:
-            path: Directory path to measure
-
-        Returns:
-            Total size in bytes
-        """
-        total = 0
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    total += file_path.stat().st_size
-                except OSError:
-                    continue
-        return total
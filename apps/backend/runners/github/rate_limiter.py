@@ -224,6 +224,30 @@ class CostTracker:
 
         return cost
 
+    def reset(self) -> None:
+        """Start a new budget period: forget the spend so far, keep the limit."""
+        self.total_cost = 0.0
+        self.operations.clear()
+
+    def add_cost(self, cost: float, operation_name: str = "unknown") -> None:
+        """
+        Record an already-computed cost without enforcing the limit.
+
+        Used when spend is attributed after the fact (e.g. per-repo shares in
+        work_scheduler.py); the budget check happens before work is started.
+        """
+        self.total_cost += cost
+        self.operations.append(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "operation": operation_name,
+                "model": None,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost": cost,
+            }
+        )
+
     @staticmethod
     def calculate_cost(input_tokens: int, output_tokens: int, model: str) -> float:
         """
@@ -36,6 +36,10 @@ Usage:
 
     # Show batch status
     python runner.py batch-status
+
+    # Keep a warm process that accepts the commands above as jobs
+    # (JSON-RPC over stdin/stdout or a Unix socket, see daemon.py)
+    python runner.py daemon --socket /tmp/auto-claude-github.sock
 """
 
 from __future__ import annotations
@@ -99,6 +103,44 @@ def print_progress(callback: ProgressCallback) -> None:
     safe_print(f"{prefix}[{callback.progress:3d}%] {callback.message}")
 
 
+def create_orchestrator(
+    args, config: GitHubRunnerConfig, with_progress: bool = True
+) -> GitHubOrchestrator:
+    """
+    Create the orchestrator for a command.
+
+    Under the daemon, args carries a shared orchestrator cache and a progress
+    callback that routes updates to the job's subscribers; orchestrators are
+    then reused by later jobs with the same project and config.
+    """
+    progress_callback = None
+    if with_progress:
+        progress_callback = getattr(args, "progress_callback", None) or print_progress
+
+    cache = getattr(args, "orchestrator_cache", None)
+    if cache is None:
+        return GitHubOrchestrator(
+            project_dir=args.project,
+            config=config,
+            progress_callback=progress_callback,
+        )
+
+    key = (
+        str(Path(args.project).resolve()),
+        json.dumps(config.to_dict(), sort_keys=True),
+        with_progress,
+    )
+    orchestrator = cache.get(key)
+    if orchestrator is None:
+        orchestrator = GitHubOrchestrator(
+            project_dir=args.project,
+            config=config,
+            progress_callback=progress_callback,
+        )
+        cache[key] = orchestrator
+    return orchestrator
+
+
 def get_config(args) -> GitHubRunnerConfig:
     """Build config from CLI args and environment."""
     import subprocess
@@ -215,11 +257,7 @@ async def cmd_review_pr(args) -> int:
         )
         safe_print("[DEBUG] Creating orchestrator...")
 
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     if debug:
         safe_print("[DEBUG] Orchestrator created")
@@ -287,11 +325,7 @@ async def cmd_followup_review_pr(args) -> int:
         )
         safe_print("[DEBUG] Creating orchestrator...")
 
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     if debug:
         safe_print("[DEBUG] Orchestrator created")
@@ -346,11 +380,7 @@ async def cmd_followup_review_pr(args) -> int:
 async def cmd_triage(args) -> int:
     """Triage issues."""
     config = get_config(args)
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     issue_numbers = args.issues if args.issues else None
     results = await orchestrator.triage_issues(
@@ -386,11 +416,7 @@ async def cmd_auto_fix(args) -> int:
     """Start auto-fix for an issue."""
     config = get_config(args)
     config.auto_fix_enabled = True
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     state = await orchestrator.auto_fix_issue(args.issue_number)
 
@@ -412,11 +438,7 @@ async def cmd_check_labels(args) -> int:
     """Check for issues with auto-fix labels."""
     config = get_config(args)
     config.auto_fix_enabled = True
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     issues = await orchestrator.check_auto_fix_labels()
 
@@ -434,11 +456,7 @@ async def cmd_check_new(args) -> int:
     """Check for new issues not yet in the auto-fix queue."""
     config = get_config(args)
     config.auto_fix_enabled = True
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     issues = await orchestrator.check_new_issues()
 
@@ -451,10 +469,7 @@ async def cmd_check_new(args) -> int:
 async def cmd_queue(args) -> int:
     """Show auto-fix queue."""
     config = get_config(args)
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-    )
+    orchestrator = create_orchestrator(args, config, with_progress=False)
 
     queue = await orchestrator.get_auto_fix_queue()
 
@@ -491,11 +506,7 @@ async def cmd_batch_issues(args) -> int:
     """Batch similar issues and create combined specs."""
     config = get_config(args)
     config.auto_fix_enabled = True
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     issue_numbers = args.issues if args.issues else None
     batches = await orchestrator.batch_and_fix_issues(issue_numbers)
@@ -525,10 +536,7 @@ async def cmd_batch_issues(args) -> int:
 async def cmd_batch_status(args) -> int:
     """Show batch status."""
     config = get_config(args)
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-    )
+    orchestrator = create_orchestrator(args, config, with_progress=False)
 
     status = await orchestrator.get_batch_status()
 
@@ -553,11 +561,7 @@ async def cmd_analyze_preview(args) -> int:
     import json
 
     config = get_config(args)
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     issue_numbers = args.issues if args.issues else None
     max_issues = getattr(args, "max_issues", 200)
@@ -622,11 +626,7 @@ async def cmd_approve_batches(args) -> int:
     import json
 
     config = get_config(args)
-    orchestrator = GitHubOrchestrator(
-        project_dir=args.project,
-        config=config,
-        progress_callback=print_progress,
-    )
+    orchestrator = create_orchestrator(args, config)
 
     # Load approved batches from file
     try:
@@ -655,8 +655,77 @@ async def cmd_approve_batches(args) -> int:
     return 0
 
 
-def main():
-    """CLI entry point."""
+# Global options a daemon job inherits from the daemon when not given
+DAEMON_INHERITED_OPTIONS = (
+    "project",
+    "token",
+    "bot_token",
+    "repo",
+    "model",
+    "thinking_level",
+    "fast_mode",
+)
+
+# (project, --repo, --token) -> resolved (token, repo), cached by the daemon
+# so jobs do not shell out to `gh` on every run
+_daemon_resolved: dict[tuple[str, str | None, str | None], tuple[str, str]] = {}
+
+
+def prepare_daemon_args(args) -> str:
+    """Resolve token/repo once per project for daemon jobs; returns the repo."""
+    args.thinking_level = sanitize_thinking_level(args.thinking_level)
+    key = (str(Path(args.project).resolve()), args.repo, args.token)
+    resolved = _daemon_resolved.get(key)
+    if resolved is None:
+        config = get_config(args)
+        resolved = (config.token, config.repo)
+        _daemon_resolved[key] = resolved
+    args.token, args.repo = resolved
+    return args.repo
+
+
+async def cmd_daemon(args) -> int:
+    """Run the long-lived job daemon."""
+    from daemon import DaemonAlreadyRunningError, GitHubDaemon
+
+    job_parser = build_parser()
+    job_parser.set_defaults(
+        **{name: getattr(args, name) for name in DAEMON_INHERITED_OPTIONS}
+    )
+    daemon = GitHubDaemon(
+        state_dir=Path(args.project) / ".auto-claude" / "github",
+        parser=job_parser,
+        commands=COMMANDS,
+        prepare_args=prepare_daemon_args,
+        max_jobs=args.max_jobs,
+        max_jobs_per_repo=args.max_jobs_per_repo,
+    )
+    try:
+        await daemon.serve(socket_path=args.socket)
+    except DaemonAlreadyRunningError as e:
+        safe_print(f"Error: {e}")
+        return 1
+    return 0
+
+
+# Command name -> handler (runnable as daemon jobs)
+COMMANDS = {
+    "review-pr": cmd_review_pr,
+    "followup-review-pr": cmd_followup_review_pr,
+    "triage": cmd_triage,
+    "auto-fix": cmd_auto_fix,
+    "check-auto-fix-labels": cmd_check_labels,
+    "check-new": cmd_check_new,
+    "queue": cmd_queue,
+    "batch-issues": cmd_batch_issues,
+    "batch-status": cmd_batch_status,
+    "analyze-preview": cmd_analyze_preview,
+    "approve-batches": cmd_approve_batches,
+}
+
+
+def build_parser():
+    """Build the CLI argument parser."""
     import argparse
 
     parser = argparse.ArgumentParser(
@@ -806,6 +875,35 @@ def main():
         help="JSON file containing approved batches",
     )
 
+    # daemon command
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Run a long-lived process that accepts commands as jobs (JSON-RPC)",
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Listen on this Unix socket (default: JSON-RPC over stdin/stdout)",
+    )
+    daemon_parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=4,
+        help="Maximum jobs running at once (default: 4)",
+    )
+    daemon_parser.add_argument(
+        "--max-jobs-per-repo",
+        type=int,
+        default=1,
+        help="Maximum jobs running at once per repo (default: 1)",
+    )
+
+    return parser
+
+
+def main():
+    """CLI entry point."""
+    parser = build_parser()
     args = parser.parse_args()
 
     # Validate and sanitize thinking level (handles legacy values like 'ultrathink')
@@ -816,19 +914,7 @@ def main():
         sys.exit(1)
 
     # Route to command handler
-    commands = {
-        "review-pr": cmd_review_pr,
-        "followup-review-pr": cmd_followup_review_pr,
-        "triage": cmd_triage,
-        "auto-fix": cmd_auto_fix,
-        "check-auto-fix-labels": cmd_check_labels,
-        "check-new": cmd_check_new,
-        "queue": cmd_queue,
-        "batch-issues": cmd_batch_issues,
-        "batch-status": cmd_batch_status,
-        "analyze-preview": cmd_analyze_preview,
-        "approve-batches": cmd_approve_batches,
-    }
+    commands = {**COMMANDS, "daemon": cmd_daemon}
 
     handler = commands.get(args.command)
     if not handler:
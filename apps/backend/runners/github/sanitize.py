@@ -7,6 +7,7 @@ Protects against prompt injection attacks by:
 - Enforcing content length limits
 - Escaping special delimiters
 - Validating AI output format before acting
+- Streaming large payloads (full diffs) through a single chunked pass
 
 Based on OWASP guidelines for LLM prompt injection prevention.
 """
@@ -16,6 +17,7 @@ from __future__ import annotations
 import json
 import logging
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from typing import Any
 
@@ -29,6 +31,10 @@ MAX_DIFF_CHARS = 100_000  # 100KB
 MAX_FILE_CONTENT_CHARS = 50_000  # 50KB per file
 MAX_COMMENT_CHARS = 5_000  # 5KB per comment
 
+# Streaming engine
+SANITIZE_CHUNK_CHARS = 64 * 1024  # Input is processed in slices of this size
+INJECTION_SCAN_OVERLAP = 64  # >= longest whitespace-collapsed injection match
+
 
 @dataclass
 class SanitizeResult:
@@ -53,6 +59,171 @@ class SanitizeResult:
         }
 
 
+def _iter_chunks(content: str, chunk_size: int) -> Iterator[str]:
+    for start in range(0, len(content), chunk_size):
+        yield content[start : start + chunk_size]
+
+
+class _RegionStripper:
+    """
+    Removes opener...closer regions from a chunked stream.
+
+    Equivalent to re.sub("opener[\\s\\S]*?closer", "", text) on the joined
+    stream. Text is only held back while it may still start a region; an open
+    region is held until its closer arrives or the stream ends.
+    """
+
+    def __init__(self, opener: str, closer: str, flags: int = 0):
+        self._opener = re.compile(re.escape(opener), flags)
+        self._closer = re.compile(re.escape(closer), flags)
+        self._open_len = len(opener)
+        self._close_len = len(closer)
+        self._carry = ""
+        self._pending: list[str] | None = None
+        self._pending_len = 0
+        self.removed: list[int] = []  # Length of each removed region
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        text = self._carry + chunk
+        self._carry = ""
+        out: list[str] = []
+        pos = 0
+        close_from = 0
+        while True:
+            if self._pending is None:
+                opened = self._opener.search(text, pos)
+                if opened is None:
+                    break
+                out.append(text[pos : opened.start()])
+                self._pending = []
+                self._pending_len = 0
+                pos = opened.start()
+                close_from = opened.end()
+            closed = self._closer.search(text, close_from)
+            if closed is None:
+                break
+            self.removed.append(self._pending_len + closed.end() - pos)
+            self._pending = None
+            pos = closed.end()
+
+        if self._pending is None:
+            keep = len(text) if final else max(pos, len(text) - self._open_len + 1)
+            out.append(text[pos:keep])
+        elif final:
+            # Never closed: the region is ordinary text after all
+            out.extend(self._pending)
+            out.append(text[pos:])
+            self._pending = None
+            keep = len(text)
+        else:
+            keep = max(close_from, len(text) - self._close_len + 1)
+            self._pending.append(text[pos:keep])
+            self._pending_len += keep - pos
+        self._carry = text[keep:]
+        return "".join(out)
+
+
+def _lower_literals(source: str) -> str:
+    """Lowercase a pattern's literal characters, leaving escapes intact."""
+    out = []
+    escaped = False
+    for char in source:
+        out.append(char if escaped else char.lower())
+        escaped = not escaped and char == "\\"
+    return "".join(out)
+
+
+class _InjectionScanner:
+    """
+    Reports which injection patterns occur anywhere in a chunked stream.
+
+    Each chunk is scanned once while it is at hand, by the patterns not yet
+    found. For ASCII chunks the case-insensitive patterns run case-sensitively
+    against a lowercased copy, which lets re use its literal-prefix search
+    (an order of magnitude faster than IGNORECASE, and faster than one merged
+    alternation, which CPython's backtracking engine tries branch by branch).
+
+    Matches that straddle chunks are caught by carrying the end of the
+    previous window with whitespace runs collapsed to one space. The patterns
+    only use \\s+ or \\s* for whitespace, so collapsing preserves which of
+    them match while bounding how much needs to be carried.
+    """
+
+    _WHITESPACE_RUN = re.compile(r"\s+")
+
+    def __init__(self, patterns: list[re.Pattern]):
+        self._patterns = patterns
+        self._ascii: list[re.Pattern | None] = []
+        for pattern in patterns:
+            lowered = None
+            if pattern.flags & re.IGNORECASE and "\\N" not in pattern.pattern:
+                try:
+                    lowered = re.compile(
+                        _lower_literals(pattern.pattern),
+                        pattern.flags & ~re.IGNORECASE,
+                    )
+                except re.error:
+                    lowered = None
+            self._ascii.append(lowered)
+        self._tail = ""
+        self.found: set[int] = set()
+
+    def feed(self, chunk: str) -> None:
+        if not chunk or len(self.found) == len(self._patterns):
+            return
+        window = self._tail + chunk
+        folded = window.lower() if window.isascii() else None
+        for index, pattern in enumerate(self._patterns):
+            if index in self.found:
+                continue
+            lowered = self._ascii[index]
+            if folded is not None and lowered is not None:
+                hit = lowered.search(folded)
+            else:
+                hit = pattern.search(window)
+            if hit:
+                self.found.add(index)
+        self._tail = self._collapsed_tail(window)
+
+    def _collapsed_tail(self, window: str) -> str:
+        size = INJECTION_SCAN_OVERLAP
+        while True:
+            tail = self._WHITESPACE_RUN.sub(" ", window[-size:])
+            if len(tail) >= INJECTION_SCAN_OVERLAP or size >= len(window):
+                return tail[-INJECTION_SCAN_OVERLAP:]
+            size *= 2
+
+
+class _DelimiterEscaper:
+    """Escapes user_content delimiter tags in a chunked stream."""
+
+    def __init__(self, pattern: re.Pattern, prefix: re.Pattern):
+        self._pattern = pattern
+        self._prefix = prefix
+        self._carry = ""
+        self.count = 0
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        text = self._carry + chunk
+        self._carry = ""
+        out: list[str] = []
+        pos = 0
+        for match in self._pattern.finditer(text):
+            out.append(text[pos : match.start()])
+            out.append(match.group(0).replace("<", "&lt;").replace(">", "&gt;"))
+            pos = match.end()
+            self.count += 1
+        if not final:
+            # Hold back a trailing "<" that may still become a tag
+            lt = text.rfind("<", pos)
+            if lt != -1 and self._prefix.fullmatch(text, lt):
+                out.append(text[pos:lt])
+                self._carry = text[lt:]
+                return "".join(out)
+        out.append(text[pos:])
+        return "".join(out)
+
+
 class ContentSanitizer:
     """
     Sanitizes user-provided content to prevent prompt injection.
@@ -104,6 +275,11 @@ class ContentSanitizer:
         r"<\s*/?\s*user_content\s*>",
         re.IGNORECASE,
     )
+    # Any prefix of a USER_CONTENT_TAG_PATTERN match (streaming lookahead)
+    USER_CONTENT_TAG_PREFIX_PATTERN = re.compile(
+        r"<\s*(?:/\s*)?(?:u(?:s(?:e(?:r(?:_(?:c(?:o(?:n(?:t(?:e(?:n(?:t\s*)?)?)?)?)?)?)?)?)?)?)?)?",
+        re.IGNORECASE,
+    )
 
     def __init__(
         self,
@@ -114,6 +290,7 @@ class ContentSanitizer:
         max_comment: int = MAX_COMMENT_CHARS,
         log_truncation: bool = True,
         detect_injection: bool = True,
+        chunk_size: int = SANITIZE_CHUNK_CHARS,
     ):
         """
         Initialize sanitizer.
@@ -126,6 +303,7 @@ class ContentSanitizer:
             max_comment: Max chars per comment
             log_truncation: Whether to log truncation events
             detect_injection: Whether to detect injection patterns
+            chunk_size: Slice size for the streaming pass
         """
         self.max_issue_body = max_issue_body
         self.max_pr_body = max_pr_body
@@ -134,6 +312,7 @@ class ContentSanitizer:
         self.max_comment = max_comment
         self.log_truncation = log_truncation
         self.detect_injection = detect_injection
+        self.chunk_size = max(chunk_size, 1)
 
     def sanitize(
         self,
@@ -162,62 +341,106 @@ class ContentSanitizer:
                 final_length=0,
                 warnings=[],
             )
+        return self.sanitize_stream(
+            _iter_chunks(content, self.chunk_size), max_length, content_type
+        )
+
+    def sanitize_stream(
+        self,
+        chunks: Iterable[str],
+        max_length: int,
+        content_type: str = "content",
+    ) -> SanitizeResult:
+        """
+        Sanitize content arriving in chunks (e.g. a large diff) in one pass.
+
+        Produces the same result as sanitize() on the joined chunks. Each
+        chunk flows through the HTML comment, script and style strippers (kept
+        as separate stages so nested constructs resolve exactly as the
+        original sequential passes did), then the injection scanner, delimiter
+        escaping and truncation. Only max_length output characters and a
+        small carry per stage are retained.
+
+        Args:
+            chunks: Raw content, in order
+            max_length: Maximum allowed length
+            content_type: Type of content for logging
+
+        Returns:
+            SanitizeResult with sanitized content and metadata
+        """
+        strippers = [
+            _RegionStripper("<!--", "-->"),
+            _RegionStripper("<script", "</script>", re.IGNORECASE),
+            _RegionStripper("<style", "</style>", re.IGNORECASE),
+        ]
+        scanner = (
+            _InjectionScanner(self.INJECTION_PATTERNS)
+            if self.detect_injection
+            else None
+        )
+        escaper = _DelimiterEscaper(
+            self.USER_CONTENT_TAG_PATTERN, self.USER_CONTENT_TAG_PREFIX_PATTERN
+        )
+        kept: list[str] = []
+        kept_length = 0
+        stripped_length = 0
+        original_length = 0
+
+        def push(chunk: str, final: bool) -> None:
+            nonlocal kept_length, stripped_length
+            for stripper in strippers:
+                chunk = stripper.feed(chunk, final)
+            if scanner is not None:
+                scanner.feed(chunk)
+            chunk = escaper.feed(chunk, final)
+            stripped_length += len(chunk)
+            if kept_length < max_length and chunk:
+                piece = chunk[: max_length - kept_length]
+                kept.append(piece)
+                kept_length += len(piece)
+
+        for chunk in chunks:
+            original_length += len(chunk)
+            push(chunk, final=False)
+        push("", final=True)
 
-        original_length = len(content)
         removed_items = []
         warnings = []
         was_modified = False
 
-        # Step 1: Remove HTML comments (common vector for hidden instructions)
-        html_comments = self.HTML_COMMENT_PATTERN.findall(content)
+        html_comments, script_tags, style_tags = (s.removed for s in strippers)
         if html_comments:
-            content = self.HTML_COMMENT_PATTERN.sub("", content)
             removed_items.extend(
-                [f"HTML comment ({len(c)} chars)" for c in html_comments]
+                [f"HTML comment ({length} chars)" for length in html_comments]
             )
             was_modified = True
             if self.log_truncation:
                 logger.info(
                     f"Removed {len(html_comments)} HTML comments from {content_type}"
                 )
-
-        # Step 2: Remove script/style tags
-        script_tags = self.SCRIPT_TAG_PATTERN.findall(content)
         if script_tags:
-            content = self.SCRIPT_TAG_PATTERN.sub("", content)
             removed_items.append(f"{len(script_tags)} script tags")
             was_modified = True
-
-        style_tags = self.STYLE_TAG_PATTERN.findall(content)
         if style_tags:
-            content = self.STYLE_TAG_PATTERN.sub("", content)
             removed_items.append(f"{len(style_tags)} style tags")
             was_modified = True
 
-        # Step 3: Detect potential injection patterns (warn only, don't remove)
-        if self.detect_injection:
-            for pattern in self.INJECTION_PATTERNS:
-                matches = pattern.findall(content)
-                if matches:
+        # Injection patterns are reported, not removed
+        if scanner is not None:
+            for index, pattern in enumerate(self.INJECTION_PATTERNS):
+                if index in scanner.found:
                     warning = f"Potential injection pattern detected: {pattern.pattern}"
                     warnings.append(warning)
                     if self.log_truncation:
                         logger.warning(f"{content_type}: {warning}")
 
-        # Step 4: Escape our delimiters if present in content (handles variations)
-        if self.USER_CONTENT_TAG_PATTERN.search(content):
-            # Use regex to catch all variations including spacing and case
-            content = self.USER_CONTENT_TAG_PATTERN.sub(
-                lambda m: m.group(0).replace("<", "&lt;").replace(">", "&gt;"),
-                content,
-            )
+        if escaper.count:
             was_modified = True
             warnings.append("Escaped delimiter tags in content")
 
-        # Step 5: Truncate if too long
         was_truncated = False
-        if len(content) > max_length:
-            content = content[:max_length]
+        if stripped_length > max_length:
             was_truncated = True
             was_modified = True
             if self.log_truncation:
@@ -228,8 +451,7 @@ class ContentSanitizer:
                 f"Content truncated from {original_length} to {max_length} chars"
             )
 
-        # Step 6: Clean up whitespace
-        content = content.strip()
+        content = "".join(kept).strip()
 
         return SanitizeResult(
             content=content,
@@ -0,0 +1,268 @@
+"""
+Finding Deduplication
+=====================
+
+Location-tolerant duplicate detection for PR review findings, shared by the
+orchestrator, follow-up and multi-pass reviewers.
+
+Specialists often report the same issue a few lines apart with slightly
+different titles. Exact (file, line, title) keys miss these, and each missed
+duplicate costs an extra finding-validator call. This module clusters
+findings instead:
+- Findings are partitioned per file (optionally per category) and swept in
+  line order, so each finding is only compared with the findings whose line
+  range lies within LINE_WINDOW lines of its own
+- Within the window, findings are bucketed by what a match requires (a
+  shared pair of title tokens, an identical title or the same line), so
+  findings are only compared with others in one of their buckets
+- Titles are compared as normalized token sets (lowercased, de-pluralized,
+  filler words dropped)
+- Sorting dominates, so clustering is O(n log n) for realistic inputs, and
+  results depend only on input order, never on hash ordering
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from itertools import combinations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..models import PRReviewFinding
+
+
+# Findings whose line ranges are at most this far apart may be duplicates
+LINE_WINDOW = 3
+
+# Share of the shorter title's tokens that must also appear in the other
+TITLE_OVERLAP = 0.5
+
+# Words that say nothing about which issue a title describes
+_FILLER_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "can",
+        "could",
+        "for",
+        "from",
+        "in",
+        "into",
+        "is",
+        "issue",
+        "it",
+        "its",
+        "may",
+        "might",
+        "of",
+        "on",
+        "or",
+        "possible",
+        "potential",
+        "potentially",
+        "should",
+        "the",
+        "this",
+        "to",
+        "via",
+        "when",
+        "with",
+    }
+)
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+
+def normalize_title(title: str) -> frozenset[str]:
+    """Reduce a finding title to the set of words that identify the issue."""
+    tokens = set()
+    for token in _TOKEN.findall(title.lower()):
+        if token in _FILLER_WORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return frozenset(tokens)
+
+
+def titles_similar(
+    a: frozenset[str], b: frozenset[str], threshold: float = TITLE_OVERLAP
+) -> bool:
+    """
+    Whether two normalized titles describe the same issue.
+
+    Equal token sets always match. Otherwise the titles must share at least
+    two tokens, covering `threshold` of the shorter title.
+    """
+    if a == b:
+        return True
+    shared = len(a & b)
+    return shared >= 2 and shared >= threshold * min(len(a), len(b))
+
+
+def _title_blocks(tokens: frozenset[str]) -> set[Hashable]:
+    """Buckets two titles must share for titles_similar() to accept them."""
+    return {("title", tokens), *combinations(sorted(tokens), 2)}
+
+
+def _span(finding: PRReviewFinding) -> tuple[int, int]:
+    start = finding.line or 0
+    end = finding.end_line if finding.end_line and finding.end_line > start else start
+    return start, end
+
+
+def cluster_findings(
+    findings: Sequence[PRReviewFinding],
+    match: Callable[[int, int], bool],
+    key: Callable[[PRReviewFinding], Hashable] = lambda f: f.file,
+    line_window: int = LINE_WINDOW,
+    blocks: Callable[[int], Iterable[Hashable]] | None = None,
+) -> list[list[PRReviewFinding]]:
+    """
+    Group findings that refer to the same issue.
+
+    Findings with the same key whose line ranges are within `line_window` of
+    each other are candidates; `match(i, j)` (indices into `findings`)
+    decides. A finding joins the earliest-created cluster containing a
+    matching candidate, otherwise it starts a new one.
+
+    `blocks(i)` names the buckets of finding i; only candidates sharing a
+    bucket are passed to `match`, so it must return a common bucket for
+    every pair that can match. Without it, all candidates are compared.
+
+    Returns:
+        Clusters ordered by their first member's input position, each listing
+        its members in input order.
+    """
+    partitions: dict[Hashable, list[int]] = {}
+    for index, finding in enumerate(findings):
+        partitions.setdefault(key(finding), []).append(index)
+
+    spans = [_span(f) for f in findings]
+    cluster_of: list[int] = [-1] * len(findings)
+    clusters: list[list[int]] = []
+    for indices in partitions.values():
+        indices.sort(key=lambda i: (*spans[i], i))
+        # Sweep in start-line order; each bucket holds the indices whose range
+        # may still be within the window of the findings that follow
+        buckets: dict[Hashable, list[int]] = {}
+        for index in indices:
+            start = spans[index][0]
+            names = set(blocks(index)) if blocks is not None else {None}
+            best = -1
+            compared: set[int] = set()
+            for name in names:
+                bucket = buckets.setdefault(name, [])
+                bucket[:] = [i for i in bucket if spans[i][1] + line_window >= start]
+                for other in bucket:
+                    candidate = cluster_of[other]
+                    if (best != -1 and candidate >= best) or other in compared:
+                        continue
+                    compared.add(other)
+                    if match(other, index):
+                        best = candidate
+            if best == -1:
+                best = len(clusters)
+                clusters.append([])
+            clusters[best].append(index)
+            cluster_of[index] = best
+            for name in names:
+                buckets[name].append(index)
+
+    ordered = sorted((sorted(members) for members in clusters), key=lambda m: m[0])
+    return [[findings[i] for i in members] for members in ordered]
+
+
+def _independent(a: PRReviewFinding, b: PRReviewFinding) -> bool:
+    """Reported by disjoint sets of agents, i.e. corroboration not repetition."""
+    agents_a = set(getattr(a, "source_agents", None) or [])
+    agents_b = set(getattr(b, "source_agents", None) or [])
+    return bool(agents_a and agents_b and agents_a.isdisjoint(agents_b))
+
+
+def deduplicate_findings(
+    findings: Sequence[PRReviewFinding],
+    line_window: int = LINE_WINDOW,
+    on_duplicate: Callable[[PRReviewFinding, PRReviewFinding], None] | None = None,
+) -> list[PRReviewFinding]:
+    """
+    Drop findings that repeat an earlier one nearby with a similar title.
+
+    Findings from disjoint sets of source agents are kept apart: agreement
+    between independent specialists is a signal for cross-validation, not
+    noise. The first finding of each cluster survives, in input order; when
+    dropped findings add source agents, a copy carrying the merged agents is
+    returned in its place and the input findings are left untouched.
+
+    Args:
+        findings: Findings in report order
+        line_window: Line distance within which findings may be duplicates
+        on_duplicate: Called with (kept, dropped) for each dropped finding
+    """
+    titles = [normalize_title(f.title) for f in findings]
+
+    def match(i: int, j: int) -> bool:
+        return not _independent(findings[i], findings[j]) and titles_similar(
+            titles[i], titles[j]
+        )
+
+    unique = []
+    for cluster in cluster_findings(
+        findings,
+        match,
+        line_window=line_window,
+        blocks=lambda i: _title_blocks(titles[i]),
+    ):
+        kept = cluster[0]
+        for dropped in cluster[1:]:
+            extra = [
+                agent
+                for agent in getattr(dropped, "source_agents", None) or []
+                if agent not in (kept.source_agents or [])
+            ]
+            if extra:
+                if kept is cluster[0]:
+                    kept = copy.copy(kept)
+                kept.source_agents = [*(kept.source_agents or []), *extra]
+            if on_duplicate is not None:
+                on_duplicate(kept, dropped)
+        unique.append(kept)
+    return unique
+
+
+def group_corroborating_findings(
+    findings: Sequence[PRReviewFinding],
+    line_window: int = LINE_WINDOW,
+) -> list[list[PRReviewFinding]]:
+    """
+    Group findings in the same file and category that describe one issue.
+
+    Findings on the same line always group (as the exact (file, line,
+    category) key did); findings up to `line_window` lines apart group when
+    their titles are similar.
+    """
+    titles = [normalize_title(f.title) for f in findings]
+
+    def match(i: int, j: int) -> bool:
+        if findings[i].line == findings[j].line:
+            return True
+        return titles_similar(titles[i], titles[j])
+
+    def blocks(i: int) -> set[Hashable]:
+        return {("line", findings[i].line), *_title_blocks(titles[i])}
+
+    return cluster_findings(
+        findings,
+        match,
+        key=lambda f: (f.file, getattr(f.category, "value", f.category)),
+        line_window=line_window,
+        blocks=blocks,
+    )
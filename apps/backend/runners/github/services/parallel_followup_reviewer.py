@@ -49,6 +49,7 @@ try:
     )
     from .agent_utils import create_working_dir_injector
     from .category_utils import map_category
+    from .finding_dedup import deduplicate_findings
     from .io_utils import safe_print
     from .pr_worktree_manager import PRWorktreeManager
     from .pydantic_models import FollowupExtractionResponse, ParallelFollowupResponse
@@ -74,6 +75,7 @@ except (ImportError, ValueError, SystemError):
     )
     from services.agent_utils import create_working_dir_injector
     from services.category_utils import map_category
+    from services.finding_dedup import deduplicate_findings
     from services.io_utils import safe_print
     from services.pr_worktree_manager import PRWorktreeManager
     from services.pydantic_models import (
@@ -167,12 +169,15 @@ class ParallelFollowupReviewer:
         logger.warning(f"Prompt file not found: {prompt_file}")
         return ""
 
-    def _create_pr_worktree(self, head_sha: str, pr_number: int) -> Path:
-        """Create a temporary worktree at the PR head commit.
+    def _create_pr_worktree(
+        self, head_sha: str, pr_number: int, changed_files: list[str] | None = None
+    ) -> Path:
+        """Lease a pooled worktree checked out at the PR head commit.
 
         Args:
             head_sha: The commit SHA of the PR head (validated before use)
             pr_number: The PR number for naming
+            changed_files: Paths changed by the PR (used for sparse checkout)
 
         Returns:
             Path to the created worktree
@@ -188,15 +193,17 @@ class ParallelFollowupReviewer:
                 "Must contain only alphanumeric characters, dots, slashes, underscores, and hyphens."
             )
 
-        return self.worktree_manager.create_worktree(head_sha, pr_number)
+        return self.worktree_manager.acquire_worktree(
+            head_sha, pr_number, changed_files=changed_files
+        )
 
     def _cleanup_pr_worktree(self, worktree_path: Path) -> None:
-        """Remove a temporary PR review worktree with fallback chain.
+        """Return a PR review worktree to the pool (one-off worktrees are removed).
 
         Args:
-            worktree_path: Path to the worktree to remove
+            worktree_path: Path to the worktree to release
         """
-        self.worktree_manager.remove_worktree(worktree_path)
+        self.worktree_manager.release_worktree(worktree_path)
 
     def _define_specialist_agents(
         self, project_root: Path | None = None
@@ -499,7 +506,9 @@ The SDK will run invoked agents in parallel automatically.
                             flush=True,
                         )
                     worktree_path = self._create_pr_worktree(
-                        head_sha, context.pr_number
+                        head_sha,
+                        context.pr_number,
+                        context.files_changed_since_review,
                     )
                     project_root = worktree_path
                     safe_print(
@@ -1423,15 +1432,8 @@ The SDK will run invoked agents in parallel automatically.
     def _deduplicate_findings(
         self, findings: list[PRReviewFinding]
     ) -> list[PRReviewFinding]:
-        """Remove duplicate findings."""
-        seen = set()
-        unique = []
-        for f in findings:
-            key = (f.file, f.line, f.title.lower().strip())
-            if key not in seen:
-                seen.add(key)
-                unique.append(f)
-        return unique
+        """Remove repeated findings (same area, similar title, same reporter)."""
+        return deduplicate_findings(findings)
 
     def _generate_summary(
         self,
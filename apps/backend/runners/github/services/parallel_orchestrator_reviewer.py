@@ -21,8 +21,7 @@ import asyncio
 import hashlib
 import logging
 import os
-from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
@@ -52,6 +51,7 @@ try:
     )
     from .agent_utils import create_working_dir_injector
     from .category_utils import map_category
+    from .finding_dedup import deduplicate_findings, group_corroborating_findings
     from .io_utils import safe_print
     from .pr_worktree_manager import PRWorktreeManager
     from .pydantic_models import (
@@ -61,6 +61,7 @@ try:
         SpecialistResponse,
     )
     from .sdk_utils import process_sdk_stream
+    from .specialist_cache import SpecialistCache, is_cache_enabled, prompt_version
 except (ImportError, ValueError, SystemError):
     from context_gatherer import PRContext, _validate_git_ref
     from core.client import create_client
@@ -82,6 +83,10 @@ except (ImportError, ValueError, SystemError):
     )
     from services.agent_utils import create_working_dir_injector
     from services.category_utils import map_category
+    from services.finding_dedup import (
+        deduplicate_findings,
+        group_corroborating_findings,
+    )
     from services.io_utils import safe_print
     from services.pr_worktree_manager import PRWorktreeManager
     from services.pydantic_models import (
@@ -91,6 +96,11 @@ except (ImportError, ValueError, SystemError):
         SpecialistResponse,
     )
     from services.sdk_utils import process_sdk_stream
+    from services.specialist_cache import (
+        SpecialistCache,
+        is_cache_enabled,
+        prompt_version,
+    )
 
 
 # =============================================================================
@@ -238,12 +248,15 @@ class ParallelOrchestratorReviewer:
         logger.warning(f"Prompt file not found: {prompt_file}")
         return ""
 
-    def _create_pr_worktree(self, head_sha: str, pr_number: int) -> Path:
-        """Create a temporary worktree at the PR head commit.
+    def _create_pr_worktree(
+        self, head_sha: str, pr_number: int, changed_files: list[str] | None = None
+    ) -> Path:
+        """Lease a pooled worktree checked out at the PR head commit.
 
         Args:
             head_sha: The commit SHA of the PR head (validated before use)
             pr_number: The PR number for naming
+            changed_files: Paths changed by the PR (used for sparse checkout)
 
         Returns:
             Path to the created worktree
@@ -259,15 +272,17 @@ class ParallelOrchestratorReviewer:
                 "Must contain only alphanumeric characters, dots, slashes, underscores, and hyphens."
             )
 
-        return self.worktree_manager.create_worktree(head_sha, pr_number)
+        return self.worktree_manager.acquire_worktree(
+            head_sha, pr_number, changed_files=changed_files
+        )
 
     def _cleanup_pr_worktree(self, worktree_path: Path) -> None:
-        """Remove a temporary PR review worktree with fallback chain.
+        """Return a PR review worktree to the pool (one-off worktrees are removed).
 
         Args:
-            worktree_path: Path to the worktree to remove
+            worktree_path: Path to the worktree to release
         """
-        self.worktree_manager.remove_worktree(worktree_path)
+        self.worktree_manager.release_worktree(worktree_path)
 
     def _cleanup_stale_pr_worktrees(self) -> None:
         """Clean up orphaned, expired, and excess PR review worktrees on startup."""
@@ -409,6 +424,7 @@ class ParallelOrchestratorReviewer:
         config: SpecialistConfig,
         context: PRContext,
         project_root: Path,
+        cached_files: list[str] | None = None,
     ) -> str:
         """Build the full prompt for a specialist agent.
 
@@ -416,6 +432,8 @@ class ParallelOrchestratorReviewer:
             config: Specialist configuration
             context: PR context with files and patches
             project_root: Working directory for the agent
+            cached_files: Changed files whose unchanged content this
+                specialist already reviewed (excluded from context)
 
         Returns:
             Full system prompt with context injected
@@ -451,6 +469,17 @@ class ParallelOrchestratorReviewer:
         if len(diff_content) > MAX_DIFF_CHARS:
             diff_content = diff_content[:MAX_DIFF_CHARS] + "\n\n... (diff truncated)"
 
+        cached_note = ""
+        if cached_files:
+            cached_list = "\n".join(f"- `{path}`" for path in cached_files)
+            cached_note = f"""
+### Previously Reviewed Files
+These files are also changed in this PR, but their content is identical to
+an earlier review and their findings are carried over. Do not report issues
+in them; read them only as context for the files above.
+{cached_list}
+"""
+
         # Compose full prompt with PR context
         pr_context = f"""
 ## PR Context
@@ -465,7 +494,7 @@ class ParallelOrchestratorReviewer:
 
 ### Diff
 {diff_content}
-
+{cached_note}
 ## Your Task
 
 Analyze this PR for {config.description}.
@@ -482,7 +511,8 @@ Report findings with specific file paths, line numbers, and code evidence.
         project_root: Path,
         model: str,
         thinking_budget: int | None,
-    ) -> tuple[str, list[PRReviewFinding]]:
+        cached_files: list[str] | None = None,
+    ) -> tuple[str, list[PRReviewFinding] | None]:
         """Run a single specialist as its own SDK session.
 
         Args:
@@ -491,9 +521,11 @@ Report findings with specific file paths, line numbers, and code evidence.
             project_root: Working directory
             model: Model to use
             thinking_budget: Max thinking tokens
+            cached_files: Changed files already covered by cached findings
 
         Returns:
-            Tuple of (specialist_name, findings)
+            Tuple of (specialist_name, findings); findings is None if the
+            session failed
         """
         safe_print(
             f"[Specialist:{config.name}] Starting analysis...",
@@ -501,7 +533,9 @@ Report findings with specific file paths, line numbers, and code evidence.
         )
 
         # Build the specialist prompt with PR context
-        prompt = self._build_specialist_prompt(config, context, project_root)
+        prompt = self._build_specialist_prompt(
+            config, context, project_root, cached_files
+        )
 
         try:
             # Create SDK client for this specialist
@@ -548,7 +582,7 @@ Report findings with specific file paths, line numbers, and code evidence.
                         f"[Specialist:{config.name}] Analysis failed: {error}",
                         flush=True,
                     )
-                    return (config.name, [])
+                    return (config.name, None)
 
                 # Parse structured output
                 structured_output = stream_result.get("structured_output")
@@ -572,7 +606,7 @@ Report findings with specific file paths, line numbers, and code evidence.
                 f"[Specialist:{config.name}] Error: {e}",
                 flush=True,
             )
-            return (config.name, [])
+            return (config.name, None)
 
     def _parse_specialist_output(
         self,
@@ -707,12 +741,85 @@ Report findings with specific file paths, line numbers, and code evidence.
 
         return findings
 
+    async def _run_cached_specialist(
+        self,
+        config: SpecialistConfig,
+        context: PRContext,
+        project_root: Path,
+        model: str,
+        thinking_budget: int | None,
+        cache: SpecialistCache,
+        file_blobs: dict[str, str],
+    ) -> tuple[str, list[PRReviewFinding] | None]:
+        """Run a specialist only on files it has not reviewed in their current form.
+
+        Findings for files whose blob SHA was already reviewed by this
+        specialist (same prompt version and model) come from the cache; the
+        session sees the remaining files, and its results are cached per file.
+
+        Returns:
+            Tuple of (specialist_name, findings); findings is None if the
+            session failed and nothing was cached
+        """
+        version = prompt_version(
+            self._load_prompt(config.prompt_file), config.description, *config.tools
+        )
+        lookup = cache.lookup(
+            config.name,
+            version,
+            [file.path for file in context.changed_files],
+            file_blobs,
+        )
+
+        if not lookup.missing_paths:
+            safe_print(
+                f"[Specialist:{config.name}] All {len(lookup.cached_paths)} files "
+                f"unchanged since last review, reusing "
+                f"{len(lookup.cached_findings)} findings",
+                flush=True,
+            )
+            return (config.name, lookup.cached_findings)
+
+        session_context = context
+        if lookup.cached_paths:
+            missing = set(lookup.missing_paths)
+            session_context = replace(
+                context,
+                changed_files=[f for f in context.changed_files if f.path in missing],
+            )
+            safe_print(
+                f"[Specialist:{config.name}] Reviewing {len(missing)} changed files, "
+                f"reusing findings for {len(lookup.cached_paths)} unchanged files",
+                flush=True,
+            )
+
+        name, findings = await self._run_specialist_session(
+            config=config,
+            context=session_context,
+            project_root=project_root,
+            model=model,
+            thinking_budget=thinking_budget,
+            cached_files=lookup.cached_paths,
+        )
+        if findings is None:
+            return (name, lookup.cached_findings or None)
+
+        cache.store_results(
+            config.name,
+            version,
+            {file.path: file.status for file in session_context.changed_files},
+            findings,
+            file_blobs,
+        )
+        return (name, findings + lookup.cached_findings)
+
     async def _run_parallel_specialists(
         self,
         context: PRContext,
         project_root: Path,
         model: str,
         thinking_budget: int | None,
+        file_blobs: dict[str, str] | None = None,
     ) -> tuple[list[PRReviewFinding], list[str]]:
         """Run all specialists in parallel and collect findings.
 
@@ -721,6 +828,8 @@ Report findings with specific file paths, line numbers, and code evidence.
             project_root: Working directory
             model: Model to use
             thinking_budget: Max thinking tokens
+            file_blobs: Path -> blob SHA for the PR head; enables reuse of
+                cached per-file specialist findings
 
         Returns:
             Tuple of (all_findings, agents_invoked)
@@ -730,17 +839,40 @@ Report findings with specific file paths, line numbers, and code evidence.
             flush=True,
         )
 
+        cache: SpecialistCache | None = None
+        if file_blobs and is_cache_enabled():
+            try:
+                cache = SpecialistCache(self.github_dir, model)
+            except Exception as e:
+                logger.warning(
+                    f"[ParallelOrchestrator] Specialist cache unavailable: {e}"
+                )
+
         # Create tasks for all specialists
-        tasks = [
-            self._run_specialist_session(
-                config=config,
-                context=context,
-                project_root=project_root,
-                model=model,
-                thinking_budget=thinking_budget,
-            )
-            for config in SPECIALIST_CONFIGS
-        ]
+        if cache is not None:
+            tasks = [
+                self._run_cached_specialist(
+                    config=config,
+                    context=context,
+                    project_root=project_root,
+                    model=model,
+                    thinking_budget=thinking_budget,
+                    cache=cache,
+                    file_blobs=file_blobs,
+                )
+                for config in SPECIALIST_CONFIGS
+            ]
+        else:
+            tasks = [
+                self._run_specialist_session(
+                    config=config,
+                    context=context,
+                    project_root=project_root,
+                    model=model,
+                    thinking_budget=thinking_budget,
+                )
+                for config in SPECIALIST_CONFIGS
+            ]
 
         # Run all specialists in parallel
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -756,7 +888,7 @@ Report findings with specific file paths, line numbers, and code evidence.
 
             specialist_name, findings = result
             agents_invoked.append(specialist_name)
-            all_findings.extend(findings)
+            all_findings.extend(findings or [])
 
         safe_print(
             f"[ParallelOrchestrator] All specialists complete. "
@@ -1038,6 +1170,33 @@ The SDK will run invoked agents in parallel automatically.
                 "awaiting_approval": 0,
             }
 
+    async def _get_file_blobs(self, pr_number: int) -> dict[str, str]:
+        """Get file blob SHAs for the PR head.
+
+        Blob SHAs persist across rebases - same content = same blob SHA - so
+        they key both rebase-resistant follow-up reviews and the specialist
+        findings cache.
+        """
+        file_blobs: dict[str, str] = {}
+        try:
+            gh_client = GHClient(
+                project_dir=self.project_dir,
+                default_timeout=30.0,
+                repo=self.config.repo,
+            )
+            pr_files = await gh_client.get_pr_files(pr_number)
+            for file in pr_files:
+                filename = file.get("filename", "")
+                blob_sha = file.get("sha", "")
+                if filename and blob_sha:
+                    file_blobs[filename] = blob_sha
+            logger.info(
+                f"Captured {len(file_blobs)} file blob SHAs for follow-up tracking"
+            )
+        except Exception as e:
+            logger.warning(f"Could not capture file blobs: {e}")
+        return file_blobs
+
     async def review(self, context: PRContext) -> PRReviewResult:
         """
         Main review entry point.
@@ -1111,7 +1270,9 @@ The SDK will run invoked agents in parallel automatically.
                     )
                 try:
                     worktree_path = self._create_pr_worktree(
-                        head_sha, context.pr_number
+                        head_sha,
+                        context.pr_number,
+                        [f.path for f in context.changed_files],
                     )
                     project_root = worktree_path
                     # Count files in worktree to give user visibility (with limit to avoid slowdown)
@@ -1192,12 +1353,17 @@ The SDK will run invoked agents in parallel automatically.
             # - No dependency on broken CLI features
             # =================================================================
 
+            # Blob SHAs identify unchanged files for the specialist cache and
+            # for follow-up reviews
+            file_blobs = await self._get_file_blobs(context.pr_number)
+
             # Run all specialists in parallel
             findings, agents_invoked = await self._run_parallel_specialists(
                 context=context,
                 project_root=project_root,
                 model=model,
                 thinking_budget=thinking_budget,
+                file_blobs=file_blobs,
             )
 
             # Log results
@@ -1337,27 +1503,6 @@ The SDK will run invoked agents in parallel automatically.
                 latest_commit = context.commits[-1]
                 head_sha = latest_commit.get("oid") or latest_commit.get("sha")
 
-            # Get file blob SHAs for rebase-resistant follow-up reviews
-            # Blob SHAs persist across rebases - same content = same blob SHA
-            file_blobs: dict[str, str] = {}
-            try:
-                gh_client = GHClient(
-                    project_dir=self.project_dir,
-                    default_timeout=30.0,
-                    repo=self.config.repo,
-                )
-                pr_files = await gh_client.get_pr_files(context.pr_number)
-                for file in pr_files:
-                    filename = file.get("filename", "")
-                    blob_sha = file.get("sha", "")
-                    if filename and blob_sha:
-                        file_blobs[filename] = blob_sha
-                logger.info(
-                    f"Captured {len(file_blobs)} file blob SHAs for follow-up tracking"
-                )
-            except Exception as e:
-                logger.warning(f"Could not capture file blobs: {e}")
-
             result = PRReviewResult(
                 pr_number=context.pr_number,
                 repo=self.config.repo,
@@ -1540,17 +1685,8 @@ The SDK will run invoked agents in parallel automatically.
     def _deduplicate_findings(
         self, findings: list[PRReviewFinding]
     ) -> list[PRReviewFinding]:
-        """Remove duplicate findings."""
-        seen = set()
-        unique = []
-
-        for f in findings:
-            key = (f.file, f.line, f.title.lower().strip())
-            if key not in seen:
-                seen.add(key)
-                unique.append(f)
-
-        return unique
+        """Remove repeated findings (same area, similar title, same reporter)."""
+        return deduplicate_findings(findings)
 
     def _cross_validate_findings(
         self, findings: list[PRReviewFinding]
@@ -1558,7 +1694,8 @@ The SDK will run invoked agents in parallel automatically.
         """
         Cross-validate findings to boost confidence when multiple agents agree.
 
-        Groups findings by location key (file, line, category) and:
+        Groups findings in the same file and category that are on the same line,
+        or within a few lines with similar titles (see finding_dedup), and:
         - For groups with 2+ findings: merges into one, boosts confidence by 0.15,
           sets cross_validated=True, collects all source agents
         - For single-agent findings: keeps as-is, ensures source_agents is populated
@@ -1573,16 +1710,10 @@ The SDK will run invoked agents in parallel automatically.
         CONFIDENCE_BOOST = 0.15
         MAX_CONFIDENCE = 0.95
 
-        # Group findings by location key: (file, line, category)
-        groups: dict[tuple, list[PRReviewFinding]] = defaultdict(list)
-        for finding in findings:
-            key = (finding.file, finding.line, finding.category.value)
-            groups[key].append(finding)
-
         validated_findings: list[PRReviewFinding] = []
         agreed_finding_ids: list[str] = []
 
-        for key, group in groups.items():
+        for group in group_corroborating_findings(findings):
             if len(group) >= 2:
                 # Multi-agent agreement: merge findings
                 # Sort by severity to keep highest severity finding
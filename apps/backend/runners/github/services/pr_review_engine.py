@@ -22,6 +22,7 @@ try:
         ReviewPass,
         StructuralIssue,
     )
+    from .finding_dedup import deduplicate_findings
     from .io_utils import safe_print
     from .prompt_manager import PromptManager
     from .response_parsers import ResponseParser
@@ -35,6 +36,7 @@ except (ImportError, ValueError, SystemError):
         StructuralIssue,
     )
     from phase_config import get_model_betas, resolve_model_id
+    from services.finding_dedup import deduplicate_findings
     from services.io_utils import safe_print
     from services.prompt_manager import PromptManager
     from services.response_parsers import ResponseParser
@@ -107,19 +109,15 @@ class PRReviewEngine:
         self, findings: list[PRReviewFinding]
     ) -> list[PRReviewFinding]:
         """Remove duplicate findings from multiple passes."""
-        seen = set()
-        unique = []
-        for f in findings:
-            key = (f.file, f.line, f.title.lower().strip())
-            if key not in seen:
-                seen.add(key)
-                unique.append(f)
-            else:
-                safe_print(
-                    f"[AI] Skipping duplicate finding: {f.file}:{f.line} - {f.title}",
-                    flush=True,
-                )
-        return unique
+
+        def report(kept: PRReviewFinding, dropped: PRReviewFinding) -> None:
+            safe_print(
+                f"[AI] Skipping duplicate finding: {dropped.file}:{dropped.line} - "
+                f"{dropped.title} (same as line {kept.line})",
+                flush=True,
+            )
+
+        return deduplicate_findings(findings, on_duplicate=report)
 
     async def run_review_pass(
         self,
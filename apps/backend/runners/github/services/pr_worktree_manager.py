@@ -9,14 +9,19 @@ Features:
 - Count-based cleanup (keep only N most recent worktrees)
 - Orphaned worktree cleanup (worktrees not registered with git)
 - Automatic cleanup on review completion
+- Warm worktree pool: a fixed set of detached worktrees that are leased to
+  reviews and re-pointed with `git checkout --detach <sha>`, so only paths
+  that differ between commits are touched (optional sparse checkout)
 """
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 import shutil
 import subprocess
+import threading
 import time
 from pathlib import Path
 from typing import NamedTuple
@@ -29,6 +34,12 @@ logger = logging.getLogger(__name__)
 DEFAULT_MAX_PR_WORKTREES = 10  # Max worktrees to keep
 DEFAULT_PR_WORKTREE_MAX_AGE_DAYS = 7  # Max age in days
 
+# Pool slots are named pool-<n>; leases are pool-<n>.lease files next to them
+POOL_SLOT_PREFIX = "pool-"
+LEASE_SUFFIX = ".lease"
+# Leases held longer than this (or by a dead process) are considered stale
+LEASE_TTL_SECONDS = 6 * 3600
+
 
 def _get_max_pr_worktrees() -> int:
     """Get max worktrees setting, read at runtime for testability."""
@@ -52,6 +63,31 @@ def _get_max_age_days() -> int:
         return DEFAULT_PR_WORKTREE_MAX_AGE_DAYS
 
 
+def _is_pool_enabled() -> bool:
+    """Whether reviews lease pooled worktrees, read at runtime for testability."""
+    return os.environ.get("PR_WORKTREE_POOL", "true").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+def _get_sparse_paths() -> list[str]:
+    """Directories always checked out in sparse pool slots (comma-separated)."""
+    value = os.environ.get("PR_WORKTREE_SPARSE_PATHS", "")
+    return [p.strip().strip("/") for p in value.split(",") if p.strip()]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
 # Safe pattern for git refs (SHA, branch names)
 # Allows: alphanumeric, dots, underscores, hyphens, forward slashes
 import re
@@ -77,16 +113,28 @@ class PRWorktreeManager:
     3. Remove orphaned worktrees (not registered with git)
     """
 
-    def __init__(self, project_dir: Path, worktree_dir: str | Path):
+    def __init__(
+        self,
+        project_dir: Path,
+        worktree_dir: str | Path,
+        sparse_paths: list[str] | None = None,
+    ):
         """
         Initialize the worktree manager.
 
         Args:
             project_dir: Root directory of the git project
             worktree_dir: Directory where PR worktrees are stored (relative to project_dir)
+            sparse_paths: Directories to check out in pool slots (sparse
+                checkout for huge repos); defaults to PR_WORKTREE_SPARSE_PATHS.
+                Directories of a review's changed files are always added.
         """
         self.project_dir = Path(project_dir)
         self.worktree_base_dir = self.project_dir / worktree_dir
+        self.sparse_paths = (
+            sparse_paths if sparse_paths is not None else _get_sparse_paths()
+        )
+        self._pool_lock = threading.Lock()
 
     def create_worktree(
         self, head_sha: str, pr_number: int, auto_cleanup: bool = True
@@ -132,24 +180,7 @@ class PRWorktreeManager:
         logger.debug(f"Creating worktree: {worktree_path}")
 
         env = get_isolated_git_env()
-        try:
-            fetch_result = subprocess.run(
-                ["git", "fetch", "origin", head_sha],
-                cwd=self.project_dir,
-                capture_output=True,
-                text=True,
-                timeout=60,
-                env=env,
-            )
-
-            if fetch_result.returncode != 0:
-                logger.warning(
-                    f"Could not fetch {head_sha} from origin (fork PR?): {fetch_result.stderr}"
-                )
-        except subprocess.TimeoutExpired:
-            logger.warning(
-                f"Timeout fetching {head_sha} from origin, continuing anyway"
-            )
+        self._fetch(head_sha)
 
         try:
             result = subprocess.run(
@@ -184,6 +215,293 @@ class PRWorktreeManager:
         logger.info(f"[WorktreeManager] Created worktree at {worktree_path}")
         return worktree_path
 
+    def _git(
+        self, args: list[str], cwd: Path | None = None, timeout: int = 60
+    ) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            ["git", *args],
+            cwd=cwd or self.project_dir,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=get_isolated_git_env(),
+        )
+
+    def _fetch(self, head_sha: str) -> None:
+        """Fetch a commit from origin unless it is already present locally."""
+        try:
+            present = self._git(
+                ["cat-file", "-e", f"{head_sha}^{{commit}}"], timeout=30
+            )
+            if present.returncode == 0:
+                return
+            fetch_result = self._git(["fetch", "origin", head_sha])
+            if fetch_result.returncode != 0:
+                logger.warning(
+                    f"Could not fetch {head_sha} from origin (fork PR?): {fetch_result.stderr}"
+                )
+        except subprocess.TimeoutExpired:
+            logger.warning(
+                f"Timeout fetching {head_sha} from origin, continuing anyway"
+            )
+
+    # ------------------------------------------------------------------
+    # Worktree pool
+    # ------------------------------------------------------------------
+
+    def acquire_worktree(
+        self,
+        head_sha: str,
+        pr_number: int,
+        changed_files: list[str] | None = None,
+        auto_cleanup: bool = True,
+    ) -> Path:
+        """
+        Lease a warm pool worktree checked out at head_sha.
+
+        A free slot already at head_sha is preferred, then the least recently
+        used free slot; a new slot is added while the pool is below
+        MAX_PR_WORKTREES. When every slot is leased (or the pool is disabled
+        with PR_WORKTREE_POOL=false) a one-off worktree is created instead.
+        Release the result with release_worktree().
+
+        Args:
+            head_sha: Git commit SHA to checkout
+            pr_number: PR number (recorded in the lease)
+            changed_files: Paths changed by the PR; their directories are
+                added to the checkout when sparse checkout is configured
+            auto_cleanup: If True (default), run cleanup before leasing
+
+        Returns:
+            Path to the leased worktree
+
+        Raises:
+            RuntimeError: If no worktree could be prepared
+            ValueError: If head_sha or pr_number are invalid
+        """
+        if not head_sha or not SAFE_REF_PATTERN.match(head_sha):
+            raise ValueError(
+                f"Invalid head_sha: must match pattern {SAFE_REF_PATTERN.pattern}"
+            )
+        if not isinstance(pr_number, int) or pr_number <= 0:
+            raise ValueError(
+                f"Invalid pr_number: must be a positive integer, got {pr_number}"
+            )
+        if not _is_pool_enabled():
+            return self.create_worktree(head_sha, pr_number, auto_cleanup)
+
+        if auto_cleanup:
+            self.cleanup_worktrees()
+
+        self._fetch(head_sha)
+        slot = self._lease_slot(head_sha, pr_number)
+        if slot is None:
+            logger.info(
+                f"[WorktreeManager] All pool worktrees leased, creating one-off worktree for PR #{pr_number}"
+            )
+            return self.create_worktree(head_sha, pr_number, auto_cleanup=False)
+
+        try:
+            self._point_slot(slot, head_sha, changed_files)
+        except Exception as e:
+            # Unhealthy slot: drop it and fall back to a fresh worktree
+            logger.warning(
+                f"[WorktreeManager] Pool worktree {slot.name} unusable, replacing: {e}"
+            )
+            self.remove_worktree(slot)
+            self._release_lease(slot)
+            return self.create_worktree(head_sha, pr_number, auto_cleanup=False)
+
+        logger.info(
+            f"[WorktreeManager] Leased pool worktree {slot.name} at {head_sha[:8]} for PR #{pr_number}"
+        )
+        return slot
+
+    def release_worktree(self, worktree_path: Path) -> None:
+        """
+        Return a leased worktree to the pool (one-off worktrees are removed).
+
+        Args:
+            worktree_path: Path returned by acquire_worktree()
+        """
+        if not worktree_path:
+            return
+        if not self._is_pool_slot(worktree_path):
+            self.remove_worktree(worktree_path)
+            return
+
+        # The mtime records last use, so age- and count-based cleanup evict
+        # the least recently used slots first
+        try:
+            os.utime(worktree_path)
+        except OSError:
+            pass
+        self._release_lease(worktree_path)
+        logger.debug(f"[WorktreeManager] Released pool worktree {worktree_path.name}")
+
+    def _is_pool_slot(self, path: Path) -> bool:
+        return (
+            path.name.startswith(POOL_SLOT_PREFIX)
+            and path.parent.resolve() == self.worktree_base_dir.resolve()
+        )
+
+    def _lease_path(self, slot: Path) -> Path:
+        return slot.with_name(slot.name + LEASE_SUFFIX)
+
+    def _claim_lease(self, slot: Path, head_sha: str, pr_number: int) -> bool:
+        """Atomically create the lease file for a slot (cross-process safe)."""
+        lease = self._lease_path(slot)
+        if lease.exists() and self._lease_is_stale(lease):
+            lease.unlink(missing_ok=True)
+        try:
+            fd = os.open(lease, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "pid": os.getpid(),
+                    "pr_number": pr_number,
+                    "head_sha": head_sha,
+                    "acquired_at": time.time(),
+                },
+                f,
+            )
+        return True
+
+    def _release_lease(self, slot: Path) -> None:
+        self._lease_path(slot).unlink(missing_ok=True)
+
+    @staticmethod
+    def _lease_is_stale(lease: Path) -> bool:
+        try:
+            with open(lease, encoding="utf-8") as f:
+                data = json.load(f)
+            pid = int(data["pid"])
+            acquired_at = float(data["acquired_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # Unreadable lease: trust it only while it is fresh
+            try:
+                return time.time() - lease.stat().st_mtime > LEASE_TTL_SECONDS
+            except OSError:
+                return True
+        return not _pid_alive(pid) or time.time() - acquired_at > LEASE_TTL_SECONDS
+
+    def _pool_slots(self) -> list[Path]:
+        if not self.worktree_base_dir.exists():
+            return []
+        return sorted(
+            item
+            for item in self.worktree_base_dir.iterdir()
+            if item.is_dir() and item.name.startswith(POOL_SLOT_PREFIX)
+        )
+
+    def leased_worktrees(self) -> set[Path]:
+        """Pool worktrees currently leased to a live review."""
+        return {
+            slot.resolve()
+            for slot in self._pool_slots()
+            if self._lease_path(slot).exists()
+            and not self._lease_is_stale(self._lease_path(slot))
+        }
+
+    @staticmethod
+    def _slot_head(slot: Path) -> str | None:
+        """Read a detached worktree's HEAD without running git."""
+        try:
+            gitdir = (slot / ".git").read_text(encoding="utf-8").strip()
+            if not gitdir.startswith("gitdir:"):
+                return None
+            head_file = Path(gitdir.split(":", 1)[1].strip()) / "HEAD"
+            head = head_file.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        return head if not head.startswith("ref:") else None
+
+    def _lease_slot(self, head_sha: str, pr_number: int) -> Path | None:
+        """Lease the best free slot, adding one if the pool has room."""
+        with self._pool_lock:
+            slots = self._pool_slots()
+            # Exact match first, then least recently used
+            free = sorted(
+                slots,
+                key=lambda s: (
+                    self._slot_head(s) != head_sha,
+                    s.stat().st_mtime,
+                ),
+            )
+            for slot in free:
+                if self._claim_lease(slot, head_sha, pr_number):
+                    return slot
+
+            if len(slots) >= _get_max_pr_worktrees():
+                return None
+            used = {s.name for s in slots}
+            index = 0
+            while f"{POOL_SLOT_PREFIX}{index}" in used:
+                index += 1
+            slot = self.worktree_base_dir / f"{POOL_SLOT_PREFIX}{index}"
+            self.worktree_base_dir.mkdir(parents=True, exist_ok=True)
+            if not self._claim_lease(slot, head_sha, pr_number):
+                return None
+
+        try:
+            self._add_slot(slot, head_sha)
+        except Exception as e:
+            logger.warning(f"[WorktreeManager] Could not add pool worktree: {e}")
+            if slot.exists():
+                shutil.rmtree(slot, ignore_errors=True)
+            self._release_lease(slot)
+            return None
+        return slot
+
+    def _add_slot(self, slot: Path, head_sha: str) -> None:
+        """Register a new pool worktree (without checking files out)."""
+        result = self._git(
+            ["worktree", "add", "--detach", "--no-checkout", str(slot), head_sha],
+            timeout=120,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to add pool worktree: {result.stderr.strip()}")
+        logger.info(f"[WorktreeManager] Added pool worktree {slot.name}")
+
+    def _point_slot(
+        self, slot: Path, head_sha: str, changed_files: list[str] | None
+    ) -> None:
+        """Health-check a slot and move it to head_sha."""
+        if not (slot / ".git").exists():
+            raise RuntimeError("missing .git link")
+
+        if self.sparse_paths:
+            directories = set(self.sparse_paths)
+            for path in changed_files or []:
+                parent = Path(path).parent.as_posix()
+                if parent != "." and not parent.startswith("-"):
+                    directories.add(parent)
+            result = self._git(
+                ["sparse-checkout", "set", "--cone", *sorted(directories)],
+                cwd=slot,
+                timeout=120,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"sparse-checkout failed: {result.stderr.strip()}")
+
+        # A slot added with --no-checkout has an empty index, so it is
+        # populated here; otherwise git only rewrites paths that differ
+        # between the slot's current commit and head_sha
+        result = self._git(
+            ["checkout", "--force", "--detach", head_sha], cwd=slot, timeout=300
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"checkout failed: {result.stderr.strip()}")
+
+        # Drop files left behind by a previous review (ignored files such as
+        # build caches are kept)
+        result = self._git(["clean", "-fdq"], cwd=slot, timeout=120)
+        if result.returncode != 0:
+            raise RuntimeError(f"clean failed: {result.stderr.strip()}")
+        os.utime(slot)
+
     def remove_worktree(self, worktree_path: Path) -> None:
         """
         Remove a PR worktree with fallback chain.
@@ -195,6 +513,8 @@ class PRWorktreeManager:
             return
 
         logger.debug(f"Removing worktree: {worktree_path}")
+        if self._is_pool_slot(worktree_path):
+            self._release_lease(worktree_path)
 
         env = get_isolated_git_env()
         try:
@@ -309,7 +629,8 @@ class PRWorktreeManager:
         Cleanup order:
         1. Remove orphaned worktrees (not registered with git)
         2. Remove worktrees older than PR_WORKTREE_MAX_AGE_DAYS
-        3. If still over MAX_PR_WORKTREES, remove oldest worktrees
+        3. If still over MAX_PR_WORKTREES (counting every worktree, pool
+           slots included), remove the oldest unleased worktrees
 
         Args:
             force: If True, skip age check and only enforce count limit
@@ -334,9 +655,14 @@ class PRWorktreeManager:
         # Get all PR worktree info
         worktrees = self.get_worktree_info()
 
+        # Leased pool worktrees are in use by a review (or being added) and
+        # are never removed
+        leased = self.leased_worktrees()
+
         # Phase 1: Remove orphaned worktrees
         for wt in worktrees:
-            if wt.path.resolve() not in registered_resolved:
+            resolved = wt.path.resolve()
+            if resolved not in registered_resolved and resolved not in leased:
                 logger.info(
                     f"[WorktreeManager] Removing orphaned worktree: {wt.path.name} (age: {wt.age_days:.1f} days)"
                 )
@@ -362,6 +688,7 @@ class PRWorktreeManager:
             wt
             for wt in self.get_worktree_info()
             if wt.path.resolve() in registered_resolved
+            and wt.path.resolve() not in leased
         ]
 
         # Phase 2: Remove expired worktrees (older than max age)
@@ -383,12 +710,17 @@ class PRWorktreeManager:
             if wt.path.resolve() in registered_resolved
         ]
 
-        # Phase 3: Remove excess worktrees (keep only max_pr_worktrees most recent)
+        # Phase 3: Remove excess worktrees. The limit covers every worktree
+        # on disk: one-off PR worktrees and pool slots, idle or leased (the
+        # pool grows against the same limit). Leased slots count but are
+        # never evicted, so the oldest unleased worktrees go first, and the
+        # total can stay above the limit until leases are released.
         max_pr_worktrees = _get_max_pr_worktrees()
         if len(worktrees) > max_pr_worktrees:
             # worktrees are already sorted by age (oldest first)
             excess_count = len(worktrees) - max_pr_worktrees
-            for wt in worktrees[:excess_count]:
+            evictable = [wt for wt in worktrees if wt.path.resolve() not in leased]
+            for wt in evictable[:excess_count]:
                 logger.info(
                     f"[WorktreeManager] Removing excess worktree: {wt.path.name} (count: {len(worktrees)}, max: {max_pr_worktrees})"
                 )
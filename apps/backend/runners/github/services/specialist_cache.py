@@ -0,0 +1,173 @@
+"""
+Specialist Findings Cache
+=========================
+
+Reuses specialist review results for files whose content has not changed
+since an earlier review (rebase, base-branch merge, retry after failure):
+- Findings are cached per file and per specialist, keyed by
+  (blob SHA, specialist prompt version, model) in the shared state store
+- Blob SHAs come from the PR files API (the same values recorded in
+  PRReviewResult.reviewed_file_blobs), so identical content hits the cache
+  whatever commit or path it appears under
+- Cached findings are remapped onto the file's current path, with ids
+  regenerated the way _parse_specialist_output builds them; line numbers
+  index into the blob itself, so they carry over unchanged
+- Only successful sessions are cached, including the files they found
+  nothing in
+
+Set PR_REVIEW_SPECIALIST_CACHE=0 to disable.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    from ..models import PRReviewFinding
+    from ..state_store import GitHubStateStore
+except (ImportError, ValueError, SystemError):
+    from models import PRReviewFinding
+    from state_store import GitHubStateStore
+
+logger = logging.getLogger(__name__)
+
+# Bump when the way specialist output becomes findings changes
+CACHE_FORMAT_VERSION = "1"
+
+# Entries not used for this long are pruned
+CACHE_TTL_SECONDS = 30 * 86400
+
+# Findings on these statuses describe content that is gone
+_UNCACHEABLE_STATUSES = ("removed", "deleted")
+
+
+def is_cache_enabled() -> bool:
+    """Check the PR_REVIEW_SPECIALIST_CACHE kill switch (on by default)."""
+    return os.environ.get("PR_REVIEW_SPECIALIST_CACHE", "1").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+def prompt_version(*parts: str) -> str:
+    """Stable version string for a specialist's prompt and configuration."""
+    digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode())
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(part.encode())
+    return digest.hexdigest()[:16]
+
+
+def remap_finding(data: dict, path: str) -> PRReviewFinding:
+    """Rebuild a cached finding for the file's current path."""
+    finding = PRReviewFinding.from_dict({**data, "file": path})
+    finding.id = hashlib.md5(
+        f"{path}:{finding.line}:{finding.title}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()[:12]
+    return finding
+
+
+@dataclass
+class CacheLookup:
+    """Split of a specialist's files into cached and to-review."""
+
+    cached_findings: list[PRReviewFinding] = field(default_factory=list)
+    cached_paths: list[str] = field(default_factory=list)
+    missing_paths: list[str] = field(default_factory=list)
+
+
+class SpecialistCache:
+    """Per-file specialist findings, keyed by blob SHA."""
+
+    def __init__(self, state_dir: Path, model: str):
+        self.store = GitHubStateStore.open(state_dir)
+        self.model = model
+
+    def lookup(
+        self,
+        specialist: str,
+        version: str,
+        paths: list[str],
+        file_blobs: dict[str, str],
+    ) -> CacheLookup:
+        """Return cached findings for unchanged files and the files to review."""
+        result = CacheLookup()
+        blobs = {path: file_blobs.get(path, "") for path in paths}
+        try:
+            entries = self.store.get_specialist_findings(
+                specialist,
+                version,
+                self.model,
+                sorted({b for b in blobs.values() if b}),
+            )
+        except Exception as e:
+            logger.warning(f"[SpecialistCache] Lookup failed: {e}")
+            entries = {}
+
+        for path in paths:
+            cached = entries.get(blobs[path]) if blobs[path] else None
+            if cached is None:
+                result.missing_paths.append(path)
+                continue
+            result.cached_paths.append(path)
+            for data in cached:
+                try:
+                    finding = remap_finding(data, path)
+                except (KeyError, ValueError) as e:
+                    logger.debug(f"[SpecialistCache] Dropping bad entry: {e}")
+                    continue
+                finding.source_agents = [specialist]
+                result.cached_findings.append(finding)
+        return result
+
+    def store_results(
+        self,
+        specialist: str,
+        version: str,
+        reviewed: dict[str, str],
+        findings: list[PRReviewFinding],
+        file_blobs: dict[str, str],
+    ) -> int:
+        """
+        Cache a successful session's findings for each reviewed file.
+
+        Args:
+            reviewed: Path -> status of the files the session was given
+            findings: Everything the session reported; findings about other
+                files (impact findings) are not cached
+            file_blobs: Path -> blob SHA for the PR head
+
+        Returns:
+            Number of files cached
+        """
+        entries: dict[str, list[dict]] = {}
+        for path, status in reviewed.items():
+            blob = file_blobs.get(path)
+            if blob and status not in _UNCACHEABLE_STATUSES:
+                entries[blob] = []
+        paths_by_blob = {
+            file_blobs[path]: path for path in reviewed if path in file_blobs
+        }
+        for finding in findings:
+            blob = file_blobs.get(finding.file)
+            if blob in entries and paths_by_blob.get(blob) == finding.file:
+                entries[blob].append(finding.to_dict())
+        if not entries:
+            return 0
+        try:
+            now = time.time()
+            self.store.put_specialist_findings(
+                specialist, version, self.model, entries, now=now
+            )
+            self.store.prune_specialist_findings(now - CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"[SpecialistCache] Store failed: {e}")
+            return 0
+        return len(entries)
@@ -0,0 +1,930 @@
+"""
+GitHub Runner State Store
+=========================
+
+Embedded SQLite store shared by lifecycle.py, trust.py and learning.py:
+- One database per state directory (state.db), opened in WAL mode so
+  readers never block the writer and several runner processes can share it
+- Indexed columns for repo, state, issue/PR number and timestamps, so state
+  and summary queries are index lookups instead of directory scans
+- The full record is kept as a JSON document next to the indexed columns
+- Single-record updates are row writes; read-modify-write sequences can be
+  wrapped in transaction() (BEGIN IMMEDIATE)
+- One-shot migrations import the legacy per-record JSON files
+- Review outcome aggregates (daily buckets, pattern counts, decayed
+  accuracy) are updated in the same transaction as the outcome row
+- Storage ledger rows (one per file under the state directory) with
+  trigger-maintained totals per category/repo and per modification day
+- The runner daemon's job queue, so queued jobs survive a restart
+- Per-file specialist findings keyed by blob SHA, reused on re-reviews
+
+Usage:
+    store = GitHubStateStore.open(Path(".auto-claude/github"))
+    store.put_lifecycle(lifecycle.to_dict())
+    counts = store.lifecycle_state_counts("owner/repo")
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "state.db"
+SCHEMA_VERSION = 5
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL,
+    records INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS lifecycle (
+    repo TEXT NOT NULL,
+    issue_number INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    pr_number INTEGER,
+    locked_by TEXT,
+    created_ts REAL,
+    updated_ts REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (repo, issue_number)
+);
+CREATE INDEX IF NOT EXISTS idx_lifecycle_state ON lifecycle (repo, state);
+CREATE INDEX IF NOT EXISTS idx_lifecycle_pr ON lifecycle (repo, pr_number);
+CREATE INDEX IF NOT EXISTS idx_lifecycle_updated ON lifecycle (updated_ts);
+
+CREATE TABLE IF NOT EXISTS trust (
+    repo TEXT PRIMARY KEY,
+    level INTEGER NOT NULL,
+    effective_level INTEGER NOT NULL,
+    total_actions INTEGER NOT NULL,
+    correct_actions INTEGER NOT NULL,
+    updated_ts REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trust_level ON trust (effective_level);
+
+CREATE TABLE IF NOT EXISTS outcomes (
+    review_id TEXT PRIMARY KEY,
+    repo TEXT NOT NULL,
+    pr_number INTEGER,
+    prediction TEXT NOT NULL,
+    actual_outcome TEXT,
+    created_ts REAL NOT NULL,
+    outcome_ts REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outcomes_repo_created ON outcomes (repo, created_ts);
+CREATE INDEX IF NOT EXISTS idx_outcomes_created ON outcomes (created_ts);
+CREATE INDEX IF NOT EXISTS idx_outcomes_pending ON outcomes (actual_outcome, repo);
+
+CREATE TABLE IF NOT EXISTS outcome_buckets (
+    repo TEXT NOT NULL,
+    prediction TEXT NOT NULL,
+    outcome TEXT NOT NULL,  -- '' while pending
+    day INTEGER NOT NULL,  -- days since epoch of the prediction
+    count INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    incorrect INTEGER NOT NULL,
+    merge_count INTEGER NOT NULL,
+    merge_seconds REAL NOT NULL,
+    PRIMARY KEY (repo, prediction, outcome, day)
+);
+CREATE INDEX IF NOT EXISTS idx_outcome_buckets_day ON outcome_buckets (day);
+
+CREATE TABLE IF NOT EXISTS outcome_patterns (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    incorrect INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value)
+);
+
+CREATE TABLE IF NOT EXISTS outcome_decay (
+    repo TEXT NOT NULL,
+    prediction TEXT NOT NULL,
+    correct REAL NOT NULL,
+    incorrect REAL NOT NULL,
+    updated_ts REAL NOT NULL,
+    PRIMARY KEY (repo, prediction)
+);
+
+CREATE TABLE IF NOT EXISTS storage_files (
+    path TEXT PRIMARY KEY,  -- POSIX path relative to the state directory
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    repo TEXT NOT NULL,  -- '' when unknown
+    bytes INTEGER NOT NULL,
+    is_record INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    record_ts REAL  -- updated_at/created_at of JSON records, when known
+);
+CREATE INDEX IF NOT EXISTS idx_storage_record_ts ON storage_files (category, record_ts);
+CREATE INDEX IF NOT EXISTS idx_storage_mtime ON storage_files (category, mtime);
+
+CREATE TABLE IF NOT EXISTS storage_totals (
+    category TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    records INTEGER NOT NULL,
+    PRIMARY KEY (category, repo)
+);
+
+CREATE TABLE IF NOT EXISTS storage_days (
+    category TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    PRIMARY KEY (category, day)
+);
+
+CREATE TABLE IF NOT EXISTS daemon_jobs (
+    job_id TEXT PRIMARY KEY,
+    repo TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_ts REAL NOT NULL,
+    updated_ts REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_daemon_jobs_status ON daemon_jobs (status, created_ts);
+CREATE INDEX IF NOT EXISTS idx_daemon_jobs_updated ON daemon_jobs (updated_ts);
+
+CREATE TABLE IF NOT EXISTS specialist_findings (
+    blob_sha TEXT NOT NULL,
+    specialist TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    used_ts REAL NOT NULL,
+    findings TEXT NOT NULL,
+    PRIMARY KEY (blob_sha, specialist, prompt_version, model)
+);
+CREATE INDEX IF NOT EXISTS idx_specialist_findings_used
+    ON specialist_findings (used_ts);
+
+CREATE TRIGGER IF NOT EXISTS storage_files_insert AFTER INSERT ON storage_files
+BEGIN
+    INSERT INTO storage_totals (category, repo, bytes, files, records)
+    VALUES (NEW.category, NEW.repo, NEW.bytes, 1, NEW.is_record)
+    ON CONFLICT (category, repo) DO UPDATE SET
+        bytes = bytes + excluded.bytes,
+        files = files + 1,
+        records = records + excluded.records;
+    INSERT INTO storage_days (category, day, bytes, files)
+    VALUES (NEW.category, CAST(NEW.mtime / 86400 AS INTEGER), NEW.bytes, 1)
+    ON CONFLICT (category, day) DO UPDATE SET
+        bytes = bytes + excluded.bytes,
+        files = files + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS storage_files_delete AFTER DELETE ON storage_files
+BEGIN
+    UPDATE storage_totals SET
+        bytes = bytes - OLD.bytes,
+        files = files - 1,
+        records = records - OLD.is_record
+    WHERE category = OLD.category AND repo = OLD.repo;
+    UPDATE storage_days SET
+        bytes = bytes - OLD.bytes,
+        files = files - 1
+    WHERE category = OLD.category AND day = CAST(OLD.mtime / 86400 AS INTEGER);
+END;
+
+CREATE TRIGGER IF NOT EXISTS storage_files_update AFTER UPDATE ON storage_files
+BEGIN
+    UPDATE storage_totals SET
+        bytes = bytes - OLD.bytes,
+        files = files - 1,
+        records = records - OLD.is_record
+    WHERE category = OLD.category AND repo = OLD.repo;
+    UPDATE storage_days SET
+        bytes = bytes - OLD.bytes,
+        files = files - 1
+    WHERE category = OLD.category AND day = CAST(OLD.mtime / 86400 AS INTEGER);
+    INSERT INTO storage_totals (category, repo, bytes, files, records)
+    VALUES (NEW.category, NEW.repo, NEW.bytes, 1, NEW.is_record)
+    ON CONFLICT (category, repo) DO UPDATE SET
+        bytes = bytes + excluded.bytes,
+        files = files + 1,
+        records = records + excluded.records;
+    INSERT INTO storage_days (category, day, bytes, files)
+    VALUES (NEW.category, CAST(NEW.mtime / 86400 AS INTEGER), NEW.bytes, 1)
+    ON CONFLICT (category, day) DO UPDATE SET
+        bytes = bytes + excluded.bytes,
+        files = files + 1;
+END;
+"""
+
+_BUCKET_FIELDS = ("count", "correct", "incorrect", "merge_count", "merge_seconds")
+
+# Tables with a repo column, deleted by purge_repo()
+_REPO_TABLES = (
+    "lifecycle",
+    "trust",
+    "outcomes",
+    "outcome_buckets",
+    "outcome_decay",
+    "daemon_jobs",
+)
+
+_stores: dict[Path, GitHubStateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _timestamp(value: str | None) -> float | None:
+    """Convert an ISO-8601 string to epoch seconds for indexed columns."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class GitHubStateStore:
+    """
+    SQLite-backed state store for the GitHub runners.
+
+    Use GitHubStateStore.open(state_dir) so all managers in a process share
+    one connection per database.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not db_path.exists()
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._conn = sqlite3.connect(
+            str(db_path),
+            isolation_level=None,  # Autocommit; transactions are explicit
+            check_same_thread=False,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+        )
+        self._conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        if is_new:
+            # Trust state used to be written 0o600; keep the same restriction
+            # (SQLite creates -wal/-shm files with the database's mode)
+            try:
+                os.chmod(db_path, 0o600)
+            except OSError:
+                pass
+
+    @classmethod
+    def open(cls, state_dir: Path) -> GitHubStateStore:
+        """Get the shared store for a state directory."""
+        db_path = (Path(state_dir) / DB_FILENAME).resolve()
+        with _stores_lock:
+            store = _stores.get(db_path)
+            if store is None or not db_path.exists():
+                if store is not None:
+                    # The database was deleted under the cached connection
+                    with store._lock:
+                        store._conn.close()
+                store = cls(db_path)
+                _stores[db_path] = store
+            return store
+
+    def close(self) -> None:
+        """Close the connection and forget the shared instance."""
+        with _stores_lock:
+            if _stores.get(self.db_path) is self:
+                del _stores[self.db_path]
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Transactions and migrations
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run a block in one write transaction (BEGIN IMMEDIATE).
+
+        Nested calls join the outer transaction.
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def _execute(self, sql: str, params: tuple | list = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _fetchall(self, sql: str, params: tuple | list = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def has_migration(self, name: str) -> bool:
+        return bool(self._fetchall("SELECT 1 FROM migrations WHERE name = ?", (name,)))
+
+    def run_migration(self, name: str, migrate: Callable[[], int]) -> bool:
+        """
+        Run a one-shot migration unless it has already been applied.
+
+        Args:
+            name: Unique migration name
+            migrate: Callable that imports records and returns how many
+
+        Returns:
+            True if the migration ran now
+        """
+        with self.transaction():
+            if self.has_migration(name):
+                return False
+            count = migrate()
+            self._execute(
+                "INSERT INTO migrations (name, migrated_at, records) "
+                "VALUES (?, datetime('now'), ?)",
+                (name, count),
+            )
+        if count:
+            logger.info(f"Migrated {count} {name} records into {self.db_path}")
+        return True
+
+    def purge_repo(self, repo: str) -> dict[str, int]:
+        """
+        Delete every row belonging to a repo in one transaction.
+
+        Outcome pattern counts aren't kept per repo: if outcomes were
+        deleted, call LearningTracker.rebuild_aggregates() in the same
+        transaction. Storage ledger rows follow the files and are removed
+        by StorageLedger.
+
+        Returns:
+            Deleted rows per table (tables without rows are omitted)
+        """
+        deleted: dict[str, int] = {}
+        with self.transaction():
+            for table in _REPO_TABLES:
+                count = self._execute(
+                    f"DELETE FROM {table} WHERE repo = ?", (repo,)
+                ).rowcount
+                if count:
+                    deleted[table] = count
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Issue lifecycle
+    # ------------------------------------------------------------------
+
+    def get_lifecycle(self, repo: str, issue_number: int) -> dict[str, Any] | None:
+        rows = self._fetchall(
+            "SELECT data FROM lifecycle WHERE repo = ? AND issue_number = ?",
+            (repo, issue_number),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def put_lifecycle(self, data: dict[str, Any], replace: bool = True) -> None:
+        """Insert or update a lifecycle record (IssueLifecycle.to_dict())."""
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        self._execute(
+            f"{verb} INTO lifecycle (repo, issue_number, state, pr_number, "
+            "locked_by, created_ts, updated_ts, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                data["repo"],
+                data["issue_number"],
+                data.get("current_state", "new"),
+                data.get("pr_number"),
+                data.get("locked_by"),
+                _timestamp(data.get("created_at")),
+                _timestamp(data.get("updated_at")),
+                json.dumps(data),
+            ),
+        )
+
+    def lifecycles_in_state(self, repo: str, state: str) -> list[dict[str, Any]]:
+        rows = self._fetchall(
+            "SELECT data FROM lifecycle WHERE repo = ? AND state = ? "
+            "ORDER BY issue_number",
+            (repo, state),
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def lifecycle_state_counts(self, repo: str) -> dict[str, int]:
+        rows = self._fetchall(
+            "SELECT state, COUNT(*) FROM lifecycle WHERE repo = ? GROUP BY state",
+            (repo,),
+        )
+        return dict(rows)
+
+    # ------------------------------------------------------------------
+    # Trust
+    # ------------------------------------------------------------------
+
+    def get_trust(self, repo: str) -> dict[str, Any] | None:
+        rows = self._fetchall("SELECT data FROM trust WHERE repo = ?", (repo,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def put_trust(
+        self,
+        data: dict[str, Any],
+        effective_level: int,
+        replace: bool = True,
+    ) -> None:
+        """Insert or update a trust record (TrustState.to_dict())."""
+        metrics = data.get("metrics", {})
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        self._execute(
+            f"{verb} INTO trust (repo, level, effective_level, total_actions, "
+            "correct_actions, updated_ts, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                data["repo"],
+                data.get("current_level", 0),
+                effective_level,
+                metrics.get("total_actions", 0),
+                metrics.get("correct_actions", 0),
+                _timestamp(metrics.get("last_action_at")),
+                json.dumps(data),
+            ),
+        )
+
+    def all_trust(self) -> list[dict[str, Any]]:
+        rows = self._fetchall("SELECT data FROM trust ORDER BY repo")
+        return [json.loads(data) for (data,) in rows]
+
+    def trust_summary(self) -> dict[str, Any]:
+        """Aggregate trust counters across all repos."""
+        by_level = dict(
+            self._fetchall(
+                "SELECT effective_level, COUNT(*) FROM trust GROUP BY effective_level"
+            )
+        )
+        total_repos, total_actions, total_correct = self._fetchall(
+            "SELECT COUNT(*), COALESCE(SUM(total_actions), 0), "
+            "COALESCE(SUM(correct_actions), 0) FROM trust"
+        )[0]
+        return {
+            "total_repos": total_repos,
+            "by_level": by_level,
+            "total_actions": total_actions,
+            "total_correct": total_correct,
+        }
+
+    # ------------------------------------------------------------------
+    # Review outcomes
+    # ------------------------------------------------------------------
+
+    def get_outcome(self, review_id: str) -> dict[str, Any] | None:
+        rows = self._fetchall(
+            "SELECT data FROM outcomes WHERE review_id = ?", (review_id,)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def put_outcome(self, data: dict[str, Any], replace: bool = True) -> None:
+        """Insert or update a review outcome (ReviewOutcome.to_dict())."""
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        self._execute(
+            f"{verb} INTO outcomes (review_id, repo, pr_number, prediction, "
+            "actual_outcome, created_ts, outcome_ts, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                data["review_id"],
+                data["repo"],
+                data.get("pr_number"),
+                data["prediction"],
+                data.get("actual_outcome"),
+                _timestamp(data["created_at"]),
+                _timestamp(data.get("outcome_recorded_at")),
+                json.dumps(data),
+            ),
+        )
+
+    def query_outcomes(
+        self,
+        repo: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        prediction: str | None = None,
+        pending: bool | None = None,
+        newest_first: bool = False,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Query review outcomes through the indexed columns.
+
+        Args:
+            repo: Filter by repo
+            since: Only outcomes created at or after this time
+            until: Only outcomes created before this time
+            prediction: Filter by prediction type value
+            pending: True for outcomes without a result, False for completed
+            newest_first: Order by creation time descending
+            limit: Maximum number of rows
+        """
+        clauses, params = [], []
+        if repo is not None:
+            clauses.append("repo = ?")
+            params.append(repo)
+        if since is not None:
+            clauses.append("created_ts >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("created_ts < ?")
+            params.append(until.timestamp())
+        if prediction is not None:
+            clauses.append("prediction = ?")
+            params.append(prediction)
+        if pending is True:
+            clauses.append("actual_outcome IS NULL")
+        elif pending is False:
+            clauses.append("actual_outcome IS NOT NULL")
+
+        sql = "SELECT data FROM outcomes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        direction = " DESC" if newest_first else ""
+        sql += f" ORDER BY created_ts{direction}, rowid{direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(data) for (data,) in self._fetchall(sql, params)]
+
+    # ------------------------------------------------------------------
+    # Review outcome aggregates
+    # ------------------------------------------------------------------
+
+    def add_outcome_bucket(
+        self,
+        repo: str,
+        prediction: str,
+        outcome: str,
+        day: int,
+        deltas: dict[str, float],
+    ) -> None:
+        """Add deltas (count, correct, ...) to a daily outcome bucket."""
+        values = [deltas.get(name, 0) for name in _BUCKET_FIELDS]
+        updates = ", ".join(
+            f"{name} = {name} + excluded.{name}" for name in _BUCKET_FIELDS
+        )
+        self._execute(
+            f"INSERT INTO outcome_buckets (repo, prediction, outcome, day, "
+            f"{', '.join(_BUCKET_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (repo, prediction, outcome, day) DO UPDATE SET {updates}",
+            (repo, prediction, outcome, day, *values),
+        )
+
+    def sum_outcome_buckets(
+        self,
+        repo: str | None = None,
+        prediction: str | None = None,
+        min_day: int | None = None,
+    ) -> list[tuple]:
+        """
+        Sum outcome buckets per (prediction, outcome).
+
+        Returns:
+            Rows of (prediction, outcome, count, correct, incorrect,
+            merge_count, merge_seconds)
+        """
+        clauses, params = [], []
+        if repo is not None:
+            clauses.append("repo = ?")
+            params.append(repo)
+        if prediction is not None:
+            clauses.append("prediction = ?")
+            params.append(prediction)
+        if min_day is not None:
+            clauses.append("day >= ?")
+            params.append(min_day)
+
+        sums = ", ".join(f"SUM({name})" for name in _BUCKET_FIELDS)
+        sql = f"SELECT prediction, outcome, {sums} FROM outcome_buckets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " GROUP BY prediction, outcome"
+        return self._fetchall(sql, params)
+
+    def add_outcome_pattern(
+        self, dimension: str, value: str, correct: int, incorrect: int
+    ) -> None:
+        self._execute(
+            "INSERT INTO outcome_patterns (dimension, value, correct, incorrect) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT (dimension, value) DO UPDATE SET "
+            "correct = correct + excluded.correct, "
+            "incorrect = incorrect + excluded.incorrect",
+            (dimension, value, correct, incorrect),
+        )
+
+    def outcome_patterns(self) -> list[tuple[str, str, int, int]]:
+        """Rows of (dimension, value, correct, incorrect)."""
+        return self._fetchall(
+            "SELECT dimension, value, correct, incorrect FROM outcome_patterns "
+            "WHERE correct + incorrect > 0 ORDER BY dimension, value"
+        )
+
+    def get_outcome_decay(
+        self, repo: str, prediction: str
+    ) -> tuple[float, float, float] | None:
+        """Decayed (correct, incorrect, updated_ts) for a repo and prediction."""
+        rows = self._fetchall(
+            "SELECT correct, incorrect, updated_ts FROM outcome_decay "
+            "WHERE repo = ? AND prediction = ?",
+            (repo, prediction),
+        )
+        return rows[0] if rows else None
+
+    def put_outcome_decay(
+        self,
+        repo: str,
+        prediction: str,
+        correct: float,
+        incorrect: float,
+        updated_ts: float,
+    ) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO outcome_decay "
+            "(repo, prediction, correct, incorrect, updated_ts) VALUES (?, ?, ?, ?, ?)",
+            (repo, prediction, correct, incorrect, updated_ts),
+        )
+
+    def outcome_decay_rows(
+        self, repo: str | None = None
+    ) -> list[tuple[str, float, float, float]]:
+        """Rows of (prediction, correct, incorrect, updated_ts)."""
+        sql = "SELECT prediction, correct, incorrect, updated_ts FROM outcome_decay"
+        params: tuple = ()
+        if repo is not None:
+            sql += " WHERE repo = ?"
+            params = (repo,)
+        return self._fetchall(sql, params)
+
+    def clear_outcome_aggregates(self) -> None:
+        with self.transaction():
+            for table in ("outcome_buckets", "outcome_patterns", "outcome_decay"):
+                self._execute(f"DELETE FROM {table}")
+
+    # ------------------------------------------------------------------
+    # Storage ledger
+    # ------------------------------------------------------------------
+
+    def put_storage_file(
+        self,
+        path: str,
+        category: str,
+        repo: str,
+        size: int,
+        is_record: bool,
+        mtime: float,
+        record_ts: float | None,
+    ) -> None:
+        """Insert or update a ledger row (totals follow via triggers)."""
+        self._execute(
+            "INSERT INTO storage_files (path, name, category, repo, bytes, "
+            "is_record, mtime, record_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET category = excluded.category, "
+            "repo = CASE WHEN excluded.repo != '' THEN excluded.repo ELSE repo END, "
+            "bytes = excluded.bytes, is_record = excluded.is_record, "
+            "mtime = excluded.mtime, "
+            "record_ts = COALESCE(excluded.record_ts, record_ts)",
+            (
+                path,
+                path.rsplit("/", 1)[-1],
+                category,
+                repo,
+                size,
+                int(is_record),
+                mtime,
+                record_ts,
+            ),
+        )
+
+    def delete_storage_files(self, paths: list[str]) -> None:
+        with self.transaction():
+            for path in paths:
+                self._execute("DELETE FROM storage_files WHERE path = ?", (path,))
+
+    def delete_storage_prefix(self, prefix: str) -> None:
+        """Delete ledger rows for everything under a directory prefix."""
+        self._execute(
+            "DELETE FROM storage_files WHERE path >= ? AND path < ?",
+            (prefix + "/", prefix + "0"),  # '0' sorts right after '/'
+        )
+
+    def clear_storage_files(self) -> None:
+        with self.transaction():
+            for table in ("storage_files", "storage_totals", "storage_days"):
+                self._execute(f"DELETE FROM {table}")
+
+    def storage_totals(self) -> list[tuple[str, str, int, int, int]]:
+        """Rows of (category, repo, bytes, files, records)."""
+        return self._fetchall(
+            "SELECT category, repo, bytes, files, records FROM storage_totals "
+            "WHERE files > 0"
+        )
+
+    def storage_days(self) -> list[tuple[str, int, int, int]]:
+        """Rows of (category, day, bytes, files)."""
+        return self._fetchall(
+            "SELECT category, day, bytes, files FROM storage_days WHERE files > 0"
+        )
+
+    def storage_prefix_bytes(self, prefix: str) -> int:
+        return self._fetchall(
+            "SELECT COALESCE(SUM(bytes), 0) FROM storage_files "
+            "WHERE path >= ? AND path < ?",
+            (prefix + "/", prefix + "0"),
+        )[0][0]
+
+    def storage_stats(self, glob: str) -> dict[str, tuple[int, float]]:
+        """(bytes, mtime) of ledger paths matching a GLOB over the relative path."""
+        rows = self._fetchall(
+            "SELECT path, bytes, mtime FROM storage_files WHERE path GLOB ?", (glob,)
+        )
+        return {path: (size, mtime) for path, size, mtime in rows}
+
+    def storage_paths(
+        self,
+        glob: str,
+        category: str | None = None,
+        record_before: float | None = None,
+        modified_before: float | None = None,
+    ) -> list[str]:
+        """
+        Ledger paths matching a GLOB over the relative path.
+
+        Args:
+            glob: SQLite GLOB pattern over the relative path
+            category: Restrict to a storage category
+            record_before: Only records older than this (or of unknown age)
+            modified_before: Only files modified before this epoch time
+        """
+        clauses, params = ["path GLOB ?"], [glob]
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if record_before is not None:
+            clauses.append("(record_ts IS NULL OR record_ts < ?)")
+            params.append(record_before)
+        if modified_before is not None:
+            clauses.append("mtime < ?")
+            params.append(modified_before)
+        rows = self._fetchall(
+            "SELECT path FROM storage_files WHERE "
+            + " AND ".join(clauses)
+            + " ORDER BY path",
+            params,
+        )
+        return [path for (path,) in rows]
+
+    # ------------------------------------------------------------------
+    # Daemon jobs
+    # ------------------------------------------------------------------
+
+    def put_job(self, data: dict[str, Any]) -> None:
+        """Insert or update a daemon job (DaemonJob.to_dict())."""
+        self._execute(
+            "INSERT OR REPLACE INTO daemon_jobs (job_id, repo, status, created_ts, "
+            "updated_ts, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                data["job_id"],
+                data.get("repo", ""),
+                data["status"],
+                _timestamp(data["created_at"]),
+                _timestamp(data.get("finished_at"))
+                or _timestamp(data.get("started_at"))
+                or _timestamp(data["created_at"]),
+                json.dumps(data),
+            ),
+        )
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        rows = self._fetchall(
+            "SELECT data FROM daemon_jobs WHERE job_id = ?", (job_id,)
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def jobs_in_status(self, statuses: list[str]) -> list[dict[str, Any]]:
+        """Jobs in any of the given statuses, oldest first."""
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = self._fetchall(
+            f"SELECT data FROM daemon_jobs WHERE status IN ({placeholders}) "
+            "ORDER BY created_ts, rowid",
+            statuses,
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def recent_jobs(
+        self, status: str | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Most recently submitted jobs, newest first."""
+        sql = "SELECT data FROM daemon_jobs"
+        params: list[Any] = []
+        if status is not None:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY created_ts DESC, rowid DESC LIMIT ?"
+        params.append(limit)
+        return [json.loads(data) for (data,) in self._fetchall(sql, params)]
+
+    def prune_jobs(self, statuses: list[str], before_ts: float) -> int:
+        """Delete finished jobs last updated before before_ts."""
+        placeholders = ", ".join("?" for _ in statuses)
+        cursor = self._execute(
+            f"DELETE FROM daemon_jobs WHERE status IN ({placeholders}) "
+            "AND updated_ts < ?",
+            [*statuses, before_ts],
+        )
+        return cursor.rowcount
+
+    # ------------------------------------------------------------------
+    # Specialist findings cache
+    # ------------------------------------------------------------------
+
+    def get_specialist_findings(
+        self,
+        specialist: str,
+        prompt_version: str,
+        model: str,
+        blob_shas: list[str],
+        now: float | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Cached findings per blob SHA (blobs without an entry are omitted)."""
+        if not blob_shas:
+            return {}
+        placeholders = ", ".join("?" for _ in blob_shas)
+        where = (
+            f"specialist = ? AND prompt_version = ? AND model = ? "
+            f"AND blob_sha IN ({placeholders})"
+        )
+        params = [specialist, prompt_version, model, *blob_shas]
+        with self.transaction():
+            rows = self._fetchall(
+                f"SELECT blob_sha, findings FROM specialist_findings WHERE {where}",
+                params,
+            )
+            if rows:
+                self._execute(
+                    f"UPDATE specialist_findings SET used_ts = ? WHERE {where}",
+                    [now if now is not None else datetime.now().timestamp(), *params],
+                )
+        return {blob: json.loads(findings) for blob, findings in rows}
+
+    def put_specialist_findings(
+        self,
+        specialist: str,
+        prompt_version: str,
+        model: str,
+        entries: dict[str, list[dict[str, Any]]],
+        now: float | None = None,
+    ) -> None:
+        """Store findings per blob SHA (an empty list records a clean file)."""
+        used_ts = now if now is not None else datetime.now().timestamp()
+        with self.transaction():
+            for blob_sha, findings in entries.items():
+                self._execute(
+                    "INSERT OR REPLACE INTO specialist_findings (blob_sha, "
+                    "specialist, prompt_version, model, used_ts, findings) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        blob_sha,
+                        specialist,
+                        prompt_version,
+                        model,
+                        used_ts,
+                        json.dumps(findings),
+                    ),
+                )
+
+    def prune_specialist_findings(self, before_ts: float) -> int:
+        """Delete cache entries last used before before_ts."""
+        cursor = self._execute(
+            "DELETE FROM specialist_findings WHERE used_ts < ?", (before_ts,)
+        )
+        return cursor.rowcount
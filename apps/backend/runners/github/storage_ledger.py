@@ -0,0 +1,559 @@
+"""
+Storage Ledger
+==============
+
+Incremental storage accounting for the GitHub automation state directory:
+- One ledger row per file (bytes, category, repo, mtime, record timestamp),
+  kept in the shared state store (state_store.py)
+- Rows are updated whenever file_lock.py creates, replaces or deletes a
+  file, so metrics never need a tree walk
+- Totals per category/repo and per modification day are maintained by
+  SQLite triggers, so totals and the age histogram are constant-time reads
+- Append-only directories (audit logs, embedding data) are refreshed with
+  a single non-recursive scandir when metrics are read
+- reconcile() rebuilds the ledger with one full walk; it runs once when the
+  ledger is first built and can be run offline to repair drift
+- Deletions don't trust the ledger alone: scan() lists the filesystem for
+  purges and sync_directory() reconciles a directory before cleanup, so
+  files written by older versions or other tools are found too
+
+Usage:
+    ledger = StorageLedger.open(Path(".auto-claude/github"))
+    totals = ledger.totals()
+    victims = ledger.records_older_than("pr", cutoff)
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+try:
+    from .state_store import DB_FILENAME, GitHubStateStore
+except (ImportError, ValueError, SystemError):
+    from state_store import DB_FILENAME, GitHubStateStore
+
+logger = logging.getLogger(__name__)
+
+# Top-level directory -> storage category
+CATEGORY_DIRS = {
+    "pr": "pr_reviews",
+    "issues": "issues",
+    "autofix": "autofix",
+    "audit": "audit_logs",
+    "archive": "archive",
+}
+OTHER_CATEGORY = "other"
+
+# Directories written by appending rather than through file_lock.py
+VOLATILE_DIRS = ("audit", "embeddings")
+
+# Age histogram buckets: (upper bound in days, label); None = unbounded
+AGE_BUCKETS = (
+    (1, "<1d"),
+    (7, "1-7d"),
+    (30, "7-30d"),
+    (90, "30-90d"),
+    (None, "90d+"),
+)
+
+# How many parent directories to search for a state directory
+MAX_ROOT_DEPTH = 4
+
+# Directories found to have no state directory are re-checked after this
+_NO_ROOT_TTL_SECONDS = 30.0
+
+# Records larger than this are not parsed for repo/timestamp by reconcile()
+_MAX_PARSE_BYTES = 1024 * 1024
+
+_LEDGER_MIGRATION = "storage_ledger"
+_SECONDS_PER_DAY = 86400
+
+_ledgers: dict[Path, StorageLedger] = {}
+# directory -> ((state_dir, relative prefix) or None, checked_at)
+_roots: dict[str, tuple[tuple[Path, str] | None, float]] = {}
+_lock = threading.Lock()
+
+
+def _record_timestamp(data: Any) -> float | None:
+    """Timestamp used for retention decisions (updated_at, else created_at)."""
+    if not isinstance(data, dict):
+        return None
+    value = data.get("updated_at") or data.get("created_at")
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _is_ignored(name: str) -> bool:
+    """Files the ledger never tracks (the database itself, temp and lock files)."""
+    return name.startswith(DB_FILENAME) or ".tmp." in name or name.endswith(".lock")
+
+
+class StorageLedger:
+    """
+    Per-file storage ledger for one state directory.
+
+    Use StorageLedger.open(state_dir); the first open builds the ledger with
+    a single walk, later updates arrive through file_lock.py.
+    """
+
+    def __init__(self, state_dir: Path):
+        self.state_dir = Path(state_dir).resolve()
+        self._store = GitHubStateStore.open(self.state_dir)
+        self._built = self._store.has_migration(_LEDGER_MIGRATION)
+
+    @classmethod
+    def open(cls, state_dir: Path, build: bool = True) -> StorageLedger:
+        """Get the shared ledger for a state directory."""
+        root = Path(state_dir).resolve()
+        with _lock:
+            ledger = _ledgers.get(root)
+            if ledger is None:
+                ledger = cls(root)
+                _ledgers[root] = ledger
+                # Directories previously seen without a ledger may now have one
+                _roots.clear()
+        if build and not ledger.is_built:
+            ledger._store.run_migration(_LEDGER_MIGRATION, ledger.reconcile)
+            ledger._built = True
+        return ledger
+
+    @property
+    def is_built(self) -> bool:
+        if not self._built:
+            # Another process may have built it since
+            self._built = self._store.has_migration(_LEDGER_MIGRATION)
+        return self._built
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _relative(self, path: Path) -> str | None:
+        try:
+            return path.resolve().relative_to(self.state_dir).as_posix()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _classify(relative: str) -> tuple[str, str]:
+        """Return (category, repo inferred from the path)."""
+        parts = relative.split("/")
+        category = OTHER_CATEGORY
+        if len(parts) > 1:
+            category = CATEGORY_DIRS.get(parts[0], OTHER_CATEGORY)
+        repo = ""
+        if parts[0] == "repos" and len(parts) > 2:
+            repo = parts[1]
+        return category, repo
+
+    def record_relative(
+        self,
+        relative: str,
+        data: Any = None,
+        stat: os.stat_result | None = None,
+    ) -> None:
+        """Record the current size of a file (relative to the state dir)."""
+        name = relative.rsplit("/", 1)[-1]
+        if _is_ignored(name):
+            return
+        if stat is None:
+            try:
+                stat = os.stat(self.state_dir / relative)
+            except OSError:
+                self.forget_relative(relative)
+                return
+
+        category, repo = self._classify(relative)
+        if isinstance(data, dict) and isinstance(data.get("repo"), str):
+            repo = data["repo"]
+        self._store.put_storage_file(
+            relative,
+            category,
+            repo,
+            stat.st_size,
+            name.endswith(".json"),
+            stat.st_mtime,
+            _record_timestamp(data),
+        )
+
+    def record(self, path: Path, data: Any = None) -> None:
+        """Record a created or replaced file."""
+        relative = self._relative(Path(path))
+        if relative is not None:
+            self.record_relative(relative, data)
+
+    def forget_relative(self, relative: str) -> None:
+        self._store.delete_storage_files([relative])
+
+    def forget(self, path: Path) -> None:
+        """Remove a deleted file from the ledger."""
+        relative = self._relative(Path(path))
+        if relative is not None:
+            self.forget_relative(relative)
+
+    def forget_directory(self, path: Path) -> None:
+        """Remove a deleted directory tree from the ledger."""
+        relative = self._relative(Path(path))
+        if relative is not None:
+            self._store.delete_storage_prefix(relative)
+
+    # ------------------------------------------------------------------
+    # Rebuild and refresh
+    # ------------------------------------------------------------------
+
+    def reconcile(self) -> int:
+        """
+        Rebuild the ledger from a full walk of the state directory.
+
+        This is the only operation that walks the whole tree; it runs when
+        the ledger is first built and can be used offline to repair drift
+        from files changed outside file_lock.py.
+
+        Returns:
+            Number of files recorded
+        """
+        count = 0
+        with self._store.transaction():
+            self._store.clear_storage_files()
+            for dirpath, _, filenames in os.walk(self.state_dir):
+                directory = Path(dirpath)
+                prefix = directory.relative_to(self.state_dir).as_posix()
+                for name in filenames:
+                    if _is_ignored(name):
+                        continue
+                    try:
+                        stat = (directory / name).stat()
+                    except OSError:
+                        continue
+                    relative = name if prefix == "." else f"{prefix}/{name}"
+                    self._record_listed(relative, stat)
+                    count += 1
+        return count
+
+    def _record_listed(self, relative: str, stat: os.stat_result) -> None:
+        """Record a file found on disk, parsing small JSON records."""
+        data = None
+        if relative.endswith(".json") and stat.st_size <= _MAX_PARSE_BYTES:
+            try:
+                with open(self.state_dir / relative, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+        self.record_relative(relative, data, stat)
+
+    def _apply_listing(
+        self,
+        listed: dict[str, os.stat_result],
+        known: dict[str, tuple[int, float]],
+    ) -> None:
+        """Record listed files that are new or changed; forget unlisted rows."""
+        with self._store.transaction():
+            for relative, stat in listed.items():
+                if known.get(relative) != (stat.st_size, stat.st_mtime):
+                    self._record_listed(relative, stat)
+            gone = [relative for relative in known if relative not in listed]
+            if gone:
+                self._store.delete_storage_files(gone)
+
+    def sync_directory(self, directory: str) -> None:
+        """
+        Reconcile the rows of a directory's direct children with one scandir.
+
+        Files the ledger missed are recorded (and parsed), changed files are
+        re-recorded and rows of vanished files dropped; unchanged files are
+        not opened.
+        """
+        path = self.state_dir / directory
+        listed = {}
+        if path.is_dir():
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not entry.is_file() or _is_ignored(entry.name):
+                        continue
+                    try:
+                        listed[f"{directory}/{entry.name}"] = entry.stat()
+                    except OSError:
+                        continue
+        known = {
+            relative: stats
+            for relative, stats in self._store.storage_stats(f"{directory}/*").items()
+            if relative.rpartition("/")[0] == directory
+        }
+        self._apply_listing(listed, known)
+
+    def refresh_volatile(self) -> None:
+        """Re-stat append-only directories with one non-recursive scandir each."""
+        for directory in VOLATILE_DIRS:
+            path = self.state_dir / directory
+            known = set(self._store.storage_paths(f"{directory}/*"))
+            seen = set()
+            if path.is_dir():
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if not entry.is_file() or _is_ignored(entry.name):
+                            continue
+                        relative = f"{directory}/{entry.name}"
+                        seen.add(relative)
+                        self.record_relative(relative, stat=entry.stat())
+            # Only direct children are refreshed here; nested files are
+            # written through file_lock.py and tracked as they change
+            gone = [relative for relative in known - seen if relative.count("/") == 1]
+            if gone:
+                self._store.delete_storage_files(gone)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def totals(self) -> dict[str, dict[str, int]]:
+        """Bytes, files and records per category."""
+        totals: dict[str, dict[str, int]] = {}
+        for category, _, size, files, records in self._store.storage_totals():
+            entry = totals.setdefault(category, {"bytes": 0, "files": 0, "records": 0})
+            entry["bytes"] += size
+            entry["files"] += files
+            entry["records"] += records
+        return totals
+
+    def usage_by_repo(self) -> dict[str, dict[str, dict[str, int]]]:
+        """Bytes and records per repo and category ('' = unattributed)."""
+        usage: dict[str, dict[str, dict[str, int]]] = {}
+        for category, repo, size, _, records in self._store.storage_totals():
+            usage.setdefault(repo, {})[category] = {"bytes": size, "records": records}
+        return usage
+
+    def age_histogram(self, category: str | None = None) -> dict[str, dict[str, int]]:
+        """Bytes and files by modification age."""
+        today = int(datetime.now(timezone.utc).timestamp() // _SECONDS_PER_DAY)
+        histogram = {label: {"bytes": 0, "files": 0} for _, label in AGE_BUCKETS}
+        for row_category, day, size, files in self._store.storage_days():
+            if category is not None and row_category != category:
+                continue
+            age = today - day
+            for bound, label in AGE_BUCKETS:
+                if bound is None or age < bound:
+                    histogram[label]["bytes"] += size
+                    histogram[label]["files"] += files
+                    break
+        return histogram
+
+    def database_bytes(self) -> int:
+        """Size of the state database files (not tracked as ledger rows)."""
+        total = 0
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                total += (self.state_dir / f"{DB_FILENAME}{suffix}").stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def directory_bytes(self, path: Path) -> int:
+        relative = self._relative(Path(path))
+        if relative is None:
+            return 0
+        return self._store.storage_prefix_bytes(relative)
+
+    def _existing(self, relatives: list[str]) -> list[Path]:
+        """Resolve ledger paths, dropping rows for files that disappeared."""
+        paths, missing = [], []
+        for relative in relatives:
+            path = self.state_dir / relative
+            if path.exists():
+                paths.append(path)
+            else:
+                missing.append(relative)
+        if missing:
+            self._store.delete_storage_files(missing)
+        return paths
+
+    def find(
+        self,
+        pattern: str,
+        directory: str | None = None,
+        recursive: bool = True,
+    ) -> list[Path]:
+        """
+        Find tracked files whose name matches a glob pattern.
+
+        Args:
+            pattern: Glob over the file name (e.g. "*123*.json")
+            directory: Restrict to a directory relative to the state dir
+            recursive: Include files in subdirectories of directory
+        """
+        # GLOB's '*' also matches '/', so this selects a superset that is
+        # narrowed by matching the file name only
+        glob = f"{directory}/*{pattern}" if directory else f"*{pattern}"
+        matches = []
+        for relative in self._store.storage_paths(glob):
+            parent, _, name = relative.rpartition("/")
+            if not fnmatch.fnmatchcase(name, pattern):
+                continue
+            if directory and not recursive and parent != directory:
+                continue
+            matches.append(relative)
+        return self._existing(matches)
+
+    def scan(
+        self,
+        patterns: list[str],
+        directory: str | None = None,
+        recursive: bool = True,
+    ) -> list[Path]:
+        """
+        Find files whose name matches any of the glob patterns by listing the
+        filesystem, for deletions that must not miss anything (GDPR purges).
+
+        The ledger rows of the matching files are reconciled with what was
+        found, as in sync_directory().
+
+        Args:
+            patterns: Globs over the file name (e.g. "*123*.json")
+            directory: Restrict to a directory relative to the state dir
+            recursive: Include files in subdirectories of directory
+        """
+
+        def matches(name: str) -> bool:
+            return not _is_ignored(name) and any(
+                fnmatch.fnmatchcase(name, pattern) for pattern in patterns
+            )
+
+        root = self.state_dir / directory if directory else self.state_dir
+        listed: dict[str, os.stat_result] = {}
+        if root.is_dir():
+            walk = os.walk(root) if recursive else [next(os.walk(root))]
+            for dirpath, _, filenames in walk:
+                prefix = Path(dirpath).relative_to(self.state_dir).as_posix()
+                for name in filenames:
+                    if not matches(name):
+                        continue
+                    relative = name if prefix == "." else f"{prefix}/{name}"
+                    try:
+                        listed[relative] = os.stat(self.state_dir / relative)
+                    except OSError:
+                        continue
+
+        scope = directory or ""
+        known: dict[str, tuple[int, float]] = {}
+        for pattern in patterns:
+            glob = f"{directory}/*{pattern}" if directory else f"*{pattern}"
+            for relative, stats in self._store.storage_stats(glob).items():
+                parent, _, name = relative.rpartition("/")
+                if not fnmatch.fnmatchcase(name, pattern):
+                    continue
+                if not recursive and parent != scope:
+                    continue
+                known[relative] = stats
+        self._apply_listing(listed, known)
+        return [self.state_dir / relative for relative in sorted(listed)]
+
+    def records_older_than(self, directory: str, cutoff: datetime) -> list[Path]:
+        """
+        JSON files directly in a directory whose record timestamp is older
+        than cutoff, or unknown.
+        """
+        category = CATEGORY_DIRS.get(directory, OTHER_CATEGORY)
+        relatives = [
+            relative
+            for relative in self._store.storage_paths(
+                f"{directory}/*.json", category, record_before=cutoff.timestamp()
+            )
+            if relative.count("/") == 1
+        ]
+        return self._existing(relatives)
+
+    def files_modified_before(
+        self, directory: str, pattern: str, cutoff: datetime
+    ) -> list[Path]:
+        """Files directly in a directory modified before cutoff."""
+        relatives = [
+            relative
+            for relative in self._store.storage_paths(
+                f"{directory}/{pattern}", modified_before=cutoff.timestamp()
+            )
+            if relative.count("/") == 1
+        ]
+        return self._existing(relatives)
+
+
+def _has_built_ledger(db_path: Path) -> bool:
+    """
+    Whether db_path is a state store with a built ledger.
+
+    Opened read-only, so unrelated databases that happen to be named state.db
+    are never migrated or switched to WAL.
+    """
+    if not db_path.is_file():
+        return False
+    try:
+        conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return False
+    try:
+        row = conn.execute(
+            "SELECT 1 FROM migrations WHERE name = ?", (_LEDGER_MIGRATION,)
+        ).fetchone()
+        return row is not None
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+def _find_root(directory: Path) -> tuple[Path, str] | None:
+    """Find the state directory (with a built ledger) above a directory."""
+    key = str(directory)
+    cached = _roots.get(key)
+    now = time.monotonic()
+    if cached is not None:
+        found, checked_at = cached
+        if found is not None or now - checked_at < _NO_ROOT_TTL_SECONDS:
+            return found
+
+    found = None
+    resolved = directory.resolve()
+    candidate = resolved
+    for _ in range(MAX_ROOT_DEPTH + 1):
+        if _has_built_ledger(candidate / DB_FILENAME):
+            found = (candidate, resolved.relative_to(candidate).as_posix())
+            break
+        if candidate.parent == candidate:
+            break
+        candidate = candidate.parent
+    _roots[key] = (found, now)
+    return found
+
+
+def record_change(path: str | Path, data: Any = None, deleted: bool = False) -> None:
+    """
+    Update the ledger of the state directory containing path, if any.
+
+    Called by file_lock.py after every write or delete. Only state stores
+    whose ledger has been built are updated, and never created here; other
+    ledgers are skipped, as their first build walks the tree anyway.
+    """
+    path = Path(path)
+    root = _find_root(path.parent)
+    if root is None:
+        return
+    state_dir, prefix = root
+    ledger = StorageLedger.open(state_dir, build=False)
+    if not ledger.is_built:
+        return
+    relative = path.name if prefix == "." else f"{prefix}/{path.name}"
+    if deleted:
+        ledger.forget_relative(relative)
+    else:
+        ledger.record_relative(relative, data)
@@ -5,10 +5,11 @@ Storage Metrics Calculator
 Handles storage usage analysis and reporting for the GitHub automation system.
 
 Features:
-- Directory size calculation
+- Storage breakdown by component type, read from the storage ledger
+  (storage_ledger.py) instead of walking the state directory
+- Per-repo usage and file age histogram
 - Top consumer identification
 - Human-readable size formatting
-- Storage breakdown by component type
 
 Usage:
     calculator = StorageMetricsCalculator(state_dir=Path(".auto-claude/github"))
@@ -18,10 +19,18 @@ Usage:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+try:
+    from .storage_ledger import StorageLedger
+except (ImportError, ValueError, SystemError):
+    from storage_ledger import StorageLedger
+
+# Ledger categories counted as records (everything but archive)
+RECORD_CATEGORIES = ("pr_reviews", "issues", "autofix")
+
 
 @dataclass
 class StorageMetrics:
@@ -40,6 +49,9 @@ class StorageMetrics:
     record_count: int = 0
     archive_count: int = 0
 
+    # Age bucket label -> {"bytes": ..., "files": ...}
+    age_histogram: dict[str, dict[str, int]] = field(default_factory=dict)
+
     @property
     def total_mb(self) -> float:
         return self.total_bytes / (1024 * 1024)
@@ -58,6 +70,7 @@ class StorageMetrics:
             },
             "record_count": self.record_count,
             "archive_count": self.archive_count,
+            "age_histogram": self.age_histogram,
         }
 
 
@@ -85,84 +98,57 @@ class StorageMetricsCalculator:
         """
         Calculate current storage usage metrics.
 
+        Reads the trigger-maintained ledger totals; only append-only
+        directories are re-stat'ed.
+
         Returns:
             StorageMetrics with breakdown by component
         """
         metrics = StorageMetrics()
-
-        # Measure each directory
-        metrics.pr_reviews_bytes = self._calculate_directory_size(self.state_dir / "pr")
-        metrics.issues_bytes = self._calculate_directory_size(self.state_dir / "issues")
-        metrics.autofix_bytes = self._calculate_directory_size(
-            self.state_dir / "autofix"
-        )
-        metrics.audit_logs_bytes = self._calculate_directory_size(
-            self.state_dir / "audit"
-        )
-        metrics.archive_bytes = self._calculate_directory_size(self.archive_dir)
-
-        # Calculate total and other
-        total = self._calculate_directory_size(self.state_dir)
-        counted = (
+        if not self.state_dir.exists():
+            return metrics
+
+        ledger = StorageLedger.open(self.state_dir)
+        ledger.refresh_volatile()
+        totals = ledger.totals()
+
+        def category_bytes(category: str) -> int:
+            return totals.get(category, {}).get("bytes", 0)
+
+        metrics.pr_reviews_bytes = category_bytes("pr_reviews")
+        metrics.issues_bytes = category_bytes("issues")
+        metrics.autofix_bytes = category_bytes("autofix")
+        metrics.audit_logs_bytes = category_bytes("audit_logs")
+        metrics.archive_bytes = category_bytes("archive")
+        metrics.other_bytes = category_bytes("other") + ledger.database_bytes()
+        metrics.total_bytes = (
             metrics.pr_reviews_bytes
             + metrics.issues_bytes
             + metrics.autofix_bytes
             + metrics.audit_logs_bytes
             + metrics.archive_bytes
+            + metrics.other_bytes
         )
-        metrics.other_bytes = max(0, total - counted)
-        metrics.total_bytes = total
-
-        # Count records
-        for subdir in ["pr", "issues", "autofix"]:
-            metrics.record_count += self._count_records(self.state_dir / subdir)
 
-        metrics.archive_count = self._count_records(self.archive_dir)
+        metrics.record_count = sum(
+            totals.get(category, {}).get("records", 0) for category in RECORD_CATEGORIES
+        )
+        metrics.archive_count = totals.get("archive", {}).get("records", 0)
+        metrics.age_histogram = ledger.age_histogram()
 
         return metrics
 
-    def _calculate_directory_size(self, path: Path) -> int:
+    def get_repo_usage(self) -> dict[str, dict[str, dict[str, int]]]:
         """
-        Calculate total size of all files in a directory recursively.
-
-        Args:
-            path: Directory path to measure
+        Get bytes and record counts per repository and category.
 
         Returns:
-            Total size in bytes
+            {repo: {category: {"bytes": ..., "records": ...}}}; files whose
+            repository is unknown are grouped under ""
         """
-        if not path.exists():
-            return 0
-
-        total = 0
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    total += file_path.stat().st_size
-                except OSError:
-                    # Skip files that can't be accessed
-                    continue
-
-        return total
-
-    def _count_records(self, path: Path) -> int:
-        """
-        Count JSON record files in a directory.
-
-        Args:
-            path: Directory path to count
-
-        Returns:
-            Number of .json files
-        """
-        if not path.exists():
-            return 0
-
-        count = 0
-        for file_path in path.rglob("*.json"):
-            count += 1
-
-        return count
+        if not self.state_dir.exists():
+            return {}
+        return StorageLedger.open(self.state_dir).usage_by_repo()
 
     def get_top_consumers(
         self,
@@ -11,17 +11,26 @@ Progressive trust system that unlocks more autonomous actions as accuracy improv
 - L4: Full auto-fix with merge
 
 Trust increases with accuracy, decreases with overrides.
+Trust state is kept in the shared SQLite state store (state_store.py).
 """
 
 from __future__ import annotations
 
 import json
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
 from pathlib import Path
 from typing import Any
 
+try:
+    from .state_store import GitHubStateStore
+except (ImportError, ValueError, SystemError):
+    from state_store import GitHubStateStore
+
+logger = logging.getLogger(__name__)
+
 
 class TrustLevel(IntEnum):
     """Trust levels with increasing autonomy."""
@@ -405,46 +414,46 @@ class TrustManager:
 
     def __init__(self, state_dir: Path):
         self.state_dir = state_dir
+        # Legacy per-repo JSON files, imported into the state store once
         self.trust_dir = state_dir / "trust"
-        self.trust_dir.mkdir(parents=True, exist_ok=True)
+        self._store = GitHubStateStore.open(state_dir)
+        self._store.run_migration("trust_json", self._migrate_json_files)
         self._states: dict[str, TrustState] = {}
 
-    def _get_state_file(self, repo: str) -> Path:
-        safe_name = repo.replace("/", "_")
-        return self.trust_dir / f"{safe_name}.json"
+    def _migrate_json_files(self) -> int:
+        """Import legacy {repo}.json trust files."""
+        if not self.trust_dir.exists():
+            return 0
+
+        count = 0
+        for file in self.trust_dir.glob("*.json"):
+            try:
+                with open(file, encoding="utf-8") as f:
+                    state = TrustState.from_dict(json.load(f))
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError, KeyError) as e:
+                logger.warning(f"Skipping unreadable trust file {file}: {e}")
+                continue
+            self._store.put_trust(
+                state.to_dict(), state.effective_level.value, replace=False
+            )
+            count += 1
+        return count
 
     def get_state(self, repo: str) -> TrustState:
         """Get trust state for a repository."""
         if repo in self._states:
             return self._states[repo]
 
-        state_file = self._get_state_file(repo)
-        if state_file.exists():
-            try:
-                with open(state_file, encoding="utf-8") as f:
-                    data = json.load(f)
-                    state = TrustState.from_dict(data)
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                # Return default state if file is corrupted
-                state = TrustState(repo=repo)
-        else:
-            state = TrustState(repo=repo)
+        data = self._store.get_trust(repo)
+        state = TrustState.from_dict(data) if data else TrustState(repo=repo)
 
         self._states[repo] = state
         return state
 
     def save_state(self, repo: str) -> None:
-        """Save trust state for a repository with secure file permissions."""
-        import os
-
+        """Save trust state for a repository."""
         state = self.get_state(repo)
-        state_file = self._get_state_file(repo)
-
-        # Write with restrictive permissions (0o600 = owner read/write only)
-        fd = os.open(str(state_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
-        # os.fdopen takes ownership of fd and will close it when the with block exits
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(state.to_dict(), f, indent=2)
+        self._store.put_trust(state.to_dict(), state.effective_level.value)
 
     def get_trust_level(self, repo: str) -> TrustLevel:
         """Get current trust level for a repository."""
@@ -513,31 +522,15 @@ class TrustManager:
 
     def get_all_states(self) -> list[TrustState]:
         """Get trust states for all repos."""
-        states = []
-        for file in self.trust_dir.glob("*.json"):
-            try:
-                with open(file, encoding="utf-8") as f:
-                    data = json.load(f)
-                    states.append(TrustState.from_dict(data))
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                # Skip corrupted state files
-                continue
-        return states
+        return [TrustState.from_dict(data) for data in self._store.all_trust()]
 
     def get_summary(self) -> dict[str, Any]:
         """Get summary of trust across all repos."""
-        states = self.get_all_states()
-        by_level = {}
-        for state in states:
-            level = state.effective_level.value
-            by_level[level] = by_level.get(level, 0) + 1
-
-        total_actions = sum(s.metrics.total_actions for s in states)
-        total_correct = sum(s.metrics.correct_actions for s in states)
-
+        summary = self._store.trust_summary()
         return {
-            "total_repos": len(states),
-            "by_level": by_level,
-            "total_actions": total_actions,
-            "overall_accuracy": total_correct / max(1, total_actions),
+            "total_repos": summary["total_repos"],
+            "by_level": summary["by_level"],
+            "total_actions": summary["total_actions"],
+            "overall_accuracy": summary["total_correct"]
+            / max(1, summary["total_actions"]),
         }
@@ -0,0 +1,560 @@
+"""
+Multi-Repository Work Scheduler
+===============================
+
+Dispatches automation work queued for the repos in a MultiRepoConfig so
+that one busy repo cannot starve the others:
+- Weighted fair queuing across repos (start-time fair queuing on a shared
+  virtual clock; RepoConfig.schedule_weight sets each repo's share)
+- A global cap on concurrent agent sessions
+- Per-repo AI budget shares carved out of the shared CostTracker; spend is
+  charged to both and starts over every budget period
+- Starvation protection: items waiting longer than max_wait_seconds jump the
+  queue, and low-priority kinds age towards the front of their repo's queue
+- Pacing against the shared GitHub token bucket
+
+The runner daemon (daemon.py) dispatches its jobs through a WorkScheduler,
+using submit(), next_item() and complete(). Standalone:
+    config = MultiRepoConfig.load(config_file)
+    scheduler = WorkScheduler(config, run_item=process, max_sessions=4)
+
+    scheduler.submit(WorkItem("owner/repo", WorkKind.PR_REVIEW, 123))
+    await scheduler.run()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+try:
+    from .multi_repo import MultiRepoConfig, RepoConfig
+    from .rate_limiter import CostTracker, RateLimiter
+except (ImportError, ValueError, SystemError):
+    from multi_repo import MultiRepoConfig, RepoConfig
+    from rate_limiter import CostTracker, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class WorkKind(str, Enum):
+    """Kinds of automation work the scheduler dispatches."""
+
+    FOLLOWUP_REVIEW = "followup_review"
+    PR_REVIEW = "pr_review"
+    AUTOFIX = "autofix"
+    TRIAGE = "triage"
+
+
+# Lower runs first within a repo; estimates are in USD and GitHub API calls
+KIND_PRIORITY = {
+    WorkKind.FOLLOWUP_REVIEW: 0,
+    WorkKind.PR_REVIEW: 1,
+    WorkKind.AUTOFIX: 2,
+    WorkKind.TRIAGE: 3,
+}
+DEFAULT_COST_ESTIMATES = {
+    WorkKind.FOLLOWUP_REVIEW: 0.50,
+    WorkKind.PR_REVIEW: 1.00,
+    WorkKind.AUTOFIX: 2.00,
+    WorkKind.TRIAGE: 0.05,
+}
+DEFAULT_GITHUB_CALLS = {
+    WorkKind.FOLLOWUP_REVIEW: 15,
+    WorkKind.PR_REVIEW: 30,
+    WorkKind.AUTOFIX: 20,
+    WorkKind.TRIAGE: 5,
+}
+
+# Smallest cost charged to a repo's virtual clock, so free items still
+# advance it and cannot monopolise dispatch
+MIN_VIRTUAL_COST = 0.01
+
+# Length of a budget period; the shared and per-repo spend start over after it
+DEFAULT_BUDGET_PERIOD_SECONDS = 86400.0
+
+
+@dataclass
+class WorkItem:
+    """
+    A unit of pending work for one repo.
+
+    repo is owner/repo; repo_key selects a path-scoped monorepo package by
+    its RepoConfig.state_key. Items are deduplicated by repo, kind and
+    number unless they carry different job_ids (daemon jobs).
+    """
+
+    repo: str
+    kind: WorkKind
+    number: int
+    estimated_cost: float | None = None
+    github_calls: int | None = None
+    payload: dict[str, Any] = field(default_factory=dict)
+    repo_key: str | None = None
+    job_id: str | None = None
+    submitted_at: float = 0.0
+
+    def __post_init__(self):
+        self.kind = WorkKind(self.kind)
+        if self.estimated_cost is None:
+            self.estimated_cost = DEFAULT_COST_ESTIMATES[self.kind]
+        if self.github_calls is None:
+            self.github_calls = DEFAULT_GITHUB_CALLS[self.kind]
+
+    @property
+    def key(self) -> tuple[str, str, int, str | None]:
+        return (self.repo_key or self.repo, self.kind.value, self.number, self.job_id)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "repo": self.repo,
+            "kind": self.kind.value,
+            "number": self.number,
+            "estimated_cost": self.estimated_cost,
+            "github_calls": self.github_calls,
+            "payload": self.payload,
+            "repo_key": self.repo_key,
+            "job_id": self.job_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WorkItem:
+        return cls(
+            repo=data["repo"],
+            kind=WorkKind(data["kind"]),
+            number=data["number"],
+            estimated_cost=data.get("estimated_cost"),
+            github_calls=data.get("github_calls"),
+            payload=data.get("payload", {}),
+            repo_key=data.get("repo_key"),
+            job_id=data.get("job_id"),
+        )
+
+
+@dataclass
+class _RepoQueue:
+    """Scheduling state for one repo."""
+
+    config: RepoConfig
+    items: list[WorkItem] = field(default_factory=list)
+    running: int = 0
+    reserved: float = 0.0
+    virtual_finish: float = 0.0
+    dispatched: int = 0
+    failed: int = 0
+    costs: CostTracker = field(default_factory=CostTracker)
+
+    @property
+    def weight(self) -> float:
+        return max(self.config.schedule_weight, 0.001)
+
+
+def _kind_enabled(config: RepoConfig, kind: WorkKind) -> bool:
+    if kind in (WorkKind.PR_REVIEW, WorkKind.FOLLOWUP_REVIEW):
+        return config.pr_review_enabled
+    if kind == WorkKind.AUTOFIX:
+        return config.auto_fix_enabled
+    return config.triage_enabled
+
+
+class WorkScheduler:
+    """
+    Fair scheduler for automation work across many repos.
+
+    Repos are served in order of their virtual start time: dispatching an item
+    advances its repo's virtual clock by estimated_cost / schedule_weight, so
+    over time each repo receives AI spend in proportion to its weight no matter
+    how much work it queues. A repo that goes idle cannot bank credit - on
+    return its clock is brought up to the global virtual time.
+
+    Each repo's budget share is cost_limit * weight / total_weight of the
+    shared CostTracker. Repos within their share are preferred; a repo over its
+    share only runs when no in-share repo has eligible work and the global
+    budget still covers it (work conserving). Completed work is charged to the
+    repo and to the shared CostTracker; both start over every
+    budget_period_seconds, so a long-lived scheduler gets a fresh budget per
+    period.
+    """
+
+    def __init__(
+        self,
+        config: MultiRepoConfig,
+        run_item: Callable[[WorkItem], Awaitable[float | None]] | None = None,
+        max_sessions: int = 4,
+        max_sessions_per_repo: int | None = 1,
+        cost_tracker: CostTracker | None = None,
+        rate_limiter: RateLimiter | None = None,
+        max_wait_seconds: float = 1800.0,
+        aging_seconds: float = 300.0,
+        budget_period_seconds: float | None = DEFAULT_BUDGET_PERIOD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            config: Repos to schedule across (only enabled repos are served)
+            run_item: Coroutine that performs one item for run(); returns its
+                actual AI cost in USD, or None to charge the estimate
+            max_sessions: Global cap on concurrently running items
+            max_sessions_per_repo: Per-repo cap (None for no cap)
+            cost_tracker: Shared AI budget (defaults to the RateLimiter's)
+            rate_limiter: Checked for GitHub quota before dispatch
+            max_wait_seconds: Items older than this are dispatched first
+            aging_seconds: Wait that promotes an item by one priority level
+            budget_period_seconds: Period after which the shared and per-repo
+                spend are reset (None to never reset)
+            clock: Monotonic time source
+        """
+        self.config = config
+        self.run_item = run_item
+        self.max_sessions = max_sessions
+        self.max_sessions_per_repo = max_sessions_per_repo
+        self.rate_limiter = rate_limiter
+        if cost_tracker is None:
+            limiter = rate_limiter or RateLimiter.get_instance()
+            cost_tracker = limiter.cost_tracker
+        self.cost_tracker = cost_tracker
+        self.max_wait_seconds = max_wait_seconds
+        self.aging_seconds = aging_seconds
+        self.budget_period_seconds = budget_period_seconds
+        self.clock = clock
+        self._period_start = clock()
+
+        self._queues: dict[str, _RepoQueue] = {}
+        self._keys: set[tuple[str, str, int, str | None]] = set()
+        self._virtual_time = 0.0
+        self._running = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._changed: asyncio.Event | None = None
+
+    # ------------------------------------------------------------------
+    # Queueing
+    # ------------------------------------------------------------------
+
+    def submit(self, item: WorkItem) -> bool:
+        """
+        Queue an item.
+
+        Returns False if the repo is unknown or disabled, the kind is turned
+        off for the repo, or the same item is already queued or running.
+        """
+        repo_config = self._resolve(item)
+        if repo_config is None or not repo_config.enabled:
+            return False
+        if not _kind_enabled(repo_config, item.kind) or item.key in self._keys:
+            return False
+
+        queue = self._queues.get(repo_config.state_key)
+        if queue is None:
+            queue = _RepoQueue(config=repo_config)
+            self._queues[repo_config.state_key] = queue
+        else:
+            queue.config = repo_config
+        if not queue.items and not queue.running:
+            # Returning from idle: no credit for the time away
+            queue.virtual_finish = max(queue.virtual_finish, self._virtual_time)
+
+        item.submitted_at = self.clock()
+        queue.items.append(item)
+        self._keys.add(item.key)
+        self._notify()
+        return True
+
+    def cancel(self, item: WorkItem) -> bool:
+        """Remove a queued (not yet dispatched) item."""
+        for queue in self._queues.values():
+            if item in queue.items:
+                queue.items.remove(item)
+                self._keys.discard(item.key)
+                return True
+        return False
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue.items) for queue in self._queues.values())
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def _resolve(self, item: WorkItem) -> RepoConfig | None:
+        if item.repo_key:
+            return self.config.repos.get(item.repo_key)
+        return self.config.get_repo(item.repo)
+
+    def budget_share(self, repo_config: RepoConfig) -> float:
+        """A repo's slice of the shared AI budget, by schedule_weight."""
+        repos = self.config.list_repos(enabled_only=True)
+        total = sum(max(r.schedule_weight, 0.001) for r in repos)
+        if not repo_config.enabled or not total:
+            return 0.0
+        return self.cost_tracker.cost_limit * (
+            max(repo_config.schedule_weight, 0.001) / total
+        )
+
+    def _roll_budget_period(self, now: float) -> None:
+        """Reset the shared and per-repo spend once the period has passed."""
+        period = self.budget_period_seconds
+        if not period or now - self._period_start < period:
+            return
+        self._period_start += (now - self._period_start) // period * period
+        self.cost_tracker.reset()
+        for queue in self._queues.values():
+            queue.costs = CostTracker()
+        logger.info("Budget period rolled over; AI spend reset for all repos")
+
+    def budget_wait(self) -> float | None:
+        """
+        Seconds until the next budget period, if queued items can't start
+        before it (the global budget covers none of them), else None.
+        """
+        if not self.budget_period_seconds:
+            return None
+        costs = [item.estimated_cost for q in self._queues.values() for item in q.items]
+        if not costs:
+            return None
+        now = self.clock()
+        self._roll_budget_period(now)
+        reserved = sum(queue.reserved for queue in self._queues.values())
+        if min(costs) <= self.cost_tracker.remaining_budget() - reserved:
+            return None
+        return max(self._period_start + self.budget_period_seconds - now, 0.0)
+
+    def retry_wait(self) -> float | None:
+        """Seconds until quota or budget may let a queued item start."""
+        waits = [w for w in (self.quota_wait(), self.budget_wait()) if w is not None]
+        return min(waits) if waits else None
+
+    def _effective_priority(self, item: WorkItem, now: float) -> float:
+        waited = now - item.submitted_at
+        return KIND_PRIORITY[item.kind] - waited / max(self.aging_seconds, 1e-9)
+
+    def quota_wait(self) -> float | None:
+        """
+        Seconds until the GitHub quota covers the cheapest queued item.
+
+        None if nothing is queued, no rate limiter is set, or the quota
+        already covers it (queued items then wait for a session or budget,
+        which complete() signals).
+        """
+        if self.rate_limiter is None:
+            return None
+        calls = [item.github_calls for q in self._queues.values() for item in q.items]
+        if not calls:
+            return None
+        wait = self.rate_limiter.github_bucket.time_until_available(min(calls))
+        return wait if wait > 0 else None
+
+    def _head(
+        self, queue: _RepoQueue, now: float, affordable: Callable[[WorkItem], bool]
+    ) -> WorkItem | None:
+        items = [item for item in queue.items if affordable(item)]
+        if not items:
+            return None
+        return min(
+            items,
+            key=lambda i: (self._effective_priority(i, now), i.submitted_at),
+        )
+
+    def next_item(self) -> WorkItem | None:
+        """
+        Pick and claim the next item to run, or None if nothing may start.
+
+        The caller must report completion through complete().
+        """
+        now = self.clock()
+        self._roll_budget_period(now)
+        if self._running >= self.max_sessions:
+            return None
+        candidates = [
+            queue
+            for queue in self._queues.values()
+            if queue.items
+            and queue.config.enabled
+            and (
+                self.max_sessions_per_repo is None
+                or queue.running < self.max_sessions_per_repo
+            )
+        ]
+        if not candidates:
+            return None
+
+        reserved = sum(queue.reserved for queue in self._queues.values())
+        global_remaining = self.cost_tracker.remaining_budget() - reserved
+        github_available = (
+            self.rate_limiter.github_bucket.available()
+            if self.rate_limiter is not None
+            else None
+        )
+
+        def affordable(item: WorkItem) -> bool:
+            if item.estimated_cost > global_remaining:
+                return False
+            return github_available is None or item.github_calls <= github_available
+
+        # Starvation protection: the oldest overdue item goes first
+        overdue = [
+            (item.submitted_at, queue, item)
+            for queue in candidates
+            for item in queue.items
+            if now - item.submitted_at >= self.max_wait_seconds and affordable(item)
+        ]
+        if overdue:
+            _, queue, item = min(overdue, key=lambda entry: entry[0])
+            return self._dispatch(queue, item)
+
+        heads = [(queue, self._head(queue, now, affordable)) for queue in candidates]
+        heads = [(queue, item) for queue, item in heads if item is not None]
+        in_share = [
+            (queue, item)
+            for queue, item in heads
+            if queue.costs.total_cost + queue.reserved + item.estimated_cost
+            <= self.budget_share(queue.config)
+        ]
+        pool = in_share or heads
+        if not pool:
+            return None
+
+        queue, item = min(
+            pool,
+            key=lambda entry: (
+                max(self._virtual_time, entry[0].virtual_finish),
+                -entry[0].weight,
+                entry[1].submitted_at,
+            ),
+        )
+        return self._dispatch(queue, item)
+
+    def _dispatch(self, queue: _RepoQueue, item: WorkItem) -> WorkItem:
+        start = max(self._virtual_time, queue.virtual_finish)
+        queue.virtual_finish = (
+            start + max(item.estimated_cost, MIN_VIRTUAL_COST) / queue.weight
+        )
+        self._virtual_time = start
+        queue.items.remove(item)
+        queue.running += 1
+        queue.reserved += item.estimated_cost
+        queue.dispatched += 1
+        self._running += 1
+        return item
+
+    def complete(
+        self, item: WorkItem, cost: float | None = None, failed: bool = False
+    ) -> None:
+        """
+        Release an item's session and charge its cost to the repo's share and
+        to the shared CostTracker (in the current budget period).
+        """
+        self._roll_budget_period(self.clock())
+        repo_config = self._resolve(item)
+        queue = self._queues.get(repo_config.state_key) if repo_config else None
+        self._keys.discard(item.key)
+        self._running = max(0, self._running - 1)
+        charged = item.estimated_cost if cost is None else cost
+        operation = f"{item.kind.value}:{item.number}"
+        self.cost_tracker.add_cost(charged, f"{item.repo}:{operation}")
+        if queue is not None:
+            queue.running = max(0, queue.running - 1)
+            queue.reserved = max(0.0, queue.reserved - item.estimated_cost)
+            queue.costs.add_cost(charged, operation)
+            if failed:
+                queue.failed += 1
+        self._notify()
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+
+    async def _execute(self, item: WorkItem) -> None:
+        cost = None
+        failed = False
+        try:
+            cost = await self.run_item(item)
+        except asyncio.CancelledError:
+            failed = True
+            raise
+        except Exception as e:
+            failed = True
+            logger.error(
+                f"{item.kind.value} #{item.number} for {item.repo} failed: {e}"
+            )
+        finally:
+            self.complete(item, cost, failed=failed)
+
+    async def run(self, until_idle: bool = True) -> None:
+        """
+        Dispatch queued work until the queues drain.
+
+        With until_idle=False, keeps waiting for new submissions until
+        cancelled. With until_idle=True, also returns when the remaining
+        items are blocked on budget and nothing is running. Items blocked on
+        GitHub quota are retried once the token bucket has refilled enough,
+        and (with until_idle=False) items blocked on budget once the next
+        budget period starts.
+        """
+        if self.run_item is None:
+            raise ValueError("run() needs a run_item")
+        self._changed = asyncio.Event()
+        try:
+            while True:
+                self._changed.clear()
+                while (item := self.next_item()) is not None:
+                    task = asyncio.create_task(self._execute(item))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                wait = self.quota_wait()
+                if wait is None and until_idle and not self._running:
+                    return
+                if wait is None and not until_idle:
+                    wait = self.budget_wait()
+                if wait is None:
+                    await self._changed.wait()
+                    continue
+                try:
+                    await asyncio.wait_for(self._changed.wait(), wait)
+                except TimeoutError:
+                    pass  # Quota refilled or a new period began; try again
+        finally:
+            self._changed = None
+
+    async def stop(self) -> None:
+        """Cancel running items; queued items stay queued."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._running,
+            "pending": self.pending,
+            "virtual_time": self._virtual_time,
+            "repos": {
+                queue.config.state_key: {
+                    "repo": queue.config.repo,
+                    "weight": queue.weight,
+                    "queued": len(queue.items),
+                    "running": queue.running,
+                    "dispatched": queue.dispatched,
+                    "failed": queue.failed,
+                    "spent": queue.costs.total_cost,
+                    "budget_share": self.budget_share(queue.config),
+                }
+                for queue in self._queues.values()
+            },
+        }
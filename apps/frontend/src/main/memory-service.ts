@@ -2,12 +2,14 @@
  * Memory Service
  *
  * Queries the LadybugDB graph database for memories stored by Graphiti.
- * Uses Python subprocess to communicate with the embedded database.
+ * Queries go to a long-lived `query_memory.py serve` process that keeps the
+ * database and embedder warm; a one-shot subprocess per query is used if
+ * the server cannot be started.
  *
  * LadybugDB stores data in Kuzu format at ~/.auto-claude/memories/<database>/
  */
 
-import { spawn } from 'child_process';
+import { spawn, type ChildProcess } from 'child_process';
 import * as path from 'path';
 import { fileURLToPath } from 'url';
 import * as fs from 'fs';
@@ -74,6 +76,16 @@ interface MemoryQueryResult {
   }>;
   count: number;
   query?: string;
+  next_cursor?: string | null;
+}
+
+/**
+ * One page of memories; pass nextCursor back to get the following page
+ * (null on the last page)
+ */
+export interface MemoryPage {
+  memories: MemoryEpisode[];
+  nextCursor: string | null;
 }
 
 interface StatusResult {
@@ -279,32 +291,10 @@ async function executeQuery(
 }
 
 /**
- * Execute semantic search with embedder configuration passed via environment
+ * Environment variables configuring the embedder for semantic search
  */
-async function executeSemanticQuery(
-  args: string[],
-  embedderConfig: EmbedderConfig,
-  timeout: number = 30000 // Longer timeout for embedding operations
-): Promise<QueryResult> {
-  // Use getBackendPythonPath() to find the correct Python:
-  // - In dev mode: uses backend venv with real_ladybug installed
-  // - In packaged app: falls back to bundled Python
-  const pythonCmd = getBackendPythonPath();
-
-  const scriptPath = getQueryScriptPath();
-  if (!scriptPath) {
-    return { success: false, error: 'query_memory.py script not found' };
-  }
-
-  const [pythonExe, baseArgs] = parsePythonCommand(pythonCmd);
-
-  // Get Python environment (includes PYTHONPATH for bundled/venv packages)
-  // This is critical for finding real_ladybug (LadybugDB)
-  const pythonEnv = getMemoryPythonEnv();
-
-  // Build environment with embedder configuration
-  // Use pythonEnv which combines sanitized env + site-packages for real_ladybug
-  const env: Record<string, string | undefined> = { ...pythonEnv };
+function buildEmbedderEnv(embedderConfig: EmbedderConfig): Record<string, string> {
+  const env: Record<string, string> = {};
 
   // Set the embedder provider
   env.GRAPHITI_EMBEDDER_PROVIDER = embedderConfig.provider;
@@ -363,6 +353,40 @@ async function executeSemanticQuery(
       break;
   }
 
+  return env;
+}
+
+/**
+ * Execute semantic search with embedder configuration passed via environment
+ */
+async function executeSemanticQuery(
+  args: string[],
+  embedderConfig: EmbedderConfig,
+  timeout: number = 30000 // Longer timeout for embedding operations
+): Promise<QueryResult> {
+  // Use getBackendPythonPath() to find the correct Python:
+  // - In dev mode: uses backend venv with real_ladybug installed
+  // - In packaged app: falls back to bundled Python
+  const pythonCmd = getBackendPythonPath();
+
+  const scriptPath = getQueryScriptPath();
+  if (!scriptPath) {
+    return { success: false, error: 'query_memory.py script not found' };
+  }
+
+  const [pythonExe, baseArgs] = parsePythonCommand(pythonCmd);
+
+  // Get Python environment (includes PYTHONPATH for bundled/venv packages)
+  // This is critical for finding real_ladybug (LadybugDB)
+  const pythonEnv = getMemoryPythonEnv();
+
+  // Build environment with embedder configuration
+  // Use pythonEnv which combines sanitized env + site-packages for real_ladybug
+  const env: Record<string, string | undefined> = {
+    ...pythonEnv,
+    ...buildEmbedderEnv(embedderConfig),
+  };
+
   return new Promise((resolve) => {
     // Promise guard flag to prevent double resolution
     let resolved = false;
@@ -430,16 +454,191 @@ async function executeSemanticQuery(
   });
 }
 
+interface PendingRequest {
+  resolve: (result: QueryResult | null) => void;
+  timeoutId: ReturnType<typeof setTimeout>;
+}
+
+/**
+ * Long-lived `query_memory.py serve` process shared by all memory queries.
+ *
+ * Requests are JSON lines matched to responses by id. The process is started
+ * on first use and again after it exits; it releases database locks by itself
+ * when idle. request() resolves to null when the server is unavailable so
+ * callers can fall back to a one-shot subprocess.
+ *
+ * Each MemoryService using the process holds a reference (retain/release);
+ * the process is stopped once the last one is closed.
+ */
+class MemoryQueryServer {
+  private proc: ChildProcess | null = null;
+  private buffer = '';
+  private nextId = 1;
+  private pending = new Map<number, PendingRequest>();
+  private users = 0;
+
+  retain(): void {
+    this.users++;
+  }
+
+  release(): void {
+    this.users = Math.max(0, this.users - 1);
+    if (this.users === 0) {
+      this.stop();
+    }
+  }
+
+  request(
+    command: string,
+    params: Record<string, unknown>,
+    timeout: number = 10000
+  ): Promise<QueryResult | null> {
+    const proc = this.start();
+    if (!proc?.stdin?.writable) {
+      return Promise.resolve(null);
+    }
+
+    const id = this.nextId++;
+    return new Promise((resolve) => {
+      const timeoutId = setTimeout(() => {
+        if (this.pending.delete(id)) {
+          resolve({ success: false, error: 'Query timed out' });
+        }
+      }, timeout);
+      this.pending.set(id, { resolve, timeoutId });
+      proc.stdin?.write(`${JSON.stringify({ ...params, id, command })}\n`);
+    });
+  }
+
+  stop(): void {
+    if (this.proc) {
+      this.proc.stdin?.end();
+      this.proc = null;
+    }
+    this.failPending();
+  }
+
+  private start(): ChildProcess | null {
+    if (this.proc) {
+      return this.proc;
+    }
+
+    const scriptPath = getQueryScriptPath();
+    if (!scriptPath) {
+      return null;
+    }
+
+    const [pythonExe, baseArgs] = parsePythonCommand(getBackendPythonPath());
+    try {
+      const proc = spawn(pythonExe, [...baseArgs, scriptPath, 'serve'], {
+        stdio: ['pipe', 'pipe', 'pipe'],
+        env: getMemoryPythonEnv(),
+      });
+      proc.stdout?.on('data', (data) => this.onData(data.toString('utf-8')));
+      proc.stderr?.on('data', (data) => {
+        console.warn('[MemoryService] Query server:', data.toString('utf-8').trim());
+      });
+      proc.on('exit', () => this.onExit(proc));
+      proc.on('error', (err) => {
+        console.error('[MemoryService] Query server failed:', err.message);
+        this.onExit(proc);
+      });
+      this.proc = proc;
+      this.buffer = '';
+      return proc;
+    } catch (error) {
+      console.error('[MemoryService] Could not start query server:', error);
+      return null;
+    }
+  }
+
+  private onData(chunk: string): void {
+    this.buffer += chunk;
+    let newline = this.buffer.indexOf('\n');
+    while (newline >= 0) {
+      const line = this.buffer.slice(0, newline).trim();
+      this.buffer = this.buffer.slice(newline + 1);
+      newline = this.buffer.indexOf('\n');
+      if (!line) continue;
+
+      let response: QueryResult & { id?: number };
+      try {
+        response = JSON.parse(line);
+      } catch {
+        console.error('[MemoryService] Invalid query server response:', line);
+        continue;
+      }
+      const pending = response.id !== undefined ? this.pending.get(response.id) : undefined;
+      if (pending && response.id !== undefined) {
+        this.pending.delete(response.id);
+        clearTimeout(pending.timeoutId);
+        pending.resolve({ success: response.success, data: response.data, error: response.error });
+      }
+    }
+  }
+
+  private onExit(proc: ChildProcess): void {
+    if (this.proc === proc) {
+      this.proc = null;
+      this.failPending();
+    }
+  }
+
+  private failPending(): void {
+    for (const { resolve, timeoutId } of this.pending.values()) {
+      clearTimeout(timeoutId);
+      resolve(null);
+    }
+    this.pending.clear();
+  }
+}
+
+const queryServer = new MemoryQueryServer();
+
+/**
+ * Run a memory query on the query server, or a one-shot subprocess if the
+ * server is unavailable
+ */
+async function runQuery(
+  server: MemoryQueryServer,
+  command: string,
+  params: Record<string, unknown>,
+  cliArgs: string[],
+  timeout?: number
+): Promise<QueryResult> {
+  const result = await server.request(command, params, timeout);
+  if (result) {
+    return result;
+  }
+  if (params.cursor) {
+    // Cursors live in the server process; the one-shot CLI can't continue them
+    return { success: false, error: 'Unknown or expired cursor' };
+  }
+  return executeQuery(command, cliArgs, timeout);
+}
+
 /**
  * Memory Service for querying graph memories from LadybugDB
  */
 export class MemoryService {
   private config: MemoryServiceConfig;
+  private holdsServer = false;
 
   constructor(config: MemoryServiceConfig) {
     this.config = config;
   }
 
+  /**
+   * The shared query server, holding a reference to it until close()
+   */
+  private server(): MemoryQueryServer {
+    if (!this.holdsServer) {
+      queryServer.retain();
+      this.holdsServer = true;
+    }
+    return queryServer;
+  }
+
   /**
    * Get the full path to the database
    */
@@ -479,51 +678,81 @@ export class MemoryService {
    * Query episodic memories from the database
    */
   async getEpisodicMemories(limit: number = 20): Promise<MemoryEpisode[]> {
-    const result = await executeQuery('get-memories', [
-      this.config.dbPath,
-      this.config.database,
-      '--limit',
-      String(limit),
-    ]);
+    return (await this.getEpisodicMemoriesPage(limit)).memories;
+  }
+
+  /**
+   * Query one page of episodic memories, newest first
+   *
+   * @param limit Page size (a cursor keeps the page size of its first page)
+   * @param cursor nextCursor of the previous page
+   */
+  async getEpisodicMemoriesPage(limit: number = 20, cursor?: string): Promise<MemoryPage> {
+    const result = await runQuery(
+      this.server(),
+      'get-memories',
+      { ...this.dbParams(), limit, cursor },
+      [this.config.dbPath, this.config.database, '--limit', String(limit)]
+    );
 
     if (!result.success || !result.data) {
       console.error('Failed to get memories:', result.error);
-      return [];
+      return { memories: [], nextCursor: null };
     }
 
     const data = result.data as MemoryQueryResult;
-    return data.memories.map((m) => ({
-      id: m.id,
-      type: this.mapMemoryType(m.type),
-      timestamp: m.timestamp,
-      content: m.content,
-      session_number: m.session_number,
-    }));
+    return {
+      memories: data.memories.map((m) => ({
+        id: m.id,
+        type: this.mapMemoryType(m.type),
+        timestamp: m.timestamp,
+        content: m.content,
+        session_number: m.session_number,
+      })),
+      nextCursor: data.next_cursor ?? null,
+    };
   }
 
   /**
    * Query entity memories (patterns, gotchas, etc.) from the database
    */
   async getEntityMemories(limit: number = 20): Promise<MemoryEpisode[]> {
-    const result = await executeQuery('get-entities', [
-      this.config.dbPath,
-      this.config.database,
-      '--limit',
-      String(limit),
-    ]);
+    return (await this.getEntityMemoriesPage(limit)).memories;
+  }
+
+  /**
+   * Query one page of entity memories, newest first
+   *
+   * @param limit Page size (a cursor keeps the page size of its first page)
+   * @param cursor nextCursor of the previous page
+   */
+  async getEntityMemoriesPage(limit: number = 20, cursor?: string): Promise<MemoryPage> {
+    const result = await runQuery(
+      this.server(),
+      'get-entities',
+      { ...this.dbParams(), limit, cursor },
+      [this.config.dbPath, this.config.database, '--limit', String(limit)]
+    );
 
     if (!result.success || !result.data) {
       console.error('Failed to get entities:', result.error);
-      return [];
+      return { memories: [], nextCursor: null };
     }
 
-    const data = result.data as { entities: MemoryQueryResult['memories']; count: number };
-    return data.entities.map((e) => ({
-      id: e.id,
-      type: this.mapMemoryType(e.type),
-      timestamp: e.timestamp,
-      content: e.content,
-    }));
+    const data = result.data as {
+      entities: MemoryQueryResult['memories'];
+      count: number;
+      next_cursor?: string | null;
+    };
+    return {
+      memories: data.entities.map((e) => ({
+        id: e.id,
+        type: this.mapMemoryType(e.type),
+        timestamp: e.timestamp,
+        content: e.content,
+      })),
+      nextCursor: data.next_cursor ?? null,
+    };
   }
 
   /**
@@ -547,28 +776,45 @@ export class MemoryService {
    * Search memories in the database (keyword search)
    */
   async searchMemories(searchQuery: string, limit: number = 20): Promise<MemoryEpisode[]> {
-    const result = await executeQuery('search', [
-      this.config.dbPath,
-      this.config.database,
-      searchQuery,
-      '--limit',
-      String(limit),
-    ]);
+    return (await this.searchMemoriesPage(searchQuery, limit)).memories;
+  }
+
+  /**
+   * Keyword search, one page at a time
+   *
+   * @param searchQuery The search query (a cursor keeps the query of its first page)
+   * @param limit Page size
+   * @param cursor nextCursor of the previous page
+   */
+  async searchMemoriesPage(
+    searchQuery: string,
+    limit: number = 20,
+    cursor?: string
+  ): Promise<MemoryPage> {
+    const result = await runQuery(
+      this.server(),
+      'search',
+      { ...this.dbParams(), query: searchQuery, limit, cursor },
+      [this.config.dbPath, this.config.database, searchQuery, '--limit', String(limit)]
+    );
 
     if (!result.success || !result.data) {
       console.error('Failed to search memories:', result.error);
-      return [];
+      return { memories: [], nextCursor: null };
     }
 
     const data = result.data as MemoryQueryResult;
-    return data.memories.map((m) => ({
-      id: m.id,
-      type: this.mapMemoryType(m.type),
-      timestamp: m.timestamp,
-      content: m.content,
-      session_number: m.session_number,
-      score: m.score,
-    }));
+    return {
+      memories: data.memories.map((m) => ({
+        id: m.id,
+        type: this.mapMemoryType(m.type),
+        timestamp: m.timestamp,
+        content: m.content,
+        session_number: m.session_number,
+        score: m.score,
+      })),
+      nextCursor: data.next_cursor ?? null,
+    };
   }
 
   /**
@@ -587,10 +833,23 @@ export class MemoryService {
     embedderConfig: EmbedderConfig,
     limit: number = 20
   ): Promise<{ memories: MemoryEpisode[]; searchType: 'semantic' | 'keyword' }> {
-    const result = await executeSemanticQuery(
-      [this.config.dbPath, this.config.database, searchQuery, '--limit', String(limit)],
-      embedderConfig
-    );
+    const semanticTimeout = 30000; // Longer timeout for embedding operations
+    const result =
+      (await this.server().request(
+        'semantic-search',
+        {
+          ...this.dbParams(),
+          query: searchQuery,
+          limit,
+          embedder_env: buildEmbedderEnv(embedderConfig),
+        },
+        semanticTimeout
+      )) ??
+      (await executeSemanticQuery(
+        [this.config.dbPath, this.config.database, searchQuery, '--limit', String(limit)],
+        embedderConfig,
+        semanticTimeout
+      ));
 
     if (!result.success || !result.data) {
       console.error('Semantic search failed, falling back to keyword:', result.error);
@@ -619,7 +878,10 @@ export class MemoryService {
    * Test connection to the database
    */
   async testConnection(): Promise<{ success: boolean; message: string }> {
-    const result = await executeQuery('get-status', [this.config.dbPath, this.config.database]);
+    const result = await runQuery(this.server(), 'get-status', this.dbParams(), [
+      this.config.dbPath,
+      this.config.database,
+    ]);
 
     if (!result.success) {
       return {
@@ -691,7 +953,18 @@ export class MemoryService {
       args.push('--group-id', groupId);
     }
 
-    const result = await executeQuery('add-episode', args);
+    const result = await runQuery(
+      this.server(),
+      'add-episode',
+      {
+        ...this.dbParams(),
+        name,
+        content: contentStr,
+        episode_type: episodeType,
+        group_id: groupId,
+      },
+      args
+    );
 
     if (!result.success) {
       console.error('Failed to add episode:', result.error);
@@ -703,10 +976,21 @@ export class MemoryService {
   }
 
   /**
-   * Close the database connection (no-op for subprocess model)
+   * Release this service's reference to the shared query server, which is
+   * stopped once no service uses it (and restarted by the next query)
    */
   async close(): Promise<void> {
-    // No persistent connection to close with subprocess model
+    if (this.holdsServer) {
+      this.holdsServer = false;
+      queryServer.release();
+    }
+  }
+
+  /**
+   * Database location parameters for query server requests
+   */
+  private dbParams(): { db_path: string; database: string } {
+    return { db_path: this.config.dbPath, database: this.config.database };
   }
 
   /**
@@ -742,6 +1026,8 @@ export function getMemoryService(config: MemoryServiceConfig): MemoryService {
     serviceInstance['config'].dbPath !== config.dbPath ||
     serviceInstance['config'].database !== config.database
   ) {
+    // The replaced instance no longer needs the query server
+    void serviceInstance?.close();
     serviceInstance = new MemoryService(config);
   }
   return serviceInstance;
@@ -593,3 +593,51 @@ class TestSimpleClientAPIProfileAuthentication:
 
             # Verify SDK client was created successfully
             assert client is mock_sdk_client
+
+
+class TestProjectIndexCache:
+    """Tests for the shared, read-only project index snapshot."""
+
+    @staticmethod
+    def _write_index(project_dir, index):
+        import json
+
+        index_dir = project_dir / ".auto-claude"
+        index_dir.mkdir(exist_ok=True)
+        (index_dir / "project_index.json").write_text(json.dumps(index))
+
+    def test_cache_hits_share_one_read_only_snapshot(self, tmp_path):
+        """Repeated lookups return the same objects, which cannot be modified."""
+        from core.client import _get_cached_project_data, get_project_snapshot
+
+        self._write_index(
+            tmp_path, {"services": {"web": {"framework": "react", "dependencies": []}}}
+        )
+
+        index, capabilities = _get_cached_project_data(tmp_path)
+        again, _ = _get_cached_project_data(tmp_path)
+
+        assert again is index
+        assert capabilities["is_web_frontend"] is True
+        with pytest.raises(TypeError):
+            index["services"]["web"]["framework"] = "vue"
+        assert index["services"]["web"]["dependencies"] == ()
+
+        mutable = get_project_snapshot(tmp_path).mutable_index()
+        mutable["services"]["web"]["dependencies"].append("vite")
+        assert index["services"]["web"]["dependencies"] == ()
+
+    def test_snapshot_reloaded_when_index_file_changes(self, tmp_path):
+        """A rewritten project_index.json replaces the snapshot without a TTL."""
+        from core.client import get_project_snapshot
+
+        missing = get_project_snapshot(tmp_path)
+        assert missing.index == {}
+        assert missing.version is None
+
+        self._write_index(tmp_path, {"services": {"app": {"framework": "nextjs"}}})
+        snapshot = get_project_snapshot(tmp_path)
+
+        assert snapshot is not missing
+        assert snapshot.capabilities["is_nextjs"] is True
+        assert get_project_snapshot(tmp_path) is snapshot
@@ -0,0 +1,221 @@
+"""
+Tests for Audit Logger Queries
+==============================
+
+Tests indexed audit log queries and rollup-based statistics.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from audit import ActorType, AuditAction, AuditLogger
+from audit_index import AuditLogIndex
+
+
+@pytest.fixture
+def audit(tmp_path):
+    return AuditLogger(log_dir=tmp_path / "audit")
+
+
+def _raw_entry(ts: datetime, repo: str, pr: int, action: str, **extra) -> dict:
+    entry = {
+        "timestamp": ts.isoformat(),
+        "correlation_id": f"gh-{pr}",
+        "action": action,
+        "actor_type": "automation",
+        "actor_id": None,
+        "repo": repo,
+        "pr_number": pr,
+        "issue_number": None,
+        "result": "success",
+        "duration_ms": 10,
+        "error": None,
+        "details": {},
+        "token_usage": {"input_tokens": 5, "output_tokens": 1},
+    }
+    entry.update(extra)
+    return entry
+
+
+def _write_partition(log_dir: Path, day: str, entries: list[dict]) -> Path:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    path = log_dir / f"audit_{day}.jsonl"
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return path
+
+
+class TestQueryLogs:
+    """Test indexed query_logs."""
+
+    def test_query_by_correlation_id(self, audit):
+        ctx_a = audit.start_operation(ActorType.USER, repo="o/a", pr_number=1)
+        ctx_b = audit.start_operation(ActorType.USER, repo="o/b", pr_number=2)
+        audit.log(ctx_a, AuditAction.PR_REVIEW_STARTED)
+        audit.log(ctx_b, AuditAction.PR_REVIEW_STARTED)
+        audit.log(ctx_a, AuditAction.PR_REVIEW_COMPLETED)
+
+        history = audit.get_operation_history(ctx_a.correlation_id)
+
+        assert [e.action for e in history] == [
+            AuditAction.PR_REVIEW_STARTED,
+            AuditAction.PR_REVIEW_COMPLETED,
+        ]
+
+    def test_combined_filters_and_limit(self, audit):
+        for pr in (1, 2, 1, 1):
+            ctx = audit.start_operation(ActorType.BOT, repo="o/a", pr_number=pr)
+            audit.log(ctx, AuditAction.TRIAGE_STARTED)
+
+        assert len(audit.query_logs(repo="o/a", pr_number=1)) == 3
+        assert len(audit.query_logs(repo="o/a", pr_number=1, limit=2)) == 2
+        assert audit.query_logs(repo="o/b") == []
+        assert len(audit.query_logs(action=AuditAction.TRIAGE_STARTED)) == 4
+
+    def test_picks_up_entries_from_other_writers(self, audit):
+        ctx = audit.start_operation(ActorType.USER, repo="o/a")
+        audit.log(ctx, AuditAction.TRIAGE_STARTED)
+        assert len(audit.query_logs(repo="o/a")) == 1
+
+        # Another process appends to the same partition
+        other = AuditLogger(log_dir=audit.log_dir)
+        other.log(ctx, AuditAction.TRIAGE_COMPLETED)
+
+        assert len(audit.query_logs(repo="o/a")) == 2
+
+    def test_reindexes_replaced_partition(self, tmp_path):
+        log_dir = tmp_path / "audit"
+        now = datetime.now(timezone.utc)
+        path = _write_partition(
+            log_dir, "2024-01-01", [_raw_entry(now, "o/a", 1, "triage_started")] * 3
+        )
+        index = AuditLogIndex(log_dir)
+        index.refresh()
+        index.flush()
+
+        path.unlink()
+        _write_partition(
+            log_dir, "2024-01-01", [_raw_entry(now, "o/b", 2, "triage_started")]
+        )
+
+        fresh = AuditLogIndex(log_dir)
+        entries = list(fresh.iter_entries({"repo": "o/b"}))
+        assert len(entries) == 1
+        assert list(fresh.iter_entries({"repo": "o/a"})) == []
+
+    def test_skips_partitions_before_since(self, tmp_path):
+        log_dir = tmp_path / "audit"
+        old = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        _write_partition(
+            log_dir, "2024-01-01", [_raw_entry(old, "o/a", 1, "triage_started")]
+        )
+        audit = AuditLogger(log_dir=log_dir)
+
+        assert audit.query_logs(since=old + timedelta(days=1)) == []
+        assert len(audit.query_logs(since=old)) == 1
+
+
+class TestStatistics:
+    """Test rollup-based statistics."""
+
+    def test_statistics_match_full_scan(self, tmp_path):
+        log_dir = tmp_path / "audit"
+        base = datetime(2024, 3, 1, 9, 0, tzinfo=timezone.utc)
+        entries = [
+            _raw_entry(
+                base + timedelta(minutes=7 * i),
+                "o/a" if i % 3 else "o/b",
+                i % 5,
+                "pr_review_completed" if i % 2 else "ai_agent_completed",
+                result="success" if i % 4 else "failure",
+            )
+            for i in range(600)
+        ]
+        _write_partition(log_dir, "2024-03-01", entries[:300])
+        _write_partition(log_dir, "2024-03-02", entries[300:])
+        audit = AuditLogger(log_dir=log_dir)
+        since = base + timedelta(hours=5, minutes=23)
+
+        stats = audit.get_statistics(repo="o/a", since=since)
+
+        expected = [
+            e
+            for e in entries
+            if e["repo"] == "o/a" and datetime.fromisoformat(e["timestamp"]) >= since
+        ]
+        assert stats["total_entries"] == len(expected)
+        assert stats["total_duration_ms"] == 10 * len(expected)
+        assert stats["total_input_tokens"] == 5 * len(expected)
+        assert stats["by_result"]["failure"] == sum(
+            1 for e in expected if e["result"] == "failure"
+        )
+
+    def test_statistics_without_filters(self, audit):
+        ctx = audit.start_operation(ActorType.AUTOMATION, repo="o/a")
+        audit.log_ai_agent(
+            ctx, "reviewer", "sonnet", input_tokens=100, output_tokens=20
+        )
+        audit.log(ctx, AuditAction.PR_REVIEW_COMPLETED, duration_ms=50)
+
+        stats = audit.get_statistics()
+
+        assert stats["total_entries"] == 2
+        assert stats["total_input_tokens"] == 100
+        assert stats["total_output_tokens"] == 20
+        assert stats["by_actor_type"] == {"automation": 2}
+
+    def test_disabled_logger_returns_empty(self, tmp_path):
+        audit = AuditLogger(log_dir=tmp_path / "audit", enabled=False)
+        assert audit.get_statistics()["total_entries"] == 0
+        assert audit.query_logs() == []
+
+    def test_own_appends_do_not_rescan_partitions(self, tmp_path, monkeypatch):
+        log_dir = tmp_path / "audit"
+        old = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for day in ("2024-01-01", "2024-01-02"):
+            _write_partition(log_dir, day, [_raw_entry(old, "o/a", 1, "pr_created")])
+        audit = AuditLogger(log_dir=log_dir)
+        ctx = audit.start_operation(ActorType.USER, repo="o/a")
+        audit.log(ctx, AuditAction.TRIAGE_STARTED)
+        assert audit.get_statistics()["total_entries"] == 3
+
+        def fail(log_file):
+            raise AssertionError(f"re-read {log_file}")
+
+        monkeypatch.setattr(audit._index, "_read_head", fail)
+        for _ in range(3):
+            audit.log(ctx, AuditAction.TRIAGE_COMPLETED, duration_ms=5)
+
+        stats = audit.get_statistics(repo="o/a")
+        assert stats["total_entries"] == 6
+        assert stats["by_action"]["triage_completed"] == 3
+        assert stats["total_duration_ms"] == 10 * 2 + 15
+
+    def test_rollups_follow_other_writers_and_deleted_partitions(self, tmp_path):
+        log_dir = tmp_path / "audit"
+        old = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        path = _write_partition(
+            log_dir, "2024-01-01", [_raw_entry(old, "o/a", 1, "pr_created")] * 2
+        )
+        audit = AuditLogger(log_dir=log_dir)
+        ctx = audit.start_operation(ActorType.USER, repo="o/a")
+        audit.log(ctx, AuditAction.TRIAGE_STARTED)
+        assert audit.get_statistics()["total_entries"] == 3
+
+        AuditLogger(log_dir=log_dir).log(ctx, AuditAction.TRIAGE_COMPLETED)
+        assert audit.get_statistics()["total_entries"] == 4
+
+        path.unlink()
+        assert audit.get_statistics()["total_entries"] == 2
+        assert audit.get_statistics(repo="o/b")["total_entries"] == 0
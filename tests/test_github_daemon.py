@@ -0,0 +1,310 @@
+"""
+Tests for GitHub Automation Daemon
+==================================
+
+Tests the daemon's job queue, concurrency limits, persistence and
+JSON-RPC protocol using stub commands.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from daemon import (
+    DaemonAlreadyRunningError,
+    DaemonJob,
+    GitHubDaemon,
+    JobStatus,
+    RPCError,
+    _socket_in_use,
+)
+from multi_repo import MultiRepoConfig, RepoConfig
+from rate_limiter import CostTracker, TokenBucket
+from state_store import GitHubStateStore
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repo", default="o/default")
+    subparsers = parser.add_subparsers(dest="command")
+    work = subparsers.add_parser("work")
+    work.add_argument("name")
+    subparsers.add_parser("fail")
+    return parser
+
+
+class StubCommands:
+    """Commands that block until released, recording concurrency."""
+
+    def __init__(self):
+        self.running: set[str] = set()
+        self.max_running = 0
+        self.started: list[str] = []
+        self.release = asyncio.Event()
+        self.args: list[argparse.Namespace] = []
+
+    async def work(self, args) -> int:
+        self.args.append(args)
+        self.started.append(args.name)
+        self.running.add(args.name)
+        self.max_running = max(self.max_running, len(self.running))
+        print(f"working on {args.name}")
+        args.progress_callback(
+            SimpleNamespace(
+                phase="run",
+                progress=50,
+                message=args.name,
+                issue_number=None,
+                pr_number=7,
+            )
+        )
+        await self.release.wait()
+        self.running.discard(args.name)
+        return 0
+
+    async def fail(self, args) -> int:
+        raise RuntimeError("boom")
+
+    def table(self):
+        return {"work": self.work, "fail": self.fail}
+
+
+@pytest.fixture
+def state_dir(tmp_path):
+    yield tmp_path
+    GitHubStateStore.open(tmp_path).close()
+
+
+async def _settle(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+class TestScheduling:
+    """Queue ordering and concurrency limits."""
+
+    async def test_per_repo_and_global_limits(self, state_dir):
+        stubs = StubCommands()
+        daemon = GitHubDaemon(
+            state_dir, _parser(), stubs.table(), max_jobs=2, max_jobs_per_repo=1
+        )
+
+        a1 = await daemon.submit(["--repo", "o/a", "work", "a1"])
+        await daemon.submit(["--repo", "o/a", "work", "a2"])
+        await daemon.submit(["--repo", "o/b", "work", "b1"])
+        await daemon.submit(["--repo", "o/c", "work", "c1"])
+        await _settle(lambda: len(stubs.started) == 2)
+
+        # a2 waits for a1 (same repo); c1 waits for a global slot
+        assert stubs.started == ["a1", "b1"]
+        assert a1.repo == "o/a"
+
+        stubs.release.set()
+        await _settle(lambda: len(stubs.started) == 4 and not daemon._running)
+
+        assert stubs.max_running == 2
+        assert daemon.get_job(a1.job_id).status == JobStatus.COMPLETED
+
+    async def test_busy_repo_does_not_starve_others(self, state_dir):
+        stubs = StubCommands()
+        stubs.release.set()
+        daemon = GitHubDaemon(state_dir, _parser(), stubs.table(), max_jobs=1)
+
+        for name in ("a1", "a2", "a3"):
+            await daemon.submit(["--repo", "o/a", "work", name])
+        await daemon.submit(["--repo", "o/b", "work", "b1"])
+        await _settle(lambda: len(stubs.started) == 4 and not daemon._running)
+
+        # b1 is served before o/a's backlog, not after it
+        assert stubs.started.index("b1") < stubs.started.index("a3")
+
+    async def test_repo_config_toggles_and_quota(self, state_dir):
+        stubs = StubCommands()
+        stubs.release.set()
+        bucket = TokenBucket(capacity=100, refill_rate=200.0)
+        bucket.tokens = 0.0
+        repos = MultiRepoConfig(
+            [RepoConfig(repo="o/quiet", triage_enabled=False)],
+            base_dir=state_dir / "repos",
+        )
+        daemon = GitHubDaemon(
+            state_dir,
+            _parser(),
+            stubs.table(),
+            repos=repos,
+            rate_limiter=SimpleNamespace(
+                github_bucket=bucket, cost_tracker=CostTracker(cost_limit=10.0)
+            ),
+        )
+
+        # "work" is scheduled as triage, which o/quiet turns off
+        with pytest.raises(RPCError):
+            await daemon.submit(["--repo", "o/quiet", "work", "x"])
+
+        await daemon.submit(["work", "later"])
+        assert stubs.started == []
+        # Started once the GitHub quota refills, with nothing else running
+        await _settle(lambda: stubs.started == ["later"])
+
+    async def test_failures_and_cancellation(self, state_dir):
+        stubs = StubCommands()
+        daemon = GitHubDaemon(state_dir, _parser(), stubs.table(), max_jobs=1)
+
+        failing = await daemon.submit(["fail"])
+        queued = await daemon.submit(["work", "later"])
+        assert daemon.cancel(queued.job_id)
+        await _settle(lambda: not daemon._running)
+
+        assert daemon.get_job(failing.job_id).status == JobStatus.FAILED
+        assert daemon.get_job(failing.job_id).error == "boom"
+        assert daemon.get_job(queued.job_id).status == JobStatus.CANCELLED
+        assert stubs.started == []
+
+    async def test_rejects_unknown_commands(self, state_dir):
+        daemon = GitHubDaemon(state_dir, _parser(), StubCommands().table())
+
+        with pytest.raises(RPCError):
+            await daemon.submit(["daemon"])
+        with pytest.raises(RPCError):
+            await daemon.submit("work x")
+
+
+class TestPersistence:
+    """Jobs survive a daemon restart."""
+
+    async def test_queued_and_interrupted_jobs_are_recovered(self, state_dir):
+        store = GitHubStateStore.open(state_dir)
+        running = DaemonJob("r1", ["work", "r1"], "work", status=JobStatus.RUNNING)
+        running.attempts = 1
+        store.put_job(running.to_dict())
+        store.put_job(DaemonJob("q1", ["work", "q1"], "work").to_dict())
+        exhausted = DaemonJob("x1", ["work", "x1"], "work", status=JobStatus.RUNNING)
+        exhausted.attempts = 3
+        store.put_job(exhausted.to_dict())
+
+        stubs = StubCommands()
+        stubs.release.set()
+        daemon = GitHubDaemon(state_dir, _parser(), stubs.table(), max_jobs=4)
+        recovered = daemon.recover()
+        daemon._schedule()
+        await _settle(lambda: not daemon._running)
+
+        assert [job.job_id for job in recovered] == ["r1", "q1"]
+        assert sorted(stubs.started) == ["q1", "r1"]
+        assert daemon.get_job("x1").status == JobStatus.FAILED
+
+    async def test_shutdown_requeues_running_jobs(self, state_dir):
+        stubs = StubCommands()
+        daemon = GitHubDaemon(state_dir, _parser(), stubs.table())
+        job = await daemon.submit(["work", "long"])
+        await _settle(lambda: stubs.started == ["long"])
+
+        await daemon._shutdown()
+
+        assert GitHubStateStore.open(state_dir).get_job(job.job_id)["status"] == (
+            "queued"
+        )
+
+    async def test_second_daemon_leaves_running_jobs_alone(self, state_dir):
+        first = GitHubDaemon(state_dir, _parser(), StubCommands().table())
+        first.recover()
+        GitHubStateStore.open(state_dir).put_job(
+            DaemonJob("r1", ["work", "r1"], "work", status=JobStatus.RUNNING).to_dict()
+        )
+
+        second = GitHubDaemon(state_dir, _parser(), StubCommands().table())
+        with pytest.raises(DaemonAlreadyRunningError):
+            second.recover()
+        assert second.get_job("r1").status == JobStatus.RUNNING
+
+        first.release_lock()
+        assert [job.job_id for job in second.recover()] == ["r1"]
+        second.release_lock()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+class TestSocketProtocol:
+    """JSON-RPC over a Unix socket."""
+
+    async def test_submit_streams_progress_output_and_result(self, state_dir):
+        stubs = StubCommands()
+        daemon = GitHubDaemon(state_dir, _parser(), stubs.table())
+        socket_path = state_dir / "d.sock"
+        server = asyncio.create_task(daemon.serve(socket_path))
+        await _settle(socket_path.exists)
+
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+
+        async def call(request):
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+
+        async def next_message():
+            return json.loads(await asyncio.wait_for(reader.readline(), 2))
+
+        await call(
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "submit",
+                "params": {"argv": ["work", "pr7"]},
+            }
+        )
+        response = await next_message()
+        job_id = response["result"]["job_id"]
+
+        messages = [await next_message(), await next_message()]
+        stubs.release.set()
+        messages.append(await next_message())
+        methods = {m["method"]: m["params"] for m in messages}
+
+        assert methods["job.output"] == {"job_id": job_id, "line": "working on pr7"}
+        assert methods["job.progress"]["pr_number"] == 7
+        assert methods["job.finished"]["status"] == "completed"
+        # Warm state is handed to every job
+        assert stubs.args[0].orchestrator_cache is daemon.orchestrator_cache
+
+        await call({"jsonrpc": "2.0", "id": 2, "method": "nope"})
+        assert (await next_message())["error"]["code"] == -32601
+        await call({"jsonrpc": "2.0", "id": 3, "method": "shutdown"})
+        assert (await next_message())["result"] == {"stopping": True}
+
+        writer.close()
+        await asyncio.wait_for(server, 2)
+        assert not socket_path.exists()
+
+    async def test_live_socket_is_not_taken_over(self, state_dir):
+        socket_path = state_dir / "d.sock"
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(socket_path))
+        listener.listen()
+        daemon = GitHubDaemon(state_dir / "other", _parser(), StubCommands().table())
+
+        try:
+            with pytest.raises(DaemonAlreadyRunningError):
+                await daemon.serve(socket_path)
+            assert socket_path.exists()
+        finally:
+            listener.close()
+
+        # Once its owner is gone, the stale socket is replaced
+        server = asyncio.create_task(daemon.serve(socket_path))
+        await _settle(lambda: _socket_in_use(socket_path))
+        daemon.stop()
+        await asyncio.wait_for(server, 2)
+        assert not socket_path.exists()
@@ -0,0 +1,480 @@
+"""
+Tests for Semantic Duplicate Detection
+======================================
+
+Tests the vectorized EmbeddingIndex and the DuplicateDetector built on it.
+"""
+
+import asyncio
+import base64
+import json
+import struct
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+import duplicates
+from duplicates import CachedEmbedding, DuplicateDetector, EmbeddingProvider
+from embedding_cache import EmbeddingCacheStore
+from embedding_index import EmbeddingIndex
+
+VOCAB = ["login", "oauth", "crash", "startup", "dark", "mode", "theme", "token"]
+
+
+def _bag_of_words(text: str) -> list[float]:
+    words = text.lower().split()
+    vector = [float(words.count(w)) for w in VOCAB]
+    vector.append(0.1)  # Avoid zero vectors for empty text
+    return vector
+
+
+class FakeEmbeddingProvider:
+    """Deterministic bag-of-words embeddings that record embedded texts."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    async def get_embedding(self, text: str) -> list[float]:
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        self.calls.extend(texts)
+        return [_bag_of_words(text) for text in texts]
+
+
+class FakeBatchProvider(EmbeddingProvider):
+    """
+    EmbeddingProvider whose batch endpoint is an in-process fake.
+
+    Batches containing a text with `fail_marker` raise; `batch_size` replaces
+    the provider's packing limits.
+    """
+
+    def __init__(
+        self, fail_marker: str | None = None, batch_size: int | None = None, **kwargs
+    ):
+        super().__init__(provider="voyage", **kwargs)
+        self.fail_marker = fail_marker
+        self.batch_size = batch_size
+        self.batches: list[list[str]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _pack_batches(self, texts: list[str]) -> list[list[int]]:
+        if self.batch_size is None:
+            return super()._pack_batches(texts)
+        indices = list(range(len(texts)))
+        return [
+            indices[i : i + self.batch_size]
+            for i in range(0, len(indices), self.batch_size)
+        ]
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail_marker and any(self.fail_marker in text for text in texts):
+            raise RuntimeError("batch rejected")
+        return [_bag_of_words(text) for text in texts]
+
+
+class StubEmbeddingServer(ThreadingHTTPServer):
+    """
+    Local HTTP server speaking the OpenAI/Voyage embeddings API.
+
+    Records every request and the peak number of requests in flight.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubEmbeddingHandler)
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _StubEmbeddingHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(
+                {
+                    "path": self.path,
+                    "authorization": self.headers.get("Authorization"),
+                    **body,
+                }
+            )
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        time.sleep(0.05)  # Let concurrent requests overlap
+
+        data = []
+        for index, text in enumerate(body["input"]):
+            vector = _bag_of_words(text)
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(
+                    struct.pack(f"<{len(vector)}f", *vector)
+                ).decode()
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        payload = json.dumps(
+            {
+                "object": "list",
+                # Out of order on purpose: clients must sort by index
+                "data": data[::-1],
+                "model": body["model"],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        ).encode()
+
+        with server.lock:
+            server.in_flight -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def embedding_server():
+    server = StubEmbeddingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _issue(number: int, title: str, body: str = "") -> dict:
+    return {"number": number, "title": title, "body": body}
+
+
+def _cached(number: int, value: float, dim: int = 4, hours: int = 24):
+    now = datetime.now(timezone.utc)
+    return CachedEmbedding(
+        issue_number=number,
+        content_hash=f"hash-{number}-{value}",
+        embedding=[value] * dim,
+        created_at=now.isoformat(),
+        expires_at=(now + timedelta(hours=hours)).isoformat(),
+        title_embedding=[value + 1] * dim,
+    )
+
+
+@pytest.fixture
+def detector(tmp_path):
+    det = DuplicateDetector(cache_dir=tmp_path / "embeddings")
+    det.embedding_provider = FakeEmbeddingProvider()
+    return det
+
+
+class TestEmbeddingIndex:
+    """Test the normalized embedding matrix."""
+
+    def test_search_returns_top_k_sorted(self):
+        index = EmbeddingIndex()
+        index.upsert(1, "a", [1.0, 0.0], [1.0, 0.0])
+        index.upsert(2, "b", [0.9, 0.1], [1.0, 0.0])
+        index.upsert(3, "c", [0.0, 1.0], [0.0, 1.0])
+
+        matches = index.search([1.0, 0.0], k=2)
+
+        assert [n for n, _ in matches] == [1, 2]
+        assert matches[0][1] == pytest.approx(1.0)
+
+    def test_search_respects_candidates_exclude_and_min_score(self):
+        index = EmbeddingIndex()
+        index.upsert(1, "a", [1.0, 0.0], [1.0, 0.0])
+        index.upsert(2, "b", [0.9, 0.1], [1.0, 0.0])
+        index.upsert(3, "c", [0.0, 1.0], [0.0, 1.0])
+
+        matches = index.search(
+            [1.0, 0.0], k=5, candidates=[2, 3], exclude=[2], min_score=0.5
+        )
+
+        assert matches == []
+
+    def test_upsert_replaces_and_remove_compacts(self):
+        index = EmbeddingIndex()
+        for n in range(100):
+            index.upsert(n, str(n), [1.0, float(n)], [1.0, 0.0])
+        index.upsert(5, "new", [0.0, 1.0], [0.0, 1.0])
+        assert index.content_hash(5) == "new"
+
+        assert index.remove(0) is True
+        assert index.remove(0) is False
+        assert len(index) == 99
+        assert 0 not in index
+        np.testing.assert_allclose(index.vector(5), [0.0, 1.0])
+
+    def test_dimension_mismatch_raises(self):
+        index = EmbeddingIndex()
+        index.upsert(1, "a", [1.0, 0.0], [1.0, 0.0])
+        with pytest.raises(ValueError):
+            index.upsert(2, "b", [1.0, 0.0, 0.0], [1.0, 0.0, 0.0])
+
+    def test_all_pairs_matches_bruteforce(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(40, 8)).astype(np.float32)
+        index = EmbeddingIndex()
+        for n, vec in enumerate(vectors):
+            index.upsert(n, str(n), vec, vec)
+
+        pairs = index.all_pairs(min_score=0.3)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = {
+            (i, j)
+            for i in range(40)
+            for j in range(i + 1, 40)
+            if normalized[i] @ normalized[j] >= 0.3
+        }
+        assert {(a, b) for a, b, _ in pairs} == expected
+        scores = [s for _, _, s in pairs]
+        assert scores == sorted(scores, reverse=True)
+
+
+class TestEmbeddingCacheStore:
+    """Test the memory-mapped binary embedding cache."""
+
+    def test_put_and_load_round_trip(self, tmp_path):
+        store = EmbeddingCacheStore(tmp_path, "owner/repo")
+        store.put_many([_cached(1, 0.5), _cached(2, 0.25)])
+
+        records = {r["issue_number"]: r for r in store.load()}
+
+        assert set(records) == {1, 2}
+        assert isinstance(records[1]["embedding"], np.memmap)
+        np.testing.assert_allclose(records[1]["embedding"], [0.5] * 4)
+        np.testing.assert_allclose(records[2]["title_embedding"], [1.25] * 4)
+        assert records[2]["body_embedding"] is None
+        # float32: 3 vectors x 4 dims x 4 bytes per slot
+        assert (tmp_path / "owner_repo_embeddings.0.f32").stat().st_size == 2 * 48
+
+    def test_updates_append_and_compact_tombstones(self, tmp_path):
+        store = EmbeddingCacheStore(tmp_path, "owner/repo", compact_min_dead=4)
+        store.put_many([_cached(n, 0.0) for n in range(4)])
+        for round_ in range(1, 4):
+            store.put_many([_cached(n, float(round_)) for n in range(4)])
+
+        index = json.loads(store.index_file.read_text())
+        assert index["generation"] >= 1
+        assert index["slots"] <= 8
+        assert not (tmp_path / "owner_repo_embeddings.0.f32").exists()
+        records = {r["issue_number"]: r for r in store.load()}
+        np.testing.assert_allclose(records[3]["embedding"], [3.0] * 4)
+
+    def test_expired_records_are_skipped(self, tmp_path):
+        store = EmbeddingCacheStore(tmp_path, "owner/repo")
+        store.put_many([_cached(1, 0.5), _cached(2, 0.5, hours=-1)])
+
+        assert [r["issue_number"] for r in store.load()] == [1]
+
+    def test_dimension_change_resets_cache(self, tmp_path):
+        store = EmbeddingCacheStore(tmp_path, "owner/repo")
+        store.put_many([_cached(1, 0.5, dim=4)])
+        store.put_many([_cached(2, 0.5, dim=8)])
+
+        assert [r["issue_number"] for r in store.load()] == [2]
+
+    def test_migrates_legacy_json_cache(self, tmp_path):
+        legacy = tmp_path / "owner_repo_embeddings.json"
+        legacy.write_text(
+            json.dumps({"embeddings": [_cached(7, 0.5).to_dict()]}),
+            encoding="utf-8",
+        )
+        store = EmbeddingCacheStore(tmp_path, "owner/repo")
+
+        records = store.load()
+
+        assert [r["issue_number"] for r in records] == [7]
+        assert not legacy.exists()
+        assert store.index_file.exists()
+
+
+class TestEmbeddingProviderBatching:
+    """Test batched, concurrent embedding requests."""
+
+    async def test_get_embeddings_packs_batches_and_preserves_order(self):
+        provider = FakeBatchProvider(max_concurrency=3)
+        texts = [f"login {i}" for i in range(300)] + ["login 0"]
+
+        vectors = await provider.get_embeddings(texts)
+
+        assert len(vectors) == len(texts)
+        assert vectors[-1] == vectors[0]
+        # 300 unique texts at 128 inputs per Voyage request
+        assert [len(b) for b in provider.batches] == [128, 128, 44]
+        assert provider.peak_in_flight <= 3
+        assert sum(len(b) for b in provider.batches) == 300
+
+    async def test_batches_respect_token_limit(self):
+        provider = FakeBatchProvider()
+        big = "x" * 7996  # ~2000 tokens each after truncation
+        texts = [big + str(i) for i in range(120)]
+
+        await provider.get_embeddings(texts)
+
+        assert len(provider.batches) > 1
+        for batch in provider.batches:
+            assert sum(provider._estimate_tokens(t) for t in batch) <= 100_000
+
+    async def test_get_embeddings_empty(self):
+        provider = FakeBatchProvider()
+        assert await provider.get_embeddings([]) == []
+        assert provider.batches == []
+
+    async def test_failed_batch_only_loses_its_own_texts(self):
+        provider = FakeBatchProvider(fail_marker="crash", batch_size=2)
+        texts = ["login", "oauth", "crash", "dark", "mode"]
+
+        vectors = await provider.get_embeddings(texts)
+
+        assert vectors[2] is None and vectors[3] is None
+        assert vectors[0] == _bag_of_words("login")
+        assert vectors[4] == _bag_of_words("mode")
+
+    async def test_all_batches_failing_raises(self):
+        provider = FakeBatchProvider(fail_marker="crash", batch_size=1)
+
+        with pytest.raises(RuntimeError, match="batch rejected"):
+            await provider.get_embeddings(["crash"])
+
+
+class TestEmbeddingProviderHTTP:
+    """Test the real provider clients against a local stub server."""
+
+    @pytest.mark.parametrize(
+        "provider,client_module",
+        [
+            ("voyage", "httpx"),
+            ("openai", "openai"),
+        ],
+    )
+    async def test_batches_concurrency_and_base_url(
+        self, embedding_server, monkeypatch, provider, client_module
+    ):
+        pytest.importorskip(client_module)
+        monkeypatch.setitem(duplicates.EMBEDDING_BATCH_LIMITS, provider, (3, 1000))
+        embedder = EmbeddingProvider(
+            provider=provider,
+            api_key="test-key",
+            model="stub-model",
+            base_url=embedding_server.base_url,
+            max_concurrency=2,
+        )
+        texts = [f"login {'crash ' * i}" for i in range(10)] + ["login "]
+
+        vectors = await embedder.get_embeddings(texts)
+
+        # The OpenAI client may fetch float32 base64 vectors
+        np.testing.assert_allclose(
+            vectors, [_bag_of_words(text) for text in texts], rtol=1e-6
+        )
+        requests = embedding_server.requests
+        # 10 unique texts at 3 inputs per request
+        assert sorted(len(r["input"]) for r in requests) == [1, 3, 3, 3]
+        assert embedding_server.peak_in_flight == 2
+        assert {r["path"] for r in requests} == {"/v1/embeddings"}
+        assert {r["authorization"] for r in requests} == {"Bearer test-key"}
+        assert {r["model"] for r in requests} == {"stub-model"}
+
+
+class TestDuplicateDetector:
+    """Test duplicate detection on top of the index."""
+
+    async def test_find_duplicates_ranks_similar_issues(self, detector):
+        open_issues = [
+            _issue(1, "login oauth crash", "oauth token crash"),
+            _issue(2, "dark mode theme", "theme dark"),
+            _issue(3, "login oauth", "oauth token"),
+        ]
+
+        results = await detector.find_duplicates(
+            repo="owner/repo",
+            issue_number=10,
+            title="login oauth crash",
+            body="oauth token crash",
+            open_issues=open_issues,
+        )
+
+        assert [r.issue_b for r in results][0] == 1
+        assert 2 not in [r.issue_b for r in results]
+        assert results[0].is_duplicate
+        assert results[0].title_score == pytest.approx(1.0, abs=1e-5)
+
+    async def test_repeat_lookup_makes_no_embedding_calls(self, detector):
+        open_issues = [_issue(n, f"login crash {n}", "startup") for n in range(20)]
+
+        await detector.find_duplicates(
+            "owner/repo", 100, "login crash", "startup", open_issues
+        )
+        first_calls = len(detector.embedding_provider.calls)
+        # Full and title texts per issue; the shared body is embedded once
+        assert first_calls == 21 * 2 + 1
+
+        await detector.find_duplicates(
+            "owner/repo", 100, "login crash", "startup", open_issues
+        )
+        assert len(detector.embedding_provider.calls) == first_calls
+
+    async def test_failed_batch_keeps_other_issues(self, detector):
+        # Full, title and body text per issue: one batch each
+        detector.embedding_provider = FakeBatchProvider(
+            fail_marker="crash", batch_size=3
+        )
+        issues = [
+            _issue(1, "login", "oauth"),
+            _issue(2, "startup crash", "token"),
+            _issue(3, "dark", "mode"),
+        ]
+
+        assert await detector.precompute_embeddings("owner/repo", issues) == 2
+        cache = detector._get_repo_cache("owner/repo")
+        assert sorted(cache) == [1, 3]
+
+    async def test_cache_persists_component_embeddings(self, detector, tmp_path):
+        issues = [_issue(1, "login", "oauth"), _issue(2, "dark mode", "")]
+        assert await detector.precompute_embeddings("owner/repo", issues) == 2
+
+        fresh = DuplicateDetector(cache_dir=tmp_path / "embeddings")
+        fresh.embedding_provider = FakeEmbeddingProvider()
+        result = await fresh.compare_issues("owner/repo", issues[0], issues[1])
+
+        assert fresh.embedding_provider.calls == []
+        assert result.body_score == 0.0
+
+    async def test_find_duplicate_pairs(self, detector):
+        issues = [
+            _issue(1, "login oauth", "token"),
+            _issue(2, "login oauth", "token"),
+            _issue(3, "dark theme", "mode"),
+        ]
+
+        pairs = await detector.find_duplicate_pairs("owner/repo", issues)
+
+        assert [(p.issue_a, p.issue_b) for p in pairs] == [(1, 2)]
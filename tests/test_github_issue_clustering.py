@@ -0,0 +1,176 @@
+"""
+Tests for Issue Clustering Engine
+=================================
+
+Tests sparse keyword similarity and heap-driven agglomerative clustering
+used by IssueBatcher.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from issue_clustering import (
+    agglomerative_cluster,
+    build_keyword_similarity,
+    sparse_from_pairs,
+    split_into_groups,
+)
+
+
+def _issue(number: int, title: str, labels: list[str] | None = None) -> dict:
+    return {
+        "number": number,
+        "title": title,
+        "labels": [{"name": name} for name in labels or []],
+    }
+
+
+def _reference_cluster(nodes, pairs, threshold, max_size):
+    """Naive average-linkage clustering (the previous IssueBatcher algorithm,
+    skipping oversized merges instead of stopping)."""
+    clusters = [{n} for n in nodes]
+    blocked = set()
+
+    def score(c1, c2):
+        scores = [pairs[(a, b)] for a in c1 for b in c2 if (a, b) in pairs]
+        return sum(scores) / len(scores) if scores else 0.0
+
+    while True:
+        best, best_pair = 0.0, None
+        for i in range(len(clusters)):
+            for j in range(i + 1, len(clusters)):
+                key = (frozenset(clusters[i]), frozenset(clusters[j]))
+                s = score(clusters[i], clusters[j])
+                if s > best and key not in blocked:
+                    best, best_pair = s, (i, j)
+        if best_pair is None or best < threshold:
+            break
+        i, j = best_pair
+        if len(clusters[i]) + len(clusters[j]) > max_size:
+            blocked.add((frozenset(clusters[i]), frozenset(clusters[j])))
+            continue
+        merged = clusters[i] | clusters[j]
+        clusters = [c for k, c in enumerate(clusters) if k not in (i, j)]
+        clusters.append(merged)
+    return sorted(sorted(c) for c in clusters)
+
+
+class TestKeywordSimilarity:
+    """Test inverted-index keyword similarity."""
+
+    def test_only_issues_sharing_keywords_are_scored(self):
+        issues = [
+            _issue(1, "Login fails with OAuth"),
+            _issue(2, "OAuth login timeout"),
+            _issue(3, "Dark mode colors"),
+        ]
+
+        similarity = build_keyword_similarity(issues)
+
+        assert set(similarity) == {1, 2}
+        assert similarity[1][2] == similarity[2][1]
+        assert similarity[1][2] == pytest.approx(2 / 4)
+
+    def test_labels_contribute_keywords(self):
+        issues = [
+            _issue(1, "Alpha", ["frontend"]),
+            _issue(2, "Beta", ["frontend"]),
+        ]
+
+        assert build_keyword_similarity(issues)[1][2] == pytest.approx(1 / 3)
+
+    def test_common_keywords_are_skipped(self):
+        issues = [_issue(n, "crash") for n in range(10)]
+
+        assert build_keyword_similarity(issues, max_posting=5) == {}
+
+
+class TestAgglomerativeCluster:
+    """Test the priority-queue clustering engine."""
+
+    def test_merges_above_threshold(self):
+        pairs = {(1, 2): 0.9, (2, 3): 0.8, (3, 4): 0.1}
+        clusters = agglomerative_cluster(
+            [1, 2, 3, 4], sparse_from_pairs(pairs), threshold=0.7, max_cluster_size=5
+        )
+
+        assert clusters == [[1, 2, 3], [4]]
+
+    def test_respects_max_cluster_size(self):
+        pairs = {(a, b): 0.9 for a in range(6) for b in range(6) if a < b}
+        clusters = agglomerative_cluster(
+            range(6), sparse_from_pairs(pairs), threshold=0.7, max_cluster_size=2
+        )
+
+        assert sorted(len(c) for c in clusters) == [2, 2, 2]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_naive_average_linkage(self, seed):
+        rng = random.Random(seed)
+        nodes = list(range(14))
+        pairs = {}
+        for a in nodes:
+            for b in nodes:
+                if a < b and rng.random() < 0.35:
+                    score = round(rng.random(), 6)
+                    pairs[(a, b)] = score
+                    pairs[(b, a)] = score
+
+        clusters = agglomerative_cluster(
+            nodes, sparse_from_pairs(pairs), threshold=0.5, max_cluster_size=4
+        )
+
+        assert sorted(sorted(c) for c in clusters) == _reference_cluster(
+            nodes, pairs, 0.5, 4
+        )
+
+    def test_scales_to_thousands_of_issues(self):
+        rng = random.Random(0)
+        words = [f"word{i}" for i in range(300)]
+        issues = [
+            _issue(n, " ".join(rng.sample(words, 4)), [rng.choice(["ui", "api"])])
+            for n in range(2000)
+        ]
+
+        start = time.monotonic()
+        similarity = build_keyword_similarity(issues)
+        clusters = agglomerative_cluster(
+            [i["number"] for i in issues],
+            similarity,
+            threshold=0.3,
+            max_cluster_size=5,
+        )
+        elapsed = time.monotonic() - start
+
+        assert sum(len(c) for c in clusters) == 2000
+        assert elapsed < 10
+
+
+class TestSplitIntoGroups:
+    """Test splitting oversized pre-groups."""
+
+    def test_small_group_unchanged(self):
+        issues = [_issue(1, "a"), _issue(2, "b")]
+        assert split_into_groups(issues, 5) == [issues]
+
+    def test_groups_are_bounded_and_keep_related_issues_together(self):
+        issues = [_issue(n, "oauth login token") for n in range(3)] + [
+            _issue(n, f"unrelated thing {n}") for n in range(3, 12)
+        ]
+
+        groups = split_into_groups(issues, 4)
+
+        assert all(len(g) <= 4 for g in groups)
+        assert sorted(i["number"] for g in groups for i in g) == list(range(12))
+        oauth_group = next(g for g in groups if g[0]["number"] in (0, 1, 2))
+        assert {0, 1, 2} <= {i["number"] for i in oauth_group}
@@ -0,0 +1,211 @@
+"""
+Tests for Learning Tracker Aggregates
+=====================================
+
+Tests the running accuracy, pattern and decayed aggregates maintained by
+LearningTracker, and their use in confidence calibration.
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from confidence import ConfidenceScorer
+from learning import (
+    LearningTracker,
+    OutcomeType,
+    PredictionType,
+    ReviewOutcome,
+    _accuracy_from_outcomes,
+)
+from state_store import GitHubStateStore
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    yield LearningTracker(tmp_path)
+    GitHubStateStore.open(tmp_path).close()
+
+
+def _seed(tracker, count: int, seed: int = 0) -> list[ReviewOutcome]:
+    """Write outcomes spread over the last 60 days."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    outcomes = []
+    for i in range(count):
+        outcome = ReviewOutcome(
+            review_id=f"r{i}",
+            repo=rng.choice(["o/a", "o/b"]),
+            pr_number=i,
+            prediction=rng.choice(list(PredictionType)),
+            findings_count=0,
+            high_severity_count=0,
+            created_at=now - timedelta(hours=rng.uniform(0, 60 * 24)),
+            file_types=rng.sample(["py", "ts", "md"], 2),
+            categories=[rng.choice(["bug", "style"])],
+            change_size=rng.choice(["small", "large"]),
+        )
+        if rng.random() < 0.8:
+            outcome.actual_outcome = rng.choice(list(OutcomeType))
+            outcome.outcome_recorded_at = now
+            if rng.random() < 0.5:
+                outcome.time_to_outcome = timedelta(minutes=rng.randint(1, 600))
+        tracker._save_outcome(outcome)
+        outcomes.append(outcome)
+    return outcomes
+
+
+class TestRunningAccuracy:
+    """Accuracy served from buckets matches a full recomputation."""
+
+    def test_matches_recompute_with_filters(self, tracker):
+        outcomes = _seed(tracker, 300)
+        since = datetime.now(timezone.utc) - timedelta(days=7, hours=5)
+
+        for repo in (None, "o/a"):
+            for prediction in (None, PredictionType.REVIEW_APPROVE):
+                expected = _accuracy_from_outcomes(
+                    [
+                        o
+                        for o in outcomes
+                        if (repo is None or o.repo == repo)
+                        and (prediction is None or o.prediction == prediction)
+                        and o.created_at >= since
+                    ]
+                )
+                actual = tracker.get_accuracy(repo, since, prediction)
+                assert actual.total_predictions == expected.total_predictions
+                assert actual.correct_predictions == expected.correct_predictions
+                assert actual.pending_outcomes == expected.pending_outcomes
+                assert actual.by_type == expected.by_type
+                if expected.avg_time_to_merge:
+                    assert actual.avg_time_to_merge.total_seconds() == pytest.approx(
+                        expected.avg_time_to_merge.total_seconds()
+                    )
+
+        assert tracker.check_consistency() == []
+
+    def test_rerecorded_outcome_moves_counts(self, tracker):
+        tracker.record_prediction("o/r", "x", PredictionType.REVIEW_APPROVE)
+        tracker.record_outcome("o/r", "x", OutcomeType.MERGED)
+        tracker.record_outcome("o/r", "x", OutcomeType.OVERRIDDEN)
+
+        stats = tracker.get_accuracy("o/r")
+
+        assert stats.total_predictions == 1
+        assert stats.pending_outcomes == 0
+        assert stats.correct_predictions == 0
+        assert stats.incorrect_predictions == 1
+        assert tracker.check_consistency() == []
+
+    def test_dashboard_uses_aggregates(self, tracker):
+        tracker.record_prediction("o/r", "a", PredictionType.TRIAGE_SPAM)
+        tracker.record_prediction("o/r", "b", PredictionType.TRIAGE_SPAM)
+        tracker.record_outcome("o/r", "a", OutcomeType.CLOSED)
+
+        data = tracker.get_dashboard_data("o/r")
+
+        assert data["pending_count"] == 1
+        assert data["last_week"]["total_predictions"] == 2
+        assert data["all_time"]["accuracy"] == 1.0
+
+
+class TestPatterns:
+    """Pattern detection reads maintained counts."""
+
+    def test_patterns_match_recompute(self, tracker):
+        outcomes = _seed(tracker, 200, seed=3)
+
+        patterns = {p.pattern_id: p for p in tracker.detect_patterns(5)}
+
+        resolved = [o for o in outcomes if o.was_correct is not None]
+        py = [o for o in resolved if "py" in o.file_types]
+        assert patterns["file_type_py"].sample_size == len(py)
+        assert patterns["file_type_py"].accuracy == pytest.approx(
+            sum(o.was_correct for o in py) / len(py)
+        )
+        assert patterns["change_size_small"].pattern_type == "change_size_accuracy"
+
+
+class TestConsistency:
+    """Offline consistency check and rebuild."""
+
+    def test_detects_and_repairs_drift(self, tracker):
+        _seed(tracker, 50)
+        tracker._store.add_outcome_bucket(
+            "o/a", "review_approve", "merged", 0, {"count": 5}
+        )
+
+        assert tracker.check_consistency(repair=True)
+        assert tracker.check_consistency() == []
+
+    def test_existing_rows_are_aggregated_on_upgrade(self, tmp_path):
+        store = GitHubStateStore.open(tmp_path)
+        outcome = ReviewOutcome(
+            review_id="old",
+            repo="o/r",
+            pr_number=1,
+            prediction=PredictionType.REVIEW_APPROVE,
+            findings_count=0,
+            high_severity_count=0,
+            actual_outcome=OutcomeType.MERGED,
+        )
+        store.put_outcome(outcome.to_dict())
+
+        stats = LearningTracker(tmp_path).get_accuracy()
+
+        assert stats.total_predictions == 1
+        assert stats.correct_predictions == 1
+        store.close()
+
+
+class TestDecayedSummary:
+    """Decayed accuracy and confidence calibration."""
+
+    def test_recent_outcomes_dominate(self, tracker):
+        now = datetime.now(timezone.utc)
+        for i in range(10):
+            old = ReviewOutcome(
+                review_id=f"old{i}",
+                repo="o/r",
+                pr_number=i,
+                prediction=PredictionType.REVIEW_APPROVE,
+                findings_count=0,
+                high_severity_count=0,
+                created_at=now - timedelta(days=120),
+                actual_outcome=OutcomeType.MERGED,
+                outcome_recorded_at=now - timedelta(days=120),
+            )
+            tracker._save_outcome(old)
+        for i in range(10):
+            tracker.record_prediction("o/r", f"new{i}", PredictionType.REVIEW_APPROVE)
+            tracker.record_outcome("o/r", f"new{i}", OutcomeType.OVERRIDDEN)
+
+        summary = tracker.get_accuracy_summary()
+
+        assert summary.total_predictions == 20
+        assert summary.accuracy == pytest.approx(0.5)
+        assert summary.decayed_accuracy < 0.01
+
+    def test_confidence_reads_summary(self, tracker):
+        for i in range(12):
+            tracker.record_prediction("o/r", f"r{i}", PredictionType.REVIEW_APPROVE)
+            tracker.record_outcome("o/r", f"r{i}", OutcomeType.MERGED)
+        tracker.get_accuracy = None  # Would fail if called
+
+        scorer = ConfidenceScorer(learning_tracker=tracker)
+        scored = scorer.score_finding(
+            {"id": "f1", "severity": "high", "category": "bug", "description": "x"}
+        )
+
+        assert scored.factors.historical_sample_size == 12
+        assert scored.factors.historical_accuracy == pytest.approx(1.0)
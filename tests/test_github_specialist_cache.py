@@ -0,0 +1,122 @@
+"""
+Tests for Specialist Findings Cache
+===================================
+
+Tests per-file caching of specialist findings keyed by blob SHA, prompt
+version and model, and remapping of cached findings onto current paths.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from models import PRReviewFinding, ReviewCategory, ReviewSeverity
+from state_store import GitHubStateStore
+
+# Load by path: "services" may already name the backend services package
+_spec = importlib.util.spec_from_file_location(
+    "specialist_cache", _github_dir / "services" / "specialist_cache.py"
+)
+specialist_cache = importlib.util.module_from_spec(_spec)
+sys.modules["specialist_cache"] = specialist_cache
+_spec.loader.exec_module(specialist_cache)
+SpecialistCache = specialist_cache.SpecialistCache
+
+
+def _finding(file: str, line: int, title: str = "Unchecked input", **kwargs):
+    return PRReviewFinding(
+        id=kwargs.pop("id", "X"),
+        severity=ReviewSeverity.HIGH,
+        category=ReviewCategory.SECURITY,
+        title=title,
+        description="d",
+        file=file,
+        line=line,
+        source_agents=["security"],
+        **kwargs,
+    )
+
+
+class TestSpecialistCache:
+    """Store and lookup of per-file specialist findings."""
+
+    def test_round_trip_and_clean_files(self, tmp_path):
+        cache = SpecialistCache(tmp_path, "sonnet")
+        blobs = {"a.py": "blob-a", "b.py": "blob-b", "c.py": "blob-c"}
+        findings = [_finding("a.py", 10), _finding("a.py", 20, "Weak hash")]
+
+        stored = cache.store_results(
+            "security", "v1", {"a.py": "modified", "b.py": "added"}, findings, blobs
+        )
+        lookup = cache.lookup("security", "v1", ["a.py", "b.py", "c.py"], blobs)
+
+        assert stored == 2
+        assert lookup.cached_paths == ["a.py", "b.py"]
+        assert lookup.missing_paths == ["c.py"]
+        assert sorted(f.line for f in lookup.cached_findings) == [10, 20]
+
+    def test_key_includes_prompt_version_model_and_specialist(self, tmp_path):
+        cache = SpecialistCache(tmp_path, "sonnet")
+        blobs = {"a.py": "blob-a"}
+        cache.store_results("security", "v1", {"a.py": "modified"}, [], blobs)
+
+        assert cache.lookup("security", "v2", ["a.py"], blobs).missing_paths
+        assert cache.lookup("logic", "v1", ["a.py"], blobs).missing_paths
+        other_model = SpecialistCache(tmp_path, "opus")
+        assert other_model.lookup("security", "v1", ["a.py"], blobs).missing_paths
+        assert not cache.lookup("security", "v1", ["a.py"], blobs).missing_paths
+
+    def test_findings_follow_content_to_new_path(self, tmp_path):
+        cache = SpecialistCache(tmp_path, "sonnet")
+        cache.store_results(
+            "security",
+            "v1",
+            {"old.py": "modified"},
+            [_finding("old.py", 42, end_line=44)],
+            {"old.py": "blob-1"},
+        )
+
+        lookup = cache.lookup("security", "v1", ["new.py"], {"new.py": "blob-1"})
+
+        (finding,) = lookup.cached_findings
+        assert finding.file == "new.py"
+        assert (finding.line, finding.end_line) == (42, 44)
+        assert (
+            finding.id == specialist_cache.remap_finding(finding.to_dict(), "new.py").id
+        )
+        assert finding.source_agents == ["security"]
+
+    def test_removed_files_and_impact_findings_are_not_cached(self, tmp_path):
+        cache = SpecialistCache(tmp_path, "sonnet")
+        blobs = {"a.py": "blob-a", "gone.py": "blob-g", "other.py": "blob-o"}
+        findings = [
+            _finding("a.py", 5),
+            _finding("other.py", 7, is_impact_finding=True),
+        ]
+
+        cache.store_results(
+            "security",
+            "v1",
+            {"a.py": "modified", "gone.py": "removed"},
+            findings,
+            blobs,
+        )
+
+        lookup = cache.lookup("security", "v1", ["a.py", "gone.py", "other.py"], blobs)
+        assert lookup.cached_paths == ["a.py"]
+        assert [f.file for f in lookup.cached_findings] == ["a.py"]
+
+    def test_stale_entries_are_pruned(self, tmp_path):
+        cache = SpecialistCache(tmp_path, "sonnet")
+        store = GitHubStateStore.open(tmp_path)
+        store.put_specialist_findings("security", "v1", "sonnet", {"old": []}, now=0)
+
+        cache.store_results("security", "v1", {"a.py": "added"}, [], {"a.py": "new"})
+
+        assert store.get_specialist_findings("security", "v1", "sonnet", ["old"]) == {}
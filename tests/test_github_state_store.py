@@ -0,0 +1,238 @@
+"""
+Tests for GitHub Runner State Store
+===================================
+
+Tests the SQLite state store behind LifecycleManager, TrustManager and
+LearningTracker, including migration from the legacy JSON files.
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from learning import LearningTracker, OutcomeType, PredictionType
+from lifecycle import IssueLifecycle, IssueLifecycleState, LifecycleManager
+from state_store import GitHubStateStore
+from trust import TrustLevel, TrustManager, TrustState
+
+
+@pytest.fixture
+def state_dir(tmp_path):
+    yield tmp_path
+    GitHubStateStore.open(tmp_path).close()
+
+
+class TestStateStore:
+    """Test the store itself."""
+
+    def test_uses_wal_and_shares_instance(self, state_dir):
+        store = GitHubStateStore.open(state_dir)
+
+        assert GitHubStateStore.open(state_dir) is store
+        mode = store._fetchall("PRAGMA journal_mode")[0][0]
+        assert mode == "wal"
+
+    def test_state_queries_use_indexes(self, state_dir):
+        store = GitHubStateStore.open(state_dir)
+        plan = store._fetchall(
+            "EXPLAIN QUERY PLAN SELECT data FROM lifecycle "
+            "WHERE repo = ? AND state = ?",
+            ("o/r", "new"),
+        )
+        assert "idx_lifecycle_state" in " ".join(str(row) for row in plan)
+
+    def test_transaction_rolls_back_on_error(self, state_dir):
+        store = GitHubStateStore.open(state_dir)
+        lifecycle = IssueLifecycle(issue_number=1, repo="o/r")
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.put_lifecycle(lifecycle.to_dict())
+                raise RuntimeError("boom")
+
+        assert store.get_lifecycle("o/r", 1) is None
+
+    def test_migration_runs_once(self, state_dir):
+        store = GitHubStateStore.open(state_dir)
+        calls = []
+
+        assert store.run_migration("demo", lambda: calls.append(1) or 1)
+        assert not store.run_migration("demo", lambda: calls.append(1) or 1)
+        assert calls == [1]
+
+
+class TestLifecycleManager:
+    """Test lifecycle persistence through the store."""
+
+    def test_state_queries_and_summary(self, state_dir):
+        manager = LifecycleManager(state_dir)
+        for number in range(1, 6):
+            manager.get_or_create("o/r", number)
+        for number in (2, 4):
+            manager.transition("o/r", number, IssueLifecycleState.TRIAGING, "bot")
+        manager.get_or_create("o/other", 1)
+
+        triaging = manager.get_all_in_state("o/r", IssueLifecycleState.TRIAGING)
+
+        assert [lc.issue_number for lc in triaging] == [2, 4]
+        assert manager.get_summary("o/r") == {"new": 3, "triaging": 2}
+        assert manager.get_summary("o/other") == {"new": 1}
+
+    def test_transition_and_lock_persist(self, state_dir):
+        manager = LifecycleManager(state_dir)
+        manager.transition("o/r", 7, IssueLifecycleState.TRIAGING, "bot")
+        assert manager.acquire_lock("o/r", 7, "autofix")
+        assert not manager.acquire_lock("o/r", 7, "review")
+
+        reloaded = LifecycleManager(state_dir).get("o/r", 7)
+
+        assert reloaded.current_state == IssueLifecycleState.TRIAGING
+        assert reloaded.locked_by == "autofix"
+        assert len(reloaded.transitions) == 1
+
+    def test_invalid_transition_is_not_saved(self, state_dir):
+        manager = LifecycleManager(state_dir)
+        result = manager.transition("o/r", 1, IssueLifecycleState.MERGED, "bot")
+
+        assert result.has_conflict
+        assert manager.get("o/r", 1).current_state == IssueLifecycleState.NEW
+
+    def test_migrates_legacy_json_files(self, state_dir):
+        legacy_dir = state_dir / "lifecycle"
+        legacy_dir.mkdir()
+        for number, state in ((1, "triaged"), (2, "building")):
+            lifecycle = IssueLifecycle(
+                issue_number=number,
+                repo="o/r",
+                current_state=IssueLifecycleState(state),
+            )
+            (legacy_dir / f"o_r_{number}.json").write_text(
+                json.dumps(lifecycle.to_dict())
+            )
+        (legacy_dir / "o_r_3.json").write_text("{not json")
+
+        manager = LifecycleManager(state_dir)
+
+        assert manager.get_summary("o/r") == {"triaged": 1, "building": 1}
+        assert manager.get("o/r", 2).current_state == IssueLifecycleState.BUILDING
+
+
+class TestTrustManager:
+    """Test trust persistence through the store."""
+
+    def test_state_round_trips(self, state_dir):
+        trust = TrustManager(state_dir)
+        trust.record_action("o/r", "review", correct=True)
+        trust.set_manual_level("o/r", TrustLevel.L2_CLOSE)
+
+        state = TrustManager(state_dir).get_state("o/r")
+
+        assert state.metrics.total_actions == 1
+        assert state.effective_level == TrustLevel.L2_CLOSE
+
+    def test_summary_aggregates_in_sql(self, state_dir):
+        trust = TrustManager(state_dir)
+        trust.record_action("o/a", "review", correct=True)
+        trust.record_action("o/a", "review", correct=False)
+        trust.record_action("o/b", "label", correct=True)
+        trust.set_manual_level("o/b", TrustLevel.L1_LABEL)
+
+        summary = trust.get_summary()
+
+        assert summary["total_repos"] == 2
+        assert summary["by_level"] == {0: 1, 1: 1}
+        assert summary["total_actions"] == 3
+        assert summary["overall_accuracy"] == pytest.approx(2 / 3)
+        assert {s.repo for s in trust.get_all_states()} == {"o/a", "o/b"}
+
+    def test_migrates_legacy_json_files(self, state_dir):
+        legacy_dir = state_dir / "trust"
+        legacy_dir.mkdir()
+        state = TrustState(repo="o/r", current_level=TrustLevel.L3_MERGE_TRIVIAL)
+        (legacy_dir / "o_r.json").write_text(json.dumps(state.to_dict()))
+
+        trust = TrustManager(state_dir)
+
+        assert trust.get_trust_level("o/r") == TrustLevel.L3_MERGE_TRIVIAL
+
+    def test_database_is_private(self, state_dir):
+        TrustManager(state_dir)
+        mode = (state_dir / "state.db").stat().st_mode & 0o777
+        assert mode == 0o600
+
+
+class TestLearningTracker:
+    """Test outcome persistence through the store."""
+
+    def test_outcomes_are_row_writes(self, state_dir):
+        tracker = LearningTracker(state_dir)
+        for i in range(3):
+            tracker.record_prediction(
+                "o/r", f"r{i}", PredictionType.REVIEW_APPROVE, pr_number=i
+            )
+        tracker.record_outcome("o/r", "r1", OutcomeType.MERGED)
+
+        conn = sqlite3.connect(state_dir / "state.db")
+        rows = conn.execute(
+            "SELECT review_id, actual_outcome FROM outcomes ORDER BY review_id"
+        ).fetchall()
+        conn.close()
+
+        assert rows == [("r0", None), ("r1", "merged"), ("r2", None)]
+
+    def test_queries(self, state_dir):
+        tracker = LearningTracker(state_dir)
+        tracker.record_prediction("o/a", "a1", PredictionType.REVIEW_APPROVE)
+        tracker.record_prediction("o/a", "a2", PredictionType.TRIAGE_SPAM)
+        tracker.record_prediction("o/b", "b1", PredictionType.REVIEW_APPROVE)
+        tracker.record_outcome("o/a", "a1", OutcomeType.MERGED)
+        tracker.record_outcome("o/b", "b1", OutcomeType.CLOSED)
+
+        fresh = LearningTracker(state_dir)
+
+        assert [o.review_id for o in fresh.get_pending_outcomes()] == ["a2"]
+        assert [o.review_id for o in fresh.get_recent_outcomes("o/a")] == [
+            "a2",
+            "a1",
+        ]
+        stats = fresh.get_accuracy(prediction_type=PredictionType.REVIEW_APPROVE)
+        assert stats.total_predictions == 2
+        assert stats.correct_predictions == 1
+        assert stats.incorrect_predictions == 1
+        future = datetime.now(timezone.utc) + timedelta(minutes=1)
+        assert fresh.get_accuracy(since=future).total_predictions == 0
+        assert fresh.record_outcome("o/a", "missing", OutcomeType.MERGED) is None
+
+    def test_migrates_legacy_json_files(self, state_dir):
+        legacy_dir = state_dir / "learning"
+        legacy_dir.mkdir()
+        tracker_data = {
+            "repo": "o/r",
+            "outcomes": [
+                {
+                    "review_id": "legacy-1",
+                    "repo": "o/r",
+                    "pr_number": 3,
+                    "prediction": "review_approve",
+                    "created_at": "2024-01-01T00:00:00+00:00",
+                    "actual_outcome": "merged",
+                }
+            ],
+        }
+        (legacy_dir / "o_r_outcomes.json").write_text(json.dumps(tracker_data))
+
+        tracker = LearningTracker(state_dir)
+
+        stats = tracker.get_accuracy("o/r")
+        assert stats.total_predictions == 1
+        assert stats.correct_predictions == 1
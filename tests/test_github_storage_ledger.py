@@ -0,0 +1,303 @@
+"""
+Tests for Storage Ledger
+========================
+
+Tests incremental storage accounting and the ledger-driven metrics,
+cleanup and purge paths.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from cleanup import DataCleaner, RetentionConfig
+from file_lock import atomic_write, locked_json_write, remove_file
+from learning import LearningTracker, OutcomeType, PredictionType
+from purge_strategy import PurgeStrategy
+from state_store import GitHubStateStore
+from storage_ledger import StorageLedger
+from storage_metrics import StorageMetricsCalculator
+
+
+@pytest.fixture
+def state_dir(tmp_path):
+    yield tmp_path
+    GitHubStateStore.open(tmp_path).close()
+
+
+def _record(days_old: float, **extra) -> dict:
+    updated = datetime.now(timezone.utc) - timedelta(days=days_old)
+    data = {"repo": "o/r", "status": "completed", "updated_at": updated.isoformat()}
+    data.update(extra)
+    return data
+
+
+def _write(path: Path, data: dict) -> None:
+    with atomic_write(path) as f:
+        json.dump(data, f)
+
+
+def _walk_bytes(root: Path, subdir: str) -> int:
+    return sum(p.stat().st_size for p in (root / subdir).rglob("*") if p.is_file())
+
+
+@pytest.fixture
+def no_walk(state_dir, monkeypatch):
+    """Build the ledger, then fail if anything walks the state directory."""
+    StorageLedger.open(state_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("tree walk")
+
+    monkeypatch.setattr(Path, "rglob", fail)
+    monkeypatch.setattr(os, "walk", fail)
+
+
+class TestLedgerUpdates:
+    """Writes and deletes through file_lock.py keep the ledger current."""
+
+    def test_totals_match_walk_after_writes(self, state_dir):
+        (state_dir / "pr").mkdir()
+        (state_dir / "issues").mkdir()
+        _write(state_dir / "pr" / "review_1.json", _record(1))
+        StorageLedger.open(state_dir)
+
+        _write(state_dir / "pr" / "review_2.json", _record(2, notes="x" * 500))
+        _write(state_dir / "pr" / "review_1.json", _record(1, notes="y" * 50))
+        _write(state_dir / "issues" / "triage_3.json", _record(3))
+        remove_file(state_dir / "pr" / "review_2.json")
+
+        totals = StorageLedger.open(state_dir).totals()
+
+        assert totals["pr_reviews"]["bytes"] == _walk_bytes(state_dir, "pr")
+        assert totals["pr_reviews"]["files"] == 1
+        assert totals["issues"]["bytes"] == _walk_bytes(state_dir, "issues")
+        assert totals["issues"]["records"] == 1
+
+    async def test_locked_json_write_records_repo(self, state_dir):
+        ledger = StorageLedger.open(state_dir)
+        (state_dir / "autofix").mkdir()
+
+        await locked_json_write(
+            state_dir / "autofix" / "autofix_5.json", _record(0, repo="o/x")
+        )
+
+        usage = ledger.usage_by_repo()
+        assert usage["o/x"]["autofix"]["records"] == 1
+
+    def test_reconcile_repairs_drift(self, state_dir):
+        ledger = StorageLedger.open(state_dir)
+        (state_dir / "pr").mkdir()
+        # Written behind the ledger's back
+        (state_dir / "pr" / "review_9.json").write_text(json.dumps(_record(1)))
+        assert "pr_reviews" not in ledger.totals()
+
+        assert ledger.reconcile() == 1
+        assert ledger.totals()["pr_reviews"]["bytes"] == _walk_bytes(state_dir, "pr")
+
+    def test_writes_outside_a_state_dir_are_ignored(self, tmp_path):
+        _write(tmp_path / "plain.json", {"a": 1})
+        assert not (tmp_path / "state.db").exists()
+
+    def test_unrelated_state_db_is_left_untouched(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "state.db")
+        conn.execute("CREATE TABLE notes (body TEXT)")
+        conn.commit()
+        conn.close()
+
+        (tmp_path / "sub").mkdir()
+        _write(tmp_path / "sub" / "plain.json", {"a": 1})
+
+        conn = sqlite3.connect(tmp_path / "state.db")
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+            assert tables == {"notes"}
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+        finally:
+            conn.close()
+
+
+class TestLedgerQueries:
+    """Metrics and candidate selection read the ledger."""
+
+    def test_metrics_without_walking(self, state_dir, no_walk):
+        (state_dir / "pr").mkdir()
+        (state_dir / "archive").mkdir()
+        (state_dir / "audit").mkdir()
+        _write(state_dir / "pr" / "review_1.json", _record(1))
+        _write(state_dir / "archive" / "review_0.json", _record(200))
+        # Audit logs are appended to directly, not through file_lock.py
+        (state_dir / "audit" / "audit_2024-01-01.log").write_text("entry\n" * 10)
+
+        metrics = StorageMetricsCalculator(state_dir).calculate()
+
+        assert (
+            metrics.pr_reviews_bytes
+            == (state_dir / "pr" / "review_1.json").stat().st_size
+        )
+        assert metrics.audit_logs_bytes == 60
+        assert metrics.record_count == 1
+        assert metrics.archive_count == 1
+        assert metrics.age_histogram["<1d"]["files"] == 3
+
+    def test_age_histogram_uses_mtime(self, state_dir):
+        (state_dir / "pr").mkdir()
+        old = state_dir / "pr" / "review_old.json"
+        old.write_text("{}")
+        week_ago = time.time() - 10 * 86400
+        os.utime(old, (week_ago, week_ago))
+        ledger = StorageLedger.open(state_dir)
+
+        histogram = ledger.age_histogram("pr_reviews")
+
+        assert histogram["7-30d"]["files"] == 1
+        assert histogram["<1d"]["files"] == 0
+
+    def test_find_matches_names_not_paths(self, state_dir):
+        (state_dir / "pr" / "nested").mkdir(parents=True)
+        StorageLedger.open(state_dir)
+        _write(state_dir / "pr" / "o_r_12.json", {})
+        _write(state_dir / "pr" / "nested" / "o_r_12_x.json", {})
+        _write(state_dir / "pr" / "o_r_3.json", {})
+        ledger = StorageLedger.open(state_dir)
+
+        names = sorted(p.name for p in ledger.find("*12*.json"))
+        flat = [p.name for p in ledger.find("o_r*.json", "pr", recursive=False)]
+
+        assert names == ["o_r_12.json", "o_r_12_x.json"]
+        assert sorted(flat) == ["o_r_12.json", "o_r_3.json"]
+
+
+class TestCleanupAndPurge:
+    """Cleanup and purge select files from the ledger."""
+
+    async def test_cleanup_only_opens_due_records(self, state_dir, no_walk):
+        (state_dir / "pr").mkdir()
+        _write(state_dir / "pr" / "old.json", _record(120))
+        _write(state_dir / "pr" / "new.json", _record(1))
+        cleaner = DataCleaner(state_dir, RetentionConfig(archive_enabled=False))
+
+        result = await cleaner.run_cleanup()
+
+        assert result.deleted_count == 1
+        assert not (state_dir / "pr" / "old.json").exists()
+        assert (state_dir / "pr" / "new.json").exists()
+        assert (
+            cleaner.get_storage_metrics().pr_reviews_bytes
+            == (state_dir / "pr" / "new.json").stat().st_size
+        )
+
+    async def test_cleanup_archives_through_ledger(self, state_dir):
+        (state_dir / "issues").mkdir()
+        StorageLedger.open(state_dir)
+        _write(state_dir / "issues" / "old.json", _record(100))
+
+        await DataCleaner(state_dir).run_cleanup()
+
+        totals = StorageLedger.open(state_dir).totals()
+        assert "issues" not in totals or totals["issues"]["files"] == 0
+        assert totals["archive"]["files"] == 1
+
+    async def test_cleanup_finds_files_missing_from_ledger(self, state_dir):
+        (state_dir / "pr").mkdir()
+        StorageLedger.open(state_dir)
+        # Written without file_lock.py, e.g. by an older version
+        (state_dir / "pr" / "legacy.json").write_text(json.dumps(_record(120)))
+
+        result = await DataCleaner(
+            state_dir, RetentionConfig(archive_enabled=False)
+        ).run_cleanup()
+
+        assert result.deleted_count == 1
+        assert not (state_dir / "pr" / "legacy.json").exists()
+
+    async def test_purge_finds_files_missing_from_ledger(self, state_dir):
+        (state_dir / "pr").mkdir()
+        (state_dir / "archive").mkdir()
+        (state_dir / "repos" / "o_r").mkdir(parents=True)
+        _write(state_dir / "pr" / "o_r_pr-7.json", _record(0, pr_number=7))
+        _write(state_dir / "pr" / "o_r_pr-8.json", _record(0, pr_number=8))
+        _write(state_dir / "repos" / "o_r" / "cache.json", {"x": 1})
+        StorageLedger.open(state_dir)
+        # Written without file_lock.py, so the ledger has never seen them
+        untracked = [
+            state_dir / "pr" / "o_r_legacy_7_.json",
+            state_dir / "archive" / "pr-7.json",
+            state_dir / "pr" / "o_r_old.json",
+        ]
+        untracked[0].write_text(json.dumps(_record(0, pr_number=7)))
+        untracked[1].write_text(json.dumps(_record(0, pr_number=7)))
+        untracked[2].write_text(json.dumps(_record(0, pr_number=3)))
+        strategy = PurgeStrategy(state_dir)
+
+        result = await strategy.purge_by_criteria("pr", "pr_number", 7)
+        assert result.deleted_count == 3
+        assert not any(path.exists() for path in untracked[:2])
+        assert (state_dir / "pr" / "o_r_pr-8.json").exists()
+
+        result = await strategy.purge_repository("o/r")
+        assert result.deleted_count == 3
+        assert not untracked[2].exists()
+        assert (
+            StorageLedger.open(state_dir).totals().get("pr_reviews", {}).get("files", 0)
+            == 0
+        )
+        assert (
+            StorageLedger.open(state_dir).directory_bytes(state_dir / "repos" / "o_r")
+            == 0
+        )
+
+    async def test_purge_repository_deletes_state_rows(self, state_dir):
+        tracker = LearningTracker(state_dir)
+        tracker.record_prediction(
+            "o/r", "rev1", PredictionType.REVIEW_APPROVE, categories=["purged"]
+        )
+        tracker.record_prediction(
+            "o/other", "rev2", PredictionType.REVIEW_APPROVE, categories=["kept"]
+        )
+        tracker.record_outcome("o/r", "rev1", OutcomeType.MERGED)
+        tracker.record_outcome("o/other", "rev2", OutcomeType.MERGED)
+        store = GitHubStateStore.open(state_dir)
+        store.put_trust({"repo": "o/r"}, effective_level=0)
+        store.put_lifecycle({"repo": "o/r", "issue_number": 3})
+
+        result = await PurgeStrategy(state_dir).purge_repository("o/r")
+
+        assert result.deleted_rows >= 3
+        assert store.get_outcome("rev1") is None
+        assert store.query_outcomes(repo="o/r") == []
+        assert store.sum_outcome_buckets(repo="o/r") == []
+        assert store.get_trust("o/r") is None
+        assert store.get_lifecycle("o/r", 3) is None
+        # Other repos keep their outcomes and rebuilt aggregates
+        assert store.get_outcome("rev2") is not None
+        assert store.sum_outcome_buckets(repo="o/other") != []
+        categories = [
+            row[1] for row in store.outcome_patterns() if row[0] == "category"
+        ]
+        assert categories == ["kept"]
+
+
+class TestStateStoreOpen:
+    def test_reopen_closes_replaced_store(self, state_dir):
+        store = GitHubStateStore.open(state_dir)
+        store.db_path.unlink()
+
+        reopened = GitHubStateStore.open(state_dir)
+
+        assert reopened is not store
+        with pytest.raises(sqlite3.ProgrammingError):
+            store._conn.execute("SELECT 1")
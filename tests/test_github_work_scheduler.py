@@ -0,0 +1,276 @@
+"""
+Tests for Multi-Repository Work Scheduler
+=========================================
+
+Tests weighted fair queuing, session caps, per-repo budget shares and
+starvation protection across repos.
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the backend runners/github directory to path
+_backend_dir = Path(__file__).parent.parent / "apps" / "backend"
+_github_dir = _backend_dir / "runners" / "github"
+if str(_github_dir) not in sys.path:
+    sys.path.insert(0, str(_github_dir))
+
+from multi_repo import MultiRepoConfig, RepoConfig
+from rate_limiter import CostTracker, TokenBucket
+from work_scheduler import WorkItem, WorkKind, WorkScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _noop(item: WorkItem) -> None:
+    return None
+
+
+def _scheduler(tmp_path, repos, **kwargs) -> WorkScheduler:
+    config = MultiRepoConfig(repos, base_dir=tmp_path / "repos")
+    kwargs.setdefault("cost_tracker", CostTracker(cost_limit=1000.0))
+    kwargs.setdefault("max_sessions", 1)
+    return WorkScheduler(config, kwargs.pop("run_item", _noop), **kwargs)
+
+
+def _drain(scheduler: WorkScheduler, count: int) -> list[WorkItem]:
+    """Dispatch and immediately complete up to count items."""
+    order = []
+    for _ in range(count):
+        item = scheduler.next_item()
+        if item is None:
+            break
+        order.append(item)
+        scheduler.complete(item)
+    return order
+
+
+class TestFairness:
+    """Weighted fair queuing across repos."""
+
+    def test_busy_repo_does_not_starve_others(self, tmp_path):
+        repos = [RepoConfig(repo=f"o/r{i}") for i in range(25)]
+        scheduler = _scheduler(tmp_path, repos)
+        for n in range(200):
+            scheduler.submit(WorkItem("o/r0", WorkKind.PR_REVIEW, n))
+        for i in range(1, 25):
+            scheduler.submit(WorkItem(f"o/r{i}", WorkKind.PR_REVIEW, 1))
+
+        first = _drain(scheduler, 25)
+
+        assert {item.repo for item in first} == {f"o/r{i}" for i in range(25)}
+
+    def test_weights_split_dispatch(self, tmp_path):
+        repos = [
+            RepoConfig(repo="o/big", schedule_weight=3.0),
+            RepoConfig(repo="o/small"),
+        ]
+        scheduler = _scheduler(tmp_path, repos)
+        for n in range(40):
+            scheduler.submit(WorkItem("o/big", WorkKind.PR_REVIEW, n))
+            scheduler.submit(WorkItem("o/small", WorkKind.PR_REVIEW, n))
+
+        counts = Counter(item.repo for item in _drain(scheduler, 40))
+
+        assert counts == {"o/big": 30, "o/small": 10}
+
+    def test_idle_repo_cannot_bank_credit(self, tmp_path):
+        scheduler = _scheduler(
+            tmp_path, [RepoConfig(repo="o/a"), RepoConfig(repo="o/b")]
+        )
+        for n in range(10):
+            scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, n))
+        _drain(scheduler, 8)
+
+        for n in range(5):
+            scheduler.submit(WorkItem("o/b", WorkKind.PR_REVIEW, n))
+        repos = [item.repo for item in _drain(scheduler, 4)]
+
+        # b alternates with a rather than running its backlog first
+        assert repos.count("o/a") == 2
+
+    def test_respects_toggles_and_duplicates(self, tmp_path):
+        scheduler = _scheduler(
+            tmp_path,
+            [
+                RepoConfig(repo="o/a", triage_enabled=False),
+                RepoConfig(repo="o/off", enabled=False),
+            ],
+        )
+
+        assert not scheduler.submit(WorkItem("o/a", WorkKind.TRIAGE, 1))
+        assert not scheduler.submit(WorkItem("o/off", WorkKind.PR_REVIEW, 1))
+        assert not scheduler.submit(WorkItem("o/unknown", WorkKind.PR_REVIEW, 1))
+        assert scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, 1))
+        assert not scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, 1))
+
+
+class TestBudgetAndStarvation:
+    """Budget shares, borrowing and aging."""
+
+    def test_over_share_repo_yields_then_borrows(self, tmp_path):
+        tracker = CostTracker(cost_limit=4.0)
+        scheduler = _scheduler(
+            tmp_path,
+            [RepoConfig(repo="o/a"), RepoConfig(repo="o/b")],
+            cost_tracker=tracker,
+        )
+        scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, 1))
+        first = scheduler.next_item()
+        scheduler.complete(first, cost=2.5)  # a is now over its $2 share
+        tracker.total_cost = 2.5
+
+        scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, 2))
+        scheduler.submit(WorkItem("o/b", WorkKind.PR_REVIEW, 1))
+        nxt = scheduler.next_item()
+        assert nxt.repo == "o/b"
+        scheduler.complete(nxt, cost=0.5)
+        tracker.total_cost = 3.0
+
+        # No in-share work left: a may borrow what the global budget covers
+        assert scheduler.next_item().number == 2
+
+    def test_spend_is_charged_and_resets_each_period(self, tmp_path):
+        clock = FakeClock()
+        tracker = CostTracker(cost_limit=4.0)
+        scheduler = _scheduler(
+            tmp_path,
+            [RepoConfig(repo="o/a"), RepoConfig(repo="o/b")],
+            cost_tracker=tracker,
+            budget_period_seconds=3600,
+            clock=clock,
+        )
+        scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, 1))
+        scheduler.complete(scheduler.next_item(), cost=3.5)
+        assert tracker.total_cost == pytest.approx(3.5)
+
+        scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, 2))
+        assert scheduler.next_item() is None  # Global budget exhausted
+        clock.now += 600
+        assert scheduler.budget_wait() == pytest.approx(3000)
+
+        clock.now += 3000
+        item = scheduler.next_item()
+        assert item.number == 2
+        assert tracker.total_cost == 0.0
+        scheduler.complete(item, cost=1.0)
+        # o/a is back within its $2 share in the new period
+        assert scheduler.stats()["repos"]["o_a"]["spent"] == pytest.approx(1.0)
+        assert scheduler.budget_wait() is None
+
+    def test_global_budget_blocks_dispatch(self, tmp_path):
+        tracker = CostTracker(cost_limit=1.0)
+        tracker.total_cost = 0.9
+        scheduler = _scheduler(tmp_path, [RepoConfig(repo="o/a")], cost_tracker=tracker)
+        scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, 1))
+        scheduler.submit(WorkItem("o/a", WorkKind.TRIAGE, 2))
+
+        assert scheduler.next_item().kind == WorkKind.TRIAGE
+        assert scheduler.next_item() is None
+
+    def test_low_priority_work_ages_forward(self, tmp_path):
+        clock = FakeClock()
+        scheduler = _scheduler(
+            tmp_path,
+            [RepoConfig(repo="o/a")],
+            clock=clock,
+            aging_seconds=60,
+        )
+        scheduler.submit(WorkItem("o/a", WorkKind.TRIAGE, 1))
+        clock.now += 600
+        for n in range(5):
+            scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, n))
+
+        assert scheduler.next_item().kind == WorkKind.TRIAGE
+
+    def test_overdue_items_jump_the_queue(self, tmp_path):
+        clock = FakeClock()
+        scheduler = _scheduler(
+            tmp_path,
+            [RepoConfig(repo="o/a", schedule_weight=100.0), RepoConfig(repo="o/b")],
+            clock=clock,
+            max_wait_seconds=300,
+        )
+        scheduler.submit(WorkItem("o/b", WorkKind.AUTOFIX, 1))
+        _drain(scheduler, 1)
+        scheduler.submit(WorkItem("o/b", WorkKind.AUTOFIX, 2))
+        for n in range(5):
+            scheduler.submit(WorkItem("o/a", WorkKind.PR_REVIEW, n))
+        assert scheduler.next_item().repo == "o/a"
+
+        clock.now += 301
+        assert scheduler.next_item() is None  # a capped at one session
+        scheduler.max_sessions_per_repo = None
+        scheduler.max_sessions = 4
+        assert scheduler.next_item().number == 2
+
+
+class TestRun:
+    """End-to-end dispatch with a session cap."""
+
+    async def test_run_caps_sessions_and_charges_costs(self, tmp_path):
+        active = 0
+        peak = 0
+
+        async def work(item: WorkItem) -> float:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if item.number == 3:
+                raise RuntimeError("boom")
+            return 0.25
+
+        repos = [RepoConfig(repo=f"o/r{i}") for i in range(5)]
+        scheduler = _scheduler(tmp_path, repos, run_item=work, max_sessions=3)
+
+        for repo in repos:
+            for n in range(4):
+                assert scheduler.submit(WorkItem(repo.repo, WorkKind.PR_REVIEW, n))
+        await asyncio.wait_for(scheduler.run(), 5)
+
+        stats = scheduler.stats()
+        assert peak == 3
+        assert stats["pending"] == 0 and stats["running"] == 0
+        assert stats["repos"]["o_r0"]["failed"] == 1
+        # Failed items are charged their estimate
+        assert stats["repos"]["o_r0"]["spent"] == pytest.approx(0.75 + 1.0)
+
+    async def test_run_waits_for_github_quota(self, tmp_path):
+        bucket = TokenBucket(capacity=100, refill_rate=200.0)
+        bucket.tokens = 0.0
+        done = []
+
+        async def work(item: WorkItem) -> None:
+            done.append(item.number)
+
+        scheduler = _scheduler(
+            tmp_path,
+            [RepoConfig(repo="o/a")],
+            run_item=work,
+            rate_limiter=SimpleNamespace(github_bucket=bucket),
+        )
+        scheduler.submit(WorkItem("o/a", WorkKind.TRIAGE, 1))
+
+        assert scheduler.next_item() is None
+        assert 0 < scheduler.quota_wait() <= 0.05
+        # Nothing is running, so only the timed wait can wake the loop
+        task = asyncio.create_task(scheduler.run(until_idle=False))
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            task.cancel()
+
+        assert done == [1]
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Tests for the Graphiti embedding cache.
+
+Checks hits, batched misses, LRU eviction, persistence across processes
+(instances) and digest verification with a fake embedder, and the cache in
+front of the Ollama provider with a local stub server.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add apps/backend to path for imports (idempotent guard)
+sys_path = Path(__file__).parent.parent / "apps" / "backend"
+if str(sys_path) not in sys.path:
+    sys.path.insert(0, str(sys_path))
+
+from integrations.graphiti.providers_pkg import embedder_cache
+from integrations.graphiti.providers_pkg.embedder_cache import (
+    CachingEmbedder,
+    EmbeddingStore,
+    text_digest,
+)
+
+DIM = 4
+
+
+def _vector(text: str) -> list[float]:
+    return [float(len(text)), float(ord(text[0])), 1.0, 2.0]
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, input_data):
+        self.calls.append(list(input_data))
+        return _vector(input_data[0])
+
+    async def create_batch(self, input_data_list):
+        self.calls.append(list(input_data_list))
+        return [_vector(text) for text in input_data_list]
+
+
+def _store(tmp_path, capacity=None, model="nomic-embed-text"):
+    return EmbeddingStore(tmp_path, "ollama", model, DIM, capacity=capacity)
+
+
+async def test_repeated_text_is_served_from_cache(tmp_path):
+    inner = FakeEmbedder()
+    embedder = CachingEmbedder(inner, _store(tmp_path))
+
+    first = await embedder.create(input_data=["auth flow"])
+    second = await embedder.create(input_data=["auth flow"])
+
+    assert first == second == _vector("auth flow")
+    assert inner.calls == [["auth flow"]]
+    assert embedder.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+async def test_batch_sends_only_distinct_misses(tmp_path):
+    inner = FakeEmbedder()
+    embedder = CachingEmbedder(inner, _store(tmp_path))
+    await embedder.create(input_data=["cached"])
+
+    vectors = await embedder.create_batch(["cached", "new", "other", "new"])
+
+    assert vectors == [_vector(t) for t in ["cached", "new", "other", "new"]]
+    assert inner.calls[-1] == ["new", "other"]
+
+
+async def test_misses_are_split_at_the_batch_limit(tmp_path):
+    inner = FakeEmbedder()
+    embedder = CachingEmbedder(inner, _store(tmp_path), max_batch_size=2)
+
+    await embedder.create_batch(["one", "two", "three", "four", "five"])
+
+    assert inner.calls == [["one", "two"], ["three", "four"], ["five"]]
+
+
+async def test_concurrent_requests_share_one_call(tmp_path):
+    inner = FakeEmbedder()
+    embedder = CachingEmbedder(inner, _store(tmp_path))
+
+    results = await asyncio.gather(
+        *(embedder.create(input_data=["same text"]) for _ in range(3))
+    )
+
+    assert results == [_vector("same text")] * 3
+    assert inner.calls == [["same text"]]
+
+
+async def test_least_recently_used_entries_are_evicted(tmp_path):
+    store = _store(tmp_path, capacity=2)
+    a, b, c = (text_digest(t) for t in "abc")
+    store.put_many({a: _vector("a"), b: _vector("b")})
+    # Touch a so b is the least recently used
+    store._slots[a.hex()][1] += 10
+    store.put_many({c: _vector("c")})
+
+    found = store.get_many([a, b, c])
+
+    assert set(found) == {a, c}
+    assert len(store) == 2
+    assert store.data_file.stat().st_size == 2 * (DIM + 4) * 4
+
+
+async def test_cache_persists_across_instances(tmp_path):
+    await CachingEmbedder(FakeEmbedder(), _store(tmp_path)).create_batch(["kept"])
+
+    inner = FakeEmbedder()
+    vectors = await CachingEmbedder(inner, _store(tmp_path)).create_batch(["kept"])
+
+    assert vectors == [_vector("kept")]
+    assert inner.calls == []
+
+
+async def test_models_do_not_share_entries(tmp_path):
+    await CachingEmbedder(FakeEmbedder(), _store(tmp_path)).create_batch(["text"])
+
+    inner = FakeEmbedder()
+    await CachingEmbedder(inner, _store(tmp_path, model="mxbai")).create_batch(["text"])
+
+    assert inner.calls == [["text"]]
+
+
+async def test_slot_reused_elsewhere_is_a_miss(tmp_path):
+    reader = _store(tmp_path, capacity=1)
+    writer = _store(tmp_path, capacity=1)
+    first, second = text_digest("first"), text_digest("second")
+    writer.put_many({first: _vector("first")})
+    assert reader.get_many([first]) == {first: _vector("first")}
+
+    writer.put_many({second: _vector("second")})
+    # Stale index in reader: same slot, different row
+    reader._index_mtime = reader.index_file.stat().st_mtime_ns
+    reader._slots = {first.hex(): [0, 0.0]}
+
+    assert reader.get_many([first]) == {}
+
+
+def test_wrap_is_skipped_without_database_path(monkeypatch):
+    monkeypatch.setattr(embedder_cache, "EmbedderClient", object)
+    inner = FakeEmbedder()
+
+    class Config:
+        db_path = None
+
+    assert embedder_cache.wrap_with_cache(inner, Config()) is inner
+
+
+def test_wrap_respects_disable_switch(monkeypatch, tmp_path):
+    from integrations.graphiti.config import GraphitiConfig
+
+    monkeypatch.setattr(embedder_cache, "EmbedderClient", object)
+    monkeypatch.setenv("GRAPHITI_EMBEDDING_CACHE", "false")
+    inner = FakeEmbedder()
+    config = GraphitiConfig(db_path=str(tmp_path), embedder_provider="ollama")
+
+    assert embedder_cache.wrap_with_cache(inner, config) is inner
+
+
+class _OllamaStub(BaseHTTPRequestHandler):
+    """Answers OpenAI-compatible /v1/embeddings requests."""
+
+    requests: list = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        inputs = body["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        type(self).requests.append(inputs)
+        payload = {
+            "object": "list",
+            "model": body["model"],
+            "data": [
+                {"object": "embedding", "index": i, "embedding": _vector(text)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        }
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def ollama_server():
+    _OllamaStub.requests = []
+    server = HTTPServer(("127.0.0.1", 0), _OllamaStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _OllamaStub.requests
+    server.shutdown()
+    server.server_close()
+
+
+async def test_ollama_embedder_is_cached(ollama_server, tmp_path, monkeypatch):
+    pytest.importorskip("graphiti_core")
+    from integrations.graphiti.config import GraphitiConfig
+    from integrations.graphiti.providers_pkg.factory import create_embedder
+
+    monkeypatch.setenv("OPENAI_API_KEY", "unused")
+    base_url, requests = ollama_server
+    config = GraphitiConfig(
+        db_path=str(tmp_path),
+        embedder_provider="ollama",
+        ollama_base_url=base_url,
+        ollama_embedding_model="stub-embed",
+        ollama_embedding_dim=DIM,
+    )
+
+    embedder = create_embedder(config)
+    first = await embedder.create(input_data=["stub text"])
+    batch = await embedder.create_batch(["stub text", "fresh text"])
+    again = await create_embedder(config).create(input_data=["fresh text"])
+
+    assert isinstance(embedder, CachingEmbedder)
+    assert batch == [first, again]
+    assert requests == [["stub text"], ["fresh text"]]
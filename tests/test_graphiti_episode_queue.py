@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind Graphiti episode queue.
+
+graphiti-core is replaced by small stand-ins for EpisodeType and RawEpisode,
+so journaling, batching, deduplication, retry backoff and flushing can be
+checked without a graph database.
+"""
+
+import asyncio
+import sys
+from datetime import UTC, datetime, timezone
+from enum import Enum
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add apps/backend to path for imports (idempotent guard)
+sys_path = Path(__file__).parent.parent / "apps" / "backend"
+if str(sys_path) not in sys.path:
+    sys.path.insert(0, str(sys_path))
+
+from integrations.graphiti.queries_pkg import episode_queue
+from integrations.graphiti.queries_pkg.episode_queue import EpisodeQueue
+from integrations.graphiti.queries_pkg.queries import GraphitiQueries
+
+
+class EpisodeType(Enum):
+    text = "text"
+
+
+@pytest.fixture(autouse=True)
+def graphiti_core():
+    """Minimal graphiti_core modules used by the queue."""
+    modules = {
+        "graphiti_core": MagicMock(),
+        "graphiti_core.nodes": SimpleNamespace(EpisodeType=EpisodeType),
+        "graphiti_core.utils": MagicMock(),
+        "graphiti_core.utils.bulk_utils": SimpleNamespace(RawEpisode=SimpleNamespace),
+    }
+    with patch.dict(sys.modules, modules):
+        yield
+
+
+def _client(bulk=True):
+    graphiti = MagicMock(
+        spec=["add_episode", "add_episode_bulk"] if bulk else ["add_episode"]
+    )
+    graphiti.add_episode = AsyncMock()
+    if bulk:
+        graphiti.add_episode_bulk = AsyncMock()
+    return SimpleNamespace(graphiti=graphiti, config=None)
+
+
+def _episode(name, body="{}"):
+    return {
+        "name": name,
+        "episode_body": body,
+        "source": EpisodeType.text,
+        "source_description": "test",
+        "reference_time": datetime(2026, 1, 1, tzinfo=UTC),
+        "group_id": "project_app_1234",
+    }
+
+
+async def test_episodes_are_journaled_and_ingested_in_bulk(tmp_path):
+    client = _client()
+    queue = EpisodeQueue(tmp_path, client, "project_app_1234")
+
+    for name in ("a", "b", "a"):
+        assert queue.enqueue(**_episode(name))
+    assert [e["name"] for e in queue.pending()] == ["a", "b"]
+
+    await queue._task
+
+    assert queue.pending() == []
+    (episodes,), kwargs = client.graphiti.add_episode_bulk.await_args
+    assert [e.name for e in episodes] == ["a", "b"]
+    assert episodes[0].source is EpisodeType.text
+    assert kwargs == {"group_id": "project_app_1234"}
+    client.graphiti.add_episode.assert_not_awaited()
+
+
+async def test_failed_bulk_group_falls_back_without_duplicating_others(tmp_path):
+    client = _client()
+    queue = EpisodeQueue(tmp_path, client, "g")
+    queue._start_worker = lambda: None
+    for name, group in (("a1", "a"), ("b1", "b"), ("a2", "a"), ("b2", "b")):
+        queue.enqueue(**{**_episode(name), "group_id": group})
+    pending_at_b = []
+
+    async def bulk(episodes, group_id):
+        if group_id == "b":
+            pending_at_b.extend(e["name"] for e in queue.pending())
+            raise RuntimeError("LLM timeout")
+
+    client.graphiti.add_episode_bulk.side_effect = bulk
+
+    assert await queue.flush() == 0
+    # Group a left the journal before group b was attempted
+    assert pending_at_b == ["b1", "b2"]
+    added = [c.kwargs["name"] for c in client.graphiti.add_episode.await_args_list]
+    assert added == ["b1", "b2"]
+
+
+async def test_failed_episode_is_retried_with_backoff_then_dropped(tmp_path):
+    now = [1000.0]
+    client = _client(bulk=False)
+    client.graphiti.add_episode.side_effect = RuntimeError("LLM timeout")
+    queue = EpisodeQueue(tmp_path, client, "g", clock=lambda: now[0])
+    queue.enqueue(**_episode("a"))
+
+    assert len(await queue.drain()) == 1
+    (entry,) = queue.pending()
+    assert entry["attempts"] == 1 and entry["next_attempt"] == 1002.0
+
+    await queue.drain()  # not due yet
+    assert client.graphiti.add_episode.await_count == 1
+
+    for _ in range(episode_queue.MAX_ATTEMPTS - 1):
+        await queue.flush()  # ignores backoff
+    assert queue.pending() == []
+    assert client.graphiti.add_episode.await_count == episode_queue.MAX_ATTEMPTS
+
+
+async def test_duplicate_facts_error_counts_as_ingested(tmp_path):
+    client = _client(bulk=False)
+    client.graphiti.add_episode.side_effect = RuntimeError("duplicate_facts found")
+    queue = EpisodeQueue(tmp_path, client, "g")
+    queue.enqueue(**_episode("a"))
+
+    assert await queue.flush() == 0
+
+
+async def test_one_owner_ingests_a_journal(tmp_path):
+    client = _client(bulk=False)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_add(**kwargs):
+        started.set()
+        await release.wait()
+
+    client.graphiti.add_episode.side_effect = slow_add
+    other_client = _client(bulk=False)
+    owner = EpisodeQueue(tmp_path, client, "g")
+    other = EpisodeQueue(tmp_path, other_client, "g")
+    owner.enqueue(**_episode("a"))
+    await started.wait()
+
+    assert await other.drain() is None
+    release.set()
+    assert await owner.flush() == 0
+    other_client.graphiti.add_episode.assert_not_awaited()
+
+
+async def test_journal_survives_restart(tmp_path):
+    first = EpisodeQueue(tmp_path, _client(), "g")
+    first._start_worker = lambda: None  # process dies before ingesting
+    first.enqueue(**_episode("a"))
+
+    client = _client()
+    assert await EpisodeQueue(tmp_path, client, "g").flush() == 0
+    client.graphiti.add_episode.assert_awaited_once()
+    assert client.graphiti.add_episode.await_args.kwargs["name"] == "a"
+
+
+async def test_queries_enqueue_instead_of_adding(tmp_path):
+    client = _client()
+    queue = EpisodeQueue(tmp_path, client, "project_app_1234")
+    queue._start_worker = lambda: None
+    queries = GraphitiQueries(client, "project_app_1234", "001-spec", queue=queue)
+
+    assert await queries.add_pattern("Use the repository layer")
+
+    client.graphiti.add_episode.assert_not_awaited()
+    assert len(queue.pending()) == 1
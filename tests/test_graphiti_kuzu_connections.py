@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for LadybugDB reader/writer connections and the database lease.
+
+Checks query routing, concurrent reads, ordered writes, and turn-taking
+between processes (another process's lock is simulated with a separately
+opened, locked file).
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add apps/backend to path for imports (idempotent guard)
+sys_path = Path(__file__).parent.parent / "apps" / "backend"
+if str(sys_path) not in sys.path:
+    sys.path.insert(0, str(sys_path))
+
+from integrations.graphiti.queries_pkg.kuzu_connections import (
+    DatabaseLease,
+    KuzuConnectionManager,
+    is_write_query,
+)
+
+fcntl = pytest.importorskip("fcntl")
+
+
+class FakeConnection:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.queries = []
+        self.running = 0
+        self.max_running = 0
+
+    async def execute(self, query, parameters=None):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.queries.append(query)
+        self.running -= 1
+        return query
+
+
+@pytest.mark.parametrize(
+    "query,is_write",
+    [
+        ("MATCH (e:Episodic) RETURN e.uuid", False),
+        ("CALL QUERY_FTS_INDEX('Episodic', 'episode_content', $q) RETURN node", False),
+        ("MATCH (n:Entity {uuid: $uuid}) SET n.name = $name", True),
+        ("MERGE (n:Entity {uuid: $uuid}) ON CREATE SET n.created_at = $now", True),
+        ("MATCH (n) DETACH DELETE n", True),
+        ("CALL CREATE_FTS_INDEX('Entity', 'node_name_and_summary', ['name'])", True),
+        ("MATCH (n) WHERE n.created_at > $after RETURN n", False),
+    ],
+)
+def test_is_write_query(query, is_write):
+    assert is_write_query(query) is is_write
+
+
+async def test_reads_run_concurrently_and_writes_in_order():
+    reader, writer = FakeConnection(), FakeConnection()
+    manager = KuzuConnectionManager(writer, reader)
+
+    await asyncio.gather(
+        *(manager.execute(f"MATCH (n) RETURN {i}") for i in range(4)),
+        *(manager.execute(f"CREATE (n:Entity {{i: {i}}})") for i in range(3)),
+    )
+
+    assert reader.max_running == 4
+    assert writer.max_running == 1
+    assert writer.queries == [f"CREATE (n:Entity {{i: {i}}})" for i in range(3)]
+
+
+async def test_writer_serves_reads_without_pool():
+    writer = FakeConnection(delay=0)
+    manager = KuzuConnectionManager(writer)
+
+    await manager.execute("MATCH (n) RETURN n")
+
+    assert writer.queries == ["MATCH (n) RETURN n"]
+
+
+def _lock_as_other_process(path: Path) -> int:
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+
+async def test_lease_waits_for_other_process(tmp_path):
+    db_path = tmp_path / "memory_db"
+    lease = DatabaseLease(db_path)
+    other = _lock_as_other_process(lease.lock_path)
+
+    assert await lease.acquire(timeout=0.1) is False
+
+    async def hand_over():
+        await asyncio.sleep(0.1)
+        # The waiter has announced itself
+        assert any(lease.waiters_dir.iterdir())
+        fcntl.flock(other, fcntl.LOCK_UN)
+        os.close(other)
+
+    acquired, _ = await asyncio.gather(lease.acquire(timeout=5), hand_over())
+
+    assert acquired is True
+    assert not any(lease.waiters_dir.iterdir())
+    lease.release()
+
+
+async def test_holder_sees_fresh_waiters_only(tmp_path):
+    lease = DatabaseLease(tmp_path / "memory_db")
+    assert await lease.acquire(timeout=0)
+    lease.waiters_dir.mkdir()
+    marker = lease.waiters_dir / "12345-1"
+    marker.touch()
+
+    assert lease.has_waiters() is True
+
+    old = time.time() - 60
+    os.utime(marker, (old, old))
+    assert lease.has_waiters() is False
+    lease.release()
+
+
+async def test_leases_in_one_process_are_shared(tmp_path):
+    db_path = tmp_path / "memory_db"
+    first, second = DatabaseLease(db_path), DatabaseLease(db_path)
+
+    assert await first.acquire(timeout=0)
+    assert await second.acquire(timeout=0)
+
+    fd = os.open(first.lock_path, os.O_RDWR)
+    try:
+        first.release()
+        with pytest.raises(OSError):
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        second.release()
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    finally:
+        os.close(fd)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide GraphitiMemory pool.
+
+Uses a stand-in memory class so reuse, reference counting, idle closing and
+keying by provider configuration can be checked without graphiti-core.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add apps/backend to path for imports (idempotent guard)
+sys_path = Path(__file__).parent.parent / "apps" / "backend"
+if str(sys_path) not in sys.path:
+    sys.path.insert(0, str(sys_path))
+
+from memory.graphiti_pool import GraphitiMemoryPool
+
+
+class FakeMemory:
+    created = []
+
+    def __init__(self, spec_dir, project_dir, group_id_mode="spec", ok=True):
+        self.spec_dir = spec_dir
+        self.group_id_mode = group_id_mode
+        self.is_initialized = False
+        self.ok = ok
+        self.initialize_calls = 0
+        self.closed = False
+        FakeMemory.created.append(self)
+
+    async def initialize(self):
+        self.initialize_calls += 1
+        await asyncio.sleep(0)
+        self.is_initialized = self.ok
+        return self.ok
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _reset_created():
+    FakeMemory.created = []
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    project = tmp_path / "project"
+    spec = project / ".auto-claude" / "specs" / "001-test"
+    spec.mkdir(parents=True)
+    return spec, project
+
+
+async def test_memory_is_reused_between_leases(dirs):
+    pool = GraphitiMemoryPool(idle_seconds=60)
+
+    first = await pool.acquire(*dirs, "project", factory=FakeMemory)
+    await first.close()
+    await first.close()  # idempotent
+    second = await pool.acquire(*dirs, "project", factory=FakeMemory)
+
+    assert len(FakeMemory.created) == 1
+    assert second.spec_dir == dirs[0]  # attributes come from the memory
+    assert not FakeMemory.created[0].closed
+
+    await second.close()
+    await pool.close_all()
+    assert FakeMemory.created[0].closed
+
+
+async def test_concurrent_acquires_share_one_initialization(dirs):
+    pool = GraphitiMemoryPool(idle_seconds=60)
+
+    leases = await asyncio.gather(
+        *(pool.acquire(*dirs, "project", factory=FakeMemory) for _ in range(3))
+    )
+
+    assert len(FakeMemory.created) == 1
+    await leases[0].close()
+    await pool.close_all()
+    # Still leased twice: closed when the last lease is released
+    assert not FakeMemory.created[0].closed
+    await leases[1].close()
+    assert FakeMemory.created[0].closed
+
+
+async def test_provider_config_and_spec_are_part_of_the_key(dirs, monkeypatch):
+    pool = GraphitiMemoryPool(idle_seconds=60)
+    spec, project = dirs
+
+    monkeypatch.setenv("GRAPHITI_EMBEDDER_PROVIDER", "openai")
+    a = await pool.acquire(spec, project, "project", factory=FakeMemory)
+    monkeypatch.setenv("GRAPHITI_EMBEDDER_PROVIDER", "ollama")
+    b = await pool.acquire(spec, project, "project", factory=FakeMemory)
+    c = await pool.acquire(spec.parent, project, "project", factory=FakeMemory)
+
+    assert len(FakeMemory.created) == 3
+    for lease in (a, b, c):
+        await lease.close()
+    await pool.close_all()
+
+
+async def test_idle_memory_is_closed_after_timeout(dirs):
+    pool = GraphitiMemoryPool(idle_seconds=0.01)
+
+    lease = await pool.acquire(*dirs, "project", factory=FakeMemory)
+    await lease.close()
+    assert not FakeMemory.created[0].closed
+
+    await asyncio.sleep(0.05)
+
+    assert FakeMemory.created[0].closed
+    assert len(pool) == 0
+
+
+async def test_zero_idle_closes_on_release(dirs):
+    pool = GraphitiMemoryPool(idle_seconds=0)
+
+    lease = await pool.acquire(*dirs, "project", factory=FakeMemory)
+    await lease.close()
+
+    assert FakeMemory.created[0].closed
+    assert len(pool) == 0
+
+
+async def test_expired_memory_closed_on_next_acquire(dirs):
+    now = [0.0]
+    pool = GraphitiMemoryPool(idle_seconds=30, clock=lambda: now[0])
+    spec, project = dirs
+
+    lease = await pool.acquire(spec, project, "project", factory=FakeMemory)
+    await lease.close()
+    now[0] = 40
+    # Timer lost with its event loop (asyncio.run callers): swept on acquire
+    other = await pool.acquire(spec.parent, project, "project", factory=FakeMemory)
+
+    assert FakeMemory.created[0].closed
+    await other.close()
+    await pool.close_all()
+
+
+async def test_failed_initialization_is_not_pooled(dirs):
+    pool = GraphitiMemoryPool(idle_seconds=60)
+
+    def failing(*args, **kwargs):
+        return FakeMemory(*args, ok=False, **kwargs)
+
+    lease = await pool.acquire(*dirs, "project", factory=failing)
+    assert not lease.is_initialized
+    assert len(pool) == 0
+
+    await lease.close()
+    assert FakeMemory.created[0].closed
+
+
+async def test_memory_closed_when_another_process_waits(dirs):
+    pool = GraphitiMemoryPool(idle_seconds=60)
+    lease = await pool.acquire(*dirs, "project", factory=FakeMemory)
+    memory = FakeMemory.created[0]
+    memory.database_contended = lambda: True
+
+    await lease.close()
+
+    assert memory.closed
+    assert len(pool) == 0
+
+
+def test_entries_are_not_shared_across_event_loops(dirs):
+    """The build path calls asyncio.run() once per phase."""
+    pool = GraphitiMemoryPool(idle_seconds=60)
+
+    async def use():
+        lease = await pool.acquire(*dirs, "project", factory=FakeMemory)
+        await lease.close()
+
+    asyncio.run(use())
+    asyncio.run(use())
+
+    assert len(FakeMemory.created) == 2
+    assert len(pool) == 1
+    # The first loop ended, so its memory was abandoned rather than awaited
+    assert not FakeMemory.created[0].closed
+
+    # Like the atexit hook: a fresh loop never awaits the second loop's memory
+    asyncio.run(pool.close_all())
+    assert len(pool) == 0
+    assert not FakeMemory.created[1].closed
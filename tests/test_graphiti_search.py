@@ -468,3 +468,74 @@ class TestEdgeCases:
 
         # Verify: All insights should be returned
         assert len(result) == 2
+
+
+class TestGetSubtaskContext:
+    """Test the combined retrieval used for each coding subtask."""
+
+    @pytest.mark.asyncio
+    async def test_one_query_search_and_history_search(
+        self, graphiti_search, mock_client
+    ):
+        """Context, patterns and gotchas share one search of the query."""
+        pattern = _create_mock_result(content=_create_valid_pattern(), score=0.9)
+        gotcha = _create_mock_result(content=_create_valid_gotcha(), score=0.7)
+        weak = _create_mock_result(content=_create_valid_gotcha(), score=0.2)
+        for result in (pattern, gotcha, weak):
+            result.group_id = "test_group_id"
+        insight = _create_mock_result(content=_create_valid_session_insight(4))
+
+        async def search(query, group_ids, num_results):
+            if query == "add login form":
+                return [pattern, gotcha, weak]
+            return [insight]
+
+        mock_client.graphiti.search.side_effect = search
+
+        result = await graphiti_search.get_subtask_context(
+            "add login form", num_results=2, num_patterns=3, min_score=0.5
+        )
+
+        queries = [c.kwargs["query"] for c in mock_client.graphiti.search.call_args_list]
+        assert sorted(queries) == sorted(
+            ["add login form", "session insight completed subtasks recommendations"]
+        )
+        assert len(result["context"]) == 2
+        assert [p["pattern"] for p in result["patterns"]] == ["Test pattern"]
+        assert [g["score"] for g in result["gotchas"]] == [0.7]
+        assert [s["session_number"] for s in result["session_history"]] == [4]
+
+    @pytest.mark.asyncio
+    async def test_patterns_only_from_own_group_in_spec_mode(
+        self, graphiti_search, mock_client
+    ):
+        """Project-wide results count as context but not as patterns."""
+        own = _create_mock_result(content=_create_valid_pattern(), score=0.9)
+        own.group_id = "test_group_id"
+        project = _create_mock_result(content=_create_valid_pattern(), score=0.9)
+        project.group_id = "project_test_project_12345678"
+        mock_client.graphiti.search.return_value = [own, project]
+
+        result = await graphiti_search.get_subtask_context("query")
+
+        assert len(result["context"]) == 2
+        assert len(result["patterns"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_search_keeps_other_results(
+        self, graphiti_search, mock_client
+    ):
+        """A failing history search still returns the query results."""
+        pattern = _create_mock_result(content=_create_valid_pattern(), score=0.9)
+
+        async def search(query, group_ids, num_results):
+            if query == "query":
+                return [pattern]
+            raise RuntimeError("database is locked")
+
+        mock_client.graphiti.search.side_effect = search
+
+        result = await graphiti_search.get_subtask_context("query")
+
+        assert len(result["context"]) == 1
+        assert result["session_history"] == []
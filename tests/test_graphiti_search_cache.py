@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the Graphiti search result cache.
+
+Checks keying, write-generation invalidation, LRU/TTL bounds and the
+hit-rate counters, through GraphitiSearch and GraphitiQueries with a mock
+client.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+# Add apps/backend to path for imports (idempotent guard)
+sys_path = Path(__file__).parent.parent / "apps" / "backend"
+if str(sys_path) not in sys.path:
+    sys.path.insert(0, str(sys_path))
+
+from integrations.graphiti.queries_pkg import search as search_module
+from integrations.graphiti.queries_pkg import search_cache as search_cache_module
+from integrations.graphiti.queries_pkg.queries import GraphitiQueries
+from integrations.graphiti.queries_pkg.search import GraphitiSearch
+from integrations.graphiti.queries_pkg.search_cache import SearchResultCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh cache shared by searches and the write helpers."""
+    now = [0.0]
+    cache = SearchResultCache(ttl_seconds=60, max_entries=3, clock=lambda: now[0])
+    cache.now = now
+    monkeypatch.setattr(search_module, "search_cache", cache)
+    monkeypatch.setattr(search_cache_module, "search_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.config = SimpleNamespace(db_path="/db", database="memory")
+    client.graphiti.search = AsyncMock(
+        side_effect=lambda **kwargs: [Mock(content=kwargs["query"], score=0.9)]
+    )
+    client.graphiti.add_episode = AsyncMock()
+    return client
+
+
+def _search(client, group_id="project_app_1234"):
+    return GraphitiSearch(client, group_id, "001-spec", "project", Path("/app"))
+
+
+async def test_repeated_query_is_served_from_cache(cache, client):
+    search = _search(client)
+
+    first = await search.get_relevant_context("Add login  form", num_results=5)
+    second = await search.get_relevant_context("add login form", num_results=5)
+    await search.get_relevant_context("add login form", num_results=3)
+
+    assert first == second
+    assert client.graphiti.search.await_count == 2  # num_results is in the key
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+
+
+async def test_write_to_group_invalidates_its_searches(cache, client):
+    search = _search(client)
+    other_group = _search(client, "project_other_5678")
+    queries = GraphitiQueries(client, "project_app_1234", "001-spec")
+
+    await search.get_session_history()
+    await other_group.get_session_history()
+    await queries._add_episode(name="x", group_id="project_app_1234")
+    await search.get_session_history()
+    await other_group.get_session_history()
+
+    assert client.graphiti.search.await_count == 3
+    assert cache.stats()["invalidations"] == 1
+
+
+async def test_write_during_search_is_not_hidden(cache, client):
+    search = _search(client)
+    queries = GraphitiQueries(client, "project_app_1234", "001-spec")
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_search(**kwargs):
+        started.set()
+        await release.wait()
+        return []
+
+    client.graphiti.search.side_effect = slow_search
+    pending = asyncio.ensure_future(search.get_relevant_context("q"))
+    await started.wait()
+    await queries._add_episode(name="x", group_id="project_app_1234")
+    release.set()
+    await pending
+
+    client.graphiti.search.side_effect = None
+    client.graphiti.search.return_value = []
+    await search.get_relevant_context("q")
+    assert client.graphiti.search.await_count == 2
+
+
+async def test_entries_are_bounded_by_age_and_count(cache, client):
+    search = _search(client)
+
+    for query in ("a", "b", "c", "d"):
+        await search.get_relevant_context(query)
+    assert cache.stats()["entries"] == 3
+
+    await search.get_relevant_context("a")  # evicted as least recently used
+    cache.now[0] = 61
+    await search.get_relevant_context("d")  # expired
+
+    assert client.graphiti.search.await_count == 6
+    assert cache.stats()["hits"] == 0
+
+
+async def test_unidentified_database_is_not_cached(cache):
+    client = MagicMock()
+    client.graphiti.search = AsyncMock(return_value=[])
+    search = _search(client)
+
+    await search.get_relevant_context("q")
+    await search.get_relevant_context("q")
+
+    assert client.graphiti.search.await_count == 2
+    assert cache.stats()["entries"] == 0
+
+
+async def test_bulk_writes_invalidate_their_group(cache, client):
+    search = _search(client)
+    client.graphiti.add_episode_bulk = AsyncMock(side_effect=RuntimeError("partial"))
+
+    await search.get_session_history()
+    with pytest.raises(RuntimeError):
+        await search_cache_module.add_episode_bulk(client, [], "project_app_1234")
+    await search.get_session_history()
+
+    assert client.graphiti.search.await_count == 2
+
+
+def test_writes_by_another_process_invalidate(tmp_path):
+    namespace = (str(tmp_path), "memory")
+    agent = SearchResultCache(ttl_seconds=60)
+    writer = SearchResultCache(ttl_seconds=60)  # e.g. the memory query server
+    key = agent.key(namespace, ["g", "other"], "q", 5, "context")
+    agent.put(key, ["old"])
+    other_key = agent.key(namespace, ["other"], "q", 5, "context")
+    agent.put(other_key, ["kept"])
+
+    writer.bump(namespace, "g")
+
+    assert agent.get(key) is None
+    assert agent.get(other_key) == ["kept"]
+    # Database listings skip the hidden stamp directory
+    assert [p.name for p in tmp_path.iterdir()] == [".search_stamps"]
@@ -13,6 +13,7 @@ and the finding-validator agent.
 """
 
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -90,6 +91,15 @@ agent_utils_module = importlib.util.module_from_spec(agent_utils_spec)
 sys.modules["services.agent_utils"] = agent_utils_module
 agent_utils_spec.loader.exec_module(agent_utils_module)
 
+# Load finding_dedup (location-tolerant dedup and cross-validation grouping)
+finding_dedup_spec = importlib.util.spec_from_file_location(
+    "finding_dedup",
+    backend_path / "runners" / "github" / "services" / "finding_dedup.py",
+)
+finding_dedup_module = importlib.util.module_from_spec(finding_dedup_spec)
+sys.modules["services.finding_dedup"] = finding_dedup_module
+finding_dedup_spec.loader.exec_module(finding_dedup_module)
+
 # Load parallel_orchestrator_reviewer (contains _is_finding_in_scope and _cross_validate_findings)
 orchestrator_spec = importlib.util.spec_from_file_location(
     "parallel_orchestrator_reviewer",
@@ -112,6 +122,7 @@ _modules_to_mock = [
     "phase_config",
     "services.pr_worktree_manager",
     "services.sdk_utils",
+    "services.specialist_cache",
     "claude_agent_sdk",
 ]
 _original_modules = {name: sys.modules.get(name) for name in _modules_to_mock}
@@ -721,3 +732,221 @@ class TestCrossValidation:
         assert len(validated) == 0
         assert len(agreement.agreed_findings) == 0
         assert len(agreement.conflicting_findings) == 0
+
+    def test_nearby_similar_findings_merge(self, make_finding, mock_reviewer):
+        """Agents reporting one issue a few lines apart should still agree."""
+        finding1 = make_finding(
+            id="F1",
+            line=40,
+            title="SQL injection in query builder",
+            source_agents=["security-reviewer"],
+        )
+        finding2 = make_finding(
+            id="F2",
+            line=42,
+            title="Possible SQL injection via string formatting",
+            source_agents=["logic-reviewer"],
+        )
+        unrelated = make_finding(id="F3", line=43, title="Hardcoded API key")
+
+        validated, agreement = mock_reviewer._cross_validate_findings(
+            [finding1, finding2, unrelated]
+        )
+
+        assert [f.id for f in validated] == ["F1", "F3"]
+        assert agreement.agreed_findings == ["F1"]
+        assert validated[0].source_agents == ["security-reviewer", "logic-reviewer"]
+
+
+class TestFindingDedup:
+    """Location-tolerant deduplication shared by the PR reviewers."""
+
+    deduplicate = staticmethod(finding_dedup_module.deduplicate_findings)
+
+    @staticmethod
+    def _finding(id: str, line: int, title: str, file: str = "src/a.py", **kwargs):
+        return PRReviewFinding(
+            id=id,
+            severity=ReviewSeverity.MEDIUM,
+            category=kwargs.pop("category", ReviewCategory.QUALITY),
+            title=title,
+            description="d",
+            file=file,
+            line=line,
+            **kwargs,
+        )
+
+    def test_merges_repeats_within_window(self):
+        findings = [
+            self._finding("F1", 10, "Missing null check for user"),
+            self._finding("F2", 12, "Null checks missing on user object"),
+            self._finding("F3", 30, "Missing null check for user"),
+            self._finding("F4", 11, "Missing null check for user", file="src/b.py"),
+            self._finding("F5", 11, "Unused import"),
+        ]
+        dropped = []
+
+        unique = self.deduplicate(findings, on_duplicate=lambda k, d: dropped.append(d))
+
+        assert [f.id for f in unique] == ["F1", "F3", "F4", "F5"]
+        assert [f.id for f in dropped] == ["F2"]
+
+    def test_end_line_ranges_and_determinism(self):
+        findings = [
+            self._finding("F1", 100, "Race condition on cache dict", end_line=140),
+            self._finding("F2", 138, "Cache dict race condition"),
+            self._finding("F3", 20, "Unused variable"),
+        ]
+
+        first = [f.id for f in self.deduplicate(findings)]
+        second = [f.id for f in self.deduplicate(list(reversed(findings)))]
+
+        assert first == ["F1", "F3"]
+        assert second == ["F3", "F2"]
+
+    def test_independent_agents_are_left_for_cross_validation(self):
+        findings = [
+            self._finding("F1", 10, "Unchecked return", source_agents=["a"]),
+            self._finding("F2", 10, "Unchecked return", source_agents=["b"]),
+            self._finding("F3", 11, "Unchecked return value", source_agents=["a"]),
+        ]
+
+        unique = self.deduplicate(findings)
+
+        assert [f.id for f in unique] == ["F1", "F2"]
+
+    def test_merged_agents_leave_input_untouched(self):
+        findings = [
+            self._finding("F1", 10, "Unchecked return", source_agents=["a"]),
+            self._finding("F2", 11, "Unchecked return", source_agents=["a", "b"]),
+        ]
+        kept = []
+
+        unique = self.deduplicate(findings, on_duplicate=lambda k, d: kept.append(k))
+
+        assert unique[0].id == "F1"
+        assert unique[0].source_agents == ["a", "b"]
+        assert kept == [unique[0]]
+        assert findings[0].source_agents == ["a"]
+
+    def test_only_compares_findings_sharing_title_tokens(self, monkeypatch):
+        findings = [
+            self._finding(f"F{i}", 10, f"Problem number{i} in handler{i}")
+            for i in range(200)
+        ]
+        findings.append(self._finding("dup", 11, "Problem number7 in handler7"))
+        calls = []
+        real_similar = finding_dedup_module.titles_similar
+
+        def counting_similar(a, b):
+            calls.append(1)
+            return real_similar(a, b)
+
+        monkeypatch.setattr(finding_dedup_module, "titles_similar", counting_similar)
+        unique = self.deduplicate(findings)
+
+        assert len(unique) == 200
+        assert "dup" not in [f.id for f in unique]
+        assert len(calls) < 1000
+
+
+class TestSpecialistCacheWiring:
+    """Specialists only review files whose blobs they have not seen."""
+
+    @dataclass
+    class _File:
+        path: str
+        status: str = "modified"
+        additions: int = 1
+        deletions: int = 0
+        patch: str = ""
+
+    @dataclass
+    class _Context:
+        changed_files: list = field(default_factory=list)
+
+    class _Cache:
+        def __init__(self, cached: dict):
+            self.cached = cached
+            self.stored = None
+
+        def lookup(self, specialist, version, paths, file_blobs):
+            return MagicMock(
+                cached_paths=[p for p in paths if p in self.cached],
+                missing_paths=[p for p in paths if p not in self.cached],
+                cached_findings=[f for p in paths for f in self.cached.get(p, [])],
+            )
+
+        def store_results(self, specialist, version, reviewed, findings, file_blobs):
+            self.stored = (reviewed, findings)
+
+    @staticmethod
+    def _finding(id: str, file: str):
+        return PRReviewFinding(
+            id=id,
+            severity=ReviewSeverity.LOW,
+            category=ReviewCategory.QUALITY,
+            title="t",
+            description="d",
+            file=file,
+            line=1,
+        )
+
+    @pytest.fixture
+    def reviewer(self, tmp_path):
+        from models import GitHubRunnerConfig
+
+        config = GitHubRunnerConfig(token="test-token", repo="test/repo")
+        github_dir = tmp_path / ".auto-claude" / "github"
+        github_dir.mkdir(parents=True)
+        return ParallelOrchestratorReviewer(
+            project_dir=tmp_path, github_dir=github_dir, config=config
+        )
+
+    async def _run(self, reviewer, cache, session_result):
+        seen = {}
+
+        async def session(config, context, cached_files=None, **kwargs):
+            seen["files"] = [f.path for f in context.changed_files]
+            seen["cached_files"] = cached_files
+            return (config.name, session_result)
+
+        context = self._Context([self._File("a.py"), self._File("b.py")])
+        with patch.object(reviewer, "_run_specialist_session", session):
+            result = await reviewer._run_cached_specialist(
+                config=orchestrator_module.SPECIALIST_CONFIGS[0],
+                context=context,
+                project_root=Path("."),
+                model="sonnet",
+                thinking_budget=None,
+                cache=cache,
+                file_blobs={"a.py": "1", "b.py": "2"},
+            )
+        return result, seen
+
+    async def test_only_new_blobs_are_reviewed(self, reviewer):
+        cache = self._Cache({"a.py": [self._finding("OLD", "a.py")]})
+
+        (_, findings), seen = await self._run(
+            reviewer, cache, [self._finding("NEW", "b.py")]
+        )
+
+        assert seen == {"files": ["b.py"], "cached_files": ["a.py"]}
+        assert [f.id for f in findings] == ["NEW", "OLD"]
+        assert list(cache.stored[0]) == ["b.py"]
+
+    async def test_fully_cached_specialist_skips_session(self, reviewer):
+        cache = self._Cache({"a.py": [], "b.py": [self._finding("OLD", "b.py")]})
+
+        (_, findings), seen = await self._run(reviewer, cache, [])
+
+        assert seen == {}
+        assert [f.id for f in findings] == ["OLD"]
+
+    async def test_failed_session_is_not_cached(self, reviewer):
+        cache = self._Cache({})
+
+        (_, findings), _ = await self._run(reviewer, cache, None)
+
+        assert findings is None
+        assert cache.stored is None
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Tests for the long-lived memory query server.
+
+Uses an in-memory stand-in for kuzu connections so the request protocol,
+connection reuse, idle release, cursor paging and the full-text search path
+can be checked without LadybugDB installed.
+"""
+
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add apps/backend to path for imports (idempotent guard)
+sys_path = Path(__file__).parent.parent / "apps" / "backend"
+if str(sys_path) not in sys.path:
+    sys.path.insert(0, str(sys_path))
+
+import memory_query_server
+from integrations.graphiti.queries_pkg import search_cache as search_cache_module
+from integrations.graphiti.queries_pkg.search_cache import SearchResultCache
+from memory_query_server import MemoryQueryServer
+from query_memory import MemoryQueryError
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def has_next(self):
+        return bool(self._rows)
+
+    def get_next(self):
+        return self._rows.pop(0)
+
+
+class FakeConnection:
+    """Answers the Episodic queries query_memory issues, over a list of rows."""
+
+    def __init__(self, episodes, fts=True):
+        # Rows in _episode_columns() order: uuid, name, created_at, content, ...
+        self.episodes = episodes
+        self.fts = fts
+        self.queries = []
+        self.closed = False
+
+    def execute(self, query, parameters=None):
+        parameters = parameters or {}
+        self.queries.append((query, parameters))
+        if "LOAD EXTENSION fts" in query or query.lstrip().startswith("CREATE"):
+            if not self.fts:
+                raise RuntimeError("extension not found")
+            return FakeResult([])
+        if "QUERY_FTS_INDEX" in query:
+            if not self.fts:
+                raise RuntimeError("index episode_content does not exist")
+            hits = [
+                (*row, 2.5)
+                for row in self.episodes
+                if parameters["query"].lower() in row[3].lower()
+            ][: parameters["top"]]
+            return FakeResult(hits[parameters["skip"] :][: parameters["limit"]])
+
+        rows = sorted(self.episodes, key=lambda r: (r[2], r[0]), reverse=True)
+        if "after_ts" in parameters:
+            after = (parameters["after_ts"], parameters["after_uuid"])
+            rows = [r for r in rows if (r[2], r[0]) < after]
+        if "search_query" in parameters:
+            rows = [r for r in rows if parameters["search_query"] in r[3].lower()]
+            rows = rows[parameters["skip"] :]
+        return FakeResult(rows[: parameters["limit"]])
+
+    def close(self):
+        self.closed = True
+
+
+def _episodes(count):
+    return [
+        (f"u{i:03d}", f"session_{i}", f"2026-01-01T00:{i:02d}:00", f"note {i}", "", "")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Patch database opening; returns the list of connections opened."""
+    connections = []
+
+    def open_database(db_path, database, create=False):
+        conn = FakeConnection(_episodes(7))
+        connections.append(conn)
+        return object(), conn
+
+    monkeypatch.setattr(memory_query_server, "apply_monkeypatch", lambda: "kuzu")
+    monkeypatch.setattr(memory_query_server, "open_database", open_database)
+    return connections
+
+
+def _request(command, **kwargs):
+    return {"id": 1, "command": command, "db_path": "/db", "database": "m", **kwargs}
+
+
+class TestConnections:
+    def test_connection_is_reused_and_released_when_idle(self, opened):
+        now = [0.0]
+        server = MemoryQueryServer(idle_timeout=30, clock=lambda: now[0])
+
+        for _ in range(3):
+            assert server.handle(_request("get-memories", limit=2))["success"]
+        assert len(opened) == 1
+
+        now[0] = 10
+        server._release_if_idle()
+        assert not opened[0].closed
+
+        now[0] = 45
+        server._release_if_idle()
+        assert opened[0].closed
+        assert server.handle(_request("get-memories"))["success"]
+        assert len(opened) == 2
+
+    def test_database_handed_over_to_waiting_process(self, opened, tmp_path):
+        server = MemoryQueryServer(idle_timeout=300)
+        request = _request("get-memories") | {"db_path": str(tmp_path)}
+        assert server.handle(request)["success"]
+        lease = server._handles[(str(tmp_path), "m")].lease
+        assert lease.held
+
+        server._release_if_idle()
+        assert not opened[0].closed
+
+        # Another process starts waiting for the database
+        lease.waiters_dir.mkdir()
+        (lease.waiters_dir / "4242-1").touch()
+        server._release_if_idle()
+
+        assert opened[0].closed
+        assert not lease.held
+        assert not server._handles
+
+    def test_errors_are_responses(self, opened):
+        server = MemoryQueryServer()
+
+        assert server.handle({"id": 7, "command": "nope"}) == {
+            "id": 7,
+            "success": False,
+            "error": "Unknown command: nope",
+        }
+        assert not server.handle({"command": "get-memories"})["success"]
+
+
+class TestPaging:
+    def test_cursor_walks_all_memories_newest_first(self, opened):
+        server = MemoryQueryServer()
+
+        seen = []
+        response = server.handle(_request("get-memories", limit=3))
+        while True:
+            data = response["data"]
+            seen.extend(m["id"] for m in data["memories"])
+            if not data["next_cursor"]:
+                break
+            response = server.handle(
+                _request("get-memories", cursor=data["next_cursor"])
+            )
+
+        assert seen == [f"u{i:03d}" for i in range(6, -1, -1)]
+        # Later pages filter on the last key instead of skipping rows
+        assert opened[0].queries[-1][1]["after_uuid"] == "u001"
+
+    def test_cursor_is_bound_to_its_command(self, opened):
+        server = MemoryQueryServer()
+        cursor = server.handle(_request("get-memories", limit=2))["data"]["next_cursor"]
+
+        response = server.handle(_request("get-entities", cursor=cursor))
+
+        assert response == {
+            "id": 1,
+            "success": False,
+            "error": "Unknown or expired cursor",
+        }
+
+
+class TestSearch:
+    def test_keyword_search_uses_fulltext_index(self, opened):
+        server = MemoryQueryServer()
+
+        data = server.handle(_request("search", query="NOTE", limit=4))["data"]
+
+        assert data["fulltext"] is True
+        assert data["count"] == 4 and data["memories"][0]["score"] == 2.5
+        assert not any("CONTAINS" in q for q, _ in opened[0].queries)
+        second = server.handle(_request("search", cursor=data["next_cursor"]))
+        assert second["data"]["count"] == 3
+
+    def test_scan_fallback_without_index(self, monkeypatch, opened):
+        monkeypatch.setattr(
+            memory_query_server,
+            "open_database",
+            lambda *a, **k: (object(), FakeConnection(_episodes(3), fts=False)),
+        )
+        server = MemoryQueryServer()
+
+        data = server.handle(_request("search", query="note 2"))["data"]
+
+        assert data["fulltext"] is False
+        assert [m["id"] for m in data["memories"]] == ["u002"]
+
+    def test_embedder_env_stays_out_of_server_environment(self, monkeypatch, opened):
+        monkeypatch.delenv("GRAPHITI_EMBEDDER_PROVIDER", raising=False)
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        seen = []
+
+        async def create_semantic_client(db_path, database, env=None):
+            seen.append(env)
+            raise MemoryQueryError("no graphiti here")
+
+        monkeypatch.setattr(
+            memory_query_server, "create_semantic_client", create_semantic_client
+        )
+        server = MemoryQueryServer()
+        embedder_env = {"GRAPHITI_EMBEDDER_PROVIDER": "openai", "OPENAI_API_KEY": "k"}
+
+        data = server.handle(
+            _request("semantic-search", query="note", embedder_env=embedder_env)
+        )["data"]
+
+        assert data["search_type"] == "keyword"
+        assert seen == [embedder_env]
+        assert "GRAPHITI_EMBEDDER_PROVIDER" not in os.environ
+        assert "OPENAI_API_KEY" not in os.environ
+
+    def test_added_episode_invalidates_agent_searches(
+        self, monkeypatch, opened, tmp_path
+    ):
+        monkeypatch.setattr(
+            search_cache_module, "search_cache", SearchResultCache(ttl_seconds=60)
+        )
+        # The agent process's cache, not the server's own
+        agent_cache = SearchResultCache(ttl_seconds=60)
+        key = agent_cache.key((str(tmp_path), "m"), ["g"], "note", 5, "context")
+        agent_cache.put(key, ["stale"])
+
+        response = MemoryQueryServer().handle(
+            _request(
+                "add-episode",
+                name="insight",
+                content="{}",
+                group_id="g",
+                db_path=str(tmp_path),
+            )
+        )
+
+        assert response["success"], response
+        assert agent_cache.get(key) is None
+
+    def test_semantic_search_without_embedder_falls_back(self, monkeypatch, opened):
+        monkeypatch.delenv("GRAPHITI_EMBEDDER_PROVIDER", raising=False)
+        server = MemoryQueryServer()
+
+        data = server.handle(_request("semantic-search", query="note"))["data"]
+
+        assert data["search_type"] == "keyword"
+
+
+def test_serve_loop_answers_lines_until_shutdown(opened):
+    stdin = io.StringIO(
+        "\n".join(
+            [
+                json.dumps({"id": 1, "command": "ping"}),
+                "not json",
+                json.dumps(_request("get-memories", limit=1) | {"id": 2}),
+                json.dumps({"id": 3, "command": "shutdown"}),
+                json.dumps({"id": 4, "command": "ping"}),
+            ]
+        )
+    )
+    stdout = io.StringIO()
+
+    MemoryQueryServer(idle_timeout=60).serve(stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, None, 2, 3]
+    assert [r["success"] for r in responses] == [True, False, True, True]
+    assert opened[0].closed
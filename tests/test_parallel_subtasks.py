@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Tests for Parallel Subtask Execution
+====================================
+
+Covers:
+- get_ready_subtasks: phase dependencies, parallel_safe phases, stuck subtasks
+- select_subtasks: free slots and file leases
+- SubtaskWorktree: spec copy and merging back into the build worktree
+- ParallelSubtaskScheduler: concurrent sessions, dependent phases, failures
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add auto-claude directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "apps" / "backend"))
+
+from agents import scheduler as scheduler_module
+from agents.scheduler import (
+    ParallelSubtaskScheduler,
+    SubtaskWorktree,
+    select_subtasks,
+)
+from core.progress import get_next_subtask, get_ready_subtasks
+
+
+def _plan(*phases) -> dict:
+    return {"feature": "Parallel", "workflow_type": "feature", "phases": list(phases)}
+
+
+def _phase(phase_id, subtasks, depends_on=(), parallel_safe=True) -> dict:
+    return {
+        "id": phase_id,
+        "name": f"Phase {phase_id}",
+        "depends_on": list(depends_on),
+        "parallel_safe": parallel_safe,
+        "subtasks": subtasks,
+    }
+
+
+def _subtask(subtask_id, files=(), status="pending") -> dict:
+    return {
+        "id": subtask_id,
+        "description": f"Implement {subtask_id}",
+        "status": status,
+        "files_to_modify": list(files),
+    }
+
+
+def _write_plan(spec_dir: Path, plan: dict) -> None:
+    spec_dir.mkdir(parents=True, exist_ok=True)
+    (spec_dir / "implementation_plan.json").write_text(json.dumps(plan))
+
+
+def _read_plan(spec_dir: Path) -> dict:
+    return json.loads((spec_dir / "implementation_plan.json").read_text())
+
+
+def _git(repo: Path, *args) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+class TestReadySubtasks:
+    def test_parallel_phase_offers_all_pending(self, spec_dir):
+        _write_plan(
+            spec_dir,
+            _plan(
+                _phase(1, [_subtask("a", status="completed")], parallel_safe=False),
+                _phase(2, [_subtask("b"), _subtask("c")], depends_on=[1]),
+                _phase(3, [_subtask("d"), _subtask("e")], parallel_safe=False),
+                _phase(4, [_subtask("f")], depends_on=[2]),
+            ),
+        )
+
+        ready = get_ready_subtasks(spec_dir)
+
+        assert [s["id"] for s in ready] == ["b", "c", "d"]
+        assert [s["parallel_safe"] for s in ready] == [True, True, False]
+        assert ready[0]["phase_id"] == 2
+        assert get_next_subtask(spec_dir)["id"] == "b"
+
+    def test_stuck_subtasks_are_skipped(self, spec_dir):
+        _write_plan(spec_dir, _plan(_phase(1, [_subtask("a"), _subtask("b")])))
+        memory = spec_dir / "memory"
+        memory.mkdir()
+        (memory / "attempt_history.json").write_text(
+            json.dumps({"stuck_subtasks": [{"subtask_id": "a"}]})
+        )
+
+        assert [s["id"] for s in get_ready_subtasks(spec_dir)] == ["b"]
+
+    def test_missing_plan(self, spec_dir):
+        assert get_ready_subtasks(spec_dir) == []
+
+
+class TestSelectSubtasks:
+    def test_overlapping_files_are_not_selected_together(self):
+        ready = [
+            {"id": "a", "parallel_safe": True, "files_to_modify": ["src/app.py"]},
+            {"id": "b", "parallel_safe": True, "files_to_modify": ["./src/app.py"]},
+            {"id": "c", "parallel_safe": True, "files_to_modify": ["src/util.py"]},
+            {"id": "d", "parallel_safe": False, "files_to_modify": []},
+        ]
+
+        assert [s["id"] for s in select_subtasks(ready, 4)] == ["a", "c"]
+
+    def test_running_subtasks_hold_their_files(self):
+        ready = [
+            {"id": "a", "parallel_safe": True, "files_to_modify": ["x.py"]},
+            {"id": "b", "parallel_safe": True, "files_to_modify": ["y.py"]},
+            {"id": "c", "parallel_safe": True, "files_to_modify": []},
+        ]
+
+        selected = select_subtasks(
+            ready, 1, running={"a"}, leased_files={"x.py", "y.py"}
+        )
+
+        assert [s["id"] for s in selected] == ["c"]
+
+
+@pytest.fixture
+def build(temp_git_repo):
+    """A git repo with a gitignored spec directory holding a plan."""
+    (temp_git_repo / ".gitignore").write_text(".auto-claude/\n")
+    for name in ("one", "two", "three", "four"):
+        (temp_git_repo / f"{name}.txt").write_text("")
+    _git(temp_git_repo, "add", ".")
+    _git(temp_git_repo, "commit", "-m", "Add files")
+    spec_dir = temp_git_repo / ".auto-claude" / "specs" / "001-parallel"
+    _write_plan(
+        spec_dir,
+        _plan(
+            _phase(1, [_subtask("one", ["one.txt"]), _subtask("two", ["two.txt"])]),
+            _phase(2, [_subtask("three", ["three.txt"])], depends_on=[1]),
+            _phase(3, [_subtask("four", ["four.txt"])], depends_on=[1]),
+        ),
+    )
+    return temp_git_repo, spec_dir
+
+
+class TestSubtaskWorktree:
+    def test_work_is_merged_into_the_build(self, build):
+        project_dir, spec_dir = build
+        worktree = SubtaskWorktree(project_dir, spec_dir, "one")
+        worktree.create(spec_dir)
+
+        assert (worktree.spec_dir / "implementation_plan.json").exists()
+        (worktree.path / "one.txt").write_text("one\n")
+        worktree.commit_changes()
+
+        assert worktree.merge_into_project()
+        assert (project_dir / "one.txt").read_text() == "one\n"
+        committed = _git(project_dir, "ls-tree", "-r", "--name-only", "HEAD")
+        assert "one.txt" in committed
+        assert ".auto-claude" not in committed
+
+        worktree.remove()
+        assert not worktree.path.exists()
+
+    def test_conflicts_fall_back_to_merge_orchestrator(self, build, monkeypatch):
+        project_dir, spec_dir = build
+        worktree = SubtaskWorktree(project_dir, spec_dir, "one")
+        worktree.create(spec_dir)
+        (worktree.path / "README.md").write_text("# From subtask\n")
+        worktree.commit_changes()
+        (project_dir / "README.md").write_text("# From build\n")
+        _git(project_dir, "commit", "-am", "Concurrent change")
+        fallback = MagicMock(return_value=True)
+        monkeypatch.setattr(worktree, "_merge_with_orchestrator", fallback)
+
+        assert worktree.merge_into_project("Change README")
+
+        fallback.assert_called_once()
+        assert _git(project_dir, "status", "--porcelain") == ""
+        worktree.remove()
+
+
+class TestParallelSubtaskScheduler:
+    @pytest.fixture
+    def scheduler(self, build, monkeypatch):
+        project_dir, spec_dir = build
+        monkeypatch.setattr(
+            scheduler_module,
+            "post_session_processing",
+            AsyncMock(return_value=True),
+        )
+        recovery_manager = MagicMock()
+        recovery_manager.get_attempt_count.return_value = 1
+        return ParallelSubtaskScheduler(
+            project_dir, spec_dir, "model", recovery_manager, limit=2
+        )
+
+    async def test_independent_subtasks_run_concurrently(self, scheduler, monkeypatch):
+        active = 0
+        peak = 0
+        started = []
+
+        async def fake_session(subtask, worktree, session_num):
+            nonlocal active, peak
+            started.append(subtask["id"])
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            (worktree.path / f"{subtask['id']}.txt").write_text(subtask["id"])
+            plan = _read_plan(worktree.spec_dir)
+            for phase in plan["phases"]:
+                for s in phase["subtasks"]:
+                    if s["id"] == subtask["id"]:
+                        s["status"] = "completed"
+            _write_plan(worktree.spec_dir, plan)
+            active -= 1
+            return "continue", {}
+
+        monkeypatch.setattr(scheduler, "_run_session", fake_session)
+
+        assert scheduler.has_parallel_work()
+        result = await scheduler.run(first_session=3)
+
+        assert peak == 2
+        assert sorted(started[:2]) == ["one", "two"]
+        assert sorted(result.completed) == ["four", "one", "three", "two"]
+        assert result.sessions == 4
+        statuses = {
+            s["id"]: s["status"]
+            for phase in _read_plan(scheduler.spec_dir)["phases"]
+            for s in phase["subtasks"]
+        }
+        assert set(statuses.values()) == {"completed"}
+        for name in ("one", "two", "three", "four"):
+            assert (scheduler.project_dir / f"{name}.txt").read_text() == name
+        assert (
+            list(
+                (scheduler.project_dir / ".auto-claude" / "subtask-worktrees").iterdir()
+            )
+            == []
+        )
+
+    async def test_git_work_runs_off_the_event_loop(self, scheduler, monkeypatch):
+        loop_thread = threading.get_ident()
+        threads = {}
+        worktree_cls = scheduler_module.SubtaskWorktree
+        for name in ("create", "commit_changes", "merge_into_project", "remove"):
+
+            def recording(self, *args, _name=name, _real=getattr(worktree_cls, name)):
+                threads.setdefault(_name, set()).add(threading.get_ident())
+                return _real(self, *args)
+
+            monkeypatch.setattr(worktree_cls, name, recording)
+
+        async def fake_session(subtask, worktree, session_num):
+            plan = _read_plan(worktree.spec_dir)
+            for phase in plan["phases"]:
+                for s in phase["subtasks"]:
+                    if s["id"] == subtask["id"]:
+                        s["status"] = "completed"
+            _write_plan(worktree.spec_dir, plan)
+            return "continue", {}
+
+        monkeypatch.setattr(scheduler, "_run_session", fake_session)
+
+        result = await scheduler.run()
+
+        assert sorted(result.completed) == ["four", "one", "three", "two"]
+        assert set(threads) == {
+            "create",
+            "commit_changes",
+            "merge_into_project",
+            "remove",
+        }
+        assert all(loop_thread not in idents for idents in threads.values())
+
+    async def test_failed_subtask_stays_pending(self, scheduler, monkeypatch):
+        async def fake_session(subtask, worktree, session_num):
+            return "error", {"type": "rate_limit", "message": "slow down"}
+
+        monkeypatch.setattr(scheduler, "_run_session", fake_session)
+
+        result = await scheduler.run()
+
+        assert result.sessions == 2
+        assert result.error_info["type"] == "rate_limit"
+        assert sorted(result.failed) == ["one", "two"]
+        assert scheduler.recovery_manager.record_attempt.call_count == 2
+        phase = _read_plan(scheduler.spec_dir)["phases"][0]
+        assert [s["status"] for s in phase["subtasks"]] == ["pending", "pending"]
+
+    def test_sequential_by_default(self, build, monkeypatch):
+        monkeypatch.delenv("AUTO_BUILD_PARALLEL_SUBTASKS", raising=False)
+        project_dir, spec_dir = build
+        scheduler = ParallelSubtaskScheduler(
+            project_dir,
+            spec_dir,
+            "model",
+            MagicMock(),
+            limit=scheduler_module.get_parallel_subtask_limit(),
+        )
+
+        assert not scheduler.has_parallel_work()
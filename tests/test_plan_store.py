@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests for the Implementation Plan Store
+=======================================
+
+Covers:
+- Cached parsing, invalidated when the plan file changes
+- PlanView counters and subtask lookups
+- Locked read-modify-write updates and compare-and-swap conflicts
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add auto-claude directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "apps" / "backend"))
+
+from core.plan_store import PlanConflictError, PlanStore
+from core.progress import count_subtasks_detailed
+
+
+def _plan(*statuses) -> dict:
+    return {
+        "feature": "Store",
+        "phases": [
+            {
+                "id": 1,
+                "subtasks": [
+                    {"id": f"s{i}", "status": status}
+                    for i, status in enumerate(statuses)
+                ],
+            }
+        ],
+    }
+
+
+def _write_plan(spec_dir: Path, plan: dict, age: float = 10.0) -> Path:
+    """Write a plan whose mtime is age seconds old (so it can be cached)."""
+    path = spec_dir / "implementation_plan.json"
+    path.write_text(json.dumps(plan))
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestPlanCache:
+    def test_parsed_once_per_version(self, spec_dir, monkeypatch):
+        _write_plan(spec_dir, _plan("completed", "pending"))
+        store = PlanStore(spec_dir)
+        loads = []
+        real_load = json.load
+        monkeypatch.setattr(json, "load", lambda f: loads.append(1) or real_load(f))
+
+        first = store.view()
+        assert store.view() is first
+        assert len(loads) == 1
+
+        _write_plan(spec_dir, _plan("completed", "completed"), age=5.0)
+        second = store.view()
+        assert second is not first
+        assert second.completed == 2
+        assert len(loads) == 2
+
+    def test_fresh_writes_are_not_cached(self, spec_dir):
+        path = spec_dir / "implementation_plan.json"
+        path.write_text(json.dumps(_plan("pending")))
+        store = PlanStore(spec_dir)
+        assert store.view().completed == 0
+
+        # Same size, and possibly the same mtime tick
+        path.write_text(json.dumps(_plan("pending")).replace("pending", "failed!"))
+        assert store.view().counts["pending"] == 1
+        assert store.view().data["phases"][0]["subtasks"][0]["status"] == "failed!"
+
+    def test_missing_and_invalid_plans(self, spec_dir):
+        store = PlanStore(spec_dir)
+        assert store.read() is None
+        assert store.load() is None
+        with pytest.raises(FileNotFoundError):
+            store.view()
+
+        (spec_dir / "implementation_plan.json").write_text("{not json")
+        assert store.read() is None
+
+    def test_shared_store_per_spec(self, spec_dir):
+        assert PlanStore.for_spec(spec_dir) is PlanStore.for_spec(
+            spec_dir / ".." / spec_dir.name
+        )
+
+    def test_load_returns_private_copy(self, spec_dir):
+        _write_plan(spec_dir, _plan("pending"))
+        store = PlanStore(spec_dir)
+        plan = store.load()
+        plan["phases"][0]["subtasks"][0]["status"] = "completed"
+
+        assert store.view().completed == 0
+
+
+class TestPlanView:
+    def test_counts_and_lookups(self, spec_dir):
+        _write_plan(
+            spec_dir, _plan("completed", "in_progress", "failed", "pending", "odd")
+        )
+        view = PlanStore(spec_dir).view()
+
+        assert view.counts == {
+            "completed": 1,
+            "in_progress": 1,
+            "pending": 2,
+            "failed": 1,
+            "total": 5,
+        }
+        assert not view.is_complete
+        assert view.find_subtask("s2")["status"] == "failed"
+        assert view.find_phase_for_subtask("s2")["id"] == 1
+        assert view.find_subtask("missing") is None
+
+    def test_progress_uses_store(self, spec_dir):
+        _write_plan(spec_dir, _plan("completed", "pending"))
+
+        counts = count_subtasks_detailed(spec_dir)
+        counts["completed"] = 99
+
+        assert count_subtasks_detailed(spec_dir)["completed"] == 1
+
+
+class TestPlanUpdates:
+    def test_update_writes_and_invalidates(self, spec_dir):
+        _write_plan(spec_dir, _plan("pending"))
+        store = PlanStore(spec_dir)
+        before = store.view()
+
+        def complete(plan):
+            plan["phases"][0]["subtasks"][0]["status"] = "completed"
+            return "done"
+
+        assert store.update(complete) == "done"
+        assert before.completed == 0
+        assert store.view().is_complete
+        saved = json.loads((spec_dir / "implementation_plan.json").read_text())
+        assert saved["phases"][0]["subtasks"][0]["status"] == "completed"
+
+    def test_update_skipped_when_mutate_returns_false(self, spec_dir):
+        path = _write_plan(spec_dir, _plan("pending"))
+        mtime = path.stat().st_mtime_ns
+
+        assert PlanStore(spec_dir).update(lambda plan: False) is False
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_stale_version_conflicts(self, spec_dir):
+        _write_plan(spec_dir, _plan("pending"))
+        store = PlanStore(spec_dir)
+        version = store.view().version
+        store.write(_plan("completed"))
+
+        with pytest.raises(PlanConflictError):
+            store.update(lambda plan: None, expected_version=version)
+        with pytest.raises(PlanConflictError):
+            store.write(_plan("failed"), expected_version=version)
+        assert store.view().completed == 1
+
+    def test_concurrent_updates_are_not_lost(self, spec_dir):
+        _write_plan(spec_dir, {"phases": [], "counter": 0})
+
+        def increment():
+            # Separate stores, like separate processes
+            store = PlanStore(spec_dir)
+            for _ in range(20):
+                store.update(lambda plan: plan.update(counter=plan["counter"] + 1))
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert PlanStore(spec_dir).view().data["counter"] == 80
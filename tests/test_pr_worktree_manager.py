@@ -315,3 +315,150 @@ def test_get_worktree_info(temp_git_repo):
 
     # Cleanup
     manager.cleanup_all_worktrees()
+
+
+def _commit(repo_dir, name, content, message):
+    """Add a commit and return its SHA."""
+    path = repo_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    subprocess.run(["git", "add", "."], cwd=repo_dir, check=True, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", message], cwd=repo_dir, check=True, capture_output=True
+    )
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=repo_dir,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def test_pool_reuses_worktree(temp_git_repo):
+    """Test that a released pool worktree is re-pointed for the next PR."""
+    repo_dir, commit_sha = temp_git_repo
+    second_sha = _commit(repo_dir, "src/change.py", "v2", "second")
+    manager = PRWorktreeManager(repo_dir, ".test-worktrees")
+
+    first = manager.acquire_worktree(commit_sha, pr_number=1)
+    assert first.name.startswith("pool-")
+    assert (first / "test.txt").exists()
+    assert not (first / "src" / "change.py").exists()
+    (first / "scratch.txt").write_text("left behind by a review")
+    unchanged_inode = (first / "test.txt").stat().st_ino
+    manager.release_worktree(first)
+
+    second = manager.acquire_worktree(second_sha, pr_number=2)
+
+    assert second == first
+    assert (second / "src" / "change.py").read_text() == "v2"
+    assert not (second / "scratch.txt").exists()
+    # Paths that did not change between the commits are not rewritten
+    assert (second / "test.txt").stat().st_ino == unchanged_inode
+    manager.release_worktree(second)
+    assert second.exists()
+
+
+def test_pool_leases_are_exclusive(temp_git_repo):
+    """Test that concurrent reviews get different worktrees within the limit."""
+    repo_dir, commit_sha = temp_git_repo
+    original_max = os.environ.get("MAX_PR_WORKTREES")
+    os.environ["MAX_PR_WORKTREES"] = "2"
+
+    try:
+        manager = PRWorktreeManager(repo_dir, ".test-worktrees")
+        first = manager.acquire_worktree(commit_sha, pr_number=1)
+        second = manager.acquire_worktree(commit_sha, pr_number=2)
+        # Pool is full: a one-off worktree is created and removed on release
+        third = manager.acquire_worktree(commit_sha, pr_number=3)
+
+        assert len({first, second, third}) == 3
+        assert third.name.startswith("pr-3")
+        assert manager.leased_worktrees() == {first.resolve(), second.resolve()}
+
+        # Cleanup never evicts leased worktrees
+        manager.cleanup_worktrees()
+        assert first.exists() and second.exists()
+
+        manager.release_worktree(third)
+        assert not third.exists()
+    finally:
+        if original_max is not None:
+            os.environ["MAX_PR_WORKTREES"] = original_max
+        else:
+            os.environ.pop("MAX_PR_WORKTREES", None)
+
+
+def test_cleanup_limit_counts_pool_worktrees(temp_git_repo, monkeypatch):
+    """Test that the count limit covers pool slots but never evicts leased ones."""
+    repo_dir, commit_sha = temp_git_repo
+    monkeypatch.setenv("MAX_PR_WORKTREES", "2")
+    manager = PRWorktreeManager(repo_dir, ".test-worktrees")
+    slot = manager.acquire_worktree(commit_sha, pr_number=1)
+    time.sleep(0.1)
+    older = manager.create_worktree(commit_sha, pr_number=10, auto_cleanup=False)
+
+    # Exactly at the limit: nothing to remove
+    assert manager.cleanup_worktrees(force=True)["excess"] == 0
+
+    # One over: the leased slot is the oldest, so the oldest unleased goes
+    time.sleep(0.1)
+    newer = manager.create_worktree(commit_sha, pr_number=11, auto_cleanup=False)
+    assert manager.cleanup_worktrees(force=True)["excess"] == 1
+    assert slot.exists() and not older.exists() and newer.exists()
+
+    # An idle warm slot still counts towards the limit
+    manager.release_worktree(slot)
+    assert manager.cleanup_worktrees(force=True)["excess"] == 0
+    assert slot.exists() and newer.exists()
+
+
+def test_pool_recovers_stale_and_broken_slots(temp_git_repo):
+    """Test that dead leases are reclaimed and broken slots replaced."""
+    repo_dir, commit_sha = temp_git_repo
+    manager = PRWorktreeManager(repo_dir, ".test-worktrees")
+    slot = manager.acquire_worktree(commit_sha, pr_number=1)
+
+    # Lease left behind by a crashed process
+    lease = slot.with_name(slot.name + ".lease")
+    lease.write_text('{"pid": 999999999, "acquired_at": 0}')
+    assert manager.acquire_worktree(commit_sha, pr_number=2) == slot
+    manager.release_worktree(slot)
+
+    # A slot whose git link is gone is replaced by a fresh worktree
+    (slot / ".git").unlink()
+    replacement = manager.acquire_worktree(commit_sha, pr_number=3)
+    assert (replacement / "test.txt").exists()
+    manager.release_worktree(replacement)
+
+
+def test_pool_sparse_checkout(temp_git_repo):
+    """Test that sparse pool worktrees only contain configured and changed paths."""
+    repo_dir, _ = temp_git_repo
+    _commit(repo_dir, "keep/a.txt", "a", "keep")
+    _commit(repo_dir, "skip/b.txt", "b", "skip")
+    head = _commit(repo_dir, "changed/c.txt", "c", "changed")
+    manager = PRWorktreeManager(repo_dir, ".test-worktrees", sparse_paths=["keep"])
+
+    slot = manager.acquire_worktree(head, pr_number=4, changed_files=["changed/c.txt"])
+
+    assert (slot / "keep" / "a.txt").exists()
+    assert (slot / "changed" / "c.txt").exists()
+    assert not (slot / "skip").exists()
+    # Top-level files are always present in cone mode
+    assert (slot / "test.txt").exists()
+    manager.release_worktree(slot)
+
+
+def test_pool_disabled_uses_one_off_worktrees(temp_git_repo, monkeypatch):
+    """Test PR_WORKTREE_POOL=false falls back to per-review worktrees."""
+    repo_dir, commit_sha = temp_git_repo
+    monkeypatch.setenv("PR_WORKTREE_POOL", "false")
+    manager = PRWorktreeManager(repo_dir, ".test-worktrees")
+
+    worktree = manager.acquire_worktree(commit_sha, pr_number=5)
+    assert worktree.name.startswith("pr-5")
+
+    manager.release_worktree(worktree)
+    assert not worktree.exists()
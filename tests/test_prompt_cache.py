@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prompt Assembly Cache
+===================================
+
+Covers:
+- Templates read once per process
+- Memoized fragments, invalidated by input file changes and git HEAD
+- Build timings per prompt part
+- The cached prompt builders in prompts_pkg
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add auto-claude directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "apps" / "backend"))
+
+from prompts_pkg import prompts as prompts_module
+from prompts_pkg.prompt_cache import (
+    cached_fragment,
+    file_state,
+    get_prompt_timings,
+    git_head_state,
+    load_template,
+    preload_templates,
+    reset_prompt_cache,
+)
+from prompts_pkg.prompt_generator import load_subtask_context
+from prompts_pkg.prompts import get_coding_prompt
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    reset_prompt_cache()
+    yield
+    reset_prompt_cache()
+
+
+def _rewrite(path: Path, text: str) -> None:
+    """Write text and move the mtime on, even within one timestamp tick."""
+    path.write_text(text)
+    mtime = time.time() + 10
+    os.utime(path, (mtime, mtime))
+
+
+def _git(repo: Path, *args) -> None:
+    subprocess.run(["git", *args], cwd=repo, capture_output=True, check=True)
+
+
+class TestTemplates:
+    def test_templates_are_read_once(self, temp_dir):
+        (temp_dir / "nested").mkdir()
+        template = temp_dir / "nested" / "agent.md"
+        template.write_text("v1")
+
+        preload_templates(temp_dir)
+        template.write_text("v2")
+
+        assert load_template(template) == "v1"
+        reset_prompt_cache()
+        assert load_template(template) == "v2"
+
+    def test_missing_template(self, temp_dir):
+        with pytest.raises(FileNotFoundError):
+            load_template(temp_dir / "missing.md")
+
+
+class TestFragments:
+    def test_memoized_by_key_with_timings(self, temp_dir):
+        source = temp_dir / "input.txt"
+        source.write_text("one")
+        builds = []
+
+        def build():
+            builds.append(1)
+            return source.read_text() * 2
+
+        assert cached_fragment("doubled", file_state(source), build) == "oneone"
+        assert cached_fragment("doubled", file_state(source), build) == "oneone"
+        _rewrite(source, "two")
+        assert cached_fragment("doubled", file_state(source), build) == "twotwo"
+
+        assert len(builds) == 2
+        timing = get_prompt_timings()["doubled"]
+        assert timing["builds"] == 2
+        assert timing["cache_hits"] == 1
+        assert timing["last_size"] == 6
+
+    def test_failed_builds_are_not_cached(self):
+        def fail():
+            raise FileNotFoundError("gone")
+
+        with pytest.raises(FileNotFoundError):
+            cached_fragment("broken", "key", fail)
+        assert cached_fragment("broken", "key", lambda: "ok") == "ok"
+
+    def test_git_head_state_follows_commits_and_branches(self, temp_git_repo):
+        initial = git_head_state(temp_git_repo)
+        assert initial is not None
+        assert git_head_state(temp_git_repo / "subdir") == initial
+
+        (temp_git_repo / "file.txt").write_text("change")
+        _git(temp_git_repo, "add", ".")
+        _git(temp_git_repo, "commit", "-m", "Change")
+        committed = git_head_state(temp_git_repo)
+        assert committed != initial
+
+        _git(temp_git_repo, "checkout", "-b", "feature")
+        assert git_head_state(temp_git_repo) != committed
+
+    def test_no_git_repository(self, temp_dir):
+        assert git_head_state(temp_dir) is None
+
+
+class TestPromptBuilders:
+    def test_base_branch_detection_is_memoized(
+        self, temp_git_repo, spec_dir, monkeypatch
+    ):
+        calls = []
+        real_run = subprocess.run
+
+        def counting_run(*args, **kwargs):
+            calls.append(args[0])
+            return real_run(*args, **kwargs)
+
+        monkeypatch.delenv("DEFAULT_BRANCH", raising=False)
+        monkeypatch.setattr(prompts_module.subprocess, "run", counting_run)
+
+        first = prompts_module._detect_base_branch(spec_dir, temp_git_repo)
+        lookups = len(calls)
+        assert prompts_module._detect_base_branch(spec_dir, temp_git_repo) == first
+        assert len(calls) == lookups
+
+        _git(temp_git_repo, "branch", "develop")
+        prompts_module._detect_base_branch(spec_dir, temp_git_repo)
+        assert len(calls) > lookups
+
+    def test_coding_prompt_rebuilt_on_human_input(self, spec_dir):
+        first = get_coding_prompt(spec_dir)
+        assert get_coding_prompt(spec_dir) is first
+        assert "HUMAN INPUT" not in first
+
+        _rewrite(spec_dir / "HUMAN_INPUT.md", "Use the new API")
+
+        assert "Use the new API" in get_coding_prompt(spec_dir)
+        assert get_prompt_timings()["coding_prompt"]["builds"] == 2
+
+    def test_subtask_context_follows_file_changes(self, temp_dir, spec_dir):
+        (temp_dir / "app.py").write_text("a\nb\nc")
+        subtask = {"files_to_modify": ["app.py"]}
+
+        context = load_subtask_context(spec_dir, temp_dir, subtask, max_file_lines=2)
+        assert context["files_to_modify"]["app.py"].startswith("a\nb\n\n... (truncated")
+
+        _rewrite(temp_dir / "app.py", "x")
+        context = load_subtask_context(spec_dir, temp_dir, subtask, max_file_lines=2)
+        assert context["files_to_modify"]["app.py"] == "x"